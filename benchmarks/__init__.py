@@ -0,0 +1,11 @@
+# benchmarks/__init__.py
+"""
+Repeatable performance measurements for scheduling and list pages.
+
+Run against a fresh in-memory DuckDB database filled with synthetic data:
+    python -m benchmarks --customers 2000 --transactions 20000
+    python -m benchmarks --save-baseline     # record benchmarks/baseline.json
+
+Submodules are not imported here: the database backend has to be chosen
+before database.connection creates its singleton.
+"""
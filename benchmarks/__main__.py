@@ -0,0 +1,94 @@
+# benchmarks/__main__.py
+"""Command line entry point: python -m benchmarks --help"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import date, timedelta
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scheduling and list pages on synthetic data")
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--transactions", type=int, default=5000)
+    parser.add_argument("--days-back", type=int, default=365)
+    parser.add_argument("--days-ahead", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    parser.add_argument("--path", default=":memory:", help="DuckDB file (default: in-memory)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative p95 increase")
+    parser.add_argument("--startup-runs", type=int, default=5,
+                        help="Fresh processes for the cold_start scenario (0 skips it)")
+    parser.add_argument("--result-cache", action="store_true",
+                        help="Keep the query result cache on (warm-up would otherwise serve every read)")
+    args = parser.parse_args()
+
+    # Must happen before anything imports database.connection
+    os.environ["EZBIZ_DB_BACKEND"] = "duckdb"
+    os.environ["EZBIZ_LOCAL_DB"] = args.path
+
+    from database.connection import snowflake_conn
+    from benchmarks.data import DatasetSpec, generate_dataset
+    from benchmarks.runner import (
+        compare_with_baseline, format_report, load_baseline, run_scenario, save_baseline
+    )
+    from benchmarks.scenarios import build_scenarios
+    from benchmarks.startup import cold_start_result, measure_cold_start
+
+    spec = DatasetSpec(
+        customers=args.customers,
+        accounts=args.accounts,
+        transactions=args.transactions,
+        start_date=date.today() - timedelta(days=args.days_back),
+        end_date=date.today() + timedelta(days=args.days_ahead),
+        seed=args.seed
+    )
+    counts = generate_dataset(snowflake_conn, spec)
+    print("Dataset: " + ", ".join(f"{table} {count}" for table, count in counts.items()))
+
+    # Repeated reads would be answered from the result cache after warm-up and
+    # report no queries; measure the queries themselves unless asked not to
+    if not args.result_cache:
+        snowflake_conn.results.max_entries = 0
+        snowflake_conn.results.clear()
+
+    # Pages run in bare mode here; keep Streamlit's missing-runtime warnings out of the report
+    logging.disable(logging.WARNING)
+
+    results = {}
+    for scenario in build_scenarios(snowflake_conn, spec):
+        if args.scenario and scenario.name not in args.scenario:
+            continue
+        results[scenario.name] = run_scenario(scenario, args.iterations, args.warmup, seed=args.seed)
+    if args.startup_runs > 0 and (not args.scenario or "cold_start" in args.scenario):
+        results["cold_start"] = cold_start_result(measure_cold_start(args.startup_runs))
+
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, {
+            'backend': 'duckdb',
+            'dataset': spec.to_dict(),
+            'iterations': args.iterations,
+            'result_cache': args.result_cache
+        })
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if baseline:
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
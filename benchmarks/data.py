@@ -0,0 +1,284 @@
+# benchmarks/data.py
+"""
+Seeded synthetic data for benchmarks and offline development.
+
+generate_dataset() writes customers, commercial accounts, service addresses,
+services, employees and a history of service transactions through the
+regular connection API, so it works against the local DuckDB backend and a
+scratch Snowflake schema alike. The same spec and seed always produce the
+same rows.
+"""
+
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from models.service_address import rebuild_primary_service_addresses
+
+FIRST_NAMES = ["James", "Maria", "Robert", "Linda", "Michael", "Sarah", "David", "Karen",
+               "Daniel", "Lisa", "Jose", "Nancy", "Kevin", "Emily", "Brian", "Ashley"]
+LAST_NAMES = ["Smith", "Garcia", "Johnson", "Martinez", "Brown", "Lopez", "Davis", "Wilson",
+              "Anderson", "Thomas", "Moore", "Jackson", "Lee", "Perez", "White", "Harris"]
+STREETS = ["Main St", "Oak Ave", "Mesa Dr", "Camelback Rd", "Central Ave", "Indian School Rd"]
+CITIES = [("Phoenix", 85004), ("Mesa", 85201), ("Tempe", 85281), ("Scottsdale", 85251)]
+ACCOUNT_TYPES = ["Property Management", "Hotel", "Office", "Restaurant", "Medical"]
+PAYMENT_METHODS = ["Cash", "Credit Card", "Check"]
+
+# (name, category, cost, duration minutes, customer bookable)
+SERVICE_CATALOG = [
+    ("Standard Carpet Cleaning", "Carpet Cleaning", 150.00, 90, True),
+    ("Deep Carpet Cleaning", "Deep Cleaning", 250.00, 120, True),
+    ("Upholstery Cleaning", "Upholstery Cleaning", 120.00, 60, True),
+    ("Area Rug Cleaning", "Area Rug Cleaning", 80.00, 45, True),
+    ("Tile & Grout Cleaning", "Tile & Grout Cleaning", 200.00, 120, False),
+    ("Pet Odor Treatment", "Pet Odor Treatment", 95.00, 30, True),
+    ("Stain Removal", "Stain Removal", 60.00, 30, False),
+    ("Commercial Carpet Cleaning", "Carpet Cleaning", 400.00, 180, False),
+]
+
+INSERT_BATCH_SIZE = 500
+
+@dataclass
+class DatasetSpec:
+    """Shape of a generated dataset"""
+    customers: int = 500
+    accounts: int = 50
+    services: int = len(SERVICE_CATALOG)
+    employees: int = 5
+    transactions: int = 5000
+    start_date: date = field(default_factory=lambda: date.today() - timedelta(days=365))
+    end_date: date = field(default_factory=lambda: date.today() + timedelta(days=60))
+    extra_addresses: float = 0.2  # Share of customers with a second, non-primary address
+    recurring_share: float = 0.1
+    seed: int = 7
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: str(value) if isinstance(value, date) else value
+                for key, value in asdict(self).items()}
+
+def insert_rows(conn: Any,
+                table: str,
+                columns: Sequence[str],
+                rows: Sequence[Sequence[Any]],
+                batch_size: int = INSERT_BATCH_SIZE) -> int:
+    """
+    Insert rows with multi-row VALUES statements, one round trip per batch
+
+    Args:
+        conn: SnowflakeConnection (or LocalConnection)
+        table (str): Fully qualified table
+        columns (Sequence[str]): Column names
+        rows (Sequence[Sequence[Any]]): Values in column order
+        batch_size (int): Rows per statement
+
+    Returns:
+        int: Rows inserted
+
+    Raises:
+        RuntimeError: If a batch fails
+    """
+    row_placeholder = "(" + ", ".join("?" for _ in columns) + ")"
+    for offset in range(0, len(rows), batch_size):
+        batch = rows[offset:offset + batch_size]
+        query = (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+            + ", ".join(row_placeholder for _ in batch)
+        )
+        params = [value for row in batch for value in row]
+        if conn.execute_query(query, params) is None:
+            raise RuntimeError(f"Failed inserting into {table}")
+    return len(rows)
+
+def _ids(conn: Any, query: str) -> List[int]:
+    result = conn.execute_query(query)
+    if result is None:
+        raise RuntimeError(f"Failed reading generated IDs: {query}")
+    return [int(next(iter(row.values()))) for row in result]
+
+def _business_days(start_date: date, end_date: date) -> List[date]:
+    """Dates the business operates (closed on Sundays)"""
+    days = []
+    current = start_date
+    while current <= end_date:
+        if current.weekday() != 6:
+            days.append(current)
+        current += timedelta(days=1)
+    return days
+
+def generate_dataset(conn: Any, spec: Optional[DatasetSpec] = None) -> Dict[str, int]:
+    """
+    Populate an empty database with a reproducible synthetic business
+
+    Transactions before today are COMPLETED and paid; later ones are
+    SCHEDULED. Bookings on a day are packed back to back from 8 AM so the
+    day stays inside business hours and free of overlaps.
+
+    Args:
+        conn: SnowflakeConnection (or LocalConnection) to write through
+        spec (Optional[DatasetSpec]): Dataset shape, defaults to DatasetSpec()
+
+    Returns:
+        Dict[str, int]: Rows written per table
+    """
+    spec = spec or DatasetSpec()
+    rng = random.Random(spec.seed)
+    today = date.today()
+    counts: Dict[str, int] = {}
+
+    counts['BUSINESS_INFO'] = insert_rows(conn, "OPERATIONAL.CARPET.BUSINESS_INFO", [
+        'BUSINESS_NAME', 'STREET_ADDRESS', 'CITY', 'STATE', 'ZIP_CODE', 'PHONE_NUMBER',
+        'EMAIL_ADDRESS', 'OPERATING_HOURS_START', 'OPERATING_HOURS_END',
+        'WEEKEND_OPERATING_HOURS_START', 'WEEKEND_OPERATING_HOURS_END', 'ACTIVE_STATUS'
+    ], [[
+        'EZ Biz Demo Cleaning', '100 Main St', 'Phoenix', 'AZ', 85004, '6025550100',
+        'demo@example.com', time(8, 0), time(17, 0), time(9, 0), time(13, 0), True
+    ]])
+
+    catalog = [SERVICE_CATALOG[i % len(SERVICE_CATALOG)] for i in range(spec.services)]
+    counts['SERVICES'] = insert_rows(conn, "OPERATIONAL.CARPET.SERVICES", [
+        'SERVICE_NAME', 'SERVICE_CATEGORY', 'SERVICE_DESCRIPTION', 'COST',
+        'SERVICE_DURATION', 'CUSTOMER_BOOKABLE', 'ACTIVE_STATUS'
+    ], [
+        [name if i < len(SERVICE_CATALOG) else f"{name} {i}", category,
+         f"{name} (synthetic)", cost, duration, bookable, True]
+        for i, (name, category, cost, duration, bookable) in enumerate(catalog)
+    ])
+
+    counts['EMPLOYEE'] = insert_rows(conn, "OPERATIONAL.CARPET.EMPLOYEE", [
+        'FIRST_NAME', 'LAST_NAME', 'EMAIL', 'PHONE_NUMBER', 'JOB_TITLE', 'HOURLY_WAGE', 'ACTIVE_STATUS'
+    ], [
+        [FIRST_NAMES[i % len(FIRST_NAMES)], LAST_NAMES[i % len(LAST_NAMES)],
+         f"employee{i}@example.com", f"602555{i:04d}", 'Technician', 20.0 + i, True]
+        for i in range(spec.employees)
+    ])
+
+    customer_rows = []
+    for i in range(spec.customers):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        city, zip_code = rng.choice(CITIES)
+        customer_rows.append([
+            first, last, f"{rng.randint(100, 9999)} {rng.choice(STREETS)}", city, 'AZ', zip_code,
+            f"{first.lower()}.{last.lower()}{i}@example.com", f"480{i:07d}",
+            rng.random() < 0.5, rng.choice(['Phone', 'Email', 'Text'])
+        ])
+    counts['CUSTOMER'] = insert_rows(conn, "OPERATIONAL.CARPET.CUSTOMER", [
+        'FIRST_NAME', 'LAST_NAME', 'BILLING_ADDRESS', 'BILLING_CITY', 'BILLING_STATE',
+        'BILLING_ZIP', 'EMAIL_ADDRESS', 'PHONE_NUMBER', 'TEXT_FLAG', 'PRIMARY_CONTACT_METHOD'
+    ], customer_rows)
+
+    account_rows = []
+    for i in range(spec.accounts):
+        city, zip_code = rng.choice(CITIES)
+        account_type = rng.choice(ACCOUNT_TYPES)
+        account_rows.append([
+            f"{rng.choice(LAST_NAMES)} {account_type} {i}", account_type,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"account{i}@example.com",
+            f"623{i:07d}", f"{rng.randint(100, 9999)} {rng.choice(STREETS)}", city, 'AZ', zip_code, True
+        ])
+    counts['ACCOUNTS'] = insert_rows(conn, "OPERATIONAL.CARPET.ACCOUNTS", [
+        'ACCOUNT_NAME', 'ACCOUNT_TYPE', 'CONTACT_PERSON', 'CONTACT_EMAIL', 'CONTACT_PHONE',
+        'BILLING_ADDRESS', 'CITY', 'STATE', 'ZIP_CODE', 'ACTIVE_FLAG'
+    ], account_rows)
+
+    customer_ids = _ids(conn, "SELECT CUSTOMER_ID FROM OPERATIONAL.CARPET.CUSTOMER ORDER BY CUSTOMER_ID")
+    account_ids = _ids(conn, "SELECT ACCOUNT_ID FROM OPERATIONAL.CARPET.ACCOUNTS ORDER BY ACCOUNT_ID")
+    employee_ids = _ids(conn, "SELECT EMPLOYEE_ID FROM OPERATIONAL.CARPET.EMPLOYEE ORDER BY EMPLOYEE_ID")
+    services = conn.execute_query(
+        "SELECT SERVICE_ID, SERVICE_NAME, COST, SERVICE_DURATION FROM OPERATIONAL.CARPET.SERVICES ORDER BY SERVICE_ID"
+    ) or []
+
+    address_rows = []
+    for customer_id, row in zip(customer_ids, customer_rows):
+        address_rows.append([customer_id, None, row[2], row[3], 'AZ', row[5], rng.randint(800, 3500), True])
+        if rng.random() < spec.extra_addresses:
+            city, zip_code = rng.choice(CITIES)
+            address_rows.append([customer_id, None, f"{rng.randint(100, 9999)} {rng.choice(STREETS)}",
+                                 city, 'AZ', zip_code, rng.randint(800, 3500), False])
+    for account_id in account_ids:
+        for _ in range(rng.randint(1, 3)):
+            city, zip_code = rng.choice(CITIES)
+            address_rows.append([None, account_id, f"{rng.randint(100, 9999)} {rng.choice(STREETS)}",
+                                 city, 'AZ', zip_code, rng.randint(2000, 20000), False])
+    counts['SERVICE_ADDRESSES'] = insert_rows(conn, "OPERATIONAL.CARPET.SERVICE_ADDRESSES", [
+        'CUSTOMER_ID', 'ACCOUNT_ID', 'STREET_ADDRESS', 'CITY', 'STATE', 'ZIP_CODE',
+        'SQUARE_FOOTAGE', 'IS_PRIMARY_SERVICE'
+    ], address_rows)
+    rebuild_primary_service_addresses(conn)
+
+    addresses = conn.execute_query(
+        "SELECT ADDRESS_ID, CUSTOMER_ID, ACCOUNT_ID FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES"
+    ) or []
+    days = _business_days(spec.start_date, spec.end_date)
+    transaction_rows = []
+    if days and addresses and services and spec.transactions:
+        # Spread bookings evenly, then pack each day from opening time
+        per_day: Dict[date, int] = {}
+        for _ in range(spec.transactions):
+            service_date = rng.choice(days)
+            per_day[service_date] = per_day.get(service_date, 0) + 1
+        for service_date in sorted(per_day):
+            slot = datetime.combine(service_date, time(8, 0))
+            for _ in range(per_day[service_date]):
+                service = rng.choice(services)
+                address = rng.choice(addresses)
+                duration = int(service['SERVICE_DURATION'] or 60)
+                end = slot + timedelta(minutes=duration)
+                completed = service_date < today
+                amount = float(service['COST'])
+                recurring = rng.random() < spec.recurring_share
+                transaction_rows.append([
+                    address['CUSTOMER_ID'], address['ACCOUNT_ID'], address['ADDRESS_ID'],
+                    service['SERVICE_NAME'], service['SERVICE_ID'],
+                    service_date, slot.time(), end.time() if end.date() == service_date else time(23, 59),
+                    service_date, slot.time(), recurring, 'Weekly' if recurring else None,
+                    amount, amount, 0.0,
+                    'COMPLETED' if completed else 'SCHEDULED',
+                    service_date if completed else None,
+                    amount if completed else None,
+                    rng.choice(PAYMENT_METHODS) if completed else None,
+                    amount if completed else None,
+                    rng.choice(employee_ids) if employee_ids else None
+                ])
+                # Later bookings may spill past closing time on busy days, as in production
+                slot = end + timedelta(minutes=15)
+    counts['SERVICE_TRANSACTION'] = insert_rows(conn, "OPERATIONAL.CARPET.SERVICE_TRANSACTION", [
+        'CUSTOMER_ID', 'ACCOUNT_ID', 'ADDRESS_ID', 'SERVICE_NAME', 'SERVICE_ID',
+        'SERVICE_DATE', 'START_TIME', 'END_TIME', 'TRANSACTION_DATE', 'TRANSACTION_TIME',
+        'IS_RECURRING', 'RECURRENCE_PATTERN', 'BASE_SERVICE_COST', 'AMOUNT', 'DEPOSIT',
+        'STATUS', 'COMPLETION_DATE', 'AMOUNT_RECEIVED', 'PYMT_MTHD_1', 'PYMT_MTHD_1_AMT', 'EMPLOYEE1_ID'
+    ], transaction_rows)
+
+    return counts
+
+__all__ = ['DatasetSpec', 'generate_dataset', 'insert_rows', 'SERVICE_CATALOG']
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Seed a local DuckDB database with synthetic data")
+    parser.add_argument("--path", default="local.duckdb", help="DuckDB file to create or extend")
+    parser.add_argument("--customers", type=int, default=DatasetSpec.customers)
+    parser.add_argument("--accounts", type=int, default=DatasetSpec.accounts)
+    parser.add_argument("--transactions", type=int, default=DatasetSpec.transactions)
+    parser.add_argument("--days-back", type=int, default=365)
+    parser.add_argument("--days-ahead", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=DatasetSpec.seed)
+    args = parser.parse_args()
+
+    # The connection singleton is created on import, so pick the backend first
+    os.environ["EZBIZ_DB_BACKEND"] = "duckdb"
+    os.environ["EZBIZ_LOCAL_DB"] = os.path.abspath(args.path)
+    from database.connection import snowflake_conn
+
+    spec = DatasetSpec(
+        customers=args.customers,
+        accounts=args.accounts,
+        transactions=args.transactions,
+        start_date=date.today() - timedelta(days=args.days_back),
+        end_date=date.today() + timedelta(days=args.days_ahead),
+        seed=args.seed
+    )
+    for table, count in generate_dataset(snowflake_conn, spec).items():
+        print(f"{table}: {count} rows")
@@ -0,0 +1,192 @@
+# benchmarks/runner.py
+"""
+Timing harness: runs scenarios, reports latency percentiles and query
+counts, and compares a run with a stored baseline JSON file.
+"""
+
+import json
+import math
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from database.instrumentation import get_query_sink, set_query_sink
+
+@dataclass
+class Scenario:
+    """One timed operation; run receives a seeded Random for varying its inputs"""
+    name: str
+    description: str
+    run: Callable[[random.Random], Any]
+
+@dataclass
+class ScenarioResult:
+    """Latency and query statistics for one scenario"""
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    max_ms: float
+    queries_per_run: float
+    max_queries: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+class CountingSink:
+    """Query sink that counts events and forwards them to the previous sink"""
+
+    def __init__(self, forward: Any = None):
+        self.forward = forward
+        self.count = 0
+
+    def emit(self, event: Any) -> None:
+        self.count += 1
+        if self.forward is not None:
+            self.forward.emit(event)
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Args:
+        values (List[float]): Samples
+        pct (float): Percentile between 0 and 100
+
+    Returns:
+        float: Sample at the requested rank (0.0 for no samples)
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def run_scenario(scenario: Scenario,
+                 iterations: int = 20,
+                 warmup: int = 2,
+                 seed: int = 0) -> ScenarioResult:
+    """
+    Time a scenario after warm-up runs that fill the connection pool
+
+    Args:
+        scenario (Scenario): Scenario to run
+        iterations (int): Timed runs
+        warmup (int): Untimed runs first
+        seed (int): Seed for the scenario's input choices
+
+    Returns:
+        ScenarioResult: Statistics over the timed runs
+    """
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        scenario.run(rng)
+
+    sink = CountingSink(forward=get_query_sink())
+    previous_sink = get_query_sink()
+    set_query_sink(sink)
+    durations: List[float] = []
+    query_counts: List[int] = []
+    try:
+        for _ in range(iterations):
+            before = sink.count
+            start = time.perf_counter()
+            scenario.run(rng)
+            durations.append((time.perf_counter() - start) * 1000)
+            query_counts.append(sink.count - before)
+    finally:
+        set_query_sink(previous_sink)
+
+    return ScenarioResult(
+        name=scenario.name,
+        iterations=iterations,
+        p50_ms=round(percentile(durations, 50), 3),
+        p95_ms=round(percentile(durations, 95), 3),
+        mean_ms=round(sum(durations) / len(durations), 3) if durations else 0.0,
+        max_ms=round(max(durations), 3) if durations else 0.0,
+        queries_per_run=round(sum(query_counts) / len(query_counts), 2) if query_counts else 0.0,
+        max_queries=max(query_counts) if query_counts else 0
+    )
+
+def compare_with_baseline(results: Dict[str, ScenarioResult],
+                          baseline: Dict[str, Any],
+                          tolerance: float = 0.25) -> List[str]:
+    """
+    List regressions against a baseline run
+
+    A scenario regresses when its p95 grows by more than `tolerance` or it
+    issues more queries per run than the baseline did.
+
+    Args:
+        results (Dict[str, ScenarioResult]): Current results by scenario name
+        baseline (Dict[str, Any]): Baseline file contents (see save_baseline)
+        tolerance (float): Allowed relative p95 increase
+
+    Returns:
+        List[str]: One message per regression; empty when none
+    """
+    regressions = []
+    baseline_results = baseline.get('results', {})
+    for name, result in results.items():
+        previous = baseline_results.get(name)
+        if not previous:
+            continue
+        if result.p95_ms > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: p95 {result.p95_ms:.1f} ms vs baseline {previous['p95_ms']:.1f} ms"
+            )
+        if result.queries_per_run > previous['queries_per_run']:
+            regressions.append(
+                f"{name}: {result.queries_per_run:g} queries/run vs baseline {previous['queries_per_run']:g}"
+            )
+    return regressions
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    """Baseline file contents, or None if it does not exist"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(path: str, results: Dict[str, ScenarioResult], metadata: Dict[str, Any]) -> None:
+    """
+    Write results as the new baseline
+
+    Args:
+        path (str): Baseline JSON file
+        results (Dict[str, ScenarioResult]): Results by scenario name
+        metadata (Dict[str, Any]): Run details stored alongside (dataset spec, backend)
+    """
+    with open(path, 'w') as f:
+        json.dump({
+            **metadata,
+            'results': {name: result.to_dict() for name, result in results.items()}
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def format_report(results: Dict[str, ScenarioResult], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Plain-text table of results, with the baseline p95 when available"""
+    baseline_results = (baseline or {}).get('results', {})
+    lines = [f"{'scenario':<28} {'p50 ms':>9} {'p95 ms':>9} {'base p95':>9} {'queries':>8}"]
+    for name, result in results.items():
+        previous = baseline_results.get(name)
+        base = f"{previous['p95_ms']:.1f}" if previous else "-"
+        lines.append(
+            f"{name:<28} {result.p50_ms:>9.1f} {result.p95_ms:>9.1f} {base:>9} {result.queries_per_run:>8g}"
+        )
+    return "\n".join(lines)
+
+__all__ = [
+    'Scenario',
+    'ScenarioResult',
+    'CountingSink',
+    'percentile',
+    'run_scenario',
+    'compare_with_baseline',
+    'load_baseline',
+    'save_baseline',
+    'format_report'
+]
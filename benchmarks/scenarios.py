@@ -0,0 +1,117 @@
+# benchmarks/scenarios.py
+"""
+Benchmark scenarios for the scheduling flow and the list pages.
+
+Each scenario calls the same function the page calls, with inputs drawn
+from the generated dataset. Writes (save_service_schedule) go to dates past
+the end of the dataset so repeated runs never conflict with each other.
+"""
+
+import random
+from datetime import date, time, timedelta
+from typing import List
+
+from benchmarks.data import SERVICE_CATALOG, DatasetSpec
+from benchmarks.runner import Scenario
+
+SEARCH_TERMS = ["smith", "maria", "garcia", "480000", "lee", "example.com", "nobody"]
+
+def _next_weekday(start: date, weekday: int) -> date:
+    return start + timedelta(days=(weekday - start.weekday()) % 7)
+
+def build_scenarios(conn, spec: DatasetSpec) -> List[Scenario]:
+    """
+    Scenarios over a dataset generated from spec
+
+    Args:
+        conn: Connection the dataset was written through
+        spec (DatasetSpec): Dataset shape, used to pick realistic inputs
+
+    Returns:
+        List[Scenario]: Scenarios in report order
+    """
+    # Imported here so the connection backend is chosen before any page module loads
+    from models.customer import search_customers
+    from models.service import save_service_schedule
+    from models.transaction_view import load_transaction_view
+    from pages.completed import COMPLETED_PAGE_SIZE, CompletedServicesPage
+    from pages.scheduled import SCHEDULED_PAGE_SIZE, fetch_scheduled_services, fetch_scheduled_summary
+    from utils.double_booking_prevention import (
+        get_available_time_slots_enhanced,
+        validate_recurring_service_availability
+    )
+
+    today = date.today()
+    service_names = [name for name, _, _, _, _ in SERVICE_CATALOG[:min(spec.services, len(SERVICE_CATALOG))]]
+    upcoming_days = [today + timedelta(days=offset) for offset in range(1, 31)
+                     if (today + timedelta(days=offset)).weekday() != 6]
+    account_ids = [row['ACCOUNT_ID'] for row in conn.execute_query(
+        "SELECT ACCOUNT_ID FROM OPERATIONAL.CARPET.ACCOUNTS ORDER BY ACCOUNT_ID"
+    ) or []]
+    transaction_ids = [row['ID'] for row in conn.execute_query(
+        "SELECT ID FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION ORDER BY ID"
+    ) or []]
+    completed_page = CompletedServicesPage()
+
+    # Each save books a weekly series of up to 24 Tuesdays; series start 26 weeks apart
+    first_series = _next_weekday(spec.end_date + timedelta(days=30), 1)
+    series_counter = {'next': 0}
+
+    def available_slots(rng: random.Random):
+        return get_available_time_slots_enhanced(
+            rng.choice(upcoming_days), rng.sample(service_names, 2)
+        )
+
+    def recurring_validation(rng: random.Random):
+        return validate_recurring_service_availability(
+            base_date=rng.choice(upcoming_days),
+            service_time=time(rng.choice([8, 10, 13, 15]), 0),
+            service_names=[rng.choice(service_names)],
+            recurrence_pattern=rng.choice(["Weekly", "Bi-Weekly", "Monthly"])
+        )
+
+    def save_recurring_schedule(rng: random.Random):
+        series_start = first_series + timedelta(weeks=26 * series_counter['next'])
+        series_counter['next'] += 1
+        # Account bookings skip the confirmation email
+        return save_service_schedule(
+            services=[rng.choice(service_names)],
+            service_date=series_start,
+            service_time=time(9, 0),
+            account_id=rng.choice(account_ids) if account_ids else None,
+            notes="benchmark",
+            is_recurring=True,
+            recurrence_pattern="Weekly"
+        )
+
+    def scheduled_services(rng: random.Random):
+        end_date = today + timedelta(days=30)
+        return (
+            fetch_scheduled_summary(conn, today, end_date),
+            fetch_scheduled_services(conn, today, end_date, limit=SCHEDULED_PAGE_SIZE + 1)
+        )
+
+    def completed_services(rng: random.Random):
+        dates = {'start_date': today - timedelta(days=30), 'end_date': today}
+        return (
+            completed_page._fetch_summary_statistics(dates),
+            completed_page._fetch_completed_services(dates, limit=COMPLETED_PAGE_SIZE + 1)
+        )
+
+    def customer_search(rng: random.Random):
+        return search_customers(rng.choice(SEARCH_TERMS))
+
+    def transaction_details(rng: random.Random):
+        return load_transaction_view(rng.choice(transaction_ids), conn=conn)
+
+    return [
+        Scenario("available_time_slots", "get_available_time_slots_enhanced, two services", available_slots),
+        Scenario("recurring_validation", "validate_recurring_service_availability", recurring_validation),
+        Scenario("save_recurring_schedule", "save_service_schedule, weekly for six months", save_recurring_schedule),
+        Scenario("scheduled_services_page", "scheduled services summary and first page, next 30 days", scheduled_services),
+        Scenario("completed_services_page", "completed services summary and first page, last 30 days", completed_services),
+        Scenario("search_customers", "search_customers by name, phone or email", customer_search),
+        Scenario("transaction_details_page", "load_transaction_view for a random transaction", transaction_details),
+    ]
+
+__all__ = ['build_scenarios']
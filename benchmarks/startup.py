@@ -0,0 +1,97 @@
+# benchmarks/startup.py
+"""
+Cold-start measurement: renders the login page in a fresh interpreter with
+Streamlit's AppTest and collects the startup steps main.py recorded
+(imports, connection setup, page imports, first render).
+
+python -m benchmarks.startup --runs 5 prints the timings of each run.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+from benchmarks.runner import ScenarioResult, percentile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; the last line of its output is the JSON result
+_RENDER_LOGIN = """
+import json, logging, os, sys, time
+from streamlit.testing.v1 import AppTest
+logging.disable(logging.WARNING)
+app = AppTest.from_file(os.path.join(sys.argv[1], "main.py"), default_timeout=120)
+app.secrets["environment"] = "production"
+start = time.perf_counter()
+app.run()
+elapsed = time.perf_counter() - start
+from database.instrumentation import get_query_sink, startup_timings
+print(json.dumps({
+    "render_ms": round(elapsed * 1000, 1),
+    "timings": startup_timings(),
+    "queries": len(get_query_sink().events()),
+    "errors": [str(element.value) for element in app.exception]
+}))
+"""
+
+def measure_cold_start(runs: int = 5) -> List[Dict[str, Any]]:
+    """
+    Render the login page in `runs` fresh processes against an empty in-memory database
+
+    Args:
+        runs (int): Processes to start
+
+    Returns:
+        List[Dict[str, Any]]: Per run: render_ms, startup timings, queries issued
+
+    Raises:
+        RuntimeError: If a run fails or the page raises
+    """
+    env = dict(os.environ, EZBIZ_DB_BACKEND="duckdb", EZBIZ_LOCAL_DB=":memory:")
+    samples = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _RENDER_LOGIN, PROJECT_ROOT],
+            cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+        )
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or not lines:
+            raise RuntimeError(f"Cold start run failed: {completed.stderr.strip()[-2000:]}")
+        sample = json.loads(lines[-1])
+        if sample['errors']:
+            raise RuntimeError(f"Login page raised: {sample['errors'][0]}")
+        samples.append(sample)
+    return samples
+
+def cold_start_result(samples: List[Dict[str, Any]]) -> ScenarioResult:
+    """Summarize cold-start runs as a scenario result for the report and baseline"""
+    durations = [sample['render_ms'] for sample in samples]
+    queries = [sample['queries'] for sample in samples]
+    return ScenarioResult(
+        name="cold_start",
+        iterations=len(samples),
+        p50_ms=round(percentile(durations, 50), 3),
+        p95_ms=round(percentile(durations, 95), 3),
+        mean_ms=round(sum(durations) / len(durations), 3) if durations else 0.0,
+        max_ms=round(max(durations), 3) if durations else 0.0,
+        queries_per_run=round(sum(queries) / len(queries), 2) if queries else 0.0,
+        max_queries=max(queries) if queries else 0
+    )
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Time the login page render in fresh processes")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    for sample in measure_cold_start(args.runs):
+        steps = ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in sample['timings'].items())
+        print(f"render {sample['render_ms']:.0f} ms, {sample['queries']} queries — {steps}")
+    return 0
+
+__all__ = ['measure_cold_start', 'cold_start_result']
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,253 @@
 import streamlit as st
 import os
+import threading
+import time
 import base64
-from snowflake.snowpark import Session
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Tuple, Iterator, Dict, TYPE_CHECKING
+from .pool import SessionPool
+from .instrumentation import attribute_queries, record_query, record_startup, script_context
+from .ids import IdBlockAllocator, sequence_for
+from .result_cache import ResultCache, is_cacheable, referenced_tables
+
+# pandas, the connector and Snowpark are imported where first used to keep cold start fast
+if TYPE_CHECKING:
+    import pandas as pd
+    import snowflake.connector
+    from snowflake.snowpark import Session
+
+def database_backend() -> str:
+    """
+    Backend selected by EZBIZ_DB_BACKEND or [database] backend in secrets
+    
+    Returns:
+        str: "snowflake" (default) or "duckdb" for the offline local database
+    """
+    backend = os.environ.get("EZBIZ_DB_BACKEND")
+    if not backend:
+        try:
+            backend = st.secrets.get("database", {}).get("backend")
+        except Exception:
+            backend = None  # No secrets file, e.g. on a laptop without credentials
+    return (backend or "snowflake").strip().lower()
 
 class SnowflakeConnection:
     """
-    Singleton class to manage Snowflake database connection
+    Singleton class to manage Snowflake database connections.
+    
+    Queries run on snowflake.connector connections checked out from a
+    thread-safe pool, so concurrent Streamlit sessions no longer share (and
+    queue behind) a single session. execute_query uses a DictCursor with
+    server-side binding and execute_query_df converts Arrow result batches
+    straight to pandas; Snowpark is only needed for lazy DataFrame work
+    through snowpark_session(). Pool behaviour is configured in the [snowflake]
+    secrets section with pool_size, pool_idle_timeout,
+    pool_health_check_interval and pool_checkout_timeout. Read results are
+    cached in process (result_cache_size entries for result_cache_ttl
+    seconds) and evicted when a write through this connection touches one of
+    their tables. Writes from other processes go unseen until the TTL passes,
+    so reads that must be current (booking conflicts) pass cache=False.
     """
     _instance = None
+    _instance_lock = threading.Lock()
+    _query_executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
     
     @classmethod
     def get_instance(cls):
-        """Get or create singleton instance"""
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+        """Get or create singleton instance (the local backend when configured)"""
+        if SnowflakeConnection._instance is None:
+            with SnowflakeConnection._instance_lock:
+                if SnowflakeConnection._instance is None:
+                    start = time.perf_counter()
+                    if database_backend() == "duckdb":
+                        from .local import LocalConnection
+                        SnowflakeConnection._instance = LocalConnection()
+                    else:
+                        SnowflakeConnection._instance = SnowflakeConnection()
+                    record_startup("connection", time.perf_counter() - start)
+        return SnowflakeConnection._instance
     
     def __init__(self):
-        """Initialize connection"""
-        self.session = self._create_session()
+        """Initialize connection pool"""
+        self._private_key: Optional[bytes] = None
+        # id(connection) -> Snowpark Session; the Session holds the connection,
+        # so entries are removed when the pool closes that connection
+        self._snowpark_sessions: Dict[int, Any] = {}
+        self._snowpark_lock = threading.Lock()
+        settings = st.secrets.get("snowflake", {})
+        self.pool = SessionPool(
+            factory=self._create_connection,
+            on_close=self._forget_snowpark_session,
+            max_size=int(settings.get("pool_size", 4)),
+            idle_timeout=float(settings.get("pool_idle_timeout", 300)),
+            health_check_interval=float(settings.get("pool_health_check_interval", 60)),
+            checkout_timeout=float(settings.get("pool_checkout_timeout", 30))
+        )
+        self.pool.warm_up()
+        self.ids = IdBlockAllocator(
+            fetch=self._fetch_quietly,
+            block_size=int(settings.get("id_block_size", 20))
+        )
+        self.results = ResultCache(
+            max_entries=int(settings.get("result_cache_size", 256)),
+            ttl=float(settings.get("result_cache_ttl", 60))
+        )
     
-    def _create_session(self) -> Optional[Session]:
-        """Create Snowflake session"""
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        """Errors that mean the session should be discarded rather than reused"""
+        message = str(error).lower()
+        return "connection" in message or "session" in message
+    
+    def _create_connection(self) -> Optional["snowflake.connector.SnowflakeConnection"]:
+        """Create Snowflake connector connection"""
         try:
-            private_key = self._load_private_key()
-            connection_parameters = {
-                "account": st.secrets.get("snowflake", {}).get("account", ""),
-                "user": st.secrets.get("snowflake", {}).get("user", ""),
-                "private_key": private_key,
-                "role": st.secrets.get("snowflake", {}).get("role", "ACCOUNTADMIN"),
-                "warehouse": st.secrets.get("snowflake", {}).get("warehouse", "COMPUTE_WH"),
-                "database": st.secrets.get("snowflake", {}).get("database", "OPERATIONAL"),
-                "schema": st.secrets.get("snowflake", {}).get("schema", "CARPET")
-            }
-            return Session.builder.configs(connection_parameters).create()
+            import snowflake.connector
+            
+            # Parse the private key once; every pooled connection reuses it
+            if self._private_key is None:
+                self._private_key = self._load_private_key()
+            private_key = self._private_key
+            return snowflake.connector.connect(
+                account=st.secrets.get("snowflake", {}).get("account", ""),
+                user=st.secrets.get("snowflake", {}).get("user", ""),
+                private_key=private_key,
+                role=st.secrets.get("snowflake", {}).get("role", "ACCOUNTADMIN"),
+                warehouse=st.secrets.get("snowflake", {}).get("warehouse", "COMPUTE_WH"),
+                database=st.secrets.get("snowflake", {}).get("database", "OPERATIONAL"),
+                schema=st.secrets.get("snowflake", {}).get("schema", "CARPET"),
+                # Server-side binding for both ? and :1 placeholders
+                paramstyle="qmark"
+            )
         except Exception as e:
-            st.error(f"Failed to create Snowpark session: {e}")
+            st.error(f"Failed to create Snowflake connection: {e}")
             return None
 
+    def _run(self, connection: Any, query: str, params: Optional[List[Any]] = None) -> List[dict]:
+        """Execute one statement and record its timing"""
+        started_at = time.time()
+        start = time.perf_counter()
+        rows: List[dict] = []
+        error = None
+        try:
+            rows = self._fetch_rows(connection, query, params)
+            return rows
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            record_query(query, started_at, time.perf_counter() - start, len(rows), error)
+
+    def _fetch_rows(self, connection: Any, query: str, params: Optional[List[Any]] = None) -> List[dict]:
+        """Execute one statement on a DictCursor and return its rows"""
+        from snowflake.connector import DictCursor
+        
+        cursor = connection.cursor(DictCursor)
+        try:
+            # Bind values are sent separately so identical statements reuse compiled plans
+            cursor.execute(query, params if params else None)
+            return cursor.fetchall() if cursor.description else []
+        finally:
+            cursor.close()
+
+    def _fetch_row_sets(self,
+                        connection: Any,
+                        statements: List[Tuple[str, Optional[List[Any]]]]) -> List[List[dict]]:
+        """Execute statements as one multi-statement request and return each one's rows"""
+        from snowflake.connector import DictCursor
+        
+        query = ";\n".join(statement.strip().rstrip(';') for statement, _ in statements)
+        params = [value for _, values in statements for value in (values or [])]
+        cursor = connection.cursor(DictCursor)
+        try:
+            # The cursor starts on the first statement's result; nextset() moves to the next
+            cursor.execute(query, params if params else None, num_statements=len(statements))
+            row_sets = []
+            while True:
+                row_sets.append(cursor.fetchall() if cursor.description else [])
+                if cursor.nextset() is None:
+                    return row_sets
+        finally:
+            cursor.close()
+
+    def _run_frame(self,
+                   connection: Any,
+                   query: str,
+                   params: Optional[List[Any]] = None,
+                   dtype_backend: Optional[str] = None) -> "pd.DataFrame":
+        """Execute one statement into a DataFrame and record its timing"""
+        started_at = time.time()
+        start = time.perf_counter()
+        row_count = 0
+        error = None
+        try:
+            frame = self._fetch_frame(connection, query, params, dtype_backend)
+            row_count = len(frame)
+            return frame
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            record_query(query, started_at, time.perf_counter() - start, row_count, error)
+
+    def _fetch_frame(self,
+                     connection: Any,
+                     query: str,
+                     params: Optional[List[Any]] = None,
+                     dtype_backend: Optional[str] = None) -> "pd.DataFrame":
+        """Execute one statement and convert its Arrow result batches to a DataFrame"""
+        import pandas as pd
+        from snowflake.connector.errors import NotSupportedError
+        
+        cursor = connection.cursor()
+        try:
+            cursor.execute(query, params if params else None)
+            if not cursor.description:
+                return pd.DataFrame()
+            try:
+                if dtype_backend == "pyarrow":
+                    table = cursor.fetch_arrow_all(force_return_table=True)
+                    return table.to_pandas(types_mapper=pd.ArrowDtype)
+                return cursor.fetch_pandas_all()
+            except NotSupportedError:
+                # Results of SHOW/DESCRIBE arrive as JSON rather than Arrow
+                columns = [column[0] for column in cursor.description]
+                return pd.DataFrame(cursor.fetchall(), columns=columns)
+        finally:
+            cursor.close()
+
+    def _fetch_quietly(self, query: str, params: Optional[List[Any]] = None) -> List[dict]:
+        """Run a query on a pooled connection and let errors propagate to the caller"""
+        with self.pool.connection(is_broken=self._is_connection_error) as connection:
+            return self._run(connection, query, params)
+
+    @contextmanager
+    def snowpark_session(self) -> Iterator["Session"]:
+        """
+        Lease a pooled connection wrapped in a Snowpark Session for DataFrame work
+        
+        Yields:
+            Session: Snowpark session bound to the current thread's connection
+        """
+        from snowflake.snowpark import Session
+        
+        with self.pool.connection(is_broken=self._is_connection_error) as connection:
+            with self._snowpark_lock:
+                session = self._snowpark_sessions.get(id(connection))
+                if session is None:
+                    session = Session.builder.configs({"connection": connection}).create()
+                    self._snowpark_sessions[id(connection)] = session
+            yield session
+
+    def _forget_snowpark_session(self, connection: Any) -> None:
+        """Drop the Snowpark Session of a connection the pool is closing"""
+        with self._snowpark_lock:
+            self._snowpark_sessions.pop(id(connection), None)
+
     def _load_private_key(self) -> bytes:
         """Load private key for authentication"""
         # Check if in cloud environment (detect by checking if private_key is in secrets directly)
@@ -107,59 +314,363 @@ class SnowflakeConnection:
                 st.error(f"Error loading private key from file: {e}")
                 raise
 
+    def _cache_lookup(self,
+                      query: str,
+                      params: Optional[List[Any]],
+                      cache: bool,
+                      shape: str = "rows") -> Tuple[Any, Optional[Tuple[Any, ...]]]:
+        """
+        Cached result for a read, or a token for caching the fresh result
+        
+        Args:
+            shape (str): Result form kept apart in the cache ("rows", "frame", "frame:pyarrow")
+        
+        Returns:
+            Tuple: (cached result or None, token for _cache_store or None when not cacheable)
+        """
+        if not (cache and self.results.enabled and is_cacheable(query)):
+            return None, None
+        key = self.results.key(query, params, shape)
+        try:
+            cached = self.results.get(key)
+        except TypeError:
+            return None, None  # Unhashable bind value
+        if cached is not None:
+            return cached, None
+        tables = referenced_tables(query)
+        return None, (key, tables, self.results.generation(tables))
+
+    def _cache_store(self, token: Optional[Tuple[Any, ...]], rows: Any) -> None:
+        if token is not None:
+            key, tables, generation = token
+            self.results.put(key, rows, tables, generation)
+
     def execute_query(self, 
                      query: str, 
                      params: Optional[List[Any]] = None, 
-                     error_msg: str = "Error executing query") -> Optional[List[dict]]:
+                     error_msg: str = "Error executing query",
+                     cache: bool = True) -> Optional[List[dict]]:
         """
         Execute SQL query with parameters
         
+        Reads are served from the result cache when possible; writes evict
+        cached results of the tables they touch.
+        
         Args:
             query (str): SQL query to execute
             params (Optional[List[Any]]): Query parameters
             error_msg (str): Custom error message
+            cache (bool): Serve this read from the result cache when possible (default);
+                False for reads that must see writes made by other processes
         
         Returns:
             Optional[List[dict]]: Query results or None if error
         """
+        cached, cache_token = self._cache_lookup(query, params, cache)
+        if cached is not None:
+            return cached
+        
         try:
-            if not self.session:
-                st.info("Creating new database session...")
-                self.session = self._create_session()
-                if not self.session:
-                    raise Exception("Failed to create database session")
-            
-            # Execute query with better error handling
-            if params:
-                result = self.session.sql(query, params).collect()
-            else:
-                result = self.session.sql(query).collect()
+            # Execute query on a pooled connection; DictCursor rows need no conversion
+            with self.pool.connection(is_broken=self._is_connection_error) as connection:
+                rows = self._run(connection, query, params)
+            self._cache_store(cache_token, rows)
+            return rows
                 
-            # Convert Snowpark Row objects to dictionaries
-            if result:
-                return [dict(row.asDict()) for row in result]
+        except Exception as e:
+            self._report_query_error(error_msg, e, query, params)
+            return None
+        
+        finally:
+            # A failed write may still have changed rows, so invalidate either way
+            self.results.note_statement(query)
+
+    def execute_query_df(self,
+                         query: str,
+                         params: Optional[List[Any]] = None,
+                         error_msg: str = "Error executing query",
+                         cache: bool = True,
+                         dtype_backend: Optional[str] = None) -> Optional["pd.DataFrame"]:
+        """
+        Execute a read and return its result as a DataFrame
+        
+        Rows are converted column by column from the Arrow result batches
+        instead of one dict per row, so large result sets take less time and
+        memory. Dates and times come back as datetime.date/datetime.time
+        objects, timestamps as datetime64 and scaled numbers as float64;
+        with dtype_backend="pyarrow" every column keeps its Arrow type
+        (date32, time64, decimal128, nullable integers).
+        
+        Args:
+            query (str): SQL query to execute
+            params (Optional[List[Any]]): Query parameters
+            error_msg (str): Custom error message
+            cache (bool): Serve this read from the result cache when possible (default);
+                False for reads that must see writes made by other processes
+            dtype_backend (Optional[str]): "pyarrow" for ArrowDtype columns; None for NumPy dtypes
+        
+        Returns:
+            Optional[pd.DataFrame]: Query results (empty when no rows) or None if error
+        """
+        shape = f"frame:{dtype_backend}" if dtype_backend else "frame"
+        cached, cache_token = self._cache_lookup(query, params, cache, shape)
+        if cached is not None:
+            return cached
+        
+        try:
+            with self.pool.connection(is_broken=self._is_connection_error) as connection:
+                frame = self._run_frame(connection, query, params, dtype_backend)
+            self._cache_store(cache_token, frame)
+            return frame
+        
+        except Exception as e:
+            self._report_query_error(error_msg, e, query, params)
+            return None
+        
+        finally:
+            self.results.note_statement(query)
+
+    def _report_query_error(self,
+                            error_msg: str,
+                            error: Exception,
+                            query: str,
+                            params: Optional[List[Any]]) -> None:
+        """Show a failed statement, with its SQL and parameters in debug mode"""
+        st.error(f"{error_msg}: {str(error)}")
+        
+        # Show more debug info if in debug mode
+        if st.session_state.get('debug_mode', False):
+            st.error(f"Query: {query}")
+            if params:
+                st.error(f"Parameters: {params}")
+            st.exception(error)
+        
+        # Broken sessions are discarded by the pool; the next query reconnects
+        if self._is_connection_error(error):
+            st.info("Attempting to reconnect to database...")
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Workers for execute_many_async, one per pooled connection"""
+        with SnowflakeConnection._executor_lock:
+            if SnowflakeConnection._query_executor is None:
+                SnowflakeConnection._query_executor = ThreadPoolExecutor(
+                    max_workers=self.pool.max_size,
+                    thread_name_prefix="query"
+                )
+            return SnowflakeConnection._query_executor
+
+    def _fetch_for(self, context: Dict[str, Any], query: str, params: Optional[List[Any]]) -> List[dict]:
+        """Runs on a worker thread; events are attributed to the submitting script run"""
+        with attribute_queries(context):
+            return self._fetch_quietly(query, params)
+
+    def execute_many_async(self,
+                           statements: List[Tuple[str, Optional[List[Any]]]],
+                           error_msg: str = "Error executing query",
+                           cache: bool = True) -> List[Optional[List[dict]]]:
+        """
+        Run independent statements concurrently and gather their results
+        
+        Each statement runs on its own pooled connection, so the call takes
+        about as long as the slowest statement instead of the sum of all of
+        them. Cached reads are answered without a round trip.
+        
+        Args:
+            statements (List[Tuple[str, Optional[List[Any]]]]): (query, params) pairs with no ordering dependency
+            error_msg (str): Custom error message
+            cache (bool): Serve reads from the result cache when possible (default);
+                False for reads that must see writes made by other processes
+        
+        Returns:
+            List[Optional[List[dict]]]: Results in statement order; None for a statement that failed
+        """
+        results: List[Optional[List[dict]]] = [None] * len(statements)
+        pending = []
+        for index, (query, params) in enumerate(statements):
+            cached, token = self._cache_lookup(query, params, cache)
+            if cached is not None:
+                results[index] = cached
             else:
-                return []
+                pending.append((index, query, params, token))
+        
+        if len(pending) == 1:
+            index, query, params, _ = pending[0]
+            results[index] = self.execute_query(query, params, error_msg=error_msg, cache=cache)
+            return results
+        
+        context = script_context()
+        futures = [
+            (index, query, params, token, self._executor().submit(self._fetch_for, context, query, params))
+            for index, query, params, token in pending
+        ]
+        for index, query, params, token, future in futures:
+            try:
+                rows = future.result()
+                self._cache_store(token, rows)
+                results[index] = rows
+            except Exception as e:
+                self._report_query_error(error_msg, e, query, params)
+            finally:
+                self.results.note_statement(query)
+        return results
+
+    def execute_multi(self,
+                      statements: List[Tuple[str, Optional[List[Any]]]],
+                      error_msg: str = "Error executing query") -> List[Optional[List[dict]]]:
+        """
+        Run several reads in one round trip as a multi-statement request
+        
+        The statements run in order on one pooled connection and are never
+        answered from the result cache.
+        
+        Args:
+            statements (List[Tuple[str, Optional[List[Any]]]]): (query, params) pairs
+            error_msg (str): Custom error message
+        
+        Returns:
+            List[Optional[List[dict]]]: Results in statement order; all None if the request failed
+        """
+        query = ";\n".join(statement for statement, _ in statements)
+        params = [value for _, values in statements for value in (values or [])]
+        started_at = time.time()
+        start = time.perf_counter()
+        row_sets: List[List[dict]] = []
+        error = None
+        try:
+            with self.pool.connection(is_broken=self._is_connection_error) as connection:
+                row_sets = self._fetch_row_sets(connection, statements)
+            return list(row_sets)
+        except Exception as e:
+            error = e
+            self._report_query_error(error_msg, e, query, params)
+            return [None] * len(statements)
+        finally:
+            record_query(query, started_at, time.perf_counter() - start, sum(len(rows) for rows in row_sets), error)
+            for statement, _ in statements:
+                self.results.note_statement(statement)
+
+    def execute_transaction(self,
+                            statements: List[Tuple[str, Optional[List[Any]]]],
+                            error_msg: str = "Error executing transaction") -> Optional[List[List[dict]]]:
+        """
+        Execute several SQL statements inside a single transaction
+        
+        Args:
+            statements (List[Tuple[str, Optional[List[Any]]]]): (query, params) pairs in execution order
+            error_msg (str): Custom error message
+        
+        Returns:
+            Optional[List[List[dict]]]: Results for each statement or None if rolled back
+        """
+        try:
+            # Every statement must run on the same connection for the transaction to hold
+            with self.pool.connection(is_broken=self._is_connection_error) as connection:
+                self._run(connection, "BEGIN")
+                try:
+                    results = [self._run(connection, query, params) for query, params in statements]
+                    self._run(connection, "COMMIT")
+                    return results
+                except Exception:
+                    self._run(connection, "ROLLBACK")
+                    raise
+                finally:
+                    for query, _ in statements:
+                        self.results.note_statement(query)
                 
         except Exception as e:
-            error_details = f"{error_msg}: {str(e)}"
-            st.error(error_details)
+            st.error(f"{error_msg}: {str(e)}")
             
             # Show more debug info if in debug mode
             if st.session_state.get('debug_mode', False):
-                st.error(f"Query: {query}")
-                if params:
-                    st.error(f"Parameters: {params}")
+                for query, params in statements:
+                    st.error(f"Query: {query}")
+                    if params:
+                        st.error(f"Parameters: {params}")
                 st.exception(e)
-                
-            # Try to recreate session on connection errors
-            if "connection" in str(e).lower() or "session" in str(e).lower():
+            
+            # Broken sessions are discarded by the pool; the next query reconnects
+            if self._is_connection_error(e):
                 st.info("Attempting to reconnect to database...")
-                self.session = None  # Force session recreation
-                
+            
+            return None
+
+    def insert_returning_id(self,
+                            table: str,
+                            values: Dict[str, Any],
+                            id_column: str,
+                            expressions: Optional[Dict[str, str]] = None,
+                            error_msg: str = "Error inserting record") -> Optional[int]:
+        """
+        Insert one row and return its identity value
+        
+        The ID comes from a block of sequence values reserved in process, so the
+        INSERT is the only round trip. Until the table's sequence exists the row
+        is inserted and read back in one transaction on the same session.
+        
+        Args:
+            table (str): Fully qualified table name
+            values (Dict[str, Any]): Column values to bind
+            id_column (str): Identity column to return
+            expressions (Optional[Dict[str, str]]): Columns set to SQL expressions, e.g. CURRENT_TIMESTAMP()
+            error_msg (str): Custom error message
+        
+        Returns:
+            Optional[int]: ID of the new row or None if error
+        """
+        expressions = expressions or {}
+        columns = list(values.keys())
+        params = list(values.values())
+        
+        new_id = self.ids.next_id(sequence_for(table, id_column))
+        if new_id is not None:
+            insert_columns = [id_column] + columns + list(expressions.keys())
+            placeholders = ['?'] * (len(columns) + 1) + list(expressions.values())
+            query = f"""
+            INSERT INTO {table} ({', '.join(insert_columns)})
+            VALUES ({', '.join(placeholders)})
+            """
+            result = self.execute_query(query, [new_id] + params, error_msg=error_msg)
+            return new_id if result is not None else None
+        
+        insert_columns = columns + list(expressions.keys())
+        placeholders = ['?'] * len(columns) + list(expressions.values())
+        insert_query = f"""
+        INSERT INTO {table} ({', '.join(insert_columns)})
+        VALUES ({', '.join(placeholders)})
+        """
+        match = ' AND '.join(f"EQUAL_NULL({column}, ?)" for column in columns) or 'TRUE'
+        select_query = f"""
+        SELECT {id_column} AS ID
+        FROM {table}
+        WHERE {match}
+        ORDER BY {id_column} DESC
+        LIMIT 1
+        """
+        results = self.execute_transaction(
+            [(insert_query, params), (select_query, params)],
+            error_msg=error_msg
+        )
+        if not results or not results[1]:
             return None
+        return int(results[1][0]['ID'])
+
+class DeferredConnection:
+    """
+    Stand-in for the singleton that creates it on first use
+    
+    Modules keep a module-level snowflake_conn without importing the connector,
+    parsing the private key or opening a session at import time; the first
+    query (any attribute access) does that through get_instance().
+    """
+    
+    def __getattr__(self, name: str) -> Any:
+        return getattr(SnowflakeConnection.get_instance(), name)
+    
+    def __repr__(self) -> str:
+        instance = SnowflakeConnection._instance
+        return f"<DeferredConnection to {instance!r}>" if instance else "<DeferredConnection (not connected)>"
 
-# Create and export the singleton instance
-snowflake_conn = SnowflakeConnection.get_instance()
+# Export the singleton; it is created by the first query
+snowflake_conn = DeferredConnection()
 
 __all__ = ['snowflake_conn']
\ No newline at end of file
@@ -0,0 +1,101 @@
+# database/generation_cache.py
+"""
+Process-wide cache of values built from query results, stamped with the
+write generation (see ResultCache.generation) of the tables they were read
+from.
+
+A value is served only while the generation is unchanged and its TTL has not
+run out, so writes through this process make it stale at once and writes
+made elsewhere are picked up after at most `ttl` seconds. Code that knows
+exactly what a write did can patch the stored values instead of dropping
+them. Values must provide copy(); callers always get an independent copy.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class GenerationCache:
+    """Bounded, generation-stamped store of copyable values"""
+
+    def __init__(self, max_entries: int, ttl: float = 60.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Values kept before the least recently stored is dropped
+            ttl (float): Seconds a value may be served, bounding staleness from writes made elsewhere
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, generation: Tuple[int, ...]) -> Any:
+        """Copy of the stored value if it is current for `generation`, else None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['generation'] != generation or entry['expires'] <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry['value'].copy()
+
+    def put(self, key: Hashable, value: Any, generation: Tuple[int, ...]) -> None:
+        """Store a value built from rows read at `generation`"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {
+                'value': value.copy(),
+                'generation': generation,
+                'expires': time.monotonic() + self.ttl
+            }
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+
+    def patch(self,
+              before: Tuple[int, ...],
+              after: Tuple[int, ...],
+              change: Callable[[Dict[Hashable, Any]], None]) -> None:
+        """
+        Apply a known write to every value that was current before it
+
+        Values stamped `before` are passed to `change`, keyed as stored, and
+        restamped `after`; `change` updates them in place and removes keys it
+        cannot patch. Values from other generations are dropped.
+
+        Args:
+            before: Generation snapshot taken before the write
+            after: Generation the write alone leads to (see advance_generation)
+            change: Updates the affected values in place
+        """
+        with self._lock:
+            current = {
+                key: entry['value']
+                for key, entry in self._entries.items()
+                if entry['generation'] == before
+            }
+            change(current)
+            for key in list(self._entries):
+                if key in current:
+                    self._entries[key]['generation'] = after
+                else:
+                    del self._entries[key]
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one value, or every value when no key is given"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+__all__ = ['GenerationCache']
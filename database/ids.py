@@ -0,0 +1,103 @@
+# database/ids.py
+"""
+In-process blocks of identity values drawn from Snowflake sequences.
+
+Snowflake has no INSERT ... RETURNING, so a new row's ID used to be found
+with a second "SELECT ... ORDER BY ID DESC LIMIT 1" query, which could pick
+up a concurrent insert. Instead IDs are reserved up front: one query takes a
+block of NEXTVAL values and later inserts consume them locally, so most
+inserts need a single round trip and always know their own ID.
+
+Sequences follow the <TABLE>_<ID_COLUMN>_SEQ naming convention and are
+created by database_fixes.sql (Fix 3).
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+def sequence_for(table: str, id_column: str) -> str:
+    """
+    Name of the sequence that supplies IDs for a table's identity column
+
+    Args:
+        table (str): Fully qualified table, e.g. OPERATIONAL.CARPET.CUSTOMER
+        id_column (str): Identity column, e.g. CUSTOMER_ID
+
+    Returns:
+        str: Fully qualified sequence name
+    """
+    return f"{table}_{id_column}_SEQ"
+
+class IdBlockAllocator:
+    """Thread-safe cache of prefetched sequence values, one block per sequence"""
+
+    def __init__(self,
+                 fetch: Callable[[str], List[Any]],
+                 block_size: int = 20,
+                 missing_retry_seconds: float = 300.0):
+        """
+        Initialize the allocator
+
+        Args:
+            fetch (Callable[[str], List[Any]]): Runs a query and returns its rows; raises on failure
+            block_size (int): Values reserved per round trip
+            missing_retry_seconds (float): How long a missing sequence is remembered before retrying
+        """
+        self._fetch = fetch
+        self.block_size = max(1, int(block_size))
+        self.missing_retry_seconds = float(missing_retry_seconds)
+        self._blocks: Dict[str, Deque[int]] = {}
+        self._missing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def next_id(self, sequence: str) -> Optional[int]:
+        """
+        Take the next reserved value for a sequence
+
+        Args:
+            sequence (str): Fully qualified sequence name
+
+        Returns:
+            Optional[int]: Reserved ID, or None if the sequence is unavailable
+        """
+        with self._lock:
+            block = self._blocks.get(sequence)
+            if block:
+                return block.popleft()
+            missing_since = self._missing.get(sequence)
+            if missing_since is not None and time.monotonic() - missing_since < self.missing_retry_seconds:
+                return None
+
+        try:
+            # GENERATOR needs a constant row count; block_size is always an int
+            rows = self._fetch(
+                f"SELECT {sequence}.NEXTVAL AS ID "
+                f"FROM TABLE(GENERATOR(ROWCOUNT => {self.block_size}))"
+            )
+        except Exception:
+            with self._lock:
+                self._missing[sequence] = time.monotonic()
+            return None
+
+        values = sorted(int(row['ID']) for row in rows)
+        if not values:
+            return None
+        with self._lock:
+            self._missing.pop(sequence, None)
+            block = self._blocks.setdefault(sequence, deque())
+            block.extend(values[1:])
+        return values[0]
+
+    def reset(self, sequence: Optional[str] = None) -> None:
+        """Discard reserved values (all sequences when none is given)"""
+        with self._lock:
+            if sequence is None:
+                self._blocks.clear()
+                self._missing.clear()
+            else:
+                self._blocks.pop(sequence, None)
+                self._missing.pop(sequence, None)
+
+__all__ = ['IdBlockAllocator', 'sequence_for']
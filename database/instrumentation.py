@@ -0,0 +1,305 @@
+# database/instrumentation.py
+"""
+Timing events for every statement SnowflakeConnection sends to the warehouse.
+
+Events go to a pluggable sink (anything with an emit(event) method); the
+default keeps the most recent events in an in-memory ring buffer. main()
+marks the start of each Streamlit rerun so the debug sidebar panel can show
+how many statements the current render issued and which were slowest.
+
+One-time startup steps (imports, connection setup, first import of each page,
+first render) are timed per process with record_startup and logged once by
+report_startup.
+"""
+
+import hashlib
+import re
+import threading
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+import streamlit as st
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBERED_PLACEHOLDER = re.compile(r":\d+\b")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_statement(query: str) -> str:
+    """
+    Reduce a statement to its shape: literals and IN-lists become placeholders
+
+    Args:
+        query (str): SQL text as executed
+
+    Returns:
+        str: Single-line statement with literals replaced by ?
+    """
+    text = _WHITESPACE.sub(' ', query).strip()
+    text = _STRING_LITERAL.sub('?', text)
+    text = _NUMBERED_PLACEHOLDER.sub('?', text)
+    text = _NUMBER_LITERAL.sub('?', text)
+    return _PLACEHOLDER_LIST.sub('(?)', text)
+
+def query_fingerprint(query: str) -> str:
+    """Short stable identifier for statements with the same shape"""
+    return hashlib.sha1(normalize_statement(query).encode('utf-8')).hexdigest()[:12]
+
+@dataclass
+class QueryEvent:
+    """One statement executed on a pooled connection"""
+    fingerprint: str
+    statement: str
+    row_count: int
+    duration_ms: float
+    page: Optional[str]
+    session_key: Optional[str]
+    rerun: Optional[int]
+    started_at: float
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'fingerprint': self.fingerprint,
+            'statement': self.statement,
+            'row_count': self.row_count,
+            'duration_ms': self.duration_ms,
+            'page': self.page,
+            'session_key': self.session_key,
+            'rerun': self.rerun,
+            'started_at': self.started_at,
+            'error': self.error
+        }
+
+class RingBufferSink:
+    """Keep the most recent query events in memory (shared by all sessions)"""
+
+    def __init__(self, capacity: int = 1000):
+        self._events: Deque[QueryEvent] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def emit(self, event: QueryEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+
+    def events(self,
+               session_key: Optional[str] = None,
+               rerun: Optional[int] = None) -> List[QueryEvent]:
+        """
+        Get buffered events, oldest first
+
+        Args:
+            session_key (Optional[str]): Only events from this browser session
+            rerun (Optional[int]): Only events from this rerun of the session
+
+        Returns:
+            List[QueryEvent]: Matching events
+        """
+        with self._lock:
+            snapshot = list(self._events)
+        return [
+            event for event in snapshot
+            if (session_key is None or event.session_key == session_key)
+            and (rerun is None or event.rerun == rerun)
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+_sink: Any = RingBufferSink()
+
+def set_query_sink(sink: Any) -> None:
+    """Send query events to another sink (an object with emit(event))"""
+    global _sink
+    _sink = sink
+
+def get_query_sink() -> Any:
+    return _sink
+
+# Worker threads running queries on behalf of a script run
+_attribution = threading.local()
+
+@contextmanager
+def attribute_queries(context: Dict[str, Any]) -> Iterator[None]:
+    """
+    Attribute queries run on this thread to another thread's script run
+
+    Args:
+        context (Dict[str, Any]): Result of script_context() on the submitting thread
+    """
+    _attribution.context = context
+    try:
+        yield
+    finally:
+        _attribution.context = None
+
+def script_context() -> Dict[str, Any]:
+    """Page and rerun of the Streamlit session running on this thread, if any"""
+    attributed = getattr(_attribution, 'context', None)
+    if attributed is not None:
+        return attributed
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        if get_script_run_ctx(suppress_warning=True) is None:
+            # Background threads (e.g. session activity writes) have no session
+            return {'page': None, 'session_key': None, 'rerun': None}
+    except ImportError:
+        pass
+    try:
+        return {
+            'page': st.session_state.get('page'),
+            'session_key': st.session_state.get('query_log_session'),
+            'rerun': st.session_state.get('query_log_rerun')
+        }
+    except Exception:
+        return {'page': None, 'session_key': None, 'rerun': None}
+
+def record_query(query: str,
+                 started_at: float,
+                 duration: float,
+                 row_count: int,
+                 error: Optional[Exception] = None) -> None:
+    """
+    Emit a timing event for a finished statement; never raises
+
+    Args:
+        query (str): SQL text as executed
+        started_at (float): Wall-clock start time (time.time())
+        duration (float): Elapsed seconds
+        row_count (int): Rows returned
+        error (Optional[Exception]): Exception raised by the statement, if any
+    """
+    try:
+        statement = normalize_statement(query)
+        context = script_context()
+        _sink.emit(QueryEvent(
+            fingerprint=query_fingerprint(query),
+            statement=statement[:500],
+            row_count=row_count,
+            duration_ms=round(duration * 1000, 2),
+            page=context['page'],
+            session_key=context['session_key'],
+            rerun=context['rerun'],
+            started_at=started_at,
+            error=str(error) if error else None
+        ))
+    except Exception as e:
+        print(f"Error recording query event: {str(e)}")
+
+def begin_rerun() -> None:
+    """Mark the start of a script run so its queries can be counted together"""
+    if 'query_log_session' not in st.session_state:
+        st.session_state['query_log_session'] = uuid.uuid4().hex
+    st.session_state['query_log_rerun'] = st.session_state.get('query_log_rerun', 0) + 1
+
+# Cold-start timings for this process in milliseconds, in the order first recorded
+_startup: Dict[str, float] = {}
+_startup_lock = threading.Lock()
+_startup_reported = False
+
+def record_startup(phase: str, seconds: float) -> None:
+    """
+    Record a one-time startup step; later timings for the same phase are ignored
+
+    Args:
+        phase (str): Step name, e.g. "imports", "connection" or "page pages.scheduled"
+        seconds (float): Elapsed seconds
+    """
+    with _startup_lock:
+        _startup.setdefault(phase, round(seconds * 1000, 1))
+
+def startup_timings() -> Dict[str, float]:
+    """Milliseconds per startup step recorded so far in this process"""
+    with _startup_lock:
+        return dict(_startup)
+
+def report_startup(seconds: float) -> None:
+    """
+    Record the first finished script run and log the startup timings once per process
+
+    Args:
+        seconds (float): Time from the start of the first script run to the end of its render
+    """
+    global _startup_reported
+    with _startup_lock:
+        if _startup_reported:
+            return
+        _startup_reported = True
+        _startup.setdefault('first_render', round(seconds * 1000, 1))
+        summary = ', '.join(f"{phase} {ms:.0f} ms" for phase, ms in _startup.items())
+    print(f"Startup: {summary}")
+
+def display_query_debug_panel(slowest: int = 5) -> None:
+    """Sidebar summary of this rerun's queries, shown only in debug mode"""
+    if not st.session_state.get('debug_mode', False):
+        return
+    sink = get_query_sink()
+    if not isinstance(sink, RingBufferSink):
+        return
+
+    session_key = st.session_state.get('query_log_session')
+    rerun = st.session_state.get('query_log_rerun')
+    current = sink.events(session_key=session_key, rerun=rerun)
+    recent = sink.events(session_key=session_key)
+
+    with st.sidebar.expander("⏱️ Startup", expanded=False):
+        for phase, ms in startup_timings().items():
+            st.caption(f"{phase}: {ms:.0f} ms")
+
+    with st.sidebar.expander("🔍 Queries", expanded=False):
+        total_ms = sum(event.duration_ms for event in current)
+        st.write(f"This rerun: {len(current)} queries, {total_ms:.0f} ms")
+
+        by_fingerprint: Dict[str, Dict[str, Any]] = {}
+        for event in current:
+            summary = by_fingerprint.setdefault(
+                event.fingerprint, {'statement': event.statement, 'count': 0, 'ms': 0.0}
+            )
+            summary['count'] += 1
+            summary['ms'] += event.duration_ms
+        repeated = [s for s in by_fingerprint.values() if s['count'] > 1]
+        if repeated:
+            st.write("Repeated this rerun:")
+            for summary in sorted(repeated, key=lambda s: s['count'], reverse=True):
+                st.caption(f"{summary['count']}× {summary['ms']:.0f} ms — {summary['statement'][:120]}")
+
+        # Imported here: connection imports this module
+        from .connection import SnowflakeConnection
+        connection = SnowflakeConnection._instance
+        if connection is not None:
+            cache = connection.results.stats()
+            st.write(
+                f"Result cache: {cache['hits']} hits, {cache['misses']} misses, "
+                f"{cache['size']} entries"
+            )
+
+        st.write(f"Slowest of last {len(recent)}:")
+        for event in sorted(recent, key=lambda e: e.duration_ms, reverse=True)[:slowest]:
+            page = event.page or '-'
+            marker = " ❌" if event.error else ""
+            st.caption(
+                f"{event.duration_ms:.0f} ms, {event.row_count} rows, {page}{marker} — "
+                f"{event.statement[:120]}"
+            )
+
+__all__ = [
+    'QueryEvent',
+    'RingBufferSink',
+    'normalize_statement',
+    'query_fingerprint',
+    'record_query',
+    'script_context',
+    'attribute_queries',
+    'set_query_sink',
+    'get_query_sink',
+    'begin_rerun',
+    'record_startup',
+    'startup_timings',
+    'report_startup',
+    'display_query_debug_panel'
+]
@@ -0,0 +1,491 @@
+# database/local.py
+"""
+Offline stand-in for SnowflakeConnection backed by an embedded DuckDB file.
+
+Selected with EZBIZ_DB_BACKEND=duckdb (or backend = "duckdb" under
+[database] in secrets), it honours the same execute_query /
+execute_transaction / insert_returning_id contract, so pages can be run,
+profiled and load tested without Snowflake credentials. The OPERATIONAL.CARPET
+tables are created on first use; statements are translated for the handful
+of Snowflake-only constructs the app uses (:1 binds, CURRENT_TIMESTAMP(),
+DATEADD, EQUAL_NULL, sequence NEXTVAL and GENERATOR).
+
+Seed synthetic data with:
+    python -m benchmarks.data --path local.duckdb --customers 2000
+"""
+
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from .connection import SnowflakeConnection
+from .ids import IdBlockAllocator, sequence_for
+from .pool import SessionPool
+from .result_cache import ResultCache
+
+DEFAULT_DATABASE_PATH = "local.duckdb"
+
+# (table, id column or None, column definitions)
+LOCAL_SCHEMA = [
+    ("SERVICES", "SERVICE_ID", """
+        SERVICE_NAME VARCHAR,
+        SERVICE_CATEGORY VARCHAR,
+        SERVICE_DESCRIPTION VARCHAR,
+        COST DECIMAL(10,2),
+        ACTIVE_STATUS BOOLEAN DEFAULT TRUE,
+        SERVICE_DURATION INTEGER DEFAULT 60,
+        CUSTOMER_BOOKABLE BOOLEAN DEFAULT FALSE,
+        DEPOSIT_REQUIRED BOOLEAN DEFAULT FALSE,
+        DEPOSIT_AMOUNT DECIMAL(10,2),
+        MODIFIED_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("CUSTOMER", "CUSTOMER_ID", """
+        FIRST_NAME VARCHAR,
+        LAST_NAME VARCHAR,
+        BILLING_ADDRESS VARCHAR,
+        BILLING_CITY VARCHAR,
+        BILLING_STATE VARCHAR,
+        BILLING_ZIP INTEGER,
+        CITY VARCHAR,
+        STATE VARCHAR,
+        EMAIL_ADDRESS VARCHAR,
+        PHONE_NUMBER VARCHAR,
+        TEXT_FLAG BOOLEAN DEFAULT FALSE,
+        COMMENTS VARCHAR,
+        PRIMARY_CONTACT_METHOD VARCHAR,
+        MEMBER_FLAG BOOLEAN DEFAULT FALSE,
+        CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        LAST_UPDATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("ACCOUNTS", "ACCOUNT_ID", """
+        ACCOUNT_NAME VARCHAR,
+        ACCOUNT_TYPE VARCHAR,
+        ACCOUNT_DESCRIPTION VARCHAR,
+        CONTACT_PERSON VARCHAR,
+        CONTACT_EMAIL VARCHAR,
+        CONTACT_PHONE VARCHAR,
+        BILLING_ADDRESS VARCHAR,
+        CITY VARCHAR,
+        STATE VARCHAR,
+        ZIP_CODE INTEGER,
+        BILLING_DATE DATE,
+        ACTIVE_FLAG BOOLEAN DEFAULT TRUE,
+        ACCOUNT_CREATION_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        LAST_MODIFIED_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("SERVICE_ADDRESSES", "ADDRESS_ID", """
+        CUSTOMER_ID BIGINT,
+        ACCOUNT_ID BIGINT,
+        STREET_ADDRESS VARCHAR,
+        CITY VARCHAR,
+        STATE VARCHAR,
+        ZIP_CODE INTEGER,
+        SQUARE_FOOTAGE INTEGER DEFAULT 0,
+        IS_PRIMARY_SERVICE BOOLEAN DEFAULT FALSE,
+        LAST_UPDATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("PRIMARY_SERVICE_ADDRESSES", None, """
+        CUSTOMER_ID BIGINT,
+        ACCOUNT_ID BIGINT,
+        ADDRESS_ID BIGINT,
+        STREET_ADDRESS VARCHAR,
+        CITY VARCHAR,
+        STATE VARCHAR,
+        ZIP_CODE INTEGER,
+        SQUARE_FOOTAGE INTEGER,
+        REFRESHED_AT TIMESTAMP"""),
+    ("EMPLOYEE", "EMPLOYEE_ID", """
+        FIRST_NAME VARCHAR,
+        LAST_NAME VARCHAR,
+        EMAIL VARCHAR,
+        EMAIL_ADDRESS VARCHAR,
+        PHONE_NUMBER VARCHAR,
+        JOB_TITLE VARCHAR,
+        DEPARTMENT VARCHAR,
+        ROLE VARCHAR,
+        STATUS VARCHAR DEFAULT 'Active',
+        ACTIVE_STATUS BOOLEAN DEFAULT TRUE,
+        HOURLY_WAGE DECIMAL(10,2),
+        HOURLY_RATE DECIMAL(10,2),
+        SALARY DECIMAL(12,2),
+        HIRE_DATE DATE,
+        TERMINATION_DATE DATE,
+        TERMINATION_REASON VARCHAR,
+        MODIFIED_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("SERVICE_TRANSACTION", "ID", """
+        CUSTOMER_ID BIGINT,
+        ACCOUNT_ID BIGINT,
+        ADDRESS_ID BIGINT,
+        SERVICE_NAME VARCHAR,
+        SERVICE_ID BIGINT,
+        SERVICE2_ID BIGINT,
+        SERVICE3_ID BIGINT,
+        SERVICE_DATE DATE,
+        START_TIME TIME,
+        END_TIME TIME,
+        TRANSACTION_DATE DATE,
+        TRANSACTION_TIME TIME,
+        IS_RECURRING BOOLEAN DEFAULT FALSE,
+        RECURRENCE_PATTERN VARCHAR,
+        COMMENTS VARCHAR,
+        DEPOSIT DECIMAL(10,2) DEFAULT 0,
+        DEPOSIT_PAID BOOLEAN DEFAULT FALSE,
+        DEPOSIT_PAYMENT_METHOD VARCHAR,
+        BASE_SERVICE_COST DECIMAL(10,2),
+        SERVICE2_COST DECIMAL(10,2),
+        SERVICE3_COST DECIMAL(10,2),
+        AMOUNT DECIMAL(10,2),
+        AMOUNT_RECEIVED DECIMAL(10,2),
+        DISCOUNT DECIMAL(10,2),
+        MATERIAL_COST DECIMAL(10,2),
+        TOTAL_LABOR_COST DECIMAL(10,2),
+        MARKUP_PERCENTAGE DECIMAL(10,2),
+        PRICE_ADJUSTMENTS_JSON VARCHAR,
+        PRICING_STRATEGY VARCHAR,
+        EMPLOYEE1_ID BIGINT,
+        EMPLOYEE2_ID BIGINT,
+        EMPLOYEE3_ID BIGINT,
+        PYMT_MTHD_1 VARCHAR,
+        PYMT_MTHD_1_AMT DECIMAL(10,2),
+        PYMT_MTHD_2 VARCHAR,
+        PYMT_MTHD_2_AMT DECIMAL(10,2),
+        PYMT_MTHD_3 VARCHAR,
+        PYMT_MTHD_3_AMT DECIMAL(10,2),
+        PYMT_DATE DATE,
+        STATUS VARCHAR DEFAULT 'SCHEDULED',
+        COMPLETION_DATE DATE,
+        CREATED_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        LAST_MODIFIED_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("SERVICE_ASSIGNMENTS", "ASSIGNMENT_ID", """
+        TRANSACTION_ID BIGINT NOT NULL,
+        EMPLOYEE_ID BIGINT NOT NULL,
+        ASSIGNMENT_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ASSIGNMENT_STATUS VARCHAR DEFAULT 'ASSIGNED',
+        NOTES VARCHAR,
+        CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        MODIFIED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("BUSINESS_INFO", "BUSINESS_ID", """
+        BUSINESS_NAME VARCHAR,
+        STREET_ADDRESS VARCHAR,
+        CITY VARCHAR,
+        STATE VARCHAR,
+        ZIP_CODE INTEGER,
+        PHONE_NUMBER VARCHAR,
+        EMAIL_ADDRESS VARCHAR,
+        WEBSITE VARCHAR,
+        OPERATING_HOURS_START TIME,
+        OPERATING_HOURS_END TIME,
+        WEEKEND_OPERATING_HOURS_START TIME,
+        WEEKEND_OPERATING_HOURS_END TIME,
+        ACTIVE_STATUS BOOLEAN DEFAULT TRUE,
+        MODIFIED_DATE TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("BUSINESS_PORTAL_USERS", "PORTAL_USER_ID", """
+        EMPLOYEE_ID BIGINT,
+        EMAIL VARCHAR,
+        PASSWORD_HASH VARCHAR,
+        IS_ADMIN BOOLEAN DEFAULT FALSE,
+        IS_ACTIVE BOOLEAN DEFAULT TRUE,
+        EMAIL_VERIFIED BOOLEAN DEFAULT FALSE,
+        FAILED_LOGIN_ATTEMPTS INTEGER DEFAULT 0,
+        ACCOUNT_LOCKED BOOLEAN DEFAULT FALSE,
+        ACCOUNT_LOCKED_UNTIL TIMESTAMP,
+        LAST_LOGIN_DATE TIMESTAMP,
+        PASSWORD_RESET_TOKEN VARCHAR,
+        PASSWORD_RESET_EXPIRY TIMESTAMP,
+        CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        MODIFIED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("CUSTOMER_PORTAL_USERS", "PORTAL_USER_ID", """
+        CUSTOMER_ID BIGINT,
+        EMAIL VARCHAR,
+        PASSWORD_HASH VARCHAR,
+        IS_ACTIVE BOOLEAN DEFAULT TRUE,
+        EMAIL_VERIFIED BOOLEAN DEFAULT FALSE,
+        FAILED_LOGIN_ATTEMPTS INTEGER DEFAULT 0,
+        ACCOUNT_LOCKED BOOLEAN DEFAULT FALSE,
+        ACCOUNT_LOCKED_UNTIL TIMESTAMP,
+        LAST_LOGIN_DATE TIMESTAMP,
+        PASSWORD_RESET_TOKEN VARCHAR,
+        PASSWORD_RESET_EXPIRY TIMESTAMP,
+        CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        MODIFIED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("SCHEDULE_LOCKS", None, """
+        SERVICE_DATE DATE PRIMARY KEY,
+        LOCKED_AT TIMESTAMP"""),
+    ("BUSINESS_SESSIONS", None, """
+        SESSION_ID VARCHAR PRIMARY KEY,
+        PORTAL_USER_ID BIGINT,
+        IP_ADDRESS VARCHAR,
+        USER_AGENT VARCHAR,
+        LOGIN_TIME TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        LAST_ACTIVITY TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        EXPIRES_AT TIMESTAMP,
+        IS_ACTIVE BOOLEAN DEFAULT TRUE,
+        MODIFIED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("CUSTOMER_SESSIONS", None, """
+        SESSION_ID VARCHAR PRIMARY KEY,
+        PORTAL_USER_ID BIGINT,
+        IP_ADDRESS VARCHAR,
+        USER_AGENT VARCHAR,
+        LOGIN_TIME TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        LAST_ACTIVITY TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        EXPIRES_AT TIMESTAMP,
+        IS_ACTIVE BOOLEAN DEFAULT TRUE,
+        MODIFIED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("SESSION_LOG", "LOG_ID", """
+        PORTAL_USER_ID BIGINT,
+        EVENT_TYPE VARCHAR,
+        IP_ADDRESS VARCHAR,
+        USER_AGENT VARCHAR,
+        EVENT_DETAILS VARCHAR,
+        EVENT_TIME TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("RATE_LIMIT_LOG", "LOG_ID", """
+        IP_ADDRESS VARCHAR,
+        ACTION_TYPE VARCHAR,
+        PORTAL_USER_ID BIGINT,
+        LAST_ATTEMPT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("VERIFICATION_TOKENS", None, """
+        TOKEN_ID VARCHAR PRIMARY KEY,
+        PORTAL_USER_ID BIGINT,
+        TOKEN_TYPE VARCHAR,
+        EXPIRES_AT TIMESTAMP,
+        IS_USED BOOLEAN DEFAULT FALSE,
+        USED_AT TIMESTAMP,
+        CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("EMAIL_LOGS", "LOG_ID", """
+        EMAIL_TYPE VARCHAR,
+        EMAIL_TO VARCHAR,
+        EMAIL_SUBJECT VARCHAR,
+        STATUS VARCHAR,
+        ERROR_MESSAGE VARCHAR,
+        SENT_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("CUSTOMER_PREFERENCES", None, """
+        CUSTOMER_ID BIGINT PRIMARY KEY,
+        MARKETING_EMAILS BOOLEAN DEFAULT TRUE,
+        MARKETING_SMS BOOLEAN DEFAULT FALSE,
+        APPOINTMENT_REMINDERS BOOLEAN DEFAULT TRUE,
+        PROMOTIONAL_MESSAGES BOOLEAN DEFAULT FALSE,
+        MODIFIED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("MESSAGE_TEMPLATES", "TEMPLATE_ID", """
+        TEMPLATE_NAME VARCHAR,
+        TEMPLATE_TYPE VARCHAR,
+        TEMPLATE_CONTENT VARCHAR,
+        DELIVERY_CHANNELS VARCHAR,
+        IS_ACTIVE BOOLEAN DEFAULT TRUE,
+        CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("MESSAGE_LOG", "LOG_ID", """
+        TEMPLATE_ID BIGINT,
+        RECIPIENT_TYPE VARCHAR,
+        RECIPIENT_COUNT INTEGER,
+        DELIVERY_STATUS VARCHAR,
+        SENT_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+    ("PRICING_STRATEGIES", "STRATEGY_ID", """
+        STRATEGY_NAME VARCHAR,
+        STRATEGY_TYPE VARCHAR,
+        RULES_JSON VARCHAR,
+        ACTIVE_FLAG BOOLEAN DEFAULT TRUE,
+        CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        MODIFIED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP"""),
+]
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBERED_BIND = re.compile(r"(?<![:\w]):(\d+)\b")
+_NO_ARG_FUNCTIONS = re.compile(r"\b(CURRENT_TIMESTAMP|CURRENT_DATE|CURRENT_TIME)\s*\(\s*\)", re.IGNORECASE)
+_NEXTVAL = re.compile(r"\b([A-Za-z_][\w.]*)\.NEXTVAL\b", re.IGNORECASE)
+_GENERATOR = re.compile(r"TABLE\s*\(\s*GENERATOR\s*\(\s*ROWCOUNT\s*=>\s*(\d+)\s*\)\s*\)", re.IGNORECASE)
+_TIMESTAMP_TYPES = re.compile(r"\bTIMESTAMP_(?:NTZ|LTZ|TZ)\b", re.IGNORECASE)
+_DATE_UNITS = {
+    'year': 'YEAR', 'years': 'YEAR', 'month': 'MONTH', 'months': 'MONTH',
+    'week': 'WEEK', 'weeks': 'WEEK', 'day': 'DAY', 'days': 'DAY',
+    'hour': 'HOUR', 'hours': 'HOUR', 'minute': 'MINUTE', 'minutes': 'MINUTE',
+    'second': 'SECOND', 'seconds': 'SECOND'
+}
+
+def _map_code(sql: str, transform: Callable[[str], str]) -> str:
+    """Apply transform to the parts of sql that are not string literals"""
+    parts = []
+    last = 0
+    for match in _STRING_LITERAL.finditer(sql):
+        parts.append(transform(sql[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(transform(sql[last:]))
+    return ''.join(parts)
+
+def _split_call(sql: str, open_paren: int) -> Optional[tuple]:
+    """Top-level arguments of the call whose '(' is at open_paren, and the index after ')'"""
+    depth = 0
+    args = []
+    start = open_paren + 1
+    index = open_paren
+    in_string = False
+    while index < len(sql):
+        char = sql[index]
+        if char == "'":
+            in_string = not in_string
+        elif not in_string:
+            if char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0:
+                    args.append(sql[start:index].strip())
+                    return args, index + 1
+            elif char == ',' and depth == 1:
+                args.append(sql[start:index].strip())
+                start = index + 1
+        index += 1
+    return None
+
+def _rewrite_calls(sql: str, name: str, build: Callable[[List[str]], str]) -> str:
+    """Replace every name(...) call with build(arguments)"""
+    pattern = re.compile(r"\b" + name + r"\s*\(", re.IGNORECASE)
+    search_from = 0
+    while True:
+        match = pattern.search(sql, search_from)
+        if not match:
+            return sql
+        if sql.count("'", 0, match.start()) % 2:
+            search_from = match.end()  # Inside a string literal
+            continue
+        call = _split_call(sql, match.end() - 1)
+        if call is None:
+            return sql
+        args, end = call
+        replacement = build(args)
+        sql = sql[:match.start()] + replacement + sql[end:]
+        search_from = match.start() + len(replacement)
+
+def _dateadd(args: List[str]) -> str:
+    unit = _DATE_UNITS.get(args[0].strip().strip("'").lower(), args[0].upper())
+    return f"(({args[2]}) + ({args[1]}) * INTERVAL 1 {unit})"
+
+def translate_sql(sql: str) -> str:
+    """
+    Rewrite the Snowflake-specific parts of a statement for DuckDB
+
+    Args:
+        sql (str): Statement as written for Snowflake
+
+    Returns:
+        str: Equivalent DuckDB statement
+    """
+    def code(part: str) -> str:
+        part = _NUMBERED_BIND.sub(r"$\1", part)
+        part = _NO_ARG_FUNCTIONS.sub(lambda m: m.group(1).upper(), part)
+        part = _GENERATOR.sub(r"range(\1)", part)
+        part = _NEXTVAL.sub(lambda m: f"nextval('{m.group(1)}')", part)
+        return _TIMESTAMP_TYPES.sub("TIMESTAMP", part)
+
+    sql = _map_code(sql, code)
+    sql = _rewrite_calls(sql, "DATEADD", _dateadd)
+    return _rewrite_calls(sql, "EQUAL_NULL", lambda args: f"(({args[0]}) IS NOT DISTINCT FROM ({args[1]}))")
+
+def local_database_path() -> str:
+    """DuckDB file from EZBIZ_LOCAL_DB or [database] local_path in secrets"""
+    path = os.environ.get("EZBIZ_LOCAL_DB")
+    if not path:
+        try:
+            path = st.secrets.get("database", {}).get("local_path")
+        except Exception:
+            path = None
+    return path or DEFAULT_DATABASE_PATH
+
+def _import_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError(
+            "The local database backend needs DuckDB: pip install duckdb"
+        ) from e
+    return duckdb
+
+class LocalConnection(SnowflakeConnection):
+    """SnowflakeConnection that runs statements against an embedded DuckDB database"""
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (and if needed create) the local database
+
+        Args:
+            path (Optional[str]): Database file, ':memory:' for a throwaway database.
+                Defaults to local_database_path()
+        """
+        duckdb = _import_duckdb()
+        self.path = path or local_database_path()
+        self._private_key = None
+        self._snowpark_sessions: Dict[int, Any] = {}
+        self._snowpark_lock = threading.Lock()
+
+        # The catalog must be named OPERATIONAL for three-part table names to resolve
+        self._root = duckdb.connect(":memory:")
+        self._root.execute(f"ATTACH '{self.path}' AS OPERATIONAL")
+        self._root.execute("CREATE SCHEMA IF NOT EXISTS OPERATIONAL.CARPET")
+        create_local_schema(self._root)
+
+        self.pool = SessionPool(
+            factory=self._create_connection,
+            max_size=8,
+            on_close=self._forget_snowpark_session
+        )
+        self.ids = IdBlockAllocator(fetch=self._fetch_quietly, block_size=20)
+        self.results = ResultCache()
+
+    def _create_connection(self) -> Any:
+        """Each pooled session is its own DuckDB connection to the shared database"""
+        connection = self._root.cursor()
+        # Unqualified table names resolve like the Snowflake session's default schema
+        connection.execute("USE OPERATIONAL.CARPET")
+        return connection
+
+    def _fetch_rows(self, connection: Any, query: str, params: Optional[List[Any]] = None) -> List[dict]:
+        """Execute a translated statement and return rows keyed by upper-case column name"""
+        cursor = connection.execute(translate_sql(query), list(params) if params else None)
+        if not cursor.description:
+            return []
+        # Snowflake upper-cases unquoted identifiers; DuckDB preserves their case
+        columns = [column[0].upper() for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def _fetch_frame(self,
+                     connection: Any,
+                     query: str,
+                     params: Optional[List[Any]] = None,
+                     dtype_backend: Optional[str] = None) -> pd.DataFrame:
+        """Execute a translated statement straight into a DataFrame with upper-case columns"""
+        cursor = connection.execute(translate_sql(query), list(params) if params else None)
+        if not cursor.description:
+            return pd.DataFrame()
+        if dtype_backend == "pyarrow":
+            frame = cursor.fetch_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            # Dates stay datetime.date objects, as from the Snowflake connector
+            frame = cursor.df(date_as_object=True)
+        frame.columns = [str(column).upper() for column in frame.columns]
+        return frame
+
+    def execute_multi(self,
+                      statements: List[Tuple[str, Optional[List[Any]]]],
+                      error_msg: str = "Error executing query") -> List[Optional[List[dict]]]:
+        """DuckDB has no multi-statement requests; run the reads concurrently instead"""
+        return self.execute_many_async(statements, error_msg=error_msg, cache=False)
+
+    def snowpark_session(self):
+        raise NotImplementedError("Snowpark DataFrames are not available on the local backend")
+
+def create_local_schema(connection: Any) -> None:
+    """
+    Create the OPERATIONAL.CARPET tables and their ID sequences if missing
+
+    Args:
+        connection (Any): DuckDB connection with the OPERATIONAL catalog attached
+    """
+    for table, id_column, columns in LOCAL_SCHEMA:
+        qualified = f"OPERATIONAL.CARPET.{table}"
+        if id_column:
+            # Same <TABLE>_<ID>_SEQ naming insert_returning_id expects
+            sequence = sequence_for(qualified, id_column)
+            connection.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+            columns = f"{id_column} BIGINT PRIMARY KEY DEFAULT nextval('{sequence}'),{columns}"
+        connection.execute(f"CREATE TABLE IF NOT EXISTS {qualified} ({columns})")
+
+__all__ = ['LocalConnection', 'local_database_path', 'translate_sql', 'create_local_schema', 'LOCAL_SCHEMA']
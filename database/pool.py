@@ -0,0 +1,261 @@
+# database/pool.py
+"""
+Thread-safe pool of Snowflake sessions used by SnowflakeConnection.
+
+Each Streamlit script run executes in its own thread. A thread checks out
+one session for the duration of a call and nested calls on the same thread
+reuse it, so statements inside a transaction always share a session while
+different browser sessions run their queries in parallel.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+def _select_one(session: Any) -> None:
+    """Default health check: run a trivial statement on a DB-API connection."""
+    cursor = session.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+class PooledSession:
+    """Bookkeeping wrapper for a session owned by the pool."""
+
+    def __init__(self, session: Any):
+        self.session = session
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.last_checked = self.created_at
+
+
+class SessionPool:
+    """
+    Bounded pool of database sessions with per-thread checkout.
+
+    Sessions are created lazily up to max_size, health checked before reuse
+    when they have been idle longer than health_check_interval, and closed
+    once idle longer than idle_timeout (keeping min_idle warm sessions).
+    """
+
+    def __init__(self,
+                 factory: Callable[[], Any],
+                 max_size: int = 4,
+                 min_idle: int = 1,
+                 idle_timeout: float = 300.0,
+                 health_check_interval: float = 60.0,
+                 checkout_timeout: float = 30.0,
+                 ping: Optional[Callable[[Any], Any]] = None,
+                 on_close: Optional[Callable[[Any], None]] = None):
+        """
+        Initialize the pool
+
+        Args:
+            factory (Callable[[], Any]): Creates a new session, returning None on failure
+            max_size (int): Maximum number of open sessions
+            min_idle (int): Idle sessions kept open regardless of idle_timeout
+            idle_timeout (float): Seconds an idle session may stay open
+            health_check_interval (float): Idle seconds after which a session is pinged before reuse
+            checkout_timeout (float): Seconds to wait for a free session when the pool is exhausted
+            ping (Optional[Callable[[Any], Any]]): Raises if a session is no longer usable; defaults to SELECT 1
+            on_close (Optional[Callable[[Any], None]]): Called with each session the pool closes,
+                to drop state kept for it
+        """
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self.min_idle = max(0, int(min_idle))
+        self.idle_timeout = float(idle_timeout)
+        self.health_check_interval = float(health_check_interval)
+        self.checkout_timeout = float(checkout_timeout)
+        self._ping = ping or _select_one
+        self._on_close = on_close
+
+        self._idle: List[PooledSession] = []
+        self._size = 0  # Open sessions, idle and checked out
+        self._cond = threading.Condition()
+        self._local = threading.local()
+
+    def warm_up(self) -> bool:
+        """Open one session up front so connection problems surface at startup."""
+        try:
+            self.acquire()
+        except Exception:
+            return False
+        self.release()
+        return True
+
+    def acquire(self) -> Any:
+        """
+        Check out a session for the current thread
+
+        Returns:
+            Any: Session leased to this thread; nested calls return the same session
+        """
+        lease = getattr(self._local, 'lease', None)
+        if lease:
+            lease['depth'] += 1
+            return lease['pooled'].session
+
+        pooled = self._checkout()
+        self._local.lease = {'pooled': pooled, 'depth': 1, 'broken': False}
+        return pooled.session
+
+    def release(self, discard: bool = False) -> None:
+        """
+        Return the current thread's session to the pool
+
+        Args:
+            discard (bool): Close the session instead of reusing it (e.g. after a connection error)
+        """
+        lease = getattr(self._local, 'lease', None)
+        if not lease:
+            return
+        if discard:
+            lease['broken'] = True
+
+        lease['depth'] -= 1
+        if lease['depth'] > 0:
+            return
+
+        self._local.lease = None
+        pooled = lease['pooled']
+        if lease['broken']:
+            self._close(pooled)
+        else:
+            with self._cond:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+                self._cond.notify()
+        self.evict_idle()
+
+    @contextmanager
+    def connection(self, is_broken: Optional[Callable[[Exception], bool]] = None) -> Iterator[Any]:
+        """
+        Context manager that leases a session for the enclosed block
+
+        Args:
+            is_broken (Optional[Callable[[Exception], bool]]): Decides whether an error invalidates the session
+        """
+        session = self.acquire()
+        try:
+            yield session
+        except Exception as e:
+            self.release(discard=bool(is_broken and is_broken(e)))
+            raise
+        else:
+            self.release()
+
+    def evict_idle(self) -> int:
+        """
+        Close sessions that have been idle longer than idle_timeout
+
+        Returns:
+            int: Number of sessions closed
+        """
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            keep = []
+            # Most recently used sessions are at the end of the list
+            for index, pooled in enumerate(reversed(self._idle)):
+                if index >= self.min_idle and now - pooled.last_used > self.idle_timeout:
+                    expired.append(pooled)
+                else:
+                    keep.append(pooled)
+            self._idle = list(reversed(keep))
+
+        for pooled in expired:
+            self._close(pooled)
+        return len(expired)
+
+    def close_all(self) -> None:
+        """Close every idle session (checked out sessions close when released with discard)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._close(pooled)
+
+    def stats(self) -> Dict[str, int]:
+        """Return current pool counters."""
+        with self._cond:
+            return {
+                'max_size': self.max_size,
+                'open': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle)
+            }
+
+    def _checkout(self) -> PooledSession:
+        """Take an idle healthy session, create one, or wait for one to be released."""
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            candidate = None
+            with self._cond:
+                if self._idle:
+                    candidate = self._idle.pop()  # Most recently used, least likely to be stale
+                elif self._size < self.max_size:
+                    self._size += 1
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No database session available after {self.checkout_timeout:g}s "
+                            f"(pool size {self.max_size})"
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            if candidate is None:
+                return self._open()
+            if self._is_healthy(candidate):
+                return candidate
+            self._close(candidate)
+
+    def _open(self) -> PooledSession:
+        """Create a new session; the caller has already reserved a slot."""
+        try:
+            session = self._factory()
+        except Exception:
+            self._free_slot()
+            raise
+        if session is None:
+            self._free_slot()
+            raise ConnectionError("Failed to create database session")
+        return PooledSession(session)
+
+    def _is_healthy(self, pooled: PooledSession) -> bool:
+        """Ping sessions that have been idle for a while before handing them out."""
+        now = time.monotonic()
+        if now - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            self._ping(pooled.session)
+            pooled.last_checked = now
+            return True
+        except Exception:
+            return False
+
+    def _close(self, pooled: PooledSession) -> None:
+        """Close a session and free its slot."""
+        if self._on_close is not None:
+            try:
+                self._on_close(pooled.session)
+            except Exception:
+                pass  # Cleanup must not keep the slot from being freed
+        try:
+            pooled.session.close()
+        except Exception:
+            pass  # Session is already unusable
+        self._free_slot()
+
+    def _free_slot(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+
+__all__ = ['SessionPool', 'PooledSession']
@@ -0,0 +1,281 @@
+# database/result_cache.py
+"""
+In-process cache of query results, invalidated by writes to the tables read.
+
+Every cached SELECT is tagged with the tables it references. When an INSERT,
+UPDATE, DELETE or MERGE goes through the same SnowflakeConnection, entries
+tagged with the written table are evicted, so a page that writes and reruns
+reads its own changes. Writes made elsewhere (another app instance, the
+Snowflake console) are only picked up when an entry's TTL runs out.
+
+Caching is on by default for every read (execute_query and friends take
+cache=True), so unchanged reads across reruns cost nothing without each page
+opting in. The opt-out is per call: reads that must see other processes'
+writes, such as booking conflict checks, pass cache=False. The whole cache is
+switched off per deployment with result_cache_size = 0.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_WHITESPACE = re.compile(r"\s+")
+_FIRST_KEYWORD = re.compile(r"^[\s(]*([A-Za-z]+)")
+_TABLE_REFERENCE = re.compile(
+    r"\b(?:FROM|JOIN|INTO|UPDATE|USING|TABLE)\s+([A-Za-z_][\w$]*(?:\.[A-Za-z_][\w$]*)*)",
+    re.IGNORECASE
+)
+# Results that depend on the clock or a sequence are never reused
+_VOLATILE = re.compile(
+    r"\b(CURRENT_TIMESTAMP|CURRENT_DATE|CURRENT_TIME|SYSDATE|GETDATE|LOCALTIMESTAMP"
+    r"|NEXTVAL|RANDOM|UUID_STRING|SEQ\d)\b",
+    re.IGNORECASE
+)
+
+READ_KEYWORDS = {'SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'DESC'}
+WRITE_KEYWORDS = {'INSERT', 'UPDATE', 'DELETE', 'MERGE', 'TRUNCATE', 'COPY'}
+CONTROL_KEYWORDS = {'BEGIN', 'COMMIT', 'ROLLBACK', 'START', 'USE', 'SET'}
+
+def _code_only(query: str) -> str:
+    """Statement without comments or string literals"""
+    return _STRING_LITERAL.sub("''", _COMMENT.sub(' ', query))
+
+def statement_kind(query: str) -> str:
+    """
+    Classify a statement for caching purposes
+
+    Args:
+        query (str): SQL text
+
+    Returns:
+        str: 'read', 'write' (tables known), 'control' (transaction/session
+            statements) or 'other' (DDL, CALL, ...; may change anything)
+    """
+    match = _FIRST_KEYWORD.match(_code_only(query))
+    keyword = match.group(1).upper() if match else ''
+    if keyword in READ_KEYWORDS:
+        return 'read'
+    if keyword in WRITE_KEYWORDS:
+        return 'write'
+    if keyword in CONTROL_KEYWORDS:
+        return 'control'
+    return 'other'
+
+def referenced_tables(query: str) -> FrozenSet[str]:
+    """
+    Unqualified, upper-case names of the tables a statement reads or writes
+
+    Args:
+        query (str): SQL text
+
+    Returns:
+        FrozenSet[str]: Table names, e.g. {'SERVICE_TRANSACTION', 'CUSTOMER'}
+    """
+    return frozenset(
+        name.split('.')[-1].upper()
+        for name in _TABLE_REFERENCE.findall(_code_only(query))
+    )
+
+def is_cacheable(query: str) -> bool:
+    """Reads whose result depends only on table contents and bind values"""
+    return statement_kind(query) == 'read' and not _VOLATILE.search(_code_only(query))
+
+def advance_generation(generation: Tuple[int, ...],
+                       tables: FrozenSet[str],
+                       statements: Iterable[str]) -> Tuple[int, ...]:
+    """
+    Generation of `tables` after exactly these statements were noted
+
+    Args:
+        generation (Tuple[int, ...]): Snapshot from ResultCache.generation(tables)
+        tables (FrozenSet[str]): Tables the snapshot was taken for
+        statements (Iterable[str]): Statements executed since the snapshot
+
+    Returns:
+        Tuple[int, ...]: What generation(tables) reports if nothing else ran
+    """
+    ordered = sorted(tables)
+    epoch, counters = generation[0], list(generation[1:])
+    for query in statements:
+        kind = statement_kind(query)
+        written = referenced_tables(query) if kind == 'write' else frozenset()
+        if kind == 'other' or (kind == 'write' and not written):
+            epoch += 1
+        for index, table in enumerate(ordered):
+            if table in written:
+                counters[index] += 1
+    return (epoch,) + tuple(counters)
+
+def _copy_result(result: Any) -> Any:
+    """Copy of a list of row dicts or a DataFrame, so callers cannot modify the cached one"""
+    if isinstance(result, list):
+        return [dict(row) for row in result]
+    return result.copy()
+
+class ResultCache:
+    """Bounded LRU of query results with per-table invalidation"""
+
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Entries kept before the least recently used is evicted; 0 disables caching
+            ttl (float): Seconds an entry may be served without a write having been seen
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = float(ttl)
+        self._entries: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self._recording = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(query: str, params: Optional[List[Any]] = None, shape: str = 'rows') -> Tuple[Any, ...]:
+        """Cache key: whitespace-normalized SQL, bind values and result form (rows or DataFrame)"""
+        return _WHITESPACE.sub(' ', query).strip(), tuple(params or ()), shape
+
+    def get(self, key: Tuple[Any, ...]) -> Any:
+        """
+        Look up a cached result
+
+        Args:
+            key: Key from ResultCache.key
+
+        Returns:
+            Copy of the cached rows or DataFrame, or None on a miss
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry['expires'] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            rows = entry['rows']
+        # Callers may modify what they get back
+        return _copy_result(rows)
+
+    def generation(self, tables: FrozenSet[str]) -> Tuple[int, ...]:
+        """Snapshot of the tables' write counters, taken before running a read"""
+        with self._lock:
+            return self._generation_locked(tables)
+
+    def _generation_locked(self, tables: FrozenSet[str]) -> Tuple[int, ...]:
+        return (self._epoch,) + tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def put(self,
+            key: Tuple[Any, ...],
+            rows: Any,
+            tables: FrozenSet[str],
+            generation: Tuple[int, ...]) -> None:
+        """
+        Store a result unless one of its tables was written while it was read
+
+        Args:
+            key: Key from ResultCache.key
+            rows: Rows (List[dict]) or DataFrame returned by the query
+            tables (FrozenSet[str]): Tables the query references
+            generation (Tuple[int, ...]): Snapshot from generation() taken before the read
+        """
+        if not self.enabled or not tables:
+            return
+        with self._lock:
+            if self._generation_locked(tables) != generation:
+                return
+            self._entries[key] = {
+                'rows': _copy_result(rows),
+                'tables': tables,
+                'expires': time.monotonic() + self.ttl
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_tables(self, tables: FrozenSet[str]) -> int:
+        """
+        Evict every entry that reads one of the tables
+
+        Args:
+            tables (FrozenSet[str]): Unqualified, upper-case table names
+
+        Returns:
+            int: Entries evicted
+        """
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry['tables'] & tables]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        """Evict everything (after DDL, procedure calls or other unknown writes)"""
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    @contextmanager
+    def recording(self) -> Iterator[List[str]]:
+        """
+        Collect the statements this thread notes while the block runs
+
+        Yields:
+            List[str]: Filled with each statement passed to note_statement
+        """
+        previous = getattr(self._recording, 'statements', None)
+        statements: List[str] = []
+        self._recording.statements = statements
+        try:
+            yield statements
+        finally:
+            self._recording.statements = previous
+
+    def note_statement(self, query: str) -> None:
+        """Invalidate whatever a statement that was just executed may have changed"""
+        statements = getattr(self._recording, 'statements', None)
+        if statements is not None:
+            statements.append(query)
+        kind = statement_kind(query)
+        if kind == 'write':
+            tables = referenced_tables(query)
+            if tables:
+                self.invalidate_tables(tables)
+            else:
+                self.clear()
+        elif kind == 'other':
+            self.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counters plus the current size"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+__all__ = ['ResultCache', 'statement_kind', 'referenced_tables', 'is_cacheable', 'advance_generation']
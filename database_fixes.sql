@@ -22,4 +22,157 @@ CREATE TABLE IF NOT EXISTS OPERATIONAL.CARPET.SERVICE_ASSIGNMENTS (
 
 -- These fixes resolve:
 -- 1. "invalid identifier 'PORTAL_USER_ID'" errors in password reset and rate limiting
--- 2. "Object 'SERVICE_ASSIGNMENTS' does not exist" errors in employee assignments
\ No newline at end of file
+-- 2. "Object 'SERVICE_ASSIGNMENTS' does not exist" errors in employee assignments
+
+-- Fix 3: Sequences that supply IDs to SnowflakeConnection.insert_returning_id
+-- Issue: IDs were read back with "ORDER BY <ID> DESC LIMIT 1" after each insert,
+-- costing a second round trip and able to return a concurrent insert's row.
+-- The ID columns are IDENTITY columns, and Snowflake will not give one a
+-- sequence default, so each table is rebuilt from its own DDL with
+-- DEFAULT <seq>.NEXTVAL on the ID column. The new table is built under a
+-- <table>_SEQUENCE_MIGRATION name and filled from the live table; only when
+-- both hold the same number of rows does one CREATE OR REPLACE ... CLONE ...
+-- COPY GRANTS put it in place under the live name, keeping the live table's
+-- grants. Until that single statement succeeds the live table is untouched,
+-- and a failure drops the staging table and the sequence again, so a table is
+-- either fully migrated or exactly as before. Inserts that pass an ID reserved
+-- by insert_returning_id and inserts that omit the ID then draw from the same
+-- sequence, so the two can never hand out the same value. Tables whose ID
+-- column is no longer an identity are skipped, so the block can be re-run.
+-- Until a table's sequence exists, insert_returning_id reads the ID back inside
+-- the insert's transaction. Run with writes stopped: a write during the copy
+-- makes the row counts differ and aborts that table's migration.
+EXECUTE IMMEDIATE $$
+DECLARE
+    tables ARRAY DEFAULT ARRAY_CONSTRUCT(
+        ARRAY_CONSTRUCT('SERVICE_TRANSACTION', 'ID'),
+        ARRAY_CONSTRUCT('CUSTOMER', 'CUSTOMER_ID'),
+        ARRAY_CONSTRUCT('SERVICE_ADDRESSES', 'ADDRESS_ID'),
+        ARRAY_CONSTRUCT('SERVICES', 'SERVICE_ID'),
+        ARRAY_CONSTRUCT('EMPLOYEE', 'EMPLOYEE_ID'),
+        ARRAY_CONSTRUCT('BUSINESS_INFO', 'BUSINESS_ID'),
+        ARRAY_CONSTRUCT('CUSTOMER_PORTAL_USERS', 'PORTAL_USER_ID')
+    );
+    copy_mismatch EXCEPTION (-20001, 'Row count of the rebuilt table differs from the live table');
+    table_name VARCHAR;
+    qualified_name VARCHAR;
+    staging_name VARCHAR;
+    id_column VARCHAR;
+    sequence_name VARCHAR;
+    is_identity VARCHAR;
+    start_id NUMBER;
+    live_rows NUMBER;
+    staged_rows NUMBER;
+    ddl VARCHAR;
+    replaced BOOLEAN;
+BEGIN
+    FOR i IN 0 TO ARRAY_SIZE(tables) - 1 DO
+        table_name := tables[i][0]::VARCHAR;
+        id_column := tables[i][1]::VARCHAR;
+        qualified_name := 'OPERATIONAL.CARPET.' || table_name;
+        staging_name := qualified_name || '_SEQUENCE_MIGRATION';
+        sequence_name := qualified_name || '_' || id_column || '_SEQ';
+        is_identity := NULL;
+        replaced := FALSE;
+
+        SELECT IS_IDENTITY INTO :is_identity
+        FROM OPERATIONAL.INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = 'CARPET' AND TABLE_NAME = :table_name AND COLUMN_NAME = :id_column;
+
+        IF (is_identity = 'YES') THEN
+            BEGIN
+                SELECT COALESCE(MAX(IDENTIFIER(:id_column)), 0) + 1 INTO :start_id
+                FROM IDENTIFIER(:qualified_name);
+
+                -- Same columns under the staging name, with the identity clause replaced by the sequence default
+                SELECT GET_DDL('TABLE', :qualified_name, TRUE) INTO :ddl;
+                ddl := REGEXP_REPLACE(ddl, '^(\\s*create\\s+or\\s+replace\\s+table\\s+)\\S+', '\\1' || staging_name, 1, 1, 'i');
+                ddl := REGEXP_REPLACE(ddl,
+                    '\\s(autoincrement|identity)(\\s*\\(\\s*\\d+\\s*,\\s*\\d+\\s*\\))?(\\s+start\\s+\\d+)?(\\s+increment\\s+\\d+)?(\\s+(no)?order)?',
+                    ' DEFAULT ' || sequence_name || '.NEXTVAL', 1, 1, 'i');
+                ddl := REGEXP_REPLACE(ddl, ';\\s*$', '');
+
+                EXECUTE IMMEDIATE 'CREATE OR REPLACE SEQUENCE ' || sequence_name || ' START = ' || start_id || ' INCREMENT = 1';
+                EXECUTE IMMEDIATE ddl;
+                EXECUTE IMMEDIATE 'INSERT INTO ' || staging_name || ' SELECT * FROM ' || qualified_name;
+
+                SELECT COUNT(*) INTO :live_rows FROM IDENTIFIER(:qualified_name);
+                SELECT COUNT(*) INTO :staged_rows FROM IDENTIFIER(:staging_name);
+                IF (live_rows <> staged_rows) THEN
+                    RAISE copy_mismatch;
+                END IF;
+
+                -- The only statement that touches the live table; it either fully succeeds or leaves it as it was
+                EXECUTE IMMEDIATE 'CREATE OR REPLACE TABLE ' || qualified_name || ' CLONE ' || staging_name || ' COPY GRANTS';
+                replaced := TRUE;
+                EXECUTE IMMEDIATE 'DROP TABLE ' || staging_name;
+            EXCEPTION
+                WHEN OTHER THEN
+                    EXECUTE IMMEDIATE 'DROP TABLE IF EXISTS ' || staging_name;
+                    -- Once replaced, the table's default needs the sequence
+                    IF (NOT replaced) THEN
+                        EXECUTE IMMEDIATE 'DROP SEQUENCE IF EXISTS ' || sequence_name;
+                    END IF;
+                    RAISE;
+            END;
+        END IF;
+    END FOR;
+    RETURN 'ID columns use sequences';
+END;
+$$;
+
+-- Fix 4: Per-date lock rows for utils.double_booking_prevention.book_service_slot
+-- Issue: the conflict check and the INSERT ran as separate queries, so two
+-- customers booking the same slot at the same moment could both succeed.
+-- Bookings now MERGE the date's row here first. Snowflake holds that lock until
+-- commit, so a second booking for the same day waits and then sees the first
+-- one in its overlap check.
+CREATE TABLE IF NOT EXISTS OPERATIONAL.CARPET.SCHEDULE_LOCKS (
+    SERVICE_DATE DATE PRIMARY KEY,
+    LOCKED_AT TIMESTAMP_NTZ
+);
+
+-- Fix 5: Maintained primary service address per customer and account (models/service_address.py)
+-- Issue: the scheduled services query ranked every SERVICE_ADDRESSES row with
+-- ROW_NUMBER() twice per render, and transaction details joined addresses on
+-- CUSTOMER_ID OR ACCOUNT_ID. Both now equi-join this table, which the address
+-- save paths refresh. The statements below rebuild it from existing addresses
+-- in one transaction, so running this script again leaves one row per owner.
+-- Owners with no IS_PRIMARY_SERVICE address get their highest ADDRESS_ID. The
+-- table has no creation timestamp and IDs are reserved in blocks per process,
+-- so this tie-break is deterministic but not necessarily the newest address.
+-- REFRESHED_AT is the watermark the customer search index (utils/search_index.py)
+-- uses to pick up address changes.
+CREATE TABLE IF NOT EXISTS OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES (
+    CUSTOMER_ID NUMBER,
+    ACCOUNT_ID NUMBER,
+    ADDRESS_ID NUMBER,
+    STREET_ADDRESS VARCHAR,
+    CITY VARCHAR,
+    STATE VARCHAR,
+    ZIP_CODE NUMBER,
+    SQUARE_FOOTAGE NUMBER,
+    REFRESHED_AT TIMESTAMP_NTZ
+);
+
+BEGIN;
+
+DELETE FROM OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES;
+
+INSERT INTO OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES
+    (CUSTOMER_ID, ACCOUNT_ID, ADDRESS_ID, STREET_ADDRESS, CITY, STATE, ZIP_CODE, SQUARE_FOOTAGE, REFRESHED_AT)
+SELECT CUSTOMER_ID, NULL, ADDRESS_ID, STREET_ADDRESS, CITY, STATE, ZIP_CODE, SQUARE_FOOTAGE, CURRENT_TIMESTAMP()
+FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES
+WHERE CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NULL
+QUALIFY ROW_NUMBER() OVER (PARTITION BY CUSTOMER_ID
+    ORDER BY CASE WHEN IS_PRIMARY_SERVICE = TRUE THEN 0 ELSE 1 END, ADDRESS_ID DESC) = 1;
+
+INSERT INTO OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES
+    (CUSTOMER_ID, ACCOUNT_ID, ADDRESS_ID, STREET_ADDRESS, CITY, STATE, ZIP_CODE, SQUARE_FOOTAGE, REFRESHED_AT)
+SELECT NULL, ACCOUNT_ID, ADDRESS_ID, STREET_ADDRESS, CITY, STATE, ZIP_CODE, SQUARE_FOOTAGE, CURRENT_TIMESTAMP()
+FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES
+WHERE ACCOUNT_ID IS NOT NULL
+QUALIFY ROW_NUMBER() OVER (PARTITION BY ACCOUNT_ID
+    ORDER BY CASE WHEN IS_PRIMARY_SERVICE = TRUE THEN 0 ELSE 1 END, ADDRESS_ID DESC) = 1;
+
+COMMIT;
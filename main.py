@@ -1,3 +1,8 @@
+import time
+
+# Cold-start timings are measured from the top of the first script run
+_script_started = time.perf_counter()
+
 import streamlit as st
 
 # Set page configuration must be the first Streamlit command
@@ -17,38 +22,16 @@ project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from database.connection import snowflake_conn
+from database.instrumentation import (
+    begin_rerun,
+    display_query_debug_panel,
+    record_startup,
+    report_startup
+)
 from config.settings import load_css
 
-# Import unified login
-from pages.auth.unified_login import unified_login_page
-from pages.auth.business_register import business_register_page
-from pages.portal.auth.register import register_customer_page
-from pages.auth.unified_reset import unified_reset_page
-
-# Business portal imports
-from pages.new_service import new_service_page
-from pages.scheduled import scheduled_services_page
-from pages.completed import completed_services_page
-from pages.transaction_details import transaction_details_page
-
-# Customer portal imports
-from pages.portal.auth.register import register_customer_page
-from pages.portal.home import show_customer_portal
-from pages.portal.services.book import book_service_page
-from pages.portal.services.history import service_history_page
-from pages.portal.services.upcoming import upcoming_services_page
-from pages.portal.account.profile import profile_page
-
-# Settings imports
-from pages.settings import (
-    business_settings_page,
-    services_settings_page,
-    employees_settings_page,
-    accounts_settings_page,
-    customer_communications_page,
-    pricing_settings_page
-)
+# Page modules are imported on first navigation
+from pages.registry import AUTH_PAGES, BUSINESS_PAGES, PORTAL_PAGES, SETTINGS_PAGES
 
 # Import middleware
 from utils.auth.middleware import (
@@ -58,21 +41,15 @@ from utils.auth.middleware import (
 )
 
 from utils.business.business_auth import verify_business_session
+from utils.auth.session_cache import business_sessions
+from utils.business.info import get_business_profile
 
+record_startup("imports", time.perf_counter() - _script_started)
 
 def get_business_name() -> str:
-    """Fetch business name from database"""
+    """Get business name from the shared business profile cache"""
     try:
-        query = """
-        SELECT BUSINESS_NAME 
-        FROM OPERATIONAL.CARPET.BUSINESS_INFO 
-        WHERE BUSINESS_NAME IS NOT NULL
-        LIMIT 1
-        """
-        result = snowflake_conn.execute_query(query)
-        if result and len(result) > 0:
-            return result[0]['BUSINESS_NAME']
-        return None
+        return get_business_profile().get('BUSINESS_NAME') or None
     except Exception as e:
         print(f"Error fetching business name: {str(e)}")
         return None
@@ -133,18 +110,9 @@ def display_customer_portal():
         display_customer_navigation()
     
     # Route to appropriate page
-    pages = {
-        'register': register_customer_page,
-        'portal_home': show_customer_portal,
-        'book_service': book_service_page,
-        'service_history': service_history_page,
-        'upcoming_services': upcoming_services_page,
-        'profile': profile_page
-    }
-    
     current_page = st.session_state.get('page', 'login')
-    if current_page in pages:
-        pages[current_page]()
+    if current_page in PORTAL_PAGES:
+        PORTAL_PAGES[current_page]()
     
     # Show logout button if authenticated
     if is_customer_authenticated():
@@ -230,17 +198,8 @@ def display_settings_menu():
     st.session_state.settings_page = page_mapping[selected]
     
     # Display selected settings page
-    settings_pages = {
-        'business': business_settings_page,
-        'services': services_settings_page,
-        'employees': employees_settings_page,
-        'accounts': accounts_settings_page,
-        'communications': customer_communications_page,
-        'pricing': pricing_settings_page
-    }
-    
-    if st.session_state.settings_page in settings_pages:
-        settings_pages[st.session_state.settings_page]()
+    if st.session_state.settings_page in SETTINGS_PAGES:
+        SETTINGS_PAGES[st.session_state.settings_page]()
 
 def display_business_portal():
     """Display business portal interface"""
@@ -268,16 +227,8 @@ def display_business_portal():
             # Main content based on current page
             current_page = st.session_state.get('page')
             
-            # Map pages to their corresponding functions
-            pages = {
-                'new_service': new_service_page,
-                'scheduled_services': scheduled_services_page,
-                'completed_services': completed_services_page,
-                'transaction_details': transaction_details_page
-            }
-            
-            if current_page in pages:
-                pages[current_page]()
+            if current_page in BUSINESS_PAGES:
+                BUSINESS_PAGES[current_page]()
             else:
                 display_main_menu()
         
@@ -285,25 +236,19 @@ def display_business_portal():
         st.markdown("---")
         if st.button("Logout", key="business_logout"):
             if 'business_session_id' in st.session_state:
+                business_sessions.invalidate(st.session_state['business_session_id'])
                 del st.session_state['business_session_id']
             st.session_state.page = 'login'
             st.rerun()
     else:
         # Show login if not authenticated
-        unified_login_page()
+        AUTH_PAGES['login']()
 
 def main():
+    begin_rerun()
     initialize_session_state()
     load_css()
     
-    # Define auth pages
-    auth_pages = {
-        'login': unified_login_page,
-        'business_register': business_register_page,
-        'register': register_customer_page,
-        'reset': unified_reset_page
-    }
-    
     current_page = st.session_state.get('page', 'login')
     
     if st.secrets.get("environment") == "development":
@@ -312,9 +257,9 @@ def main():
         st.sidebar.write(f"🔍 Debug: Business session: {'Yes' if 'business_session_id' in st.session_state else 'No'}")
     
     # Route to appropriate page
-    if current_page in auth_pages:
+    if current_page in AUTH_PAGES:
         # Handle authentication pages
-        auth_pages[current_page]()
+        AUTH_PAGES[current_page]()
     elif 'business_session_id' in st.session_state:
         # Handle business portal
         display_business_portal()
@@ -323,7 +268,10 @@ def main():
         display_customer_portal()
     else:
         # Default to login page
-        unified_login_page()
+        AUTH_PAGES['login']()
+    
+    display_query_debug_panel()
+    report_startup(time.perf_counter() - _script_started)
 
 if __name__ == "__main__":
     main()
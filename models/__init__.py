@@ -12,7 +12,7 @@ from .service import (
     get_service_id_by_name
 )
 from .employee import EmployeeModel, fetch_all_employees, save_employee, assign_employee_to_service
-from .transaction import TransactionModel
+from .transaction import TransactionModel, TransactionEdit
 
 __all__ = [
     # Models
@@ -20,6 +20,7 @@ __all__ = [
     'ServiceModel',
     'EmployeeModel',
     'TransactionModel',
+    'TransactionEdit',
     
     # Customer functions
     'fetch_all_customers',
@@ -5,6 +5,8 @@ import pandas as pd
 import streamlit as st
 from datetime import datetime
 from database.connection import SnowflakeConnection
+from models.service_address import refresh_primary_service_address
+from utils.search_index import TableSearch
 
 @dataclass
 class AccountModel:
@@ -276,29 +278,57 @@ def fetch_all_accounts() -> pd.DataFrame:
         return df
     return pd.DataFrame()
 
-def search_accounts(search_term: str) -> pd.DataFrame:
-    """Search accounts by name, email, phone, or contact person."""
-    query = """
+ACCOUNT_SEARCH_LIMIT = 50
+
+def _load_account_search_rows(snowflake_conn: Any,
+                              since: Optional[datetime],
+                              after_id: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+    """Accounts for the search index: active ones on a full load, every changed one after the watermark"""
+    condition = "WHERE ACTIVE_FLAG = TRUE"
+    params = None
+    if since is not None:
+        # Deactivated accounts come back too, so the index can drop them
+        condition = "WHERE LAST_MODIFIED_DATE >= ? OR ACCOUNT_ID > ?"
+        params = [since, after_id]
+    query = f"""
     SELECT 
         ACCOUNT_ID, ACCOUNT_NAME, ACCOUNT_TYPE, ACCOUNT_DESCRIPTION,
         CONTACT_PERSON, CONTACT_EMAIL, CONTACT_PHONE,
         BILLING_ADDRESS, CITY, STATE, ZIP_CODE, BILLING_DATE,
-        ACTIVE_FLAG
+        ACTIVE_FLAG,
+        LAST_MODIFIED_DATE as CHANGED_AT
     FROM OPERATIONAL.CARPET.ACCOUNTS
-    WHERE ACTIVE_FLAG = TRUE
-    AND (
-        LOWER(ACCOUNT_NAME) LIKE LOWER(:1)
-        OR LOWER(CONTACT_EMAIL) LIKE LOWER(:2)
-        OR CONTACT_PHONE LIKE :3
-        OR LOWER(CONTACT_PERSON) LIKE LOWER(:4)
-    )
-    ORDER BY ACCOUNT_NAME
+    {condition}
+    """
+    return snowflake_conn.execute_query(query, params, error_msg="Error loading account search index", cache=False)
+
+# Process-wide type-ahead index over account names, contacts, emails and phone digits
+_account_search = TableSearch(
+    key_column='ACCOUNT_ID',
+    fields=[
+        ('ACCOUNT_NAME', 'text', 3.0),
+        ('CONTACT_PERSON', 'text', 2.0),
+        ('CONTACT_EMAIL', 'text', 2.0),
+        ('CONTACT_PHONE', 'digits', 2.0)
+    ],
+    load_rows=_load_account_search_rows,
+    tables=frozenset({'ACCOUNTS'}),
+    keep=lambda row: bool(row.get('ACTIVE_FLAG'))
+)
+
+def search_accounts(search_term: str, limit: int = ACCOUNT_SEARCH_LIMIT) -> pd.DataFrame:
+    """
+    Search active accounts by name, email, phone, or contact person.
+    
+    Args:
+        search_term: Part of the account name, contact person, email, or phone number
+        limit: Maximum accounts to return
+        
+    Returns:
+        pd.DataFrame: Matching accounts, best matches first, with an ACCOUNT_DETAILS label
     """
     snowflake_conn = SnowflakeConnection.get_instance()
-    search_pattern = f"%{search_term}%"
-    result = snowflake_conn.execute_query(query, [
-        search_pattern, search_pattern, search_pattern, search_pattern
-    ])
+    result = _account_search.search(snowflake_conn, search_term, limit)
     
     if result:
         df = pd.DataFrame(result)
@@ -381,6 +411,7 @@ def save_account_service_address(account_id: int, data: Dict[str, Any], is_prima
             try:
                 snowflake_conn.execute_query(query, params)
                 print(f"DEBUG: Address update successful")
+                refresh_primary_service_address(snowflake_conn, account_id=account_id)
                 return address_id
             except Exception as e:
                 print(f"DEBUG: Error updating service address: {str(e)}")
@@ -423,6 +454,7 @@ def save_account_service_address(account_id: int, data: Dict[str, Any], is_prima
                 if result and len(result) > 0:
                     address_id = result[0]['ADDRESS_ID']
                     print(f"DEBUG: New service address created with ID: {address_id}")
+                    refresh_primary_service_address(snowflake_conn, account_id=account_id)
                     return address_id
                 else:
                     print("DEBUG: Insert did not return an ADDRESS_ID")
@@ -1,9 +1,12 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from datetime import datetime
 from dataclasses import dataclass
 import pandas as pd
 import streamlit as st
 from database.connection import SnowflakeConnection
 from utils.validation import sanitize_zip_code
+from models.service_address import refresh_primary_service_address
+from utils.search_index import TableSearch
 
 @dataclass
 class CustomerModel:
@@ -161,9 +164,8 @@ def fetch_all_customers():
     """
     try:
         snowflake_conn = SnowflakeConnection.get_instance()
-        result = snowflake_conn.execute_query(query)
-        if result:
-            df = pd.DataFrame(result)
+        df = snowflake_conn.execute_query_df(query)
+        if df is not None and not df.empty:
             df['FULL_NAME'] = df['FIRST_NAME'] + ' ' + df['LAST_NAME']
             
             # Fill any missing service address fields with billing address fields
@@ -191,43 +193,23 @@ def save_service_address(snowflake_conn: Any, customer_id: int, data: Dict[str,
             st.error("Invalid service address ZIP code format. Please enter a 5-digit number.")
             return None
 
-        query = """
-        INSERT INTO OPERATIONAL.CARPET.SERVICE_ADDRESSES (
-            CUSTOMER_ID,
-            STREET_ADDRESS,
-            CITY,
-            STATE,
-            ZIP_CODE,
-            SQUARE_FOOTAGE,
-            IS_PRIMARY_SERVICE
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        params = [
-            customer_id,
-            str(data.get('service_address', '')).strip(),
-            str(data.get('service_city', '')).strip(),
-            str(data.get('service_state', '')).strip(),
-            service_zip,
-            int(data.get('service_addr_sq_ft', 0)),
-            is_primary
-        ]
-
-        snowflake_conn.execute_query(query, params)
-        
-        # Get the newly created address ID
-        result = snowflake_conn.execute_query(
-            """
-            SELECT ADDRESS_ID 
-            FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES 
-            WHERE CUSTOMER_ID = ? 
-            ORDER BY ADDRESS_ID DESC 
-            LIMIT 1
-            """,
-            [customer_id]
+        address_id = snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.SERVICE_ADDRESSES",
+            {
+                'CUSTOMER_ID': customer_id,
+                'STREET_ADDRESS': str(data.get('service_address', '')).strip(),
+                'CITY': str(data.get('service_city', '')).strip(),
+                'STATE': str(data.get('service_state', '')).strip(),
+                'ZIP_CODE': service_zip,
+                'SQUARE_FOOTAGE': int(data.get('service_addr_sq_ft', 0)),
+                'IS_PRIMARY_SERVICE': is_primary
+            },
+            id_column="ADDRESS_ID",
+            error_msg="Error saving service address"
         )
-        
-        return result[0]['ADDRESS_ID'] if result else None
+        if address_id:
+            refresh_primary_service_address(snowflake_conn, customer_id=customer_id)
+        return address_id
 
     except Exception as e:
         st.error(f"Error saving service address: {str(e)}")
@@ -302,55 +284,25 @@ def save_customer(data: Dict[str, Any], customer_id: Optional[int] = None) -> Op
             saved_customer_id = customer_id
         else:
             # Insert new customer
-            query = """
-            INSERT INTO OPERATIONAL.CARPET.CUSTOMER (
-                FIRST_NAME,
-                LAST_NAME,
-                BILLING_ADDRESS,
-                CITY,
-                STATE,
-                BILLING_ZIP,
-                EMAIL_ADDRESS,
-                PHONE_NUMBER,
-                TEXT_FLAG,
-                COMMENTS,
-                PRIMARY_CONTACT_METHOD,
-                MEMBER_FLAG
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            params = [
-                clean_data['first_name'],
-                clean_data['last_name'],
-                clean_data['billing_address'],
-                clean_data['city'],
-                clean_data['state'],
-                clean_data['billing_zip'],
-                clean_data['email_address'],
-                clean_data['phone_number'],
-                clean_data['text_flag'],
-                clean_data['comments'],
-                clean_data['primary_contact_method'],
-                clean_data['member_flag']
-            ]
-
-            # Execute insert
-            snowflake_conn.execute_query(query, params)
-
-            # Get the newly created customer ID
-            result = snowflake_conn.execute_query(
-                """
-                SELECT CUSTOMER_ID 
-                FROM OPERATIONAL.CARPET.CUSTOMER 
-                WHERE FIRST_NAME = ? 
-                AND LAST_NAME = ? 
-                AND PHONE_NUMBER = ?
-                ORDER BY ADDRESS_ID DESC 
-                LIMIT 1
-                """,
-                [clean_data['first_name'], clean_data['last_name'], clean_data['phone_number']]
+            saved_customer_id = snowflake_conn.insert_returning_id(
+                "OPERATIONAL.CARPET.CUSTOMER",
+                {
+                    'FIRST_NAME': clean_data['first_name'],
+                    'LAST_NAME': clean_data['last_name'],
+                    'BILLING_ADDRESS': clean_data['billing_address'],
+                    'CITY': clean_data['city'],
+                    'STATE': clean_data['state'],
+                    'BILLING_ZIP': clean_data['billing_zip'],
+                    'EMAIL_ADDRESS': clean_data['email_address'],
+                    'PHONE_NUMBER': clean_data['phone_number'],
+                    'TEXT_FLAG': clean_data['text_flag'],
+                    'COMMENTS': clean_data['comments'],
+                    'PRIMARY_CONTACT_METHOD': clean_data['primary_contact_method'],
+                    'MEMBER_FLAG': clean_data['member_flag']
+                },
+                id_column="CUSTOMER_ID",
+                error_msg="Error saving customer"
             )
-            
-            saved_customer_id = result[0]['CUSTOMER_ID'] if result else None
 
         # If customer was saved successfully, save the service address
         if saved_customer_id:
@@ -379,13 +331,23 @@ def save_customer(data: Dict[str, Any], customer_id: Optional[int] = None) -> Op
             st.error(f"Traceback: {traceback.format_exc()}")
         return None
 
-def search_customers(search_term: str) -> pd.DataFrame:
-    """Search customers by name, phone, or email"""
-    query = """
+CUSTOMER_SEARCH_LIMIT = 50
+
+def _load_customer_search_rows(snowflake_conn: Any,
+                               since: Optional[datetime],
+                               after_id: Optional[int]) -> Optional[List[Dict[str, Any]]]:
+    """Customers with their primary service address: all of them, or those changed since the watermark"""
+    changed = ""
+    params = None
+    if since is not None:
+        changed = "WHERE C.LAST_UPDATED_AT >= ? OR PSA.REFRESHED_AT >= ? OR C.CUSTOMER_ID > ?"
+        params = [since, since, after_id]
+    query = f"""
     SELECT 
         C.CUSTOMER_ID, 
         C.FIRST_NAME, 
         C.LAST_NAME,
+        C.FIRST_NAME || ' ' || C.LAST_NAME as FULL_NAME,
         C.PHONE_NUMBER, 
         C.EMAIL_ADDRESS,
         C.PRIMARY_CONTACT_METHOD,
@@ -394,33 +356,51 @@ def search_customers(search_term: str) -> pd.DataFrame:
         C.BILLING_STATE, 
         C.BILLING_ZIP,
         -- Get primary service address if available
-        SA.STREET_ADDRESS as PRIMARY_STREET,
-        SA.CITY as PRIMARY_CITY,
-        SA.STATE as PRIMARY_STATE,
-        SA.ZIP_CODE as PRIMARY_ZIP,
+        PSA.STREET_ADDRESS as PRIMARY_STREET,
+        PSA.CITY as PRIMARY_CITY,
+        PSA.STATE as PRIMARY_STATE,
+        PSA.ZIP_CODE as PRIMARY_ZIP,
         -- For service address, use the same for now (can be updated later)
-        SA.STREET_ADDRESS as SERVICE_STREET,
-        SA.CITY as SERVICE_CITY,
-        SA.STATE as SERVICE_STATE,
-        SA.ZIP_CODE as SERVICE_ZIP
+        PSA.STREET_ADDRESS as SERVICE_STREET,
+        PSA.CITY as SERVICE_CITY,
+        PSA.STATE as SERVICE_STATE,
+        PSA.ZIP_CODE as SERVICE_ZIP,
+        GREATEST(
+            COALESCE(C.LAST_UPDATED_AT, CAST('1970-01-01' AS TIMESTAMP)),
+            COALESCE(PSA.REFRESHED_AT, CAST('1970-01-01' AS TIMESTAMP))
+        ) as CHANGED_AT
     FROM OPERATIONAL.CARPET.CUSTOMER C
-    LEFT JOIN OPERATIONAL.CARPET.SERVICE_ADDRESSES SA 
-        ON C.CUSTOMER_ID = SA.CUSTOMER_ID
-        AND (SA.IS_PRIMARY_SERVICE = TRUE OR SA.IS_PRIMARY_SERVICE IS NULL)
-    WHERE 
-        LOWER(C.FIRST_NAME || ' ' || C.LAST_NAME) LIKE LOWER(:1)
-        OR C.PHONE_NUMBER LIKE :2
-        OR LOWER(C.EMAIL_ADDRESS) LIKE LOWER(:3)
+    LEFT JOIN OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES PSA ON C.CUSTOMER_ID = PSA.CUSTOMER_ID
+    {changed}
     """
+    return snowflake_conn.execute_query(query, params, error_msg="Error loading customer search index", cache=False)
+
+# Process-wide type-ahead index over customer names, phone digits and emails
+_customer_search = TableSearch(
+    key_column='CUSTOMER_ID',
+    fields=[
+        ('FULL_NAME', 'text', 3.0),
+        ('PHONE_NUMBER', 'digits', 2.0),
+        ('EMAIL_ADDRESS', 'text', 2.0)
+    ],
+    load_rows=_load_customer_search_rows,
+    tables=frozenset({'CUSTOMER', 'PRIMARY_SERVICE_ADDRESSES'})
+)
+
+def search_customers(search_term: str, limit: int = CUSTOMER_SEARCH_LIMIT) -> pd.DataFrame:
+    """
+    Search customers by name, phone, or email
     
+    Args:
+        search_term: Part of the full name, email, or phone number (any formatting)
+        limit: Maximum customers to return
+        
+    Returns:
+        pd.DataFrame: Matching customers with their primary service address, best matches first
+    """
     snowflake_conn = SnowflakeConnection.get_instance()
-    search_pattern = f"%{search_term}%"
-    result = snowflake_conn.execute_query(query, [
-        search_pattern, search_pattern, search_pattern
-    ])
+    result = _customer_search.search(snowflake_conn, search_term, limit)
     
     if result:
-        df = pd.DataFrame(result)
-        df['FULL_NAME'] = df['FIRST_NAME'] + " " + df['LAST_NAME']
-        return df
-    return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame(result)
+    return pd.DataFrame()
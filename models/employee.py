@@ -2,7 +2,7 @@ from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 import streamlit as st
 import pandas as pd
-from database.connection import SnowflakeConnection
+from database.connection import SnowflakeConnection, snowflake_conn
 
 @dataclass
 class EmployeeModel:
@@ -40,8 +40,6 @@ class EmployeeModel:
             status=data.get('STATUS', 'Active')
         )
 
-# Get database connection
-snowflake_conn = SnowflakeConnection.get_instance()
 
 def fetch_employee(employee_id: int) -> Optional[EmployeeModel]:
     """Fetch employee details by ID"""
@@ -108,39 +106,19 @@ def get_employee_rate(employee_name):
 def save_employee(data: Dict[str, Any]) -> Optional[int]:
     """Save new employee or update existing"""
     try:
-        query = """
-        INSERT INTO OPERATIONAL.CARPET.EMPLOYEE (
-            FIRST_NAME, LAST_NAME, PHONE_NUMBER,
-            EMAIL_ADDRESS, ROLE, STATUS
-        ) VALUES (
-            :1, :2, :3, :4, :5, :6
+        return snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.EMPLOYEE",
+            {
+                'FIRST_NAME': data['first_name'],
+                'LAST_NAME': data['last_name'],
+                'PHONE_NUMBER': data['phone'],
+                'EMAIL_ADDRESS': data.get('email'),
+                'ROLE': data.get('role', 'Technician'),
+                'STATUS': data.get('status', 'Active')
+            },
+            id_column="EMPLOYEE_ID",
+            error_msg="Error saving employee"
         )
-        """
-        params = [
-            data['first_name'],
-            data['last_name'],
-            data['phone'],
-            data.get('email'),
-            data.get('role', 'Technician'),
-            data.get('status', 'Active')
-        ]
-        
-        snowflake_conn.execute_query(query, params)
-        
-        # Get the newly created employee ID
-        result = snowflake_conn.execute_query(
-            """
-            SELECT EMPLOYEE_ID 
-            FROM OPERATIONAL.CARPET.EMPLOYEE 
-            WHERE FIRST_NAME = :1 
-            AND LAST_NAME = :2 
-            ORDER BY EMPLOYEE_ID DESC 
-            LIMIT 1
-            """,
-            [data['first_name'], data['last_name']]
-        )
-        
-        return result[0]['EMPLOYEE_ID'] if result else None
         
     except Exception as e:
         st.error(f"Error saving employee: {str(e)}")
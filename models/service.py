@@ -1,4 +1,5 @@
-from database.connection import SnowflakeConnection
+from database.connection import snowflake_conn
+from database.ids import sequence_for
 from typing import Optional, Dict, Any, List, Union, Tuple
 from dataclasses import dataclass
 from datetime import datetime, date, time, timedelta
@@ -7,6 +8,8 @@ import pandas as pd
 import json
 from utils.business.info import fetch_business_info
 from utils.email import generate_service_scheduled_email
+from utils.service_utils import get_service_by_name
+from models.transaction_view import load_transaction_view
 from utils.null_handling import (
     safe_get_value,
     safe_get_float,
@@ -15,8 +18,6 @@ from utils.null_handling import (
     safe_get_bool
 )
 
-# Initialize database connection
-snowflake_conn = SnowflakeConnection.get_instance()
 
 def debug_print(msg: str) -> None:
     """Helper function for debug logging with defensive access to debug_mode."""
@@ -110,8 +111,8 @@ def fetch_customer_services(customer_id: int) -> pd.DataFrame:
     ORDER BY ST.SERVICE_DATE DESC, ST.START_TIME ASC
     """
     try:
-        result = snowflake_conn.execute_query(query, [customer_id])
-        return pd.DataFrame(result) if result else pd.DataFrame()
+        result = snowflake_conn.execute_query_df(query, [customer_id])
+        return result if result is not None else pd.DataFrame()
     except Exception as e:
         st.error(f"Error fetching customer services: {str(e)}")
         return pd.DataFrame()
@@ -125,7 +126,10 @@ def update_service_status(service_id: int, status: str) -> bool:
             LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()
         WHERE ID = ?
         """
-        snowflake_conn.execute_query(query, [status, service_id])
+        from utils.double_booking_prevention import booking_changes
+        with booking_changes() as changes:
+            if snowflake_conn.execute_query(query, [status, service_id]) is not None:
+                changes.status_changed(service_id, status)
         return True
     except Exception as e:
         st.error(f"Error updating service status: {str(e)}")
@@ -133,17 +137,8 @@ def update_service_status(service_id: int, status: str) -> bool:
 
 def get_service_id_by_name(service_name: str) -> Optional[int]:
     """Get service ID from service name"""
-    query = """
-    SELECT SERVICE_ID 
-    FROM OPERATIONAL.CARPET.SERVICES 
-    WHERE SERVICE_NAME = ?
-    """
-    try:
-        result = snowflake_conn.execute_query(query, [service_name])
-        return result[0]['SERVICE_ID'] if result else None
-    except Exception as e:
-        st.error(f"Error getting service ID: {str(e)}")
-        return None
+    service = get_service_by_name(service_name)
+    return service['SERVICE_ID'] if service else None
 
 def fetch_upcoming_services(start_date: date, end_date: date) -> pd.DataFrame:
     """Fetch upcoming services scheduled between the specified dates"""
@@ -177,11 +172,11 @@ def fetch_upcoming_services(start_date: date, end_date: date) -> pd.DataFrame:
     """
 
     try:
-        results = snowflake_conn.execute_query(query, [
+        results = snowflake_conn.execute_query_df(query, [
             start_date.strftime('%Y-%m-%d'), 
             end_date.strftime('%Y-%m-%d')
         ])
-        return pd.DataFrame(results) if results else pd.DataFrame()
+        return results if results is not None else pd.DataFrame()
     except Exception as e:
         st.error(f"Error fetching upcoming services: {str(e)}")
         return pd.DataFrame()
@@ -200,19 +195,7 @@ def save_service_schedule(
 ) -> bool:
     """Save service schedule and create initial transaction record with enhanced double booking prevention."""
     try:
-        # Final availability check before saving
-        from utils.double_booking_prevention import check_for_booking_conflicts
-        
         service_list = services if isinstance(services, list) else [services]
-        is_available, error_message, conflicts = check_for_booking_conflicts(
-            service_date=service_date,
-            service_time=service_time,
-            service_names=service_list
-        )
-        
-        if not is_available:
-            st.error(f"❌ Cannot schedule service: {error_message}")
-            return False
 
         # Get service IDs and calculate total cost
         service_ids = []
@@ -220,12 +203,10 @@ def save_service_schedule(
         base_cost = 0.0
         
         for service_name in service_list:
-            service_query = "SELECT SERVICE_ID, COST FROM OPERATIONAL.CARPET.SERVICES WHERE SERVICE_NAME = ?"
-            result = snowflake_conn.execute_query(service_query, [service_name])
-            if result:
-                # Convert numpy.int64 to Python int
-                service_ids.append(int(result[0]['SERVICE_ID']))
-                service_cost = float(result[0]['COST'])
+            service = get_service_by_name(service_name)
+            if service:
+                service_ids.append(service['SERVICE_ID'])
+                service_cost = service['COST']
                 total_cost += service_cost
                 if len(service_ids) == 1:  # Primary service cost
                     base_cost = service_cost
@@ -255,72 +236,45 @@ def save_service_schedule(
         safe_base_cost = float(base_cost)
         safe_total_cost = float(total_cost)
 
-        # Create initial service transaction record
-        query = """
-        INSERT INTO OPERATIONAL.CARPET.SERVICE_TRANSACTION (
-            CUSTOMER_ID,
-            ACCOUNT_ID,
-            ADDRESS_ID,
-            SERVICE_NAME,
-            SERVICE_ID,
-            SERVICE2_ID,
-            SERVICE3_ID,
-            SERVICE_DATE,
-            START_TIME,
-            IS_RECURRING,
-            RECURRENCE_PATTERN,
-            COMMENTS,
-            DEPOSIT,
-            DEPOSIT_PAID,
-            BASE_SERVICE_COST,
-            AMOUNT,
-            STATUS
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, FALSE, ?, ?, 'SCHEDULED')
-        """
-        
         # Get address ID from customer data if available
         address_id = None
         if customer_data and 'service_address_id' in customer_data:
             address_id = customer_data['service_address_id']
         
-        params = [
-            safe_customer_id,
-            safe_account_id,
-            address_id,
-            service_list[0],  # Primary service name
-            int(service_ids[0]),   # Primary service ID
-            service2_id,
-            service3_id,
-            service_date,
-            service_time,
-            is_recurring,
-            recurrence_pattern if is_recurring else None,
-            notes,
-            safe_deposit,
-            safe_base_cost,
-            safe_total_cost
-        ]
+        # Create initial service transaction record
+        values = {
+            'CUSTOMER_ID': safe_customer_id,
+            'ACCOUNT_ID': safe_account_id,
+            'ADDRESS_ID': address_id,
+            'SERVICE_NAME': service_list[0],  # Primary service name
+            'SERVICE_ID': int(service_ids[0]),  # Primary service ID
+            'SERVICE2_ID': service2_id,
+            'SERVICE3_ID': service3_id,
+            'SERVICE_DATE': service_date,
+            'START_TIME': service_time,
+            'IS_RECURRING': is_recurring,
+            'RECURRENCE_PATTERN': recurrence_pattern if is_recurring else None,
+            'COMMENTS': notes,
+            'DEPOSIT': safe_deposit,
+            'DEPOSIT_PAID': False,
+            'BASE_SERVICE_COST': safe_base_cost,
+            'AMOUNT': safe_total_cost,
+            'STATUS': 'SCHEDULED'
+        }
 
         # Debug logging for params
         if st.session_state.get('debug_mode'):
             debug_print("Query parameters:")
-            for i, param in enumerate(params):
-                debug_print(f"Param {i}: {param} (type: {type(param)})")
+            for column, value in values.items():
+                debug_print(f"{column}: {value} (type: {type(value)})")
         
-        # Execute transaction insert
-        snowflake_conn.execute_query(query, params)
-        
-        # Get the newly created transaction ID
-        transaction_id_query = """
-        SELECT ID FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION 
-        WHERE CUSTOMER_ID = ? AND SERVICE_DATE = ? AND START_TIME = ?
-        ORDER BY ID DESC 
-        LIMIT 1
-        """
-        transaction_result = snowflake_conn.execute_query(transaction_id_query, [
-            safe_customer_id, service_date, service_time
-        ])
-        transaction_id = transaction_result[0]['ID'] if transaction_result else None
+        # Check for conflicts and insert in one transaction so a concurrent booking cannot take the slot
+        from utils.double_booking_prevention import book_service_slot
+        transaction_id, error_message, conflicts = book_service_slot(values, service_list)
+        if transaction_id is None:
+            if error_message:
+                st.error(f"❌ Cannot schedule service: {error_message}")
+            return False
 
         # Schedule recurring services if needed
         if is_recurring and recurrence_pattern:
@@ -348,7 +302,8 @@ def save_service_schedule(
                 customer_id=safe_customer_id,
                 account_id=safe_account_id,
                 recurrence_pattern=recurrence_pattern,
-                notes=notes
+                notes=notes,
+                address_id=address_id
             )
 
         # Handle email confirmation
@@ -434,9 +389,10 @@ def schedule_recurring_services(
     recurrence_pattern: str,
     customer_id: Optional[int] = None,
     account_id: Optional[int] = None,
-    notes: Optional[str] = None
+    notes: Optional[str] = None,
+    address_id: Optional[int] = None
 ) -> bool:
-    """Schedule recurring services for up to one year."""
+    """Schedule recurring services for up to six months with a single bulk insert."""
     try:
         if not customer_id and not account_id:
             raise ValueError("Either customer_id or account_id must be provided")
@@ -450,12 +406,10 @@ def schedule_recurring_services(
         base_cost = 0.0
         
         for service_name in service_list:
-            service_query = "SELECT SERVICE_ID, COST FROM OPERATIONAL.CARPET.SERVICES WHERE SERVICE_NAME = ?"
-            result = snowflake_conn.execute_query(service_query, [service_name])
-            if result:
-                # Convert numpy.int64 to Python int
-                service_ids.append(int(result[0]['SERVICE_ID']))
-                service_cost = float(result[0]['COST'])
+            service = get_service_by_name(service_name)
+            if service:
+                service_ids.append(service['SERVICE_ID'])
+                service_cost = service['COST']
                 total_cost += service_cost
                 if len(service_ids) == 1:  # Primary service cost
                     base_cost = service_cost
@@ -502,65 +456,45 @@ def schedule_recurring_services(
             if current_date < six_months_from_now:
                 future_dates.append(current_date)
 
-        # Create transaction records directly for each future date
+        # Load bookings for every future date at once and check conflicts in memory
+        from utils.double_booking_prevention import load_availability_for_dates
+        availability_by_date = load_availability_for_dates(future_dates, service_list)
+
+        # Skip dates that conflict with existing bookings
+        available_dates = []
         for future_date in future_dates:
-            # Check availability for this specific date before creating record
-            from utils.double_booking_prevention import check_for_booking_conflicts
-            
-            is_available, _, _ = check_for_booking_conflicts(
-                service_date=future_date,
-                service_time=service_time,
-                service_names=service_list
-            )
-            
-            # Skip this date if there's a conflict
-            if not is_available:
+            if not availability_by_date[future_date].is_available(service_time):
                 debug_print(f"Skipping recurring service on {future_date} due to conflict")
                 continue
-            
-            # Create recurring service transaction record directly
-            query = """
-            INSERT INTO OPERATIONAL.CARPET.SERVICE_TRANSACTION (
-                CUSTOMER_ID,
-                ACCOUNT_ID,
-                ADDRESS_ID,
-                SERVICE_NAME,
-                SERVICE_ID,
-                SERVICE2_ID,
-                SERVICE3_ID,
-                SERVICE_DATE,
-                START_TIME,
-                IS_RECURRING,
-                RECURRENCE_PATTERN,
-                COMMENTS,
-                DEPOSIT,
-                DEPOSIT_PAID,
-                BASE_SERVICE_COST,
-                AMOUNT,
-                STATUS
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, FALSE, ?, ?, 'SCHEDULED')
-            """
-            
-            params = [
-                safe_customer_id,
-                safe_account_id,
-                address_id,  # Use the same address_id from the initial service
-                service_list[0],  # Primary service name
-                int(service_ids[0]),   # Primary service ID
-                service2_id,
-                service3_id,
-                future_date,  # Use the future date
-                service_time,
-                True,
-                recurrence_pattern,
-                notes,
-                0.0,  # No deposit for recurring services
-                base_cost,
-                total_cost
-            ]
-            
-            # Execute transaction insert
-            snowflake_conn.execute_query(query, params)
+            available_dates.append(future_date)
+
+        if not available_dates:
+            return True
+
+        # Create all recurring transaction records in one statement
+        transaction_ids = insert_recurring_series(
+            base_values={
+                'CUSTOMER_ID': safe_customer_id,
+                'ACCOUNT_ID': safe_account_id,
+                'ADDRESS_ID': address_id,  # Use the same address_id from the initial service
+                'SERVICE_NAME': service_list[0],  # Primary service name
+                'SERVICE_ID': int(service_ids[0]),  # Primary service ID
+                'SERVICE2_ID': service2_id,
+                'SERVICE3_ID': service3_id,
+                'START_TIME': service_time,
+                'IS_RECURRING': True,
+                'RECURRENCE_PATTERN': recurrence_pattern,
+                'COMMENTS': notes,
+                'DEPOSIT': 0.0,  # No deposit for recurring services
+                'DEPOSIT_PAID': False,
+                'BASE_SERVICE_COST': base_cost,
+                'AMOUNT': total_cost,
+                'STATUS': 'SCHEDULED'
+            },
+            service_dates=available_dates
+        )
+        if transaction_ids is None:
+            return False
 
         return True
 
@@ -570,6 +504,67 @@ def schedule_recurring_services(
         print(traceback.format_exc())
         return False
 
+def insert_recurring_series(
+    base_values: Dict[str, Any],
+    service_dates: List[date],
+    date_columns: Tuple[str, ...] = ('SERVICE_DATE',)
+) -> Optional[List[int]]:
+    """
+    Insert one SERVICE_TRANSACTION row per date with a single multi-row INSERT.
+    
+    Each row's ID is reserved from the table's sequence before the insert and
+    written explicitly, so the IDs returned are exactly the rows written and
+    the whole series is one statement.
+    
+    Args:
+        base_values: Column values shared by every row in the series
+        service_dates: Dates to create rows for
+        date_columns: Columns that receive the occurrence date
+        
+    Returns:
+        Optional[List[int]]: New transaction IDs in date order, or None on failure.
+            Empty when the table has no ID sequence yet (database_fixes.sql
+            Fix 3): the rows are still written, with IDs from the column default.
+    """
+    if not service_dates:
+        return []
+
+    sequence = sequence_for('OPERATIONAL.CARPET.SERVICE_TRANSACTION', 'ID')
+    transaction_ids = []
+    for _ in service_dates:
+        new_id = snowflake_conn.ids.next_id(sequence)
+        if new_id is None:
+            transaction_ids = []
+            break
+        transaction_ids.append(new_id)
+
+    columns = list(base_values.keys()) + [col for col in date_columns if col not in base_values]
+    if transaction_ids:
+        columns = ['ID'] + [col for col in columns if col != 'ID']
+    row_placeholders = "(" + ", ".join(["?"] * len(columns)) + ")"
+
+    insert_params = []
+    for index, service_date in enumerate(service_dates):
+        row = dict(base_values)
+        for col in date_columns:
+            row[col] = service_date
+        if transaction_ids:
+            row['ID'] = transaction_ids[index]
+        insert_params.extend(row[col] for col in columns)
+
+    insert_query = f"""
+    INSERT INTO OPERATIONAL.CARPET.SERVICE_TRANSACTION (
+        {', '.join(columns)}
+    ) VALUES {', '.join([row_placeholders] * len(service_dates))}
+    """
+
+    result = snowflake_conn.execute_query(
+        insert_query, insert_params, error_msg="Error saving recurring services"
+    )
+    if result is None:
+        return None
+    return transaction_ids
+
 def get_available_time_slots(selected_date: date, selected_services: List[str] = None) -> List[time]:
     """Get available time slots for a given date and selected services using enhanced double booking prevention"""
     from utils.double_booking_prevention import get_available_time_slots_enhanced
@@ -587,101 +582,42 @@ def get_transaction_service_details(transaction_id: int) -> Tuple[Dict[str, Any]
     """
     Get service details for a transaction including any additional services.
     
+    Built from the transaction's cached TransactionView, so it shares the
+    details page's load instead of joining SERVICES again.
+    
     Args:
         transaction_id: ID of the transaction
         
     Returns:
         Tuple[Dict, List[Dict]]: Primary service details and list of additional services
     """
-    query = """
-    SELECT 
-        t.ID as TRANSACTION_ID,
-        t.SERVICE_ID,
-        t.SERVICE_NAME as PRIMARY_SERVICE_NAME,
-        COALESCE(t.BASE_SERVICE_COST, 0) as PRIMARY_COST,
-        COALESCE(s1.SERVICE_DURATION, 60) as PRIMARY_DURATION,
-        NULLIF(t.SERVICE2_ID, 0) as SERVICE2_ID,
-        NULLIF(t.SERVICE3_ID, 0) as SERVICE3_ID,
-        CASE 
-            WHEN t.SERVICE2_ID IS NOT NULL AND t.SERVICE2_ID != 0 
-            THEN s2.SERVICE_NAME 
-            ELSE NULL 
-        END as SERVICE2_NAME,
-        CASE 
-            WHEN t.SERVICE3_ID IS NOT NULL AND t.SERVICE3_ID != 0 
-            THEN s3.SERVICE_NAME 
-            ELSE NULL 
-        END as SERVICE3_NAME,
-        CASE 
-            WHEN t.SERVICE2_ID IS NOT NULL AND t.SERVICE2_ID != 0 
-            THEN COALESCE(s2.COST, 0) 
-            ELSE 0 
-        END as SERVICE2_COST,
-        CASE 
-            WHEN t.SERVICE3_ID IS NOT NULL AND t.SERVICE3_ID != 0 
-            THEN COALESCE(s3.COST, 0) 
-            ELSE 0 
-        END as SERVICE3_COST,
-        CASE 
-            WHEN t.SERVICE2_ID IS NOT NULL AND t.SERVICE2_ID != 0 
-            THEN COALESCE(s2.SERVICE_DURATION, 60)
-            ELSE NULL 
-        END as SERVICE2_DURATION,
-        CASE 
-            WHEN t.SERVICE3_ID IS NOT NULL AND t.SERVICE3_ID != 0 
-            THEN COALESCE(s3.SERVICE_DURATION, 60)
-            ELSE NULL 
-        END as SERVICE3_DURATION,
-        COALESCE(t.STATUS, 'PENDING') as STATUS,
-        t.COMMENTS
-    FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION t
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s1 ON t.SERVICE_ID = s1.SERVICE_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s2 ON t.SERVICE2_ID = s2.SERVICE_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s3 ON t.SERVICE3_ID = s3.SERVICE_ID
-    WHERE t.ID = :1
-    """
-    
     try:
-        result = snowflake_conn.execute_query(query, [transaction_id])
-        if not result:
+        view = load_transaction_view(transaction_id)
+        if view is None:
             print(f"No results found for transaction ID: {transaction_id}")
             return None, []
 
-        transaction = result[0]
+        transaction = view.transaction
+        primary = view.primary_service or {}
         
         # Primary service details with null handling
         primary_service = {
-            'id': safe_get_int(transaction['SERVICE_ID']),
+            'id': safe_get_int(transaction['PRIMARY_SERVICE_ID']),
             'name': safe_get_string(transaction['PRIMARY_SERVICE_NAME']),
-            'cost': safe_get_float(transaction['PRIMARY_COST']),
-            'duration': safe_get_int(transaction['PRIMARY_DURATION'], 60)
+            'cost': safe_get_float(transaction['BASE_SERVICE_COST']),
+            'duration': safe_get_int(primary.get('SERVICE_DURATION'), 60)
         }
         
-        # Additional services with null handling
+        # Additional services with null handling; only slots with a valid ID and name
         additional_services = []
-        
-        # Only add service2 if it exists and has a valid ID
-        service2_id = transaction.get('SERVICE2_ID')
-        if service2_id and service2_id != 0:
-            service2_name = safe_get_string(transaction['SERVICE2_NAME'])
-            if service2_name:  # Only add if we have a valid name
-                additional_services.append({
-                    'id': safe_get_int(service2_id),
-                    'name': service2_name,
-                    'cost': safe_get_float(transaction['SERVICE2_COST']),
-                    'duration': safe_get_int(transaction['SERVICE2_DURATION'], 60)
-                })
-        
-        # Only add service3 if it exists and has a valid ID
-        service3_id = transaction.get('SERVICE3_ID')
-        if service3_id and service3_id != 0:
-            service3_name = safe_get_string(transaction['SERVICE3_NAME'])
-            if service3_name:  # Only add if we have a valid name
+        for item in view.additional_services:
+            service_name = safe_get_string(item['SERVICE_NAME'])
+            if service_name:
                 additional_services.append({
-                    'id': safe_get_int(service3_id),
-                    'name': service3_name,
-                    'cost': safe_get_float(transaction['SERVICE3_COST']),
-                    'duration': safe_get_int(transaction['SERVICE3_DURATION'], 60)
+                    'id': safe_get_int(item['SERVICE_ID']),
+                    'name': service_name,
+                    'cost': safe_get_float(item['LIST_COST']),
+                    'duration': safe_get_int(item['SERVICE_DURATION'], 60)
                 })
 
         if not primary_service['name']:
@@ -719,6 +655,7 @@ __all__ = [
     "check_service_availability",
     "save_service_schedule",
     "schedule_recurring_services",
+    "insert_recurring_series",
     "fetch_customer_services",
     "update_service_status",
     "get_service_id_by_name"
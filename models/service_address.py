@@ -0,0 +1,106 @@
+# models/service_address.py
+"""
+Maintained lookup of each customer's and account's primary service address.
+
+PRIMARY_SERVICE_ADDRESSES holds one row per owner with a copy of the address
+that list and detail queries show: the address flagged IS_PRIMARY_SERVICE, or
+when none is flagged, the one with the highest ADDRESS_ID. SERVICE_ADDRESSES
+has no creation timestamp, and IDs are reserved in blocks per process (see
+database.ids), so that fallback is stable but not necessarily the newest row. Customer rows cover addresses with no
+ACCOUNT_ID; account rows cover the account's addresses. Every code path that
+saves a service address calls refresh_primary_service_address afterwards, so
+readers can equi-join on CUSTOMER_ID or ACCOUNT_ID instead of ranking the whole
+SERVICE_ADDRESSES table on every render. REFRESHED_AT lets the customer search
+index pick up address changes by watermark.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+PRIMARY_ADDRESS_TABLE = "OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES"
+
+_ADDRESS_COLUMNS = "ADDRESS_ID, STREET_ADDRESS, CITY, STATE, ZIP_CODE, SQUARE_FOOTAGE"
+
+# Flagged address first; the ADDRESS_ID tie-break is deterministic, not creation order
+_PRIMARY_FIRST = "CASE WHEN IS_PRIMARY_SERVICE = TRUE THEN 0 ELSE 1 END, ADDRESS_ID DESC"
+
+_OWNER_FILTERS = {
+    'CUSTOMER_ID': "CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NULL",
+    'ACCOUNT_ID': "ACCOUNT_ID IS NOT NULL"
+}
+
+def _owner_insert(owner_column: str, single_owner: bool) -> str:
+    """INSERT ... SELECT of the primary address for one owner, or for every owner of that kind"""
+    customer_value = "CUSTOMER_ID" if owner_column == 'CUSTOMER_ID' else "NULL"
+    account_value = "ACCOUNT_ID" if owner_column == 'ACCOUNT_ID' else "NULL"
+    owner_filter = _OWNER_FILTERS[owner_column]
+    if single_owner:
+        source = f"""
+        SELECT {customer_value}, {account_value}, {_ADDRESS_COLUMNS}, CURRENT_TIMESTAMP()
+        FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES
+        WHERE {owner_column} = ? AND {owner_filter}
+        ORDER BY {_PRIMARY_FIRST}
+        LIMIT 1"""
+    else:
+        source = f"""
+        SELECT {customer_value}, {account_value}, {_ADDRESS_COLUMNS}, CURRENT_TIMESTAMP()
+        FROM (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY {owner_column} ORDER BY {_PRIMARY_FIRST}) AS RN
+            FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES
+            WHERE {owner_filter}
+        ) RANKED
+        WHERE RN = 1"""
+    return f"""
+        INSERT INTO {PRIMARY_ADDRESS_TABLE} (CUSTOMER_ID, ACCOUNT_ID, {_ADDRESS_COLUMNS}, REFRESHED_AT)
+        {source}
+        """
+
+def refresh_primary_service_address(snowflake_conn: Any,
+                                    customer_id: Optional[int] = None,
+                                    account_id: Optional[int] = None) -> bool:
+    """
+    Recompute the primary address row of a customer and/or account after its addresses change
+
+    Args:
+        snowflake_conn: Database connection
+        customer_id: Customer whose addresses were saved
+        account_id: Account whose addresses were saved
+
+    Returns:
+        bool: True if the lookup was updated
+    """
+    statements: List[Tuple[str, Optional[List[Any]]]] = []
+    for owner_column, owner_id in (('CUSTOMER_ID', customer_id), ('ACCOUNT_ID', account_id)):
+        if owner_id is None:
+            continue
+        statements.append((
+            f"DELETE FROM {PRIMARY_ADDRESS_TABLE} WHERE {owner_column} = ?",
+            [int(owner_id)]
+        ))
+        statements.append((_owner_insert(owner_column, single_owner=True), [int(owner_id)]))
+    if not statements:
+        return False
+    return snowflake_conn.execute_transaction(
+        statements, error_msg="Error refreshing primary service address"
+    ) is not None
+
+def rebuild_primary_service_addresses(snowflake_conn: Any) -> bool:
+    """
+    Rebuild the whole lookup from SERVICE_ADDRESSES (backfill, or after bulk loads)
+
+    Args:
+        snowflake_conn: Database connection
+
+    Returns:
+        bool: True if the lookup was rebuilt
+    """
+    return snowflake_conn.execute_transaction([
+        (f"DELETE FROM {PRIMARY_ADDRESS_TABLE}", None),
+        (_owner_insert('CUSTOMER_ID', single_owner=False), None),
+        (_owner_insert('ACCOUNT_ID', single_owner=False), None)
+    ], error_msg="Error rebuilding primary service addresses") is not None
+
+__all__ = [
+    'PRIMARY_ADDRESS_TABLE',
+    'refresh_primary_service_address',
+    'rebuild_primary_service_addresses'
+]
@@ -3,8 +3,10 @@ from dataclasses import dataclass
 from datetime import datetime
 import streamlit as st
 import pandas as pd
-from database.connection import SnowflakeConnection
+from database.connection import snowflake_conn
 from models.service import fetch_services
+from models.transaction_view import load_transaction_view
+from utils.service_utils import get_service_by_id
 import json
 
 @dataclass
@@ -45,69 +47,183 @@ class TransactionModel:
             is_deposit=data.get('IS_DEPOSIT', False)
         )
 
-# Get database connection
-snowflake_conn = SnowflakeConnection.get_instance()
+# Columns summed (less DISCOUNT) into a transaction's AMOUNT
+AMOUNT_COMPONENTS = ('BASE_SERVICE_COST', 'SERVICE2_COST', 'SERVICE3_COST', 'MATERIAL_COST')
+
+class TransactionEdit:
+    """
+    Unit of work for one SERVICE_TRANSACTION row.
+
+    Field changes are collected first and written by flush() as a single
+    UPDATE. When a cost or the discount changes, AMOUNT is recomputed in the
+    same statement from the new values, so a multi-step edit is one round
+    trip and one row version instead of an UPDATE per field plus a
+    recalculation.
+    """
+    EDITABLE_COLUMNS = frozenset(AMOUNT_COMPONENTS + (
+        'DISCOUNT', 'SERVICE_ID', 'SERVICE2_ID', 'SERVICE3_ID', 'STATUS',
+        'COMPLETION_DATE', 'DEPOSIT', 'DEPOSIT_PAID', 'COMMENTS', 'TOTAL_LABOR_COST'
+    ))
+
+    def __init__(self, transaction_id: int, conn: Any = None):
+        """
+        Start an edit of a transaction
+
+        Args:
+            transaction_id (int): SERVICE_TRANSACTION.ID
+            conn: Connection to flush through (defaults to the shared snowflake_conn)
+        """
+        self.transaction_id = transaction_id
+        self.conn = conn or snowflake_conn
+        self._changes: Dict[str, Tuple[str, List[Any]]] = {}
+        self._conditions: List[str] = []
+        self._recalculate = False
+        # Rows changed by the last flush; None until one succeeds
+        self.rows_updated: Optional[int] = None
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._changes) or self._recalculate
+
+    def _stage(self, column: str, expression: str, params: List[Any]) -> 'TransactionEdit':
+        if column not in self.EDITABLE_COLUMNS:
+            raise ValueError(f"{column} cannot be edited through TransactionEdit")
+        self._changes[column] = (expression, params)
+        return self
+
+    def set(self, column: str, value: Any) -> 'TransactionEdit':
+        """Stage a new value for a column (replaces an earlier change to it)"""
+        return self._stage(column, "?", [value])
+
+    def set_now(self, column: str) -> 'TransactionEdit':
+        """Stage CURRENT_DATE() for a date column, e.g. COMPLETION_DATE"""
+        return self._stage(column, "CURRENT_DATE()", [])
+
+    def add_service(self, service_id: int, cost: float) -> 'TransactionEdit':
+        """
+        Stage a service for the first free additional slot (SERVICE2 or SERVICE3)
+
+        The slot is chosen in the UPDATE itself; flush() updates nothing and
+        returns False when both slots are taken.
+
+        Args:
+            service_id (int): Service to add
+            cost (float): Price charged for it on this transaction
+        """
+        if {'SERVICE2_ID', 'SERVICE3_ID', 'SERVICE2_COST', 'SERVICE3_COST'} & set(self._changes):
+            raise ValueError("add_service cannot be combined with other changes to the additional services")
+        self._stage('SERVICE2_ID', "CASE WHEN SERVICE2_ID IS NULL THEN ? ELSE SERVICE2_ID END", [service_id])
+        self._stage('SERVICE2_COST', "CASE WHEN SERVICE2_ID IS NULL THEN ? ELSE SERVICE2_COST END", [cost])
+        self._stage('SERVICE3_ID',
+                    "CASE WHEN SERVICE2_ID IS NOT NULL AND SERVICE3_ID IS NULL THEN ? ELSE SERVICE3_ID END",
+                    [service_id])
+        self._stage('SERVICE3_COST',
+                    "CASE WHEN SERVICE2_ID IS NOT NULL AND SERVICE3_ID IS NULL THEN ? ELSE SERVICE3_COST END",
+                    [cost])
+        self._conditions.append("(SERVICE2_ID IS NULL OR SERVICE3_ID IS NULL)")
+        return self
+
+    def remove_service(self, service_field: str) -> 'TransactionEdit':
+        """Stage removal of an additional service and its cost ('SERVICE2_ID' or 'SERVICE3_ID')"""
+        if service_field not in ('SERVICE2_ID', 'SERVICE3_ID'):
+            raise ValueError(f"{service_field} is not an additional service slot")
+        self.set(service_field, None)
+        return self.set(service_field.replace('_ID', '_COST'), None)
+
+    def recalculate(self) -> 'TransactionEdit':
+        """Recompute AMOUNT on flush even if no cost changed"""
+        self._recalculate = True
+        return self
+
+    def statement(self) -> Tuple[str, List[Any]]:
+        """
+        The UPDATE flush() would run
+
+        Returns:
+            Tuple[str, List[Any]]: SQL and its bind values
+        """
+        assignments = []
+        params: List[Any] = []
+        for column, (expression, values) in self._changes.items():
+            assignments.append(f"{column} = {expression}")
+            params.extend(values)
+
+        if self._recalculate or set(self._changes) & set(AMOUNT_COMPONENTS + ('DISCOUNT',)):
+            # Right-hand sides see the row before the update, so repeat the staged expressions
+            terms = []
+            for column in AMOUNT_COMPONENTS + ('DISCOUNT',):
+                expression, values = self._changes.get(column, (column, []))
+                terms.append(f"COALESCE({expression}, 0)")
+                params.extend(values)
+            assignments.append(f"AMOUNT = {' + '.join(terms[:-1])} - {terms[-1]}")
+
+        assignments.append("LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()")
+        conditions = ["ID = ?"] + self._conditions
+        params.append(self.transaction_id)
+        query = f"""
+        UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION
+        SET {', '.join(assignments)}
+        WHERE {' AND '.join(conditions)}
+        """
+        return query, params
+
+    def flush(self, error_msg: str = "Error updating transaction") -> bool:
+        """
+        Write all staged changes in one UPDATE
+
+        Args:
+            error_msg (str): Message shown if the statement fails
+
+        Returns:
+            bool: True if the row was updated (or nothing was staged); False if
+                the statement failed (rows_updated is None) or matched no row
+                (rows_updated is 0)
+        """
+        if not self.pending:
+            return True
+        query, params = self.statement()
+        self.rows_updated = None
+        result = self.conn.execute_query(query, params, error_msg=error_msg)
+        if result is None:
+            return False
+
+        # Snowflake reports "number of rows updated" as the first column
+        self.rows_updated = int(next(iter(result[0].values())) or 0) if result else 0
+        self._changes.clear()
+        self._conditions.clear()
+        self._recalculate = False
+        return self.rows_updated > 0
+
 
 def get_service_costs(service_ids: List[int]) -> Dict[int, Dict[str, Any]]:
     """Get costs and details for specified services"""
     if not service_ids:
         return {}
         
-    ids_str = ', '.join(str(id) for id in service_ids)
-    query = f"""
-    SELECT SERVICE_ID, SERVICE_NAME, COST
-    FROM OPERATIONAL.CARPET.SERVICES
-    WHERE SERVICE_ID IN ({ids_str})
-    """
-    
-    try:
-        results = snowflake_conn.execute_query(query)
-        return {
-            row['SERVICE_ID']: {
-                'name': row['SERVICE_NAME'],
-                'cost': float(row.get('COST', 0.0))  # Added .get() with default value
-            } for row in results
-        }
-    except Exception as e:
-        st.error(f"Error fetching service costs: {str(e)}")
-        return {}
+    costs = {}
+    for service_id in service_ids:
+        service = get_service_by_id(service_id)
+        if service:
+            costs[service['SERVICE_ID']] = {
+                'name': service['SERVICE_NAME'],
+                'cost': service['COST']
+            }
+    return costs
 
 def get_additional_services(transaction_id):
     """
     Fetch primary and additional services with their costs.
     Returns full service details for properly calculating total cost.
+    Reads the transaction's cached TransactionView.
     """
-    query = """
-    SELECT 
-        st.ID as TRANSACTION_ID,
-        st.SERVICE_ID as PRIMARY_SERVICE_ID,
-        s1.SERVICE_NAME as PRIMARY_SERVICE_NAME,
-        s1.COST as PRIMARY_COST,
-        st.SERVICE2_ID,
-        s2.SERVICE_NAME as SERVICE2_NAME,
-        s2.COST as SERVICE2_COST,
-        st.SERVICE3_ID,
-        s3.SERVICE_NAME as SERVICE3_NAME,
-        s3.COST as SERVICE3_COST
-    FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION st
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s1 ON st.SERVICE_ID = s1.SERVICE_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s2 ON st.SERVICE2_ID = s2.SERVICE_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s3 ON st.SERVICE3_ID = s3.SERVICE_ID
-    WHERE st.ID = :1
-    """
-    result = snowflake_conn.execute_query(query, [transaction_id])
-    
-    if not result or not result[0]:
+    view = load_transaction_view(transaction_id)
+    if view is None:
         return None, None, 0.0
     
-    service2_id = result[0].get('SERVICE2_ID')
-    service3_id = result[0].get('SERVICE3_ID')
-    total_cost = float(result[0].get('PRIMARY_COST') or 0.0)
-    
-    if service2_id:
-        total_cost += float(result[0].get('SERVICE2_COST') or 0.0)
-    if service3_id:
-        total_cost += float(result[0].get('SERVICE3_COST') or 0.0)
+    service2_id = view.transaction.get('SERVICE2_ID')
+    service3_id = view.transaction.get('SERVICE3_ID')
+    # Catalog prices, as before the view; services missing from the catalog count as 0
+    total_cost = sum(float(item['LIST_COST'] or 0.0) for item in view.services)
     
     return service2_id, service3_id, total_cost
 
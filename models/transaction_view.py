@@ -0,0 +1,342 @@
+# models/transaction_view.py
+"""
+Everything the transaction details page shows for one transaction.
+
+load_transaction_view reads the transaction with its customer, account and
+primary service address, its service line items and its employee
+assignments in one multi-statement request, plus the assignable employees
+and the active service list when a dialog needs them. The result is a
+TransactionView, cached per transaction ID and stamped with the write
+generation of the tables it was read from (see GenerationCache): any write this
+process makes to those tables makes the entry stale, and code that changes a
+transaction calls invalidate_transaction_view so the next render reads it
+again without waiting for the TTL.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+from database.connection import snowflake_conn
+from database.generation_cache import GenerationCache
+from models.service_address import PRIMARY_ADDRESS_TABLE
+
+TRANSACTION_VIEW_TABLES = frozenset({
+    'SERVICE_TRANSACTION', 'SERVICES', 'SERVICE_ASSIGNMENTS', 'EMPLOYEE',
+    'CUSTOMER', 'ACCOUNTS', 'PRIMARY_SERVICE_ADDRESSES'
+})
+
+TRANSACTION_DETAILS_QUERY = f"""
+SELECT
+    -- Transaction core data
+    t.ID as TRANSACTION_ID,
+    t.SERVICE_NAME as PRIMARY_SERVICE_NAME,
+    t.SERVICE_ID as PRIMARY_SERVICE_ID,
+    t.SERVICE2_ID,
+    t.SERVICE3_ID,
+    t.BASE_SERVICE_COST,
+    t.SERVICE2_COST as SERVICE2_CHARGED_COST,
+    t.SERVICE3_COST as SERVICE3_CHARGED_COST,
+    t.AMOUNT as TOTAL_AMOUNT,
+    t.DISCOUNT,
+    t.STATUS,
+    t.COMMENTS,
+    t.SERVICE_DATE,
+    t.START_TIME,
+    t.END_TIME,
+    t.DEPOSIT,
+    t.DEPOSIT_PAID,
+    t.MATERIAL_COST,
+    t.TOTAL_LABOR_COST,
+    t.PRICING_STRATEGY,
+    t.MARKUP_PERCENTAGE,
+    t.PRICE_ADJUSTMENTS_JSON,
+    t.IS_RECURRING,
+    t.RECURRENCE_PATTERN,
+    t.CREATED_DATE,
+
+    -- Customer information
+    t.CUSTOMER_ID,
+    c.FIRST_NAME as CUSTOMER_FIRST_NAME,
+    c.LAST_NAME as CUSTOMER_LAST_NAME,
+    c.EMAIL_ADDRESS as CUSTOMER_EMAIL,
+    c.PHONE_NUMBER as CUSTOMER_PHONE,
+
+    -- Account information (if applicable)
+    t.ACCOUNT_ID,
+    a.ACCOUNT_NAME,
+
+    -- Service address
+    COALESCE(pca.STREET_ADDRESS, paa.STREET_ADDRESS) as STREET_ADDRESS,
+    COALESCE(pca.CITY, paa.CITY) as CITY,
+    COALESCE(pca.STATE, paa.STATE) as STATE,
+    COALESCE(pca.ZIP_CODE, paa.ZIP_CODE) as ZIP_CODE,
+    COALESCE(pca.SQUARE_FOOTAGE, paa.SQUARE_FOOTAGE) as SQUARE_FOOTAGE
+
+FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION t
+LEFT JOIN OPERATIONAL.CARPET.CUSTOMER c ON t.CUSTOMER_ID = c.CUSTOMER_ID
+LEFT JOIN OPERATIONAL.CARPET.ACCOUNTS a ON t.ACCOUNT_ID = a.ACCOUNT_ID
+LEFT JOIN {PRIMARY_ADDRESS_TABLE} pca ON t.CUSTOMER_ID = pca.CUSTOMER_ID
+LEFT JOIN {PRIMARY_ADDRESS_TABLE} paa ON t.ACCOUNT_ID = paa.ACCOUNT_ID
+WHERE t.ID = ?
+"""
+
+TRANSACTION_LINE_ITEMS_QUERY = """
+SELECT
+    s.SERVICE_ID,
+    s.SERVICE_NAME,
+    s.COST,
+    s.SERVICE_DURATION,
+    s.SERVICE_CATEGORY
+FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION t
+JOIN OPERATIONAL.CARPET.SERVICES s
+  ON s.SERVICE_ID IN (t.SERVICE_ID, t.SERVICE2_ID, t.SERVICE3_ID)
+WHERE t.ID = ?
+"""
+
+TRANSACTION_ASSIGNMENTS_QUERY = """
+SELECT
+    sa.ASSIGNMENT_ID,
+    sa.TRANSACTION_ID,
+    sa.EMPLOYEE_ID,
+    sa.ASSIGNMENT_DATE,
+    sa.ASSIGNMENT_STATUS,
+    sa.NOTES,
+    e.FIRST_NAME,
+    e.LAST_NAME,
+    e.EMAIL,
+    e.PHONE_NUMBER
+FROM OPERATIONAL.CARPET.SERVICE_ASSIGNMENTS sa
+JOIN OPERATIONAL.CARPET.EMPLOYEE e ON sa.EMPLOYEE_ID = e.EMPLOYEE_ID
+WHERE sa.TRANSACTION_ID = ?
+ORDER BY sa.ASSIGNMENT_DATE DESC
+"""
+
+AVAILABLE_EMPLOYEES_QUERY = """
+SELECT
+    e.EMPLOYEE_ID,
+    e.FIRST_NAME,
+    e.LAST_NAME,
+    e.EMAIL
+FROM OPERATIONAL.CARPET.EMPLOYEE e
+WHERE e.EMPLOYEE_ID NOT IN (
+    SELECT sa.EMPLOYEE_ID
+    FROM OPERATIONAL.CARPET.SERVICE_ASSIGNMENTS sa
+    WHERE sa.TRANSACTION_ID = ?
+)
+ORDER BY e.FIRST_NAME, e.LAST_NAME
+"""
+
+ACTIVE_SERVICES_QUERY = """
+SELECT SERVICE_ID, SERVICE_NAME, COST, SERVICE_CATEGORY, SERVICE_DURATION
+FROM OPERATIONAL.CARPET.SERVICES
+WHERE ACTIVE_STATUS = TRUE
+ORDER BY SERVICE_CATEGORY, SERVICE_NAME
+"""
+
+# (slot, ID column, charged cost column, prefix of the page's per-slot columns)
+_SLOTS = (
+    ('PRIMARY', 'PRIMARY_SERVICE_ID', 'BASE_SERVICE_COST', 'PRIMARY_SERVICE'),
+    ('SERVICE2', 'SERVICE2_ID', 'SERVICE2_CHARGED_COST', 'SERVICE2'),
+    ('SERVICE3', 'SERVICE3_ID', 'SERVICE3_CHARGED_COST', 'SERVICE3')
+)
+
+_ADDRESS_COLUMNS = ('STREET_ADDRESS', 'CITY', 'STATE', 'ZIP_CODE', 'SQUARE_FOOTAGE')
+
+@dataclass
+class TransactionView:
+    """A transaction with its line items, assignments and address, as the details page shows it"""
+    transaction: Dict[str, Any]
+    services: List[Dict[str, Any]]
+    assignments: List[Dict[str, Any]]
+    address: Dict[str, Any]
+    # Dialog lists; None when they were not requested
+    available_employees: Optional[List[Dict[str, Any]]] = None
+    active_services: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def transaction_id(self) -> int:
+        return self.transaction['TRANSACTION_ID']
+
+    @property
+    def primary_service(self) -> Optional[Dict[str, Any]]:
+        return next((item for item in self.services if item['SLOT'] == 'PRIMARY'), None)
+
+    @property
+    def additional_services(self) -> List[Dict[str, Any]]:
+        return [item for item in self.services if item['SLOT'] != 'PRIMARY']
+
+    def copy(self) -> 'TransactionView':
+        """Copy whose rows can be modified without touching the cached view"""
+        def rows(values: Optional[List[Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+            return None if values is None else [dict(row) for row in values]
+        return replace(
+            self,
+            transaction=dict(self.transaction),
+            services=rows(self.services),
+            assignments=rows(self.assignments),
+            address=dict(self.address),
+            available_employees=rows(self.available_employees),
+            active_services=rows(self.active_services)
+        )
+
+def build_transaction_view(transaction: Dict[str, Any],
+                           catalog_rows: List[Dict[str, Any]],
+                           assignments: List[Dict[str, Any]],
+                           available_employees: Optional[List[Dict[str, Any]]] = None,
+                           active_services: Optional[List[Dict[str, Any]]] = None) -> TransactionView:
+    """
+    Assemble a view from the rows of one load
+
+    Each line item carries the catalog details of its service and COST, the
+    price charged on this transaction (the catalog COST when none was set).
+    The per-slot columns the details page reads (PRIMARY_SERVICE_TABLE_NAME,
+    SERVICE2_NAME, SERVICE2_COST, ...) are filled in on the transaction row.
+
+    Args:
+        transaction: Row of TRANSACTION_DETAILS_QUERY
+        catalog_rows: Rows of TRANSACTION_LINE_ITEMS_QUERY
+        assignments: Rows of TRANSACTION_ASSIGNMENTS_QUERY
+        available_employees: Rows of AVAILABLE_EMPLOYEES_QUERY, if loaded
+        active_services: Rows of ACTIVE_SERVICES_QUERY, if loaded
+
+    Returns:
+        TransactionView: The assembled view
+    """
+    transaction = dict(transaction)
+    catalog = {row['SERVICE_ID']: row for row in catalog_rows}
+    services = []
+    for slot, id_column, cost_column, prefix in _SLOTS:
+        service_id = transaction.get(id_column) or None
+        entry = catalog.get(service_id) if service_id is not None else None
+        if slot != 'PRIMARY' and entry is None:
+            # No service in this slot, or one missing from the catalog
+            continue
+        entry = entry or {}
+        charged = transaction.get(cost_column)
+        item = {
+            'SLOT': slot,
+            'SERVICE_ID': service_id,
+            'SERVICE_NAME': entry.get('SERVICE_NAME') or (
+                transaction.get('PRIMARY_SERVICE_NAME') if slot == 'PRIMARY' else None
+            ),
+            'SERVICE_CATEGORY': entry.get('SERVICE_CATEGORY'),
+            'SERVICE_DURATION': entry.get('SERVICE_DURATION'),
+            'LIST_COST': entry.get('COST'),
+            'COST': charged if charged is not None else entry.get('COST')
+        }
+        services.append(item)
+        if slot == 'PRIMARY':
+            transaction['PRIMARY_SERVICE_TABLE_NAME'] = entry.get('SERVICE_NAME')
+            transaction['PRIMARY_SERVICE_TABLE_COST'] = item['LIST_COST']
+        else:
+            transaction[f'{prefix}_NAME'] = item['SERVICE_NAME']
+            transaction[f'{prefix}_COST'] = item['COST']
+        transaction[f'{prefix}_DURATION'] = item['SERVICE_DURATION']
+        transaction[f'{prefix}_CATEGORY'] = item['SERVICE_CATEGORY']
+
+    return TransactionView(
+        transaction=transaction,
+        services=services,
+        assignments=list(assignments),
+        address={column: transaction.get(column) for column in _ADDRESS_COLUMNS},
+        available_employees=available_employees,
+        active_services=active_services
+    )
+
+class TransactionViewCache(GenerationCache):
+    """Views kept between reruns, keyed by transaction ID"""
+
+    def __init__(self, max_entries: int = 64, ttl: float = 60.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries (int): Views kept before the least recently stored is dropped
+            ttl (float): Seconds a view may be served, bounding staleness from writes made elsewhere
+        """
+        super().__init__(max_entries=max_entries, ttl=ttl)
+
+transaction_views = TransactionViewCache()
+
+def load_transaction_view(transaction_id: int,
+                          include_available_employees: bool = False,
+                          include_active_services: bool = False,
+                          conn: Any = None) -> Optional[TransactionView]:
+    """
+    Load a transaction and everything shown with it, from the cache when current
+
+    A cached view missing a requested dialog list is reloaded with it, keeping
+    the lists it already had.
+
+    Args:
+        transaction_id (int): SERVICE_TRANSACTION.ID
+        include_available_employees (bool): Also load employees not yet assigned to it
+        include_active_services (bool): Also load the services that can be added to it
+        conn: Connection to read through (defaults to the shared snowflake_conn)
+
+    Returns:
+        Optional[TransactionView]: The view, or None if the transaction could not be loaded
+    """
+    conn = conn or snowflake_conn
+    generation = conn.results.generation(TRANSACTION_VIEW_TABLES)
+    cached = transaction_views.get(transaction_id, generation)
+    if cached is not None:
+        if ((not include_available_employees or cached.available_employees is not None)
+                and (not include_active_services or cached.active_services is not None)):
+            return cached
+        include_available_employees = include_available_employees or cached.available_employees is not None
+        include_active_services = include_active_services or cached.active_services is not None
+
+    statements = [
+        (TRANSACTION_DETAILS_QUERY, [transaction_id]),
+        (TRANSACTION_LINE_ITEMS_QUERY, [transaction_id]),
+        (TRANSACTION_ASSIGNMENTS_QUERY, [transaction_id])
+    ]
+    if include_available_employees:
+        statements.append((AVAILABLE_EMPLOYEES_QUERY, [transaction_id]))
+    if include_active_services:
+        statements.append((ACTIVE_SERVICES_QUERY, None))
+
+    # The view is the cache for these reads; invalidation has to reach the database
+    results = conn.execute_multi(statements, error_msg="Error loading transaction details")
+    if not results[0]:
+        return None
+    header, catalog_rows, assignments = results[:3]
+    extra = iter(results[3:])
+    available_employees = next(extra) if include_available_employees else None
+    active_services = next(extra) if include_active_services else None
+
+    view = build_transaction_view(
+        header[0],
+        catalog_rows or [],
+        assignments or [],
+        available_employees=available_employees,
+        active_services=active_services
+    )
+    # Keep only complete views; a failed statement is retried on the next render
+    if all(result is not None for result in results):
+        transaction_views.put(view.transaction_id, view, generation)
+    return view
+
+def invalidate_transaction_view(transaction_id: Optional[int] = None) -> None:
+    """
+    Drop the cached view of a transaction after changing it
+
+    Args:
+        transaction_id (Optional[int]): Transaction that changed; None drops every view
+    """
+    transaction_views.invalidate(transaction_id)
+
+__all__ = [
+    'TRANSACTION_VIEW_TABLES',
+    'TRANSACTION_DETAILS_QUERY',
+    'TRANSACTION_LINE_ITEMS_QUERY',
+    'TRANSACTION_ASSIGNMENTS_QUERY',
+    'AVAILABLE_EMPLOYEES_QUERY',
+    'ACTIVE_SERVICES_QUERY',
+    'TransactionView',
+    'TransactionViewCache',
+    'build_transaction_view',
+    'load_transaction_view',
+    'invalidate_transaction_view'
+]
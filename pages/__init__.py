@@ -1,12 +1,24 @@
 # pages/__init__.py
 """
 Initialize pages module and expose page functions
+
+Page modules are imported when one of their functions is first accessed, so
+importing pages.registry (or any single page) does not load all of them.
 """
 
-from .new_service import new_service_page
-from .scheduled import scheduled_services_page
-from .completed import completed_services_page
-from .transaction_details import transaction_details_page
+import importlib
+
+_PAGE_MODULES = {
+    'new_service_page': '.new_service',
+    'scheduled_services_page': '.scheduled',
+    'completed_services_page': '.completed',
+    'transaction_details_page': '.transaction_details',
+}
+
+def __getattr__(name):
+    if name in _PAGE_MODULES:
+        return getattr(importlib.import_module(_PAGE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'new_service_page',
@@ -14,4 +26,3 @@ __all__ = [
     'completed_services_page',
     'transaction_details_page',
 ]
-
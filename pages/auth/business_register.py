@@ -3,6 +3,7 @@ import streamlit as st
 from database.connection import snowflake_conn
 from utils.auth.auth_utils import hash_password, validate_password, validate_email
 from utils.validation import validate_phone, sanitize_zip_code
+from utils.business.info import invalidate_business_profile
 import re
 from typing import Optional
 
@@ -74,38 +75,26 @@ def check_existing_business_user(email: str) -> bool:
 def create_business_info(data: dict) -> Optional[int]:
     """Create business information record"""
     try:
-        query = """
-        INSERT INTO OPERATIONAL.CARPET.BUSINESS_INFO (
-            BUSINESS_NAME,
-            STREET_ADDRESS,
-            CITY,
-            STATE,
-            ZIP_CODE,
-            PHONE_NUMBER,
-            EMAIL_ADDRESS,
-            ACTIVE_STATUS
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, TRUE)
-        """
-        
         zip_code = sanitize_zip_code(data['zip_code'])
         
-        snowflake_conn.execute_query(query, [
-            data['business_name'],
-            data['street_address'], 
-            data['city'],
-            data['state'],
-            int(zip_code),
-            data['phone'],
-            data['email']
-        ])
-        
-        # Get the business ID
-        result = snowflake_conn.execute_query(
-            "SELECT BUSINESS_ID FROM OPERATIONAL.CARPET.BUSINESS_INFO WHERE EMAIL_ADDRESS = ? ORDER BY MODIFIED_DATE DESC LIMIT 1",
-            [data['email']]
+        business_id = snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.BUSINESS_INFO",
+            {
+                'BUSINESS_NAME': data['business_name'],
+                'STREET_ADDRESS': data['street_address'],
+                'CITY': data['city'],
+                'STATE': data['state'],
+                'ZIP_CODE': int(zip_code),
+                'PHONE_NUMBER': data['phone'],
+                'EMAIL_ADDRESS': data['email']
+            },
+            id_column="BUSINESS_ID",
+            expressions={'ACTIVE_STATUS': 'TRUE'},
+            error_msg="Error creating business info"
         )
+        invalidate_business_profile()
         
-        return result[0]['BUSINESS_ID'] if result else None
+        return business_id
         
     except Exception as e:
         st.error(f"Error creating business info: {str(e)}")
@@ -114,32 +103,19 @@ def create_business_info(data: dict) -> Optional[int]:
 def create_employee_record(data: dict, business_id: int) -> Optional[int]:
     """Create employee record for business owner"""
     try:
-        query = """
-        INSERT INTO OPERATIONAL.CARPET.EMPLOYEE (
-            FIRST_NAME,
-            LAST_NAME,
-            EMAIL,
-            PHONE_NUMBER,
-            JOB_TITLE,
-            ACTIVE_STATUS
-        ) VALUES (?, ?, ?, ?, 'Owner', TRUE)
-        """
-        
-        snowflake_conn.execute_query(query, [
-            data['first_name'],
-            data['last_name'],
-            data['email'],
-            data['phone']
-        ])
-        
-        # Get the employee ID
-        result = snowflake_conn.execute_query(
-            "SELECT EMPLOYEE_ID FROM OPERATIONAL.CARPET.EMPLOYEE WHERE EMAIL = ? ORDER BY EMPLOYEE_ID DESC LIMIT 1",
-            [data['email']]
+        return snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.EMPLOYEE",
+            {
+                'FIRST_NAME': data['first_name'],
+                'LAST_NAME': data['last_name'],
+                'EMAIL': data['email'],
+                'PHONE_NUMBER': data['phone']
+            },
+            id_column="EMPLOYEE_ID",
+            expressions={'JOB_TITLE': "'Owner'", 'ACTIVE_STATUS': 'TRUE'},
+            error_msg="Error creating employee record"
         )
         
-        return result[0]['EMPLOYEE_ID'] if result else None
-        
     except Exception as e:
         st.error(f"Error creating employee record: {str(e)}")
         return None
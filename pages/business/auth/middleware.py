@@ -4,6 +4,7 @@ from functools import wraps
 from datetime import datetime, timedelta
 from typing import Callable
 from utils.business.business_auth import verify_business_session
+from utils.auth.session_cache import business_sessions
 from database.connection import snowflake_conn
 
 def init_business_session() -> None:
@@ -57,6 +58,8 @@ def clear_business_session(reason: str = None) -> None:
     """Clear business session state"""
     session_id = st.session_state.get('business_session_id')
     if session_id:
+        business_sessions.invalidate(session_id)
+        
         # Update session in database
         query = """
         UPDATE OPERATIONAL.CARPET.BUSINESS_SESSIONS
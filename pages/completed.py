@@ -1,13 +1,34 @@
 # completed.py
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import streamlit as st
 from datetime import datetime, timedelta
 import pandas as pd
 from database.connection import snowflake_conn
 from utils.email import send_service_completed_email
-from utils.formatting import format_currency, format_date, format_time, add_back_navigation
+from utils.formatting import (
+    format_currency, format_date, format_time, add_back_navigation, render_page_navigation
+)
 from pages.settings.business import fetch_business_info
-import json
+
+COMPLETED_PAGE_SIZE = 25
+
+# Newest first; services without an end time sort last within their day
+_SORT_TIME = "COALESCE(ST.END_TIME, CAST('00:00:00' AS TIME))"
+
+_PAYMENT_STATUS = """CASE 
+                WHEN (COALESCE(ST.AMOUNT_RECEIVED, 0) + COALESCE(ST.DEPOSIT, 0)) >= 
+                    (ST.AMOUNT - COALESCE(ST.DISCOUNT, 0)) THEN 'Paid'
+                ELSE 'Unpaid'
+            END"""
+
+_SUMMARY_COLUMNS = (
+    'TOTAL_SERVICES', 'UNPAID_SERVICES', 'TOTAL_AMOUNT', 'TOTAL_DISCOUNT',
+    'TOTAL_RECEIVED', 'TOTAL_OUTSTANDING'
+)
+
+def completed_cursor(row: pd.Series) -> Tuple[Any, Any, int]:
+    """Keyset position of a completed service row: (COMPLETION_DATE, SORT_TIME, TRANSACTION_ID)"""
+    return row['COMPLETION_DATE'], row['SORT_TIME'], int(row['TRANSACTION_ID'])
 
 class CompletedServicesPage:
     """Main class for the completed services page"""
@@ -25,13 +46,36 @@ class CompletedServicesPage:
         dates = self._get_date_range()
         payment_status = self._get_payment_status_filter()
         
+        # Each visited page's starting cursor; the last one is the page shown
+        filter_key = (dates['start_date'], dates['end_date'], payment_status)
+        if st.session_state.get('completed_filter_key') != filter_key:
+            st.session_state.completed_filter_key = filter_key
+            st.session_state.completed_cursors = [None]
+        cursors = st.session_state.completed_cursors
+        
         try:
-            services_df = self._fetch_completed_services(dates)
-            if services_df is not None and not services_df.empty:
-                self._display_services(services_df, payment_status)
-                self._display_summary_statistics(services_df)
-            else:
+            summary = self._fetch_summary_statistics(dates)
+            if summary is None:
+                return
+            if not summary['TOTAL_SERVICES']:
                 st.info("No completed services found for the selected date range.")
+                return
+            
+            services_df = self._fetch_completed_services(
+                dates, payment_status, after=cursors[-1], limit=COMPLETED_PAGE_SIZE + 1
+            )
+            if services_df is None:
+                services_df = pd.DataFrame()
+            has_next_page = len(services_df) > COMPLETED_PAGE_SIZE
+            services_df = services_df.head(COMPLETED_PAGE_SIZE)
+            
+            self._display_services(services_df, payment_status)
+            render_page_navigation(
+                'completed',
+                cursors,
+                completed_cursor(services_df.iloc[-1]) if has_next_page else None
+            )
+            self._display_summary_statistics(summary)
             
         except Exception as e:
             st.error(f"Error loading completed services: {str(e)}")
@@ -103,12 +147,45 @@ class CompletedServicesPage:
         return st.selectbox(
             "Filter by Payment Status", 
             ["All", "Paid", "Unpaid"],
-            help="Filter services by payment status"
+            help="Filter services by payment status",
+            key="completed_payment_status"
         )
 
-    def _fetch_completed_services(self, dates: Dict[str, datetime.date]) -> Optional[pd.DataFrame]:
-        """Fetch completed services from database"""
-        query = """
+    def _fetch_completed_services(self,
+                                  dates: Dict[str, datetime.date],
+                                  payment_status: str = "All",
+                                  after: Optional[Tuple[Any, Any, int]] = None,
+                                  limit: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """
+        Fetch one page of completed services, newest first
+        
+        Args:
+            dates: start_date and end_date of the completion date range
+            payment_status: "Paid" or "Unpaid" to filter in the query, "All" for both
+            after: completed_cursor of the row before the first one to return
+            limit: Maximum rows to return (all rows if None)
+            
+        Returns:
+            Optional[pd.DataFrame]: Services ordered by completion date and end time, or None
+        """
+        params = [
+            dates['start_date'].strftime('%Y-%m-%d'),
+            dates['end_date'].strftime('%Y-%m-%d')
+        ]
+        filters = ""
+        if payment_status in ("Paid", "Unpaid"):
+            filters += f"\n        AND {_PAYMENT_STATUS} = ?"
+            params.append(payment_status)
+        if after is not None:
+            after_date, after_time, after_id = after
+            filters += f"""
+        AND (ST.COMPLETION_DATE < ?
+             OR (ST.COMPLETION_DATE = ? AND ({_SORT_TIME} < ?
+                 OR ({_SORT_TIME} = ? AND ST.ID < ?))))"""
+            params += [after_date, after_date, after_time, after_time, int(after_id)]
+        limit_clause = f"\n        LIMIT {int(limit)}" if limit else ""
+        
+        query = f"""
         SELECT 
             ST.ID AS TRANSACTION_ID,
             COALESCE(C.CUSTOMER_ID, A.ACCOUNT_ID) AS CUSTOMER_OR_ACCOUNT_ID,
@@ -131,11 +208,7 @@ class CompletedServicesPage:
             COALESCE(C.EMAIL_ADDRESS, A.CONTACT_EMAIL) as EMAIL_ADDRESS,
             COALESCE(C.PHONE_NUMBER, A.CONTACT_PHONE) as PHONE_NUMBER,
             ST.COMMENTS,
-            CASE 
-                WHEN (COALESCE(ST.AMOUNT_RECEIVED, 0) + COALESCE(ST.DEPOSIT, 0)) >= 
-                    (ST.AMOUNT - COALESCE(ST.DISCOUNT, 0)) THEN 'Paid'
-                ELSE 'Unpaid'
-            END AS PAYMENT_STATUS,
+            {_PAYMENT_STATUS} AS PAYMENT_STATUS,
             COALESCE(E1.FIRST_NAME || ' ' || E1.LAST_NAME, '') as EMPLOYEE1_NAME,
             COALESCE(E2.FIRST_NAME || ' ' || E2.LAST_NAME, '') as EMPLOYEE2_NAME,
             COALESCE(E3.FIRST_NAME || ' ' || E3.LAST_NAME, '') as EMPLOYEE3_NAME,
@@ -143,7 +216,7 @@ class CompletedServicesPage:
             ST.TOTAL_LABOR_COST,
             ST.MATERIAL_COST,
             ST.BASE_SERVICE_COST,
-            ST.PRICE_ADJUSTMENTS_JSON
+            {_SORT_TIME} AS SORT_TIME
         FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION ST
         LEFT JOIN OPERATIONAL.CARPET.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
         LEFT JOIN OPERATIONAL.CARPET.ACCOUNTS A ON ST.ACCOUNT_ID = A.ACCOUNT_ID
@@ -153,27 +226,16 @@ class CompletedServicesPage:
         LEFT JOIN OPERATIONAL.CARPET.EMPLOYEE E2 ON ST.EMPLOYEE2_ID = E2.EMPLOYEE_ID
         LEFT JOIN OPERATIONAL.CARPET.EMPLOYEE E3 ON ST.EMPLOYEE3_ID = E3.EMPLOYEE_ID
         WHERE ST.STATUS = 'COMPLETED'
-        AND ST.COMPLETION_DATE BETWEEN ? AND ?
-        ORDER BY ST.COMPLETION_DATE DESC, ST.END_TIME DESC
+        AND ST.COMPLETION_DATE BETWEEN ? AND ?{filters}
+        ORDER BY ST.COMPLETION_DATE DESC, SORT_TIME DESC, ST.ID DESC{limit_clause}
         """
         
         try:
-            results = snowflake_conn.execute_query(query, [
-                dates['start_date'].strftime('%Y-%m-%d'),
-                dates['end_date'].strftime('%Y-%m-%d')
-            ])
+            df = snowflake_conn.execute_query_df(query, params)
             
-            if not results:
+            if df is None or df.empty:
                 return None
                 
-            df = pd.DataFrame(results)
-            
-            # Add price breakdown from JSON if available
-            if 'PRICE_ADJUSTMENTS_JSON' in df.columns:
-                df['PRICE_ADJUSTMENTS'] = df['PRICE_ADJUSTMENTS_JSON'].apply(
-                    lambda x: json.loads(x) if pd.notnull(x) else {}
-                )
-                
             return df
                 
         except Exception as e:
@@ -182,6 +244,87 @@ class CompletedServicesPage:
                 st.exception(e)
             return None
 
+    def _fetch_summary_statistics(self, dates: Dict[str, datetime.date]) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate every completed service in the date range with one GROUP BY query
+        
+        Each service contributes one SERVICE entry and each non-zero payment
+        (split payments and the deposit) one PAYMENT entry, so the totals and the
+        per-method breakdown come back as groups of the same result.
+        
+        Args:
+            dates: start_date and end_date of the completion date range
+            
+        Returns:
+            Optional[Dict[str, Any]]: Totals keyed by _SUMMARY_COLUMNS plus PAYMENT_METHODS,
+            a list of {PAYMENT_METHOD, PAYMENTS, TOTAL_RECEIVED}; None if the query failed
+        """
+        query = f"""
+        WITH Completed AS (
+            SELECT
+                ST.AMOUNT,
+                COALESCE(ST.DISCOUNT, 0) AS DISCOUNT,
+                COALESCE(ST.AMOUNT_RECEIVED, 0) + COALESCE(ST.DEPOSIT, 0) AS RECEIVED,
+                {_PAYMENT_STATUS} AS PAYMENT_STATUS,
+                ST.PYMT_MTHD_1, ST.PYMT_MTHD_1_AMT,
+                ST.PYMT_MTHD_2, ST.PYMT_MTHD_2_AMT,
+                ST.PYMT_MTHD_3, ST.PYMT_MTHD_3_AMT,
+                ST.DEPOSIT_PAYMENT_METHOD, ST.DEPOSIT
+            FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION ST
+            WHERE ST.STATUS = 'COMPLETED'
+            AND ST.COMPLETION_DATE BETWEEN ? AND ?
+        ),
+        Entries AS (
+            SELECT 'SERVICE' AS ENTRY, NULL AS PAYMENT_METHOD, AMOUNT, DISCOUNT, RECEIVED,
+                   CASE WHEN PAYMENT_STATUS = 'Unpaid' THEN 1 ELSE 0 END AS UNPAID,
+                   CASE WHEN PAYMENT_STATUS = 'Unpaid' THEN AMOUNT - DISCOUNT - RECEIVED ELSE 0 END AS OUTSTANDING
+            FROM Completed
+            UNION ALL
+            SELECT 'PAYMENT', PYMT_MTHD_1, NULL, NULL, PYMT_MTHD_1_AMT, NULL, NULL FROM Completed WHERE PYMT_MTHD_1_AMT > 0
+            UNION ALL
+            SELECT 'PAYMENT', PYMT_MTHD_2, NULL, NULL, PYMT_MTHD_2_AMT, NULL, NULL FROM Completed WHERE PYMT_MTHD_2_AMT > 0
+            UNION ALL
+            SELECT 'PAYMENT', PYMT_MTHD_3, NULL, NULL, PYMT_MTHD_3_AMT, NULL, NULL FROM Completed WHERE PYMT_MTHD_3_AMT > 0
+            UNION ALL
+            SELECT 'PAYMENT', DEPOSIT_PAYMENT_METHOD, NULL, NULL, DEPOSIT, NULL, NULL FROM Completed WHERE DEPOSIT > 0
+        )
+        SELECT
+            ENTRY,
+            COALESCE(PAYMENT_METHOD, 'Unspecified') AS PAYMENT_METHOD,
+            COUNT(*) AS ENTRIES,
+            CAST(SUM(AMOUNT) AS FLOAT) AS TOTAL_AMOUNT,
+            CAST(SUM(DISCOUNT) AS FLOAT) AS TOTAL_DISCOUNT,
+            CAST(SUM(RECEIVED) AS FLOAT) AS TOTAL_RECEIVED,
+            SUM(UNPAID) AS UNPAID_SERVICES,
+            CAST(SUM(OUTSTANDING) AS FLOAT) AS TOTAL_OUTSTANDING
+        FROM Entries
+        GROUP BY ENTRY, COALESCE(PAYMENT_METHOD, 'Unspecified')
+        ORDER BY ENTRY DESC, TOTAL_RECEIVED DESC
+        """
+        
+        result = snowflake_conn.execute_query(query, [
+            dates['start_date'].strftime('%Y-%m-%d'),
+            dates['end_date'].strftime('%Y-%m-%d')
+        ])
+        if result is None:
+            return None
+        
+        summary: Dict[str, Any] = {column: 0 for column in _SUMMARY_COLUMNS}
+        summary['PAYMENT_METHODS'] = []
+        for row in result:
+            if row['ENTRY'] == 'SERVICE':
+                summary['TOTAL_SERVICES'] = int(row['ENTRIES'])
+                summary['UNPAID_SERVICES'] = int(row['UNPAID_SERVICES'] or 0)
+                for column in ('TOTAL_AMOUNT', 'TOTAL_DISCOUNT', 'TOTAL_RECEIVED', 'TOTAL_OUTSTANDING'):
+                    summary[column] = float(row[column] or 0)
+            else:
+                summary['PAYMENT_METHODS'].append({
+                    'PAYMENT_METHOD': row['PAYMENT_METHOD'],
+                    'PAYMENTS': int(row['ENTRIES']),
+                    'TOTAL_RECEIVED': float(row['TOTAL_RECEIVED'] or 0)
+                })
+        return summary
+
     def _update_payment(self, transaction_id: int, payment_data: Dict) -> bool:
         """Update payment information in database"""
         try:
@@ -258,12 +401,12 @@ class CompletedServicesPage:
                 st.exception(e)
 
     def _display_services(self, df: pd.DataFrame, payment_status: str) -> None:
-        """Display completed services with filtering"""
-        if payment_status != "All":
-            df = df[df['PAYMENT_STATUS'] == payment_status]
-            
+        """Display one page of completed services, already filtered by payment status"""
         if df.empty:
-            st.info(f"No {payment_status.lower()} services found in the selected date range.")
+            if payment_status == "All":
+                st.info("No more services in the selected date range.")
+            else:
+                st.info(f"No {payment_status.lower()} services found in the selected date range.")
             return
 
         current_date = None
@@ -530,27 +673,33 @@ class CompletedServicesPage:
             if st.session_state.get('debug_mode'):
                 st.exception(e)
 
-    def _display_summary_statistics(self, df: pd.DataFrame) -> None:
-        """Display summary statistics in a mobile-friendly format"""
+    def _display_summary_statistics(self, summary: Dict[str, Any]) -> None:
+        """Display totals for the whole date range in a mobile-friendly format"""
         st.markdown("### Summary")
         
-        # Calculate statistics
-        total_services = len(df)
-        total_amount = df['AMOUNT'].astype(float).sum()
-        total_received = (df['AMOUNT_RECEIVED'].astype(float).sum() + 
-                         df['DEPOSIT'].astype(float).sum())
-        total_outstanding = total_amount - total_received
-        total_unpaid = len(df[df['PAYMENT_STATUS'] == 'Unpaid'])
-        
         # Display metrics in a grid
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Total Services", total_services)
-            st.metric("Total Amount", format_currency(total_amount))
+            st.metric("Total Services", summary['TOTAL_SERVICES'])
+            st.metric("Total Amount", format_currency(summary['TOTAL_AMOUNT']))
+            st.metric("Total Discounts", format_currency(summary['TOTAL_DISCOUNT']))
         
         with col2:
-            st.metric("Outstanding Balance", format_currency(total_outstanding))
-            st.metric("Unpaid Services", total_unpaid)
+            st.metric("Total Received", format_currency(summary['TOTAL_RECEIVED']))
+            st.metric("Outstanding Balance", format_currency(summary['TOTAL_OUTSTANDING']))
+            st.metric("Unpaid Services", summary['UNPAID_SERVICES'])
+        
+        if summary['PAYMENT_METHODS']:
+            st.markdown("#### Received by Payment Method")
+            st.dataframe(
+                pd.DataFrame({
+                    'Method': [method['PAYMENT_METHOD'] for method in summary['PAYMENT_METHODS']],
+                    'Payments': [method['PAYMENTS'] for method in summary['PAYMENT_METHODS']],
+                    'Received': [format_currency(method['TOTAL_RECEIVED']) for method in summary['PAYMENT_METHODS']]
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
 
 # Entry point function
 def completed_services_page():
@@ -8,6 +8,7 @@ import json
 
 from models.transaction import save_transaction
 from models.customer import CustomerModel, fetch_all_customers, save_customer, search_customers
+from models.service_address import refresh_primary_service_address
 from models.service import (
     ServiceModel,
     schedule_recurring_services,
@@ -43,6 +44,7 @@ from models.service import (
 )
 from utils.formatting import format_currency
 from utils.email import generate_service_scheduled_email
+from utils.double_booking_prevention import load_day_availability
 from database.connection import SnowflakeConnection
 
 
@@ -227,44 +229,29 @@ class ServiceScheduler:
                 st.error(f"Error converting numeric values: {str(e)}")
                 return None
 
-            query = """
-            INSERT INTO OPERATIONAL.CARPET.SERVICE_ADDRESSES (
-                CUSTOMER_ID,
-                STREET_ADDRESS,
-                CITY,
-                STATE,
-                ZIP_CODE,
-                SQUARE_FOOTAGE,
-                IS_PRIMARY_SERVICE
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-            params = [
-                customer_id_int,
-                service_street,
-                service_city,
-                service_state,
-                zip_code_int,
-                square_footage_int,
-                bool(is_primary)
-            ]
+            values = {
+                'CUSTOMER_ID': customer_id_int,
+                'STREET_ADDRESS': service_street,
+                'CITY': service_city,
+                'STATE': service_state,
+                'ZIP_CODE': zip_code_int,
+                'SQUARE_FOOTAGE': square_footage_int,
+                'IS_PRIMARY_SERVICE': bool(is_primary)
+            }
 
             if st.session_state.get('debug_mode'):
-                debug_print(f"Service Address Query: {query}")
-                debug_print(f"Service Address Params: {params}")
-                debug_print(f"Parameter types: {[type(p) for p in params]}")
-
-            snowflake_conn.execute_query(query, params)
-            result = snowflake_conn.execute_query(
-                """
-                SELECT ADDRESS_ID 
-                FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES 
-                WHERE CUSTOMER_ID = ? 
-                ORDER BY ADDRESS_ID DESC 
-                LIMIT 1
-                """,
-                [customer_id_int]
+                debug_print(f"Service Address Values: {values}")
+                debug_print(f"Parameter types: {[type(v) for v in values.values()]}")
+
+            address_id = snowflake_conn.insert_returning_id(
+                "OPERATIONAL.CARPET.SERVICE_ADDRESSES",
+                values,
+                id_column="ADDRESS_ID",
+                error_msg="Error saving service address"
             )
-            return result[0]['ADDRESS_ID'] if result else None
+            if address_id:
+                refresh_primary_service_address(snowflake_conn, customer_id=customer_id_int)
+            return address_id
 
         except Exception as e:
             st.error(f"Error saving service address: {str(e)}")
@@ -894,10 +881,8 @@ class ServiceScheduler:
                 if not selected_services:
                     selected_services = ["Standard Service"]  # Default service
                     
-                available_slots = get_available_time_slots(
-                    service_date,
-                    selected_services
-                )
+                availability = load_day_availability(service_date, selected_services)
+                available_slots = availability.available_slots()
                 if not available_slots:
                     st.warning(f"No available time slots for {service_date.strftime('%Y-%m-%d')}.")
                     return False
@@ -909,11 +894,7 @@ class ServiceScheduler:
                 )
                 if selected_time_str:
                     service_time = datetime.strptime(selected_time_str, "%I:%M %p").time()
-                    available, message = check_service_availability(
-                        service_date,
-                        service_time,
-                        selected_services
-                    )
+                    available, message, _ = availability.check(service_time)
                     if available:
                         self.form_data.service_schedule['time'] = service_time
                         return True
@@ -1010,53 +991,28 @@ class ServiceScheduler:
                 snowflake_conn.execute_query(query, params)
                 saved_customer_id = customer_id_int
             else:
-                query = """
-                INSERT INTO OPERATIONAL.CARPET.CUSTOMER (
-                    FIRST_NAME,
-                    LAST_NAME,
-                    BILLING_ADDRESS,
-                    BILLING_CITY,
-                    BILLING_STATE,
-                    BILLING_ZIP,
-                    EMAIL_ADDRESS,
-                    PHONE_NUMBER,
-                    TEXT_FLAG,
-                    COMMENTS,
-                    PRIMARY_CONTACT_METHOD,
-                    MEMBER_FLAG
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """
-                params = [
-                    clean_data['first_name'],
-                    clean_data['last_name'],
-                    clean_data['billing_address'],
-                    clean_data['billing_city'],
-                    clean_data['billing_state'],
-                    clean_data['billing_zip'],
-                    clean_data['email_address'],
-                    clean_data['phone_number'],
-                    clean_data['text_flag'],
-                    clean_data['comments'],
-                    clean_data['primary_contact_method'],
-                    clean_data['member_flag']
-                ]
+                values = {
+                    'FIRST_NAME': clean_data['first_name'],
+                    'LAST_NAME': clean_data['last_name'],
+                    'BILLING_ADDRESS': clean_data['billing_address'],
+                    'BILLING_CITY': clean_data['billing_city'],
+                    'BILLING_STATE': clean_data['billing_state'],
+                    'BILLING_ZIP': clean_data['billing_zip'],
+                    'EMAIL_ADDRESS': clean_data['email_address'],
+                    'PHONE_NUMBER': clean_data['phone_number'],
+                    'TEXT_FLAG': clean_data['text_flag'],
+                    'COMMENTS': clean_data['comments'],
+                    'PRIMARY_CONTACT_METHOD': clean_data['primary_contact_method'],
+                    'MEMBER_FLAG': clean_data['member_flag']
+                }
                 if st.session_state.get('debug_mode'):
-                    debug_print(f"Insert Query: {query}")
-                    debug_print(f"Insert Params: {params}")
-                snowflake_conn.execute_query(query, params)
-                result = snowflake_conn.execute_query(
-                    """
-                    SELECT CUSTOMER_ID 
-                    FROM OPERATIONAL.CARPET.CUSTOMER 
-                    WHERE FIRST_NAME = ? 
-                    AND LAST_NAME = ? 
-                    AND PHONE_NUMBER = ?
-                    ORDER BY ADDRESS_ID DESC 
-                    LIMIT 1
-                    """,
-                    [clean_data['first_name'], clean_data['last_name'], clean_data['phone_number']]
+                    debug_print(f"Insert Values: {values}")
+                saved_customer_id = snowflake_conn.insert_returning_id(
+                    "OPERATIONAL.CARPET.CUSTOMER",
+                    values,
+                    id_column="CUSTOMER_ID",
+                    error_msg="Error saving customer"
                 )
-                saved_customer_id = result[0]['CUSTOMER_ID'] if result else None
 
             # Save the service address if the customer was saved successfully
             if saved_customer_id:
@@ -1663,42 +1619,25 @@ def save_account_service_address(snowflake_conn: Any, account_id: int, data: Dic
             st.error("Invalid service address ZIP code format. Please enter a 5-digit number.")
             return None
         
-        query = """
-        INSERT INTO OPERATIONAL.CARPET.SERVICE_ADDRESSES (
-            ACCOUNT_ID,
-            STREET_ADDRESS,
-            CITY,
-            STATE,
-            ZIP_CODE,
-            SQUARE_FOOTAGE,
-            IS_PRIMARY_SERVICE
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        params = [
-            account_id,  # Using proper ACCOUNT_ID field for commercial accounts
-            str(data.get('service_address', '')).strip(),
-            str(data.get('service_city', '')).strip(),
-            str(data.get('service_state', '')).strip(),
-            service_zip,
-            int(data.get('service_sq_ft', 0)),
-            bool(data.get('is_primary'))
-        ]
-        debug_print(f"Service address query params: {params}")
-        snowflake_conn.execute_query(query, params)
-        
-        # Retrieve the newly created address ID
-        result = snowflake_conn.execute_query(
-            """
-            SELECT ADDRESS_ID 
-            FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES 
-            WHERE ACCOUNT_ID = ? 
-            ORDER BY ADDRESS_ID DESC 
-            LIMIT 1
-            """,
-            [account_id]
+        values = {
+            'ACCOUNT_ID': account_id,  # Using proper ACCOUNT_ID field for commercial accounts
+            'STREET_ADDRESS': str(data.get('service_address', '')).strip(),
+            'CITY': str(data.get('service_city', '')).strip(),
+            'STATE': str(data.get('service_state', '')).strip(),
+            'ZIP_CODE': service_zip,
+            'SQUARE_FOOTAGE': int(data.get('service_sq_ft', 0)),
+            'IS_PRIMARY_SERVICE': bool(data.get('is_primary'))
+        }
+        debug_print(f"Service address values: {values}")
+        address_id = snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.SERVICE_ADDRESSES",
+            values,
+            id_column="ADDRESS_ID",
+            error_msg="Error saving service address"
         )
-        address_id = result[0]['ADDRESS_ID'] if result else None
         debug_print(f"Service address saved with ADDRESS_ID: {address_id}")
+        if address_id:
+            refresh_primary_service_address(snowflake_conn, account_id=account_id)
         return address_id
     except Exception as e:
         st.error(f"Error saving service address: {str(e)}")
@@ -1805,7 +1744,7 @@ def new_service_page():
                         if not selected_services:
                             selected_services = ["Standard Service"]
                         
-                        available_slots = get_available_time_slots(selected_date, selected_services)
+                        available_slots = load_day_availability(selected_date, selected_services).available_slots()
                         
                         if available_slots:
                             time_options = [slot.strftime('%I:%M %p') for slot in available_slots]
@@ -78,62 +78,46 @@ def create_customer(
     text_updates: bool, contact_method: str
 ) -> Optional[int]:
     """Create a new customer record and return the customer ID"""
-    query = """
-    INSERT INTO OPERATIONAL.CARPET.CUSTOMER (
-        FIRST_NAME, 
-        LAST_NAME, 
-        EMAIL_ADDRESS, 
-        PHONE_NUMBER,
-        BILLING_ADDRESS, 
-        BILLING_CITY, 
-        BILLING_STATE, 
-        BILLING_ZIP,
-        TEXT_FLAG, 
-        PRIMARY_CONTACT_METHOD
-    ) 
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
     try:
-        snowflake_conn.execute_query(query, [
-            first_name, last_name, email, phone,
-            street_address, city, state, zip_code,
-            text_updates, contact_method
-        ])
-        
-        # Get new customer ID
-        result = snowflake_conn.execute_query(
-            "SELECT CUSTOMER_ID FROM OPERATIONAL.CARPET.CUSTOMER WHERE EMAIL_ADDRESS = ?",
-            [email]
+        return snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.CUSTOMER",
+            {
+                'FIRST_NAME': first_name,
+                'LAST_NAME': last_name,
+                'EMAIL_ADDRESS': email,
+                'PHONE_NUMBER': phone,
+                'BILLING_ADDRESS': street_address,
+                'BILLING_CITY': city,
+                'BILLING_STATE': state,
+                'BILLING_ZIP': zip_code,
+                'TEXT_FLAG': text_updates,
+                'PRIMARY_CONTACT_METHOD': contact_method
+            },
+            id_column="CUSTOMER_ID",
+            error_msg="Error creating customer"
         )
-        return result[0]['CUSTOMER_ID'] if result else None
     except Exception as e:
         st.error(f"Error creating customer: {str(e)}")
         return None
 
 def register_portal_user(customer_id: int, email: str, password_hash: str) -> Optional[int]:
     """Create a new portal user and return the portal user ID"""
-    portal_query = """
-    INSERT INTO OPERATIONAL.CARPET.CUSTOMER_PORTAL_USERS (
-        CUSTOMER_ID,
-        EMAIL,
-        PASSWORD_HASH,
-        IS_ACTIVE,
-        CREATED_AT,
-        MODIFIED_AT
-    )
-    VALUES (?, ?, ?, TRUE, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP())
-    """
     try:
-        snowflake_conn.execute_query(portal_query, [
-            customer_id, email, password_hash
-        ])
-        
-        # Get portal user ID
-        result = snowflake_conn.execute_query(
-            "SELECT PORTAL_USER_ID FROM OPERATIONAL.CARPET.CUSTOMER_PORTAL_USERS WHERE CUSTOMER_ID = ?",
-            [customer_id]
+        return snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.CUSTOMER_PORTAL_USERS",
+            {
+                'CUSTOMER_ID': customer_id,
+                'EMAIL': email,
+                'PASSWORD_HASH': password_hash
+            },
+            id_column="PORTAL_USER_ID",
+            expressions={
+                'IS_ACTIVE': 'TRUE',
+                'CREATED_AT': 'CURRENT_TIMESTAMP()',
+                'MODIFIED_AT': 'CURRENT_TIMESTAMP()'
+            },
+            error_msg="Error creating portal user"
         )
-        return result[0]['PORTAL_USER_ID'] if result else None
     except Exception as e:
         st.error(f"Error creating portal user: {str(e)}")
         return None
@@ -28,10 +28,30 @@ def show_customer_portal():
         WHERE CUSTOMER_ID = ?
         """
         
-        customer = snowflake_conn.execute_query(
-            customer_query, 
-            [st.session_state.customer_id]
-        )
+        # Updated query to handle nullable fields and proper date filtering
+        upcoming_query = """
+        SELECT 
+            COALESCE(SERVICE_NAME, 'Service') as SERVICE_NAME,
+            SERVICE_DATE,
+            START_TIME,
+            COALESCE(DEPOSIT, 0) as DEPOSIT,
+            DEPOSIT_PAID,
+            COALESCE(AMOUNT, 0) as AMOUNT,
+            STATUS
+        FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION
+        WHERE CUSTOMER_ID = ?
+        AND SERVICE_DATE >= CURRENT_DATE()
+        AND SERVICE_DATE <= DATEADD(days, 30, CURRENT_DATE())
+        AND STATUS IN ('SCHEDULED', 'PENDING')
+        ORDER BY SERVICE_DATE ASC, START_TIME ASC
+        LIMIT 5
+        """
+        
+        # Independent lookups run concurrently
+        customer, upcoming = snowflake_conn.execute_many_async([
+            (customer_query, [st.session_state.customer_id]),
+            (upcoming_query, [st.session_state.customer_id])
+        ])
         
         if customer and len(customer) > 0:
             customer = customer[0]
@@ -65,30 +85,6 @@ def show_customer_portal():
             with col2:
                 st.subheader("Upcoming Appointments")
                 
-                # Updated query to handle nullable fields and proper date filtering
-                upcoming_query = """
-                SELECT 
-                    COALESCE(SERVICE_NAME, 'Service') as SERVICE_NAME,
-                    SERVICE_DATE,
-                    START_TIME,
-                    COALESCE(DEPOSIT, 0) as DEPOSIT,
-                    DEPOSIT_PAID,
-                    COALESCE(AMOUNT, 0) as AMOUNT,
-                    STATUS
-                FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION
-                WHERE CUSTOMER_ID = ?
-                AND SERVICE_DATE >= CURRENT_DATE()
-                AND SERVICE_DATE <= DATEADD(days, 30, CURRENT_DATE())
-                AND STATUS IN ('SCHEDULED', 'PENDING')
-                ORDER BY SERVICE_DATE ASC, START_TIME ASC
-                LIMIT 5
-                """
-                
-                upcoming = snowflake_conn.execute_query(
-                    upcoming_query,
-                    [st.session_state.customer_id]
-                )
-                
                 if upcoming and len(upcoming) > 0:
                     for appt in upcoming:
                         # Get service name or default
@@ -1,22 +1,30 @@
 import streamlit as st
-from datetime import datetime, timedelta, time
-from typing import Tuple
+import calendar
+import time as clock
+from datetime import datetime, date, timedelta, time
+from typing import Dict, List, Tuple
 from utils.auth.middleware import require_customer_auth
 from utils.auth.auth_utils import check_rate_limit
 from database.connection import snowflake_conn
 from pages.settings.business import fetch_business_info
-from models.service import schedule_recurring_services
-from models.service import get_available_time_slots
+from models.service import schedule_recurring_services, insert_recurring_series
+from models.service_address import refresh_primary_service_address
+from utils.double_booking_prevention import BOOKING_WINDOW_DAYS, get_availability_range
+from utils.service_utils import get_catalog_services
 from utils.sms import send_service_notification_sms
 from utils.email import generate_service_scheduled_email
 
+# Seconds the 6 month availability is reused before bookings made elsewhere are read again
+AVAILABILITY_CALENDAR_TTL = 30
+
 
 def clear_booking_session():
     """Clear all booking-related session state"""
     booking_keys = [
         'booking_step', 'selected_service', 'selected_date', 'selected_time',
         'selected_address_id', 'is_recurring', 'recurrence_pattern', 'booking_notes',
-        'booking_address'
+        'booking_address', 'availability_calendar', 'availability_calendar_key',
+        'availability_calendar_loaded_at', 'calendar_month'
     ]
     for key in booking_keys:
         if key in st.session_state:
@@ -73,51 +81,18 @@ def get_business_hours(date: datetime.date) -> Tuple[time, time]:
     return opening_time, closing_time
 
 
-def handle_recurring_bookings(service, base_date, time_slot, address_id, customer_id, pattern, notes):
-    """Handle recurring bookings for a service."""
-    booking_query = """
-    INSERT INTO OPERATIONAL.CARPET.SERVICE_TRANSACTION (
-        SERVICE_ID,
-        CUSTOMER_ID,
-        ADDRESS_ID,
-        PYMT_MTHD_1,
-        TRANSACTION_DATE,
-        TRANSACTION_TIME,
-        AMOUNT,
-        DEPOSIT,
-        START_TIME,
-        END_TIME,
-        STATUS,
-        SERVICE_DATE,
-        IS_RECURRING,
-        RECURRENCE_PATTERN,
-        COMMENTS,
-        SERVICE_NAME
-    ) VALUES (
-        :1,                -- SERVICE_ID
-        :2,                -- CUSTOMER_ID
-        :3,                -- ADDRESS_ID
-        NULL,              -- PYMT_MTHD_1
-        :4,                -- TRANSACTION_DATE
-        :5,                -- TRANSACTION_TIME
-        :6,                -- AMOUNT
-        0,                 -- DEPOSIT
-        :7,                -- START_TIME
-        :8,                -- END_TIME
-        'SCHEDULED',       -- STATUS
-        :9,                -- SERVICE_DATE
-        TRUE,              -- IS_RECURRING
-        :10,               -- RECURRENCE_PATTERN
-        :11,               -- COMMENTS
-        :12                -- SERVICE_NAME
-    )
+def handle_recurring_bookings(service, base_date, time_slot, address_id, customer_id, pattern, notes, skip_dates=None):
+    """Handle recurring bookings for a service with a single bulk insert.
+
+    Returns the new transaction IDs, or None if the series could not be saved.
     """
-    
+    skip_dates = set(skip_dates or [])
     current_date = base_date
     # Use dictionary-style access instead of .get() method
     service_duration = service['SERVICE_DURATION'] if 'SERVICE_DURATION' in service else 60
     end_time = (datetime.combine(base_date, time_slot) + timedelta(minutes=service_duration)).time()
     
+    future_dates = []
     for _ in range(24):  # 6 months max
         if pattern == "Weekly":
             current_date += timedelta(days=7)
@@ -134,22 +109,32 @@ def handle_recurring_bookings(service, base_date, time_slot, address_id, custome
             
         if current_date.weekday() == 6:  # Skip Sundays
             continue
+
+        if current_date in skip_dates:  # Skip conflicted dates
+            continue
         
-        snowflake_conn.execute_query(booking_query, [
-        service['SERVICE_ID'],           # SERVICE_ID
-        customer_id,                     # CUSTOMER_ID
-        address_id,                      # ADDRESS_ID
-        current_date,                    # TRANSACTION_DATE
-        time_slot,                       # TRANSACTION_TIME
-        float(service['COST']),          # AMOUNT
-        time_slot,                       # START_TIME
-        end_time,                        # END_TIME
-        current_date,                    # SERVICE_DATE
-        pattern,                         # RECURRENCE_PATTERN
-        notes,                           # COMMENTS
-        service['SERVICE_NAME'],         # SERVICE_NAME
-        float(service['COST'])           # BASE_SERVICE_COST
-    ])
+        future_dates.append(current_date)
+
+    return insert_recurring_series(
+        base_values={
+            'SERVICE_ID': service['SERVICE_ID'],
+            'CUSTOMER_ID': customer_id,
+            'ADDRESS_ID': address_id,
+            'TRANSACTION_TIME': time_slot,
+            'AMOUNT': float(service['COST']),
+            'DEPOSIT': 0,
+            'START_TIME': time_slot,
+            'END_TIME': end_time,
+            'STATUS': 'SCHEDULED',
+            'IS_RECURRING': True,
+            'RECURRENCE_PATTERN': pattern,
+            'COMMENTS': notes,
+            'SERVICE_NAME': service['SERVICE_NAME'],
+            'BASE_SERVICE_COST': float(service['COST'])
+        },
+        service_dates=future_dates,
+        date_columns=('TRANSACTION_DATE', 'SERVICE_DATE')
+    )
 
 def get_additional_services(service_id):
     """
@@ -209,12 +194,63 @@ def clear_booking_session():
         'selected_address_id',
         'is_recurring',
         'recurrence_pattern',
-        'booking_notes'
+        'booking_notes',
+        'availability_calendar',
+        'availability_calendar_key',
+        'availability_calendar_loaded_at',
+        'calendar_month'
     ]
     for key in booking_keys:
         if key in st.session_state:
             del st.session_state[key]
 
+def display_availability_calendar(
+    availability: Dict[date, List[time]],
+    min_date: date,
+    max_date: date,
+    selected_date: date
+) -> None:
+    """Render a month grid of bookable dates, greying out days with no open times."""
+    months = []
+    for day in sorted(availability):
+        if (day.year, day.month) not in months:
+            months.append((day.year, day.month))
+    if not months:
+        return
+
+    if st.session_state.get('calendar_month') not in months:
+        st.session_state.calendar_month = (selected_date.year, selected_date.month)
+    year, month = st.selectbox(
+        "Month",
+        options=months,
+        format_func=lambda ym: date(ym[0], ym[1], 1).strftime('%B %Y'),
+        key="calendar_month"
+    )
+
+    header = st.columns(7)
+    for col, day_name in zip(header, ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']):
+        col.markdown(f"**{day_name}**")
+
+    for week in calendar.Calendar(firstweekday=6).monthdatescalendar(year, month):
+        cols = st.columns(7)
+        for col, day in zip(cols, week):
+            with col:
+                if day.month != month or day < min_date or day > max_date:
+                    st.write("")
+                    continue
+                open_slots = availability.get(day, [])
+                if st.button(
+                    str(day.day),
+                    key=f"cal_day_{day.isoformat()}",
+                    disabled=not open_slots,
+                    type="primary" if day == selected_date else "secondary",
+                    help=f"{len(open_slots)} open times" if open_slots else "No availability",
+                    use_container_width=True
+                ):
+                    st.session_state.selected_date = day
+                    st.session_state.selected_time = None
+                    st.rerun()
+
 @require_customer_auth
 def book_service_page():
     """Service booking page with service address selection"""
@@ -315,20 +351,7 @@ def book_service_page():
     # Step 2: Service Selection
     elif st.session_state.booking_step == 2:
         st.subheader("Select Service")
-        services_query = """
-        SELECT 
-            SERVICE_ID,
-            SERVICE_NAME,
-            SERVICE_DESCRIPTION,
-            SERVICE_CATEGORY,
-            COST,
-            SERVICE_DURATION
-        FROM OPERATIONAL.CARPET.SERVICES
-        WHERE ACTIVE_STATUS = TRUE
-        AND CUSTOMER_BOOKABLE = TRUE
-        ORDER BY SERVICE_CATEGORY, SERVICE_NAME
-        """
-        services = snowflake_conn.execute_query(services_query)
+        services = get_catalog_services(active_only=True, customer_bookable=True)
         if not services:
             st.error("No services available for booking")
             return
@@ -366,28 +389,36 @@ def book_service_page():
     elif st.session_state.booking_step == 3:
         st.subheader("Select Date and Time")
         
+        min_date = datetime.now().date()
+        max_date = min_date + timedelta(days=BOOKING_WINDOW_DAYS)
+        
+        # Use the selected service to get more accurate time slots
+        service_name = st.session_state.selected_service['SERVICE_NAME'] if st.session_state.selected_service else "Standard Service"
+        
+        # Compute the whole 6 month window at once; date and time changes are answered from
+        # session state until it is AVAILABILITY_CALENDAR_TTL seconds old
+        calendar_key = (service_name, min_date)
+        loaded_at = st.session_state.get('availability_calendar_loaded_at', 0.0)
+        if (st.session_state.get('availability_calendar_key') != calendar_key
+                or clock.monotonic() - loaded_at >= AVAILABILITY_CALENDAR_TTL):
+            st.session_state.availability_calendar = get_availability_range(min_date, max_date, [service_name])
+            st.session_state.availability_calendar_key = calendar_key
+            st.session_state.availability_calendar_loaded_at = clock.monotonic()
+        availability = st.session_state.availability_calendar
+        
+        selected_date = st.session_state.selected_date
+        if not selected_date or selected_date < min_date or selected_date > max_date:
+            selected_date = next((day for day in sorted(availability) if availability[day]), min_date)
+        
         col1, col2 = st.columns(2)
         with col1:
-            min_date = datetime.now().date()
-            max_date = min_date + timedelta(days=180)
-            
-            selected_date = st.date_input(
-                "Service Date",
-                min_value=min_date,
-                max_value=max_date,
-                value=st.session_state.selected_date or min_date,
-                help="Select a date within the next 6 months"
-            )
-            
-            # if selected_date and selected_date.weekday() == 6:
-            #     st.error("We are closed on Sundays. Please select another date.")
-            #     return
+            st.write("**Service Date** (next 6 months)")
+            display_availability_calendar(availability, min_date, max_date, selected_date)
         
         with col2:
             if selected_date:
-                # Use the selected service to get more accurate time slots
-                service_name = st.session_state.selected_service['SERVICE_NAME'] if st.session_state.selected_service else "Standard Service"
-                times = get_available_time_slots(selected_date, [service_name])
+                st.write(f"**{selected_date.strftime('%A, %B %d, %Y')}**")
+                times = availability.get(selected_date, [])
                 
                 if not times:
                     st.warning("No available times for selected date")
@@ -399,20 +430,8 @@ def book_service_page():
                     )
                     
                     if selected_time:
-                        # Double-check availability before confirming
-                        from utils.double_booking_prevention import check_for_booking_conflicts
-                        is_available, error_message, conflicts = check_for_booking_conflicts(
-                            service_date=selected_date,
-                            service_time=selected_time,
-                            service_names=[service_name]
-                        )
-                        
-                        if is_available:
-                            st.session_state.selected_date = selected_date
-                            st.session_state.selected_time = selected_time
-                        else:
-                            st.error(f"⚠️ {error_message}")
-                            st.info("Please select a different time slot.")
+                        st.session_state.selected_date = selected_date
+                        st.session_state.selected_time = selected_time
         
         col1, col2, col3 = st.columns([1, 1, 1])
         with col1:
@@ -532,21 +551,8 @@ def book_service_page():
         with col3:
             if st.button("Confirm Booking", type="primary", use_container_width=True):
                 try:
-                    # Final availability check before booking
-                    from utils.double_booking_prevention import check_for_booking_conflicts
                     service_name = service['SERVICE_NAME']
                     
-                    is_available, error_message, conflicts = check_for_booking_conflicts(
-                        service_date=st.session_state.selected_date,
-                        service_time=st.session_state.selected_time,
-                        service_names=[service_name]
-                    )
-                    
-                    if not is_available:
-                        st.error(f"❌ Booking failed: {error_message}")
-                        st.info("Please select a different time slot and try again.")
-                        return
-                    
                     # Calculate end time based on service duration
                     service_duration = service['SERVICE_DURATION'] if 'SERVICE_DURATION' in service else 60
                     end_time = (datetime.combine(st.session_state.selected_date, 
@@ -565,94 +571,54 @@ def book_service_page():
                             booking_address.get('zip_code', '').strip()
                         ]):
                             # Only save if address has some content
-                            address_query = """
-                            INSERT INTO OPERATIONAL.CARPET.SERVICE_ADDRESSES (
-                                CUSTOMER_ID, STREET_ADDRESS, CITY, STATE, ZIP_CODE
-                            ) VALUES (?, ?, ?, ?, ?)
-                            """
-                            snowflake_conn.execute_query(address_query, [
-                                st.session_state.customer_id,
-                                booking_address.get('street_address', '').strip(),
-                                booking_address.get('city', '').strip(),
-                                booking_address.get('state', '').strip(),
-                                booking_address.get('zip_code', '').strip()
-                            ])
-                            
-                            # Get the created address ID
-                            get_id_query = """
-                            SELECT ADDRESS_ID FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES
-                            WHERE CUSTOMER_ID = ? AND STREET_ADDRESS = ? AND CITY = ? AND STATE = ? AND ZIP_CODE = ?
-                            ORDER BY ADDRESS_ID DESC LIMIT 1
-                            """
-                            result = snowflake_conn.execute_query(get_id_query, [
-                                st.session_state.customer_id,
-                                booking_address.get('street_address', '').strip(),
-                                booking_address.get('city', '').strip(),
-                                booking_address.get('state', '').strip(),
-                                booking_address.get('zip_code', '').strip()
-                            ])
-                            address_id = result[0]['ADDRESS_ID'] if result else None
+                            address_id = snowflake_conn.insert_returning_id(
+                                "OPERATIONAL.CARPET.SERVICE_ADDRESSES",
+                                {
+                                    'CUSTOMER_ID': st.session_state.customer_id,
+                                    'STREET_ADDRESS': booking_address.get('street_address', '').strip(),
+                                    'CITY': booking_address.get('city', '').strip(),
+                                    'STATE': booking_address.get('state', '').strip(),
+                                    'ZIP_CODE': booking_address.get('zip_code', '').strip()
+                                },
+                                id_column="ADDRESS_ID",
+                                error_msg="Error saving service address"
+                            )
+                            if address_id:
+                                refresh_primary_service_address(
+                                    snowflake_conn, customer_id=st.session_state.customer_id
+                                )
                         else:
                             # Use a temporary address ID (we'll handle this in the service transaction)
                             address_id = None
                     
-                    # Save booking
-                    booking_query = """
-                    INSERT INTO OPERATIONAL.CARPET.SERVICE_TRANSACTION (
-                        SERVICE_ID,
-                        CUSTOMER_ID,
-                        ADDRESS_ID,
-                        PYMT_MTHD_1,
-                        TRANSACTION_DATE,
-                        TRANSACTION_TIME,
-                        AMOUNT,
-                        DEPOSIT,
-                        START_TIME,
-                        END_TIME,
-                        STATUS,
-                        SERVICE_DATE,
-                        IS_RECURRING,
-                        RECURRENCE_PATTERN,
-                        COMMENTS,
-                        SERVICE_NAME,
-                        BASE_SERVICE_COST  -- Add this column
-                    ) VALUES (
-                        :1,                -- SERVICE_ID
-                        :2,                -- CUSTOMER_ID
-                        :3,                -- ADDRESS_ID
-                        NULL,              -- PYMT_MTHD_1
-                        :4,                -- TRANSACTION_DATE
-                        :5,                -- TRANSACTION_TIME
-                        :6,                -- AMOUNT
-                        0,                 -- DEPOSIT
-                        :7,                -- START_TIME
-                        :8,                -- END_TIME
-                        'SCHEDULED',       -- STATUS
-                        :9,                -- SERVICE_DATE
-                        :10,               -- IS_RECURRING
-                        :11,               -- RECURRENCE_PATTERN
-                        :12,               -- COMMENTS
-                        :13,               -- SERVICE_NAME
-                        :6                 -- BASE_SERVICE_COST (same as AMOUNT)
-                    )
-                    """
+                    # Save booking; the slot is re-checked in the same transaction as the insert
+                    from utils.double_booking_prevention import book_service_slot
+                    transaction_id, error_message, conflicts = book_service_slot({
+                        'SERVICE_ID': service['SERVICE_ID'],
+                        'CUSTOMER_ID': st.session_state.customer_id,
+                        'ADDRESS_ID': address_id,
+                        'TRANSACTION_DATE': st.session_state.selected_date,
+                        'TRANSACTION_TIME': st.session_state.selected_time,
+                        'AMOUNT': float(service['COST']),
+                        'DEPOSIT': 0,
+                        'START_TIME': st.session_state.selected_time,
+                        'END_TIME': end_time,
+                        'STATUS': 'SCHEDULED',
+                        'SERVICE_DATE': st.session_state.selected_date,
+                        'IS_RECURRING': st.session_state.is_recurring,
+                        'RECURRENCE_PATTERN': st.session_state.recurrence_pattern,
+                        'COMMENTS': st.session_state.booking_notes,
+                        'SERVICE_NAME': service['SERVICE_NAME'],
+                        'BASE_SERVICE_COST': float(service['COST'])  # Same as AMOUNT
+                    }, [service_name])
                     
-                    # Execute booking query
-                    snowflake_conn.execute_query(booking_query, [
-                        service['SERVICE_ID'],                   # SERVICE_ID
-                        st.session_state.customer_id,           # CUSTOMER_ID
-                        address_id,                             # ADDRESS_ID
-                        st.session_state.selected_date,         # TRANSACTION_DATE
-                        st.session_state.selected_time,         # TRANSACTION_TIME
-                        float(service['COST']),                 # AMOUNT
-                        st.session_state.selected_time,         # START_TIME
-                        end_time,                               # END_TIME
-                        st.session_state.selected_date,         # SERVICE_DATE
-                        st.session_state.is_recurring,          # IS_RECURRING
-                        st.session_state.recurrence_pattern,    # RECURRENCE_PATTERN
-                        st.session_state.booking_notes,         # COMMENTS
-                        service['SERVICE_NAME']                 # SERVICE_NAME
-                    ])
+                    if transaction_id is None:
+                        # The slot was taken since the calendar was loaded; read it again on the next run
+                        st.session_state.pop('availability_calendar_key', None)
+                        if error_message:
+                            st.error(f"❌ Booking failed: {error_message}")
+                            st.info("Please select a different time slot and try again.")
+                        return
                     
                     # Handle recurring bookings if needed
                     if st.session_state.is_recurring:
@@ -680,7 +646,8 @@ def book_service_page():
                             address_id=st.session_state.selected_address_id,
                             customer_id=st.session_state.customer_id,
                             pattern=st.session_state.recurrence_pattern,
-                            notes=st.session_state.booking_notes
+                            notes=st.session_state.booking_notes,
+                            skip_dates=conflict_dates
                         )
                     
                     # Send confirmation notification
@@ -24,10 +24,6 @@ def service_history_page():
                 value=datetime.now().date()
             )
 
-        # Initialize query parameters
-        params = [st.session_state.customer_id, start_date, end_date]
-        selected_service = 'All'  # Default value
-            
         # Base query for services
         base_query = """
         SELECT 
@@ -49,6 +45,7 @@ def service_history_page():
         WHERE t.CUSTOMER_ID = ?
         AND t.STATUS = 'COMPLETED'
         AND t.SERVICE_DATE BETWEEN ? AND ?
+        ORDER BY t.SERVICE_DATE DESC, t.START_TIME DESC
         """
             
         # Service type filter
@@ -60,27 +57,21 @@ def service_history_page():
         ORDER BY SERVICE_NAME
         """
         
-        services = snowflake_conn.execute_query(
-            service_query, 
-            [st.session_state.customer_id]
-        )
+        # Both queries run concurrently; the service type filter is applied in memory
+        service_types_result, services = snowflake_conn.execute_many_async([
+            (service_query, [st.session_state.customer_id]),
+            (base_query, [st.session_state.customer_id, start_date, end_date])
+        ])
         
-        if services:
-            service_types = ['All'] + [s['SERVICE_NAME'] for s in services]
+        if service_types_result:
+            service_types = ['All'] + [s['SERVICE_NAME'] for s in service_types_result]
             selected_service = st.selectbox(
                 "Service Type",
                 options=service_types
             )
         
-            if selected_service != 'All':
-                base_query += " AND t.SERVICE_NAME = ?"
-                params.append(selected_service)
-        
-        # Add ordering
-        base_query += " ORDER BY t.SERVICE_DATE DESC, t.START_TIME DESC"
-        
-        # Execute final query
-        services = snowflake_conn.execute_query(base_query, params)
+            if selected_service != 'All' and services:
+                services = [s for s in services if s['SERVICE_NAME'] == selected_service]
         
         if not services:
             st.info("No completed services found for the selected criteria")
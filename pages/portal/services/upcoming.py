@@ -3,6 +3,7 @@ import streamlit as st
 from datetime import datetime, timedelta
 from utils.auth.middleware import require_customer_auth
 from database.connection import snowflake_conn
+from utils.double_booking_prevention import booking_changes
 
 @require_customer_auth
 def upcoming_services_page():
@@ -222,11 +223,14 @@ def upcoming_services_page():
                             WHERE ID = ?
                             """
                             
-                            snowflake_conn.execute_query(update_query, [
-                                new_date,
-                                datetime.strptime(new_time, "%I:%M %p").time(),
-                                service['TRANSACTION_ID']
-                            ])
+                            new_start_time = datetime.strptime(new_time, "%I:%M %p").time()
+                            with booking_changes() as changes:
+                                if snowflake_conn.execute_query(update_query, [
+                                    new_date,
+                                    new_start_time,
+                                    service['TRANSACTION_ID']
+                                ]) is not None:
+                                    changes.moved(service['TRANSACTION_ID'], new_date, new_start_time)
                             
                             st.session_state.pop('show_reschedule', None)
                             st.session_state.pop('reschedule_service', None)
@@ -314,10 +318,12 @@ def upcoming_services_page():
                         WHERE ID = ?
                         """
                         
-                        snowflake_conn.execute_query(update_query, [
-                            cancel_notes,
-                            service['TRANSACTION_ID']
-                        ])
+                        with booking_changes() as changes:
+                            if snowflake_conn.execute_query(update_query, [
+                                cancel_notes,
+                                service['TRANSACTION_ID']
+                            ]) is not None:
+                                changes.cancelled(service['TRANSACTION_ID'])
                         
                         st.session_state.pop('show_cancel', None)
                         st.session_state.pop('cancel_service', None)
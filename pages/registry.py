@@ -0,0 +1,97 @@
+# pages/registry.py
+"""
+Page functions imported on first navigation.
+
+main.py routes through these registries instead of importing every page
+module up front, so a cold start only loads the modules the login page
+needs. The first call to a page imports its module and records how long
+that took as a startup step.
+"""
+
+import importlib
+import time
+from typing import Any, Callable, Dict, Optional
+
+from database.instrumentation import record_startup
+
+class LazyPage:
+    """Callable that imports `module` and calls its `attribute` when first used"""
+
+    def __init__(self, module: str, attribute: str):
+        self.module = module
+        self.attribute = attribute
+        self._page: Optional[Callable[..., Any]] = None
+
+    def load(self) -> Callable[..., Any]:
+        """Import the page module if needed and return the page function"""
+        if self._page is None:
+            start = time.perf_counter()
+            page = getattr(importlib.import_module(self.module), self.attribute)
+            record_startup(f"page {self.module}", time.perf_counter() - start)
+            self._page = page
+        return self._page
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._page is not None else "not loaded"
+        return f"<LazyPage {self.module}.{self.attribute} ({state})>"
+
+def lazy_page(path: str) -> LazyPage:
+    """
+    Create a LazyPage from a "package.module:function" path
+
+    Args:
+        path (str): Module and page function separated by a colon
+
+    Returns:
+        LazyPage: Page that imports its module on first call
+    """
+    module, _, attribute = path.partition(':')
+    return LazyPage(module, attribute)
+
+# Login, registration and password reset
+AUTH_PAGES: Dict[str, LazyPage] = {
+    'login': lazy_page('pages.auth.unified_login:unified_login_page'),
+    'business_register': lazy_page('pages.auth.business_register:business_register_page'),
+    'register': lazy_page('pages.portal.auth.register:register_customer_page'),
+    'reset': lazy_page('pages.auth.unified_reset:unified_reset_page')
+}
+
+# Business portal
+BUSINESS_PAGES: Dict[str, LazyPage] = {
+    'new_service': lazy_page('pages.new_service:new_service_page'),
+    'scheduled_services': lazy_page('pages.scheduled:scheduled_services_page'),
+    'completed_services': lazy_page('pages.completed:completed_services_page'),
+    'transaction_details': lazy_page('pages.transaction_details:transaction_details_page')
+}
+
+# Customer portal
+PORTAL_PAGES: Dict[str, LazyPage] = {
+    'register': AUTH_PAGES['register'],
+    'portal_home': lazy_page('pages.portal.home:show_customer_portal'),
+    'book_service': lazy_page('pages.portal.services.book:book_service_page'),
+    'service_history': lazy_page('pages.portal.services.history:service_history_page'),
+    'upcoming_services': lazy_page('pages.portal.services.upcoming:upcoming_services_page'),
+    'profile': lazy_page('pages.portal.account.profile:profile_page')
+}
+
+# Business settings, keyed by st.session_state.settings_page
+SETTINGS_PAGES: Dict[str, LazyPage] = {
+    'business': lazy_page('pages.settings.business:business_settings_page'),
+    'services': lazy_page('pages.settings.services:services_settings_page'),
+    'employees': lazy_page('pages.settings.employees:employees_settings_page'),
+    'accounts': lazy_page('pages.settings.accounts:accounts_settings_page'),
+    'communications': lazy_page('pages.settings.customer_communications:customer_communications_page'),
+    'pricing': lazy_page('pages.settings.pricing_settings:pricing_settings_page')
+}
+
+__all__ = [
+    'LazyPage',
+    'lazy_page',
+    'AUTH_PAGES',
+    'BUSINESS_PAGES',
+    'PORTAL_PAGES',
+    'SETTINGS_PAGES'
+]
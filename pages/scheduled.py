@@ -1,13 +1,22 @@
 import streamlit as st
 from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
 import pandas as pd
 from models.service import ServiceModel
-from utils.formatting import format_currency, format_date, format_time, add_back_navigation
+from utils.formatting import (
+    format_currency, format_date, format_time, add_back_navigation, render_page_navigation
+)
 from database.connection import SnowflakeConnection
 from utils.null_handling import safe_get_float, safe_get_int, safe_get_string, safe_get_bool
 
 # Removed unused store_service_session_data function - using handle_service_start instead
 
+# Cards built per page; the page fetches one extra row to know whether another page follows
+SCHEDULED_PAGE_SIZE = 25
+
+# Services without a start time sort after the day's timed services
+_SORT_TIME = "COALESCE(ST.START_TIME, CAST('23:59:59' AS TIME))"
+
 def update_service_status(snowflake_conn: SnowflakeConnection, transaction_id: int, status: str = 'IN_PROGRESS') -> None:
     """
     Update the status of a service transaction.
@@ -200,6 +209,112 @@ def render_service_card(row: pd.Series, snowflake_conn: SnowflakeConnection) ->
                         handle_service_restart(snowflake_conn, row)
                         st.rerun()
 
+def service_cursor(row: pd.Series) -> Tuple[Any, Any, int]:
+    """Keyset position of a service row: (SERVICE_DATE, SORT_TIME, TRANSACTION_ID)"""
+    return row['SERVICE_DATE'], row['SORT_TIME'], int(row['TRANSACTION_ID'])
+
+def fetch_scheduled_services(snowflake_conn: SnowflakeConnection,
+                             start_date,
+                             end_date,
+                             after: Optional[Tuple[Any, Any, int]] = None,
+                             limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    Fetch scheduled, in-progress and cancelled services in a date range.
+    
+    Rows are ordered by (SERVICE_DATE, START_TIME, ID), with missing start
+    times last, so a page can start right after the previous page's last row.
+    
+    Args:
+        snowflake_conn: Snowflake connection instance
+        start_date: First service date (inclusive)
+        end_date: Last service date (inclusive)
+        after: service_cursor of the row before the first one to return
+        limit: Maximum rows to return (all rows if None)
+        
+    Returns:
+        DataFrame with one row per service, ordered by date and start time
+    """
+    params = [start_date, end_date]
+    keyset = ""
+    if after is not None:
+        after_date, after_time, after_id = after
+        keyset = f"""
+    AND (ST.SERVICE_DATE > ?
+         OR (ST.SERVICE_DATE = ? AND ({_SORT_TIME} > ?
+             OR ({_SORT_TIME} = ? AND ST.ID > ?))))"""
+        params += [after_date, after_date, after_time, after_time, int(after_id)]
+    limit_clause = f"\n    LIMIT {int(limit)}" if limit else ""
+    
+    query = f"""
+    SELECT DISTINCT
+        ST.ID as TRANSACTION_ID,
+        ST.SERVICE_ID,
+        COALESCE(ST.SERVICE_NAME, S.SERVICE_NAME, 'Unknown Service') as SERVICE_NAME,
+        ST.CUSTOMER_ID,
+        ST.ACCOUNT_ID,
+        ST.DEPOSIT,
+        ST.DEPOSIT_PAID,
+        ST.SERVICE_DATE,
+        ST.START_TIME,
+        ST.STATUS,
+        CASE 
+            WHEN ST.CUSTOMER_ID IS NOT NULL THEN C.FIRST_NAME || ' ' || C.LAST_NAME
+            WHEN ST.ACCOUNT_ID IS NOT NULL THEN A.ACCOUNT_NAME
+            ELSE 'Unknown Customer'
+        END as CUSTOMER_NAME,
+        ST.COMMENTS,
+        ST.IS_RECURRING,
+        ST.RECURRENCE_PATTERN,
+        COALESCE(ST.BASE_SERVICE_COST, ST.AMOUNT, S.COST, 0) as BASE_SERVICE_COST,
+        COALESCE(PCA.STREET_ADDRESS, PAA.STREET_ADDRESS) as SERVICE_ADDRESS,
+        COALESCE(PCA.CITY, PAA.CITY) as SERVICE_CITY,
+        COALESCE(PCA.STATE, PAA.STATE) as SERVICE_STATE,
+        COALESCE(PCA.ZIP_CODE, PAA.ZIP_CODE) as SERVICE_ZIP,
+        {_SORT_TIME} as SORT_TIME
+    FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION ST
+    LEFT JOIN OPERATIONAL.CARPET.SERVICES S ON ST.SERVICE_ID = S.SERVICE_ID
+    LEFT JOIN OPERATIONAL.CARPET.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
+    LEFT JOIN OPERATIONAL.CARPET.ACCOUNTS A ON ST.ACCOUNT_ID = A.ACCOUNT_ID
+    LEFT JOIN OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES PCA ON ST.CUSTOMER_ID = PCA.CUSTOMER_ID
+    LEFT JOIN OPERATIONAL.CARPET.PRIMARY_SERVICE_ADDRESSES PAA ON ST.ACCOUNT_ID = PAA.ACCOUNT_ID
+    WHERE ST.SERVICE_DATE >= ?
+    AND ST.SERVICE_DATE <= ?
+    AND ST.STATUS IN ('SCHEDULED', 'IN_PROGRESS', 'CANCELLED')  -- Include scheduled, in-progress, and cancelled{keyset}
+    ORDER BY ST.SERVICE_DATE, SORT_TIME, ST.ID{limit_clause}
+    """
+    
+    services_df = snowflake_conn.execute_query_df(query, params)
+    return services_df if services_df is not None else pd.DataFrame()
+
+def fetch_scheduled_summary(snowflake_conn: SnowflakeConnection, start_date, end_date) -> Dict[str, int]:
+    """
+    Count the services in a date range without fetching them.
+    
+    Args:
+        snowflake_conn: Snowflake connection instance
+        start_date: First service date (inclusive)
+        end_date: Last service date (inclusive)
+        
+    Returns:
+        Dictionary with TOTAL_SERVICES, PENDING_DEPOSITS and CONFIRMED_DEPOSITS
+    """
+    query = """
+    SELECT
+        COUNT(*) as TOTAL_SERVICES,
+        SUM(CASE WHEN COALESCE(DEPOSIT, 0) > 0 AND NOT COALESCE(DEPOSIT_PAID, FALSE) THEN 1 ELSE 0 END) as PENDING_DEPOSITS,
+        SUM(CASE WHEN COALESCE(DEPOSIT, 0) > 0 AND DEPOSIT_PAID = TRUE THEN 1 ELSE 0 END) as CONFIRMED_DEPOSITS
+    FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION
+    WHERE SERVICE_DATE >= ?
+    AND SERVICE_DATE <= ?
+    AND STATUS IN ('SCHEDULED', 'IN_PROGRESS', 'CANCELLED')
+    """
+    result = snowflake_conn.execute_query(query, [start_date, end_date])
+    summary = result[0] if result else {}
+    return {
+        column: int(summary.get(column) or 0)
+        for column in ('TOTAL_SERVICES', 'PENDING_DEPOSITS', 'CONFIRMED_DEPOSITS')
+    }
+
 def scheduled_services_page():
     """Display scheduled services page with improved error handling"""
     try:
@@ -272,119 +387,115 @@ def scheduled_services_page():
         )
         st.session_state.scheduled_end_date = end_date
 
+    # Each visited page's starting cursor; the last one is the page shown
+    range_key = (start_date, end_date)
+    if st.session_state.get('scheduled_range_key') != range_key:
+        st.session_state.scheduled_range_key = range_key
+        st.session_state.scheduled_cursors = [None]
+    cursors = st.session_state.scheduled_cursors
+
     try:
-        query = """
-        WITH RankedCustomerAddresses AS (
-            SELECT 
-                CUSTOMER_ID,
-                STREET_ADDRESS,
-                CITY,
-                STATE,
-                ZIP_CODE,
-                ROW_NUMBER() OVER (PARTITION BY CUSTOMER_ID ORDER BY 
-                    CASE WHEN IS_PRIMARY_SERVICE = TRUE THEN 0 ELSE 1 END,
-                    ADDRESS_ID DESC
-                ) as rn
-            FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES
-            WHERE CUSTOMER_ID IS NOT NULL AND ACCOUNT_ID IS NULL
-        ),
-        RankedAccountAddresses AS (
-            SELECT 
-                ACCOUNT_ID,
-                STREET_ADDRESS,
-                CITY,
-                STATE,
-                ZIP_CODE,
-                ROW_NUMBER() OVER (PARTITION BY ACCOUNT_ID ORDER BY 
-                    CASE WHEN IS_PRIMARY_SERVICE = TRUE THEN 0 ELSE 1 END,
-                    ADDRESS_ID DESC
-                ) as rn
-            FROM OPERATIONAL.CARPET.SERVICE_ADDRESSES
-            WHERE ACCOUNT_ID IS NOT NULL
+        summary = fetch_scheduled_summary(snowflake_conn, start_date, end_date)
+        if not summary['TOTAL_SERVICES']:
+            st.info("No services scheduled for the selected date range.")
+            return
+        
+        view = st.radio("View", ["Cards", "Table"], horizontal=True, key="scheduled_view")
+        
+        page_df = fetch_scheduled_services(
+            snowflake_conn, start_date, end_date,
+            after=cursors[-1], limit=SCHEDULED_PAGE_SIZE + 1
         )
-        SELECT DISTINCT
-            ST.ID as TRANSACTION_ID,
-            ST.SERVICE_ID,
-            COALESCE(ST.SERVICE_NAME, S.SERVICE_NAME, 'Unknown Service') as SERVICE_NAME,
-            ST.CUSTOMER_ID,
-            ST.ACCOUNT_ID,
-            ST.DEPOSIT,
-            ST.DEPOSIT_PAID,
-            ST.SERVICE_DATE,
-            ST.START_TIME,
-            ST.STATUS,
-            CASE 
-                WHEN ST.CUSTOMER_ID IS NOT NULL THEN C.FIRST_NAME || ' ' || C.LAST_NAME
-                WHEN ST.ACCOUNT_ID IS NOT NULL THEN A.ACCOUNT_NAME
-                ELSE 'Unknown Customer'
-            END as CUSTOMER_NAME,
-            ST.COMMENTS,
-            ST.IS_RECURRING,
-            ST.RECURRENCE_PATTERN,
-            COALESCE(ST.BASE_SERVICE_COST, ST.AMOUNT, S.COST, 0) as BASE_SERVICE_COST,
-            COALESCE(RCA.STREET_ADDRESS, RAA.STREET_ADDRESS) as SERVICE_ADDRESS,
-            COALESCE(RCA.CITY, RAA.CITY) as SERVICE_CITY,
-            COALESCE(RCA.STATE, RAA.STATE) as SERVICE_STATE,
-            COALESCE(RCA.ZIP_CODE, RAA.ZIP_CODE) as SERVICE_ZIP
-        FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION ST
-        LEFT JOIN OPERATIONAL.CARPET.SERVICES S ON ST.SERVICE_ID = S.SERVICE_ID
-        LEFT JOIN OPERATIONAL.CARPET.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
-        LEFT JOIN OPERATIONAL.CARPET.ACCOUNTS A ON ST.ACCOUNT_ID = A.ACCOUNT_ID
-        LEFT JOIN RankedCustomerAddresses RCA ON ST.CUSTOMER_ID = RCA.CUSTOMER_ID AND RCA.rn = 1
-        LEFT JOIN RankedAccountAddresses RAA ON ST.ACCOUNT_ID = RAA.ACCOUNT_ID AND RAA.rn = 1
-        WHERE ST.SERVICE_DATE >= ?
-        AND ST.SERVICE_DATE <= ?
-        AND ST.STATUS IN ('SCHEDULED', 'IN_PROGRESS', 'CANCELLED')  -- Include scheduled, in-progress, and cancelled
-        ORDER BY ST.SERVICE_DATE, ST.START_TIME;
-        """
+        has_next_page = len(page_df) > SCHEDULED_PAGE_SIZE
+        page_df = page_df.head(SCHEDULED_PAGE_SIZE)
         
-        services_df = pd.DataFrame(snowflake_conn.execute_query(query, [start_date, end_date]))
+        if page_df.empty:
+            st.info("No more services in the selected date range.")
+        else:
+            first_row = (len(cursors) - 1) * SCHEDULED_PAGE_SIZE + 1
+            st.caption(
+                f"Showing {first_row}-{first_row + len(page_df) - 1} "
+                f"of {summary['TOTAL_SERVICES']} services"
+            )
+            if view == "Table":
+                render_service_table(page_df, snowflake_conn)
+            else:
+                current_date = None
+                for _, row in page_df.iterrows():
+                    if current_date != row['SERVICE_DATE']:
+                        current_date = row['SERVICE_DATE']
+                        st.markdown(f"### {format_date(current_date)}")
+                    
+                    render_service_card(row, snowflake_conn)
         
-        if not services_df.empty:
-            current_date = None
-            
-            for _, row in services_df.iterrows():
-                if current_date != row['SERVICE_DATE']:
-                    current_date = row['SERVICE_DATE']
-                    st.markdown(f"### {format_date(current_date)}")
-                
-                render_service_card(row, snowflake_conn)
+        render_page_navigation(
+            'scheduled',
+            cursors,
+            service_cursor(page_df.iloc[-1]) if has_next_page else None
+        )
 
-            # Summary statistics
-            render_summary_statistics(services_df)
-        else:
-            st.info("No services scheduled for the selected date range.")
+        # Summary statistics
+        render_summary_statistics(summary)
             
     except Exception as e:
         st.error(f"Failed to load scheduled services: {str(e)}")
         if st.session_state.get('debug_mode'):
             st.exception(e)
 
-def render_summary_statistics(services_df: pd.DataFrame) -> None:
+def render_service_table(page_df: pd.DataFrame, snowflake_conn: SnowflakeConnection) -> None:
+    """
+    Render one compact row per service; only the selected service gets a card with actions.
+    
+    Args:
+        page_df: Services on the current page
+        snowflake_conn: Snowflake connection instance
+    """
+    table = pd.DataFrame({
+        'Date': page_df['SERVICE_DATE'].map(lambda value: value.strftime('%a %m/%d/%Y')),
+        'Time': page_df['START_TIME'].map(lambda value: format_time(value) if pd.notnull(value) else ''),
+        'Service': page_df['SERVICE_NAME'],
+        'Customer': page_df['CUSTOMER_NAME'],
+        'Status': page_df['STATUS'],
+        'Deposit': [
+            format_currency(safe_get_float(deposit)) + (" (paid)" if safe_get_bool(paid) else "")
+            if safe_get_float(deposit) > 0 else ''
+            for deposit, paid in zip(page_df['DEPOSIT'], page_df['DEPOSIT_PAID'])
+        ],
+        'Cost': page_df['BASE_SERVICE_COST'].map(lambda value: format_currency(safe_get_float(value)))
+    })
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    
+    rows = {}
+    labels = {}
+    for index, row in page_df.iterrows():
+        transaction_id = safe_get_int(row['TRANSACTION_ID'])
+        rows[transaction_id] = row
+        labels[transaction_id] = (f"{table.at[index, 'Date']} {table.at[index, 'Time']} - "
+                                  f"{row['SERVICE_NAME']} - {row['CUSTOMER_NAME']}")
+    selected = st.selectbox(
+        "Select a service",
+        options=[None] + list(rows),
+        format_func=lambda transaction_id: "Choose a service..." if transaction_id is None else labels[transaction_id],
+        key="scheduled_selected_service"
+    )
+    if selected is not None:
+        render_service_card(rows[selected], snowflake_conn)
+
+def render_summary_statistics(summary: Dict[str, int]) -> None:
     """
-    Render summary statistics with proper null handling.
+    Render summary statistics for the whole date range.
     
     Args:
-        services_df: DataFrame containing services information
+        summary: Counts from fetch_scheduled_summary
     """
     st.markdown("### Summary")
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        st.metric("Total Services", len(services_df))
+        st.metric("Total Services", summary['TOTAL_SERVICES'])
 
     with col2:
-        pending_deposits = len(services_df[
-            (services_df['DEPOSIT'].notna()) & 
-            (services_df['DEPOSIT'] > 0) &
-            (~services_df['DEPOSIT_PAID'].fillna(False))
-        ])
-        st.metric("Pending Deposits", pending_deposits)
+        st.metric("Pending Deposits", summary['PENDING_DEPOSITS'])
 
     with col3:
-        confirmed_deposits = len(services_df[
-            (services_df['DEPOSIT'].notna()) &
-            (services_df['DEPOSIT'] > 0) &
-            (services_df['DEPOSIT_PAID'] == True)
-        ])
-        st.metric("Confirmed Deposits", confirmed_deposits)
\ No newline at end of file
+        st.metric("Confirmed Deposits", summary['CONFIRMED_DEPOSITS'])
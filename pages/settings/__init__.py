@@ -1,10 +1,20 @@
 # /pages/settings/__init__.py
-from .business import business_settings_page
-from .services import services_settings_page
-from .employees import employees_settings_page
-from .accounts import accounts_settings_page
-from .customer_communications import customer_communications_page
-from .pricing_settings import pricing_settings_page
+import importlib
+
+# Settings pages are imported when first accessed (see pages/__init__.py)
+_PAGE_MODULES = {
+    'business_settings_page': '.business',
+    'services_settings_page': '.services',
+    'employees_settings_page': '.employees',
+    'accounts_settings_page': '.accounts',
+    'customer_communications_page': '.customer_communications',
+    'pricing_settings_page': '.pricing_settings',
+}
+
+def __getattr__(name):
+    if name in _PAGE_MODULES:
+        return getattr(importlib.import_module(_PAGE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'business_settings_page',
@@ -13,4 +23,4 @@ __all__ = [
     'accounts_settings_page', 
     'customer_communications_page',
     'pricing_settings_page'
-]
\ No newline at end of file
+]
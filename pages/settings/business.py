@@ -1,53 +1,25 @@
 import streamlit as st
 from datetime import time
 from database.connection import snowflake_conn
+from utils.business.info import (
+    BUSINESS_PROFILE_COLUMNS,
+    get_business_profile,
+    invalidate_business_profile
+)
 import traceback
 from typing import Dict, Any
 
 
 def fetch_business_info() -> Dict:
     """Fetch current business information from settings with improved NULL handling"""
-    query = """
-    SELECT 
-        BUSINESS_ID,
-        BUSINESS_NAME,
-        STREET_ADDRESS,
-        CITY,
-        STATE,
-        ZIP_CODE,
-        PHONE_NUMBER,
-        EMAIL_ADDRESS,
-        WEBSITE,
-        OPERATING_HOURS_START,
-        OPERATING_HOURS_END,
-        WEEKEND_OPERATING_HOURS_START,
-        WEEKEND_OPERATING_HOURS_END,
-        ACTIVE_STATUS,
-        MODIFIED_DATE
-    FROM OPERATIONAL.CARPET.BUSINESS_INFO
-    WHERE ACTIVE_STATUS = TRUE
-    ORDER BY MODIFIED_DATE DESC
-    LIMIT 1
-    """
     try:
-        result = snowflake_conn.execute_query(query)
-        if not result:
+        row = get_business_profile()
+        if not row:
             print("No business info found in database")
             return {}
 
-        # Inspect the structure of the first row
-        print("Query result:", result)
-        print("First row:", result[0])
-
         # Map result to dictionary
-        column_names = [
-            "BUSINESS_ID", "BUSINESS_NAME", "STREET_ADDRESS", "CITY", "STATE",
-            "ZIP_CODE", "PHONE_NUMBER", "EMAIL_ADDRESS", "WEBSITE",
-            "OPERATING_HOURS_START", "OPERATING_HOURS_END",
-            "WEEKEND_OPERATING_HOURS_START", "WEEKEND_OPERATING_HOURS_END",
-            "ACTIVE_STATUS", "MODIFIED_DATE"
-        ]
-        business_info = {column: result[0][i] for i, column in enumerate(column_names)}
+        business_info = {column: row.get(column) for column in BUSINESS_PROFILE_COLUMNS}
 
         # Clean and validate each field
         for key in business_info:
@@ -87,38 +59,14 @@ def fetch_business_info() -> Dict:
 def business_settings_page():
     st.title("Business Settings")
 
-    # Fetch current settings
-    query = """
-    SELECT BUSINESS_ID, BUSINESS_NAME, PHONE_NUMBER, EMAIL_ADDRESS, WEBSITE,
-           STREET_ADDRESS, CITY, STATE, ZIP_CODE,
-           OPERATING_HOURS_START, OPERATING_HOURS_END,
-           WEEKEND_OPERATING_HOURS_START, WEEKEND_OPERATING_HOURS_END,
-           ACTIVE_STATUS, MODIFIED_DATE
-    FROM OPERATIONAL.CARPET.BUSINESS_INFO
-    WHERE ACTIVE_STATUS = TRUE
-    ORDER BY MODIFIED_DATE DESC
-    LIMIT 1
-    """
-    
+    # Fetch current settings from the shared business profile cache
     try:
-        result = snowflake_conn.execute_query(query)
+        settings = get_business_profile()
         if st.session_state.get('debug_mode'):
-            st.write("Raw Query Result:", result)
+            st.write("Settings:", settings)
             
-        if result and len(result) > 0:
-            columns = [
-                'BUSINESS_ID', 'BUSINESS_NAME', 'PHONE_NUMBER', 'EMAIL_ADDRESS', 'WEBSITE',
-                'STREET_ADDRESS', 'CITY', 'STATE', 'ZIP_CODE',
-                'OPERATING_HOURS_START', 'OPERATING_HOURS_END',
-                'WEEKEND_OPERATING_HOURS_START', 'WEEKEND_OPERATING_HOURS_END',
-                'ACTIVE_STATUS', 'MODIFIED_DATE'
-            ]
-            settings = dict(zip(columns, result[0]))
-            if st.session_state.get('debug_mode'):
-                st.write("Settings After Conversion:", settings)
-        else:
+        if not settings:
             st.warning("No active business settings found.")
-            settings = {}
     except Exception as e:
         st.error(f"Failed to fetch settings: {str(e)}")
         if st.session_state.get('debug_mode'):
@@ -288,6 +236,8 @@ def business_settings_page():
                     st.write("Save Result:", result)
 
                 if result is not None:
+                    # Every consumer reads the cached profile; make them see the change
+                    invalidate_business_profile()
                     st.success("Business information saved successfully!")
                     st.rerun()
                 else:
@@ -2,6 +2,13 @@ import streamlit as st
 from database.connection import snowflake_conn
 from config.settings import SERVICE_CATEGORIES
 from utils.formatting import format_currency
+from utils.service_utils import get_catalog_services, invalidate_service_catalog
+from models.service import fetch_services
+
+def refresh_service_caches() -> None:
+    """Make every cached view of SERVICES reload after an edit"""
+    invalidate_service_catalog()
+    fetch_services.clear()
 
 def services_settings_page():
     """Services management settings page"""
@@ -15,22 +22,9 @@ def services_settings_page():
 
     # Current Services Tab
     with tab1:
-        # Fetch existing services
-        query = """
-        SELECT 
-            SERVICE_ID,
-            SERVICE_NAME,
-            SERVICE_CATEGORY,
-            SERVICE_DESCRIPTION,
-            COST,
-            ACTIVE_STATUS,
-            COALESCE(SERVICE_DURATION, 60) as SERVICE_DURATION
-        FROM OPERATIONAL.CARPET.SERVICES
-        ORDER BY SERVICE_CATEGORY, SERVICE_NAME
-        """
-        
+        # Fetch existing services (active and inactive) from the service catalog
         try:
-            services = snowflake_conn.execute_query(query)
+            services = get_catalog_services(active_only=False)
             if not services:
                 st.warning("No services found in the database.")
                 return
@@ -110,6 +104,7 @@ def services_settings_page():
                                             new_cost, new_status, new_duration,
                                             service['SERVICE_ID']
                                         ])
+                                        refresh_service_caches()
                                         st.success("Service updated successfully!")
                                         st.session_state.editing_service = None
                                         st.rerun()
@@ -172,6 +167,7 @@ def services_settings_page():
                             service_name, service_category, service_description,
                             cost, active_status, service_duration
                         ])
+                        refresh_service_caches()
                         st.success("New service added successfully!")
                         st.rerun()
                     except Exception as e:
@@ -7,93 +7,23 @@ import streamlit as st
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from database.connection import SnowflakeConnection
+from models.transaction import TransactionEdit
+from models.transaction_view import (
+    TRANSACTION_ASSIGNMENTS_QUERY,
+    AVAILABLE_EMPLOYEES_QUERY,
+    ACTIVE_SERVICES_QUERY,
+    load_transaction_view,
+    invalidate_transaction_view
+)
+from utils.double_booking_prevention import booking_changes
 from utils.formatting import format_currency, format_date, format_time
 from utils.null_handling import safe_get_float, safe_get_int, safe_get_string, safe_get_bool
 
 def get_transaction_details(transaction_id: int) -> Optional[Dict[str, Any]]:
-    """Get complete transaction details from database"""
-    conn = SnowflakeConnection.get_instance()
-    
-    query = """
-    SELECT 
-        -- Transaction core data
-        t.ID as TRANSACTION_ID,
-        t.SERVICE_NAME as PRIMARY_SERVICE_NAME,
-        t.SERVICE_ID as PRIMARY_SERVICE_ID,
-        t.SERVICE2_ID,
-        t.SERVICE3_ID,
-        t.BASE_SERVICE_COST,
-        t.AMOUNT as TOTAL_AMOUNT,
-        t.DISCOUNT,
-        t.STATUS,
-        t.COMMENTS,
-        t.SERVICE_DATE,
-        t.START_TIME,
-        t.END_TIME,
-        t.DEPOSIT,
-        t.DEPOSIT_PAID,
-        t.MATERIAL_COST,
-        t.TOTAL_LABOR_COST,
-        t.PRICING_STRATEGY,
-        t.MARKUP_PERCENTAGE,
-        t.PRICE_ADJUSTMENTS_JSON,
-        t.IS_RECURRING,
-        t.RECURRENCE_PATTERN,
-        t.CREATED_DATE,
-        
-        -- Customer information
-        t.CUSTOMER_ID,
-        c.FIRST_NAME as CUSTOMER_FIRST_NAME,
-        c.LAST_NAME as CUSTOMER_LAST_NAME,
-        c.EMAIL_ADDRESS as CUSTOMER_EMAIL,
-        c.PHONE_NUMBER as CUSTOMER_PHONE,
-        
-        -- Account information (if applicable)
-        t.ACCOUNT_ID,
-        a.ACCOUNT_NAME,
-        
-        -- Primary service details from SERVICES table
-        s1.SERVICE_NAME as PRIMARY_SERVICE_TABLE_NAME,
-        s1.COST as PRIMARY_SERVICE_TABLE_COST,
-        s1.SERVICE_DURATION as PRIMARY_SERVICE_DURATION,
-        s1.SERVICE_CATEGORY as PRIMARY_SERVICE_CATEGORY,
-        
-        -- Additional service 2 details
-        s2.SERVICE_NAME as SERVICE2_NAME,
-        s2.COST as SERVICE2_COST,
-        s2.SERVICE_DURATION as SERVICE2_DURATION,
-        s2.SERVICE_CATEGORY as SERVICE2_CATEGORY,
-        
-        -- Additional service 3 details
-        s3.SERVICE_NAME as SERVICE3_NAME,
-        s3.COST as SERVICE3_COST,
-        s3.SERVICE_DURATION as SERVICE3_DURATION,
-        s3.SERVICE_CATEGORY as SERVICE3_CATEGORY,
-        
-        -- Service address
-        sa.STREET_ADDRESS,
-        sa.CITY,
-        sa.STATE,
-        sa.ZIP_CODE,
-        sa.SQUARE_FOOTAGE
-        
-    FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION t
-    LEFT JOIN OPERATIONAL.CARPET.CUSTOMER c ON t.CUSTOMER_ID = c.CUSTOMER_ID
-    LEFT JOIN OPERATIONAL.CARPET.ACCOUNTS a ON t.ACCOUNT_ID = a.ACCOUNT_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s1 ON t.SERVICE_ID = s1.SERVICE_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s2 ON t.SERVICE2_ID = s2.SERVICE_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICES s3 ON t.SERVICE3_ID = s3.SERVICE_ID
-    LEFT JOIN OPERATIONAL.CARPET.SERVICE_ADDRESSES sa ON 
-        (t.CUSTOMER_ID = sa.CUSTOMER_ID OR t.ACCOUNT_ID = sa.ACCOUNT_ID)
-        AND sa.IS_PRIMARY_SERVICE = TRUE
-    WHERE t.ID = ?
-    """
-    
+    """Get complete transaction details (the cached view's transaction row)"""
     try:
-        result = conn.execute_query(query, [transaction_id])
-        if result:
-            return dict(result[0])
-        return None
+        view = load_transaction_view(transaction_id, conn=SnowflakeConnection.get_instance())
+        return view.transaction if view else None
     except Exception as e:
         st.error(f"Error loading transaction details: {str(e)}")
         return None
@@ -150,8 +80,9 @@ def display_transaction_header(transaction: Dict[str, Any]) -> None:
     if comments:
         st.markdown(f"**Notes:** {comments}")
 
-def display_service_breakdown(transaction: Dict[str, Any]) -> float:
-    """Display detailed service breakdown with editing capabilities"""
+def display_service_breakdown(transaction: Dict[str, Any],
+                              active_services: Optional[List[Dict[str, Any]]] = None) -> float:
+    """Display detailed service breakdown with editing capabilities (preloaded services are used when given)"""
     
     col1, col2 = st.columns([3, 1])
     with col1:
@@ -162,7 +93,7 @@ def display_service_breakdown(transaction: Dict[str, Any]) -> float:
     
     # Show add service dialog if requested
     if st.session_state.get('show_add_service', False):
-        display_add_service_dialog(transaction)
+        display_add_service_dialog(transaction, active_services)
     
     total_cost = 0.0
     
@@ -299,10 +230,6 @@ def display_service_breakdown(transaction: Dict[str, Any]) -> float:
         
         total_cost += new_service3_cost if 'new_service3_cost' in locals() and new_service3_cost != service3_cost else service3_cost
     
-    # Show employee assignment dialog if requested
-    if st.session_state.get('show_employee_assign'):
-        display_employee_assignment_dialog(transaction)
-    
     # Cost Summary
     st.markdown("---")
     col1, col2 = st.columns([3, 1])
@@ -447,24 +374,12 @@ def display_discount_dialog(transaction: Dict[str, Any], subtotal: float) -> Non
                 st.rerun()
 
 def update_discount(transaction_id: int, discount_amount: float) -> bool:
-    """Update the discount amount for a transaction"""
-    conn = SnowflakeConnection.get_instance()
-    
-    query = """
-    UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION
-    SET DISCOUNT = ?,
-        LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()
-    WHERE ID = ?
-    """
-    
-    try:
-        conn.execute_query(query, [discount_amount, transaction_id])
-        # Recalculate the total after discount change
-        recalculate_transaction_total(transaction_id)
-        return True
-    except Exception as e:
-        st.error(f"Error updating discount: {str(e)}")
-        return False
+    """Update the discount amount for a transaction; the total is recalculated in the same UPDATE"""
+    edit = TransactionEdit(transaction_id, SnowflakeConnection.get_instance())
+    edit.set('DISCOUNT', discount_amount)
+    updated = edit.flush(error_msg="Error updating discount")
+    invalidate_transaction_view(transaction_id)
+    return updated
 
 def display_payment_information(transaction: Dict[str, Any]) -> None:
     """Display payment and deposit information"""
@@ -496,52 +411,6 @@ def display_payment_information(transaction: Dict[str, Any]) -> None:
                     st.success("Deposit marked as paid!")
                     st.rerun()
 
-def display_employee_assignment(transaction: Dict[str, Any]) -> None:
-    """Display employee assignment overview section"""
-    
-    st.markdown("### 👷 Employee Assignments")
-    
-    # Get all current assignments for this transaction
-    conn = SnowflakeConnection.get_instance()
-    assignments_query = """
-    SELECT 
-        sa.ASSIGNMENT_ID,
-        sa.NOTES,
-        sa.ASSIGNMENT_STATUS,
-        e.FIRST_NAME,
-        e.LAST_NAME,
-        e.JOB_TITLE
-    FROM OPERATIONAL.CARPET.SERVICE_ASSIGNMENTS sa
-    JOIN OPERATIONAL.CARPET.EMPLOYEE e ON sa.EMPLOYEE_ID = e.EMPLOYEE_ID
-    WHERE sa.TRANSACTION_ID = ?
-    ORDER BY e.FIRST_NAME, e.LAST_NAME
-    """
-    
-    try:
-        assignments = conn.execute_query(assignments_query, [transaction['TRANSACTION_ID']])
-        
-        if assignments:
-            st.markdown("**Current Assignments:**")
-            
-            # Display all assignments for this transaction
-            for assignment in assignments:
-                col1, col2 = st.columns([3, 1])
-                with col1:
-                    employee_name = f"{assignment['FIRST_NAME']} {assignment['LAST_NAME']}"
-                    st.markdown(f"  • {employee_name} ({assignment['JOB_TITLE']})")
-                    if assignment.get('NOTES'):
-                        st.markdown(f"    *Notes: {assignment['NOTES']}*")
-                with col2:
-                    if st.button("Remove", key=f"remove_assignment_{assignment['ASSIGNMENT_ID']}", 
-                               type="secondary", use_container_width=True):
-                        if remove_employee_assignment(assignment['ASSIGNMENT_ID']):
-                            st.success("Assignment removed!")
-                            st.rerun()
-        else:
-            st.info("No employees currently assigned to this transaction")
-    except Exception as e:
-        st.error(f"Error loading employee assignments: {str(e)}")
-
 def display_service_actions(transaction: Dict[str, Any]) -> None:
     """Display service action buttons based on status"""
     
@@ -629,23 +498,18 @@ def display_debug_information(transaction: Dict[str, Any]) -> None:
             st.write("SERVICE3_COST:", transaction.get('SERVICE3_COST'))
 
 # Service Management Functions
-def display_add_service_dialog(transaction: Dict[str, Any]) -> None:
-    """Display dialog for adding a new service"""
+def display_add_service_dialog(transaction: Dict[str, Any],
+                               services: Optional[List[Dict[str, Any]]] = None) -> None:
+    """Display dialog for adding a new service (preloaded active services are used when given)"""
     
     st.markdown("### ➕ Add New Service")
     
     with st.container():
-        # Get available services
-        conn = SnowflakeConnection.get_instance()
-        services_query = """
-        SELECT SERVICE_ID, SERVICE_NAME, COST, SERVICE_CATEGORY, SERVICE_DURATION
-        FROM OPERATIONAL.CARPET.SERVICES
-        WHERE ACTIVE_STATUS = TRUE
-        ORDER BY SERVICE_CATEGORY, SERVICE_NAME
-        """
-        
         try:
-            services = conn.execute_query(services_query)
+            # Get available services
+            if services is None:
+                conn = SnowflakeConnection.get_instance()
+                services = conn.execute_query(ACTIVE_SERVICES_QUERY)
             if services:
                 # Create service options grouped by category
                 service_options = {}
@@ -716,146 +580,14 @@ def display_add_service_dialog(transaction: Dict[str, Any]) -> None:
         except Exception as e:
             st.error(f"Error loading services: {str(e)}")
 
-def display_employee_assignment_dialog(transaction: Dict[str, Any]) -> None:
-    """Display dialog for assigning employees to services"""
-    
-    service_key = st.session_state.get('show_employee_assign', '')
-    if not service_key:
-        return
-    
-    # Parse service key to get service info
-    if service_key.startswith('primary_'):
-        service_id = service_key.replace('primary_', '')
-        service_name = transaction.get('PRIMARY_SERVICE_NAME', 'Primary Service')
-    elif service_key.startswith('service2_'):
-        service_id = service_key.replace('service2_', '')
-        service_name = transaction.get('SERVICE2_NAME', 'Additional Service 1')
-    elif service_key.startswith('service3_'):
-        service_id = service_key.replace('service3_', '')
-        service_name = transaction.get('SERVICE3_NAME', 'Additional Service 2')
-    else:
-        return
-    
-    st.markdown(f"### 👷 Assign Employees to {service_name}")
-    
-    # Get available employees
-    conn = SnowflakeConnection.get_instance()
-    employees_query = """
-    SELECT EMPLOYEE_ID, FIRST_NAME, LAST_NAME, JOB_TITLE, HOURLY_RATE
-    FROM OPERATIONAL.CARPET.EMPLOYEE
-    WHERE ACTIVE_STATUS = TRUE
-    ORDER BY FIRST_NAME, LAST_NAME
-    """
-    
-    # Get currently assigned employees
-    assignments_query = """
-    SELECT e.EMPLOYEE_ID, e.FIRST_NAME, e.LAST_NAME, e.JOB_TITLE,
-           sa.ASSIGNMENT_ID, sa.NOTES
-    FROM OPERATIONAL.CARPET.SERVICE_ASSIGNMENTS sa
-    JOIN OPERATIONAL.CARPET.EMPLOYEE e ON sa.EMPLOYEE_ID = e.EMPLOYEE_ID
-    WHERE sa.TRANSACTION_ID = ?
-    """
-    
-    try:
-        employees = conn.execute_query(employees_query)
-        current_assignments = conn.execute_query(assignments_query, [transaction['TRANSACTION_ID']])
-        
-        if employees:
-            assigned_employee_ids = [a['EMPLOYEE_ID'] for a in current_assignments] if current_assignments else []
-            
-            # Current assignments
-            if current_assignments:
-                st.markdown("**Currently Assigned:**")
-                for assignment in current_assignments:
-                    col1, col2, col3 = st.columns([2, 1, 0.5])
-                    with col1:
-                        st.markdown(f"• {assignment['FIRST_NAME']} {assignment['LAST_NAME']} ({assignment['JOB_TITLE']})")
-                    with col2:
-                        notes = assignment.get('NOTES', '')
-                        if notes:
-                            st.markdown(f"*{notes}*")
-                    with col3:
-                        if st.button("🗑️", key=f"remove_assign_{assignment['ASSIGNMENT_ID']}", help="Remove assignment"):
-                            if remove_employee_assignment(assignment['ASSIGNMENT_ID']):
-                                st.success("Assignment removed!")
-                                st.rerun()
-                
-                st.markdown("---")
-            
-            # Add new assignment
-            st.markdown("**Add New Assignment:**")
-            available_employees = [emp for emp in employees if emp['EMPLOYEE_ID'] not in assigned_employee_ids]
-            
-            if available_employees:
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    employee_options = {f"{emp['FIRST_NAME']} {emp['LAST_NAME']} ({emp['JOB_TITLE']})": emp for emp in available_employees}
-                    selected_employee_name = st.selectbox(
-                        "Select Employee",
-                        options=list(employee_options.keys()),
-                        key="assign_employee_select"
-                    )
-                
-                with col2:
-                    if selected_employee_name:
-                        selected_employee = employee_options[selected_employee_name]
-                        hourly_rate = st.number_input(
-                            "Hourly Rate Override",
-                            value=float(selected_employee.get('HOURLY_RATE', 25.0)),
-                            min_value=0.0,
-                            step=0.25,
-                            key="assign_hourly_rate",
-                            help="Leave as default or override for this service"
-                        )
-                
-                # Assignment buttons
-                col_assign, col_close = st.columns(2)
-                with col_assign:
-                    if st.button("✅ Assign Employee", type="primary", use_container_width=True):
-                        if selected_employee_name:
-                            if assign_employee_to_service(
-                                transaction['TRANSACTION_ID'],
-                                service_id,
-                                selected_employee['EMPLOYEE_ID'],
-                                hourly_rate
-                            ):
-                                st.success(f"Assigned {selected_employee_name}!")
-                                st.rerun()
-                
-                with col_close:
-                    if st.button("❌ Close", use_container_width=True):
-                        st.session_state.show_employee_assign = None
-                        st.rerun()
-            else:
-                st.info("All available employees are already assigned to this service")
-                if st.button("❌ Close", use_container_width=True):
-                    st.session_state.show_employee_assign = None
-                    st.rerun()
-        else:
-            st.error("No employees available")
-            
-    except Exception as e:
-        st.error(f"Error loading employee data: {str(e)}")
-
 # Helper functions
 def remove_additional_service(transaction_id: int, service_field: str) -> bool:
-    """Remove an additional service from the transaction"""
-    conn = SnowflakeConnection.get_instance()
-    
-    query = f"""
-    UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION
-    SET {service_field} = NULL,
-        LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()
-    WHERE ID = ?
-    """
-    
-    try:
-        conn.execute_query(query, [transaction_id])
-        return True
-    except Exception as e:
-        st.error(f"Error removing service: {str(e)}")
-        return False
+    """Remove an additional service and its cost from the transaction and recalculate the total"""
+    edit = TransactionEdit(transaction_id, SnowflakeConnection.get_instance())
+    edit.remove_service(service_field)
+    updated = edit.flush(error_msg="Error removing service")
+    invalidate_transaction_view(transaction_id)
+    return updated
 
 def mark_deposit_paid(transaction_id: int) -> bool:
     """Mark deposit as paid"""
@@ -874,6 +606,8 @@ def mark_deposit_paid(transaction_id: int) -> bool:
     except Exception as e:
         st.error(f"Error updating deposit status: {str(e)}")
         return False
+    finally:
+        invalidate_transaction_view(transaction_id)
 
 def update_service_status(transaction_id: int, new_status: str) -> bool:
     """Update service status"""
@@ -897,90 +631,35 @@ def update_service_status(transaction_id: int, new_status: str) -> bool:
         """
     
     try:
-        conn.execute_query(query, [new_status, transaction_id])
+        with booking_changes() as changes:
+            if conn.execute_query(query, [new_status, transaction_id]) is not None:
+                changes.status_changed(transaction_id, new_status)
         return True
     except Exception as e:
         st.error(f"Error updating service status: {str(e)}")
         return False
+    finally:
+        invalidate_transaction_view(transaction_id)
 
 def add_service_to_transaction(transaction_id: int, service_id: int, service_cost: float) -> bool:
-    """Add a new service to the transaction"""
-    conn = SnowflakeConnection.get_instance()
-    
-    # First check which service slot is available
-    check_query = """
-    SELECT SERVICE2_ID, SERVICE3_ID
-    FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION
-    WHERE ID = ?
-    """
-    
-    try:
-        result = conn.execute_query(check_query, [transaction_id])
-        if not result:
-            st.error("Transaction not found")
-            return False
-        
-        transaction_data = result[0]
-        
-        # Determine which slot to use
-        if not transaction_data['SERVICE2_ID']:
-            service_field = 'SERVICE2_ID'
-        elif not transaction_data['SERVICE3_ID']:
-            service_field = 'SERVICE3_ID'
-        else:
-            st.error("Cannot add more services - maximum of 3 services per transaction")
-            return False
-        
-        # Add the service
-        update_query = f"""
-        UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION
-        SET {service_field} = ?,
-            LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()
-        WHERE ID = ?
-        """
-        
-        conn.execute_query(update_query, [service_id, transaction_id])
-        
-        # Update the service cost in the appropriate cost field
-        cost_field = 'SERVICE2_COST' if service_field == 'SERVICE2_ID' else 'SERVICE3_COST'
-        cost_query = f"""
-        UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION
-        SET {cost_field} = (
-            SELECT COST FROM OPERATIONAL.CARPET.SERVICES WHERE SERVICE_ID = ?
-        ),
-        LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()
-        WHERE ID = ?
-        """
-        
-        conn.execute_query(cost_query, [service_id, transaction_id])
-        
-        # Recalculate total amount
-        recalculate_transaction_total(transaction_id)
-        
+    """Add a service at the given price to the first free slot, with the total, in one UPDATE"""
+    edit = TransactionEdit(transaction_id, SnowflakeConnection.get_instance())
+    edit.add_service(service_id, service_cost)
+    updated = edit.flush(error_msg="Error adding service")
+    invalidate_transaction_view(transaction_id)
+    if updated:
         return True
-        
-    except Exception as e:
-        st.error(f"Error adding service: {str(e)}")
-        return False
+    if edit.rows_updated == 0:
+        st.error("Cannot add more services - maximum of 3 services per transaction")
+    return False
 
 def update_service_cost(transaction_id: int, cost_field: str, new_cost: float) -> bool:
-    """Update the cost of a service in the transaction"""
-    conn = SnowflakeConnection.get_instance()
-    
-    query = f"""
-    UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION
-    SET {cost_field} = ?,
-        LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()
-    WHERE ID = ?
-    """
-    
-    try:
-        conn.execute_query(query, [new_cost, transaction_id])
-        recalculate_transaction_total(transaction_id)
-        return True
-    except Exception as e:
-        st.error(f"Error updating service cost: {str(e)}")
-        return False
+    """Update the cost of a service in the transaction and its total in one UPDATE"""
+    edit = TransactionEdit(transaction_id, SnowflakeConnection.get_instance())
+    edit.set(cost_field, new_cost)
+    updated = edit.flush(error_msg="Error updating service cost")
+    invalidate_transaction_view(transaction_id)
+    return updated
 
 def update_additional_service_cost(transaction_id: int, service_field: str, new_cost: float) -> bool:
     """Update the cost of an additional service"""
@@ -989,25 +668,10 @@ def update_additional_service_cost(transaction_id: int, service_field: str, new_
 
 def recalculate_transaction_total(transaction_id: int) -> bool:
     """Recalculate the total amount for a transaction including discount"""
-    conn = SnowflakeConnection.get_instance()
-    
-    query = """
-    UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION
-    SET AMOUNT = COALESCE(BASE_SERVICE_COST, 0) + 
-                 COALESCE(SERVICE2_COST, 0) + 
-                 COALESCE(SERVICE3_COST, 0) + 
-                 COALESCE(MATERIAL_COST, 0) - 
-                 COALESCE(DISCOUNT, 0),
-        LAST_MODIFIED_DATE = CURRENT_TIMESTAMP()
-    WHERE ID = ?
-    """
-    
-    try:
-        conn.execute_query(query, [transaction_id])
-        return True
-    except Exception as e:
-        st.error(f"Error recalculating total: {str(e)}")
-        return False
+    edit = TransactionEdit(transaction_id, SnowflakeConnection.get_instance())
+    updated = edit.recalculate().flush(error_msg="Error recalculating total")
+    invalidate_transaction_view(transaction_id)
+    return updated
 
 def assign_employee_to_service(transaction_id: int, service_id: int, employee_id: int, hourly_rate: float) -> bool:
     """Assign an employee to a specific service in a transaction"""
@@ -1030,9 +694,11 @@ def assign_employee_to_service(transaction_id: int, service_id: int, employee_id
     except Exception as e:
         st.error(f"Error assigning employee: {str(e)}")
         return False
+    finally:
+        invalidate_transaction_view(transaction_id)
 
-def remove_employee_assignment(assignment_id: int) -> bool:
-    """Remove an employee assignment"""
+def remove_employee_assignment(assignment_id: int, transaction_id: Optional[int] = None) -> bool:
+    """Remove an employee assignment (drops the cached view of its transaction, or all views if not given)"""
     conn = SnowflakeConnection.get_instance()
     
     query = """
@@ -1046,6 +712,8 @@ def remove_employee_assignment(assignment_id: int) -> bool:
     except Exception as e:
         st.error(f"Error removing assignment: {str(e)}")
         return False
+    finally:
+        invalidate_transaction_view(transaction_id)
 
 def reset_service_status(transaction_id: int) -> bool:
     """Reset service status back to SCHEDULED and clear completion data"""
@@ -1077,9 +745,13 @@ def reset_service_status(transaction_id: int) -> bool:
     except Exception as e:
         st.error(f"Error resetting service status: {str(e)}")
         return False
+    finally:
+        invalidate_transaction_view(transaction_id)
 
-def display_employee_assignment(transaction: Dict[str, Any]) -> None:
-    """Display employee assignments for this transaction"""
+def display_employee_assignment(transaction: Dict[str, Any],
+                                assignments: Optional[List[Dict[str, Any]]] = None,
+                                available_employees: Optional[List[Dict[str, Any]]] = None) -> None:
+    """Display employee assignments for this transaction (preloaded rows are used when given)"""
     
     st.markdown("### 👷 Employee Assignments")
     
@@ -1087,26 +759,9 @@ def display_employee_assignment(transaction: Dict[str, Any]) -> None:
     
     try:
         # Get employee assignments for this transaction
-        conn = SnowflakeConnection.get_instance()
-        query = """
-        SELECT 
-            sa.ASSIGNMENT_ID,
-            sa.TRANSACTION_ID,
-            sa.EMPLOYEE_ID,
-            sa.ASSIGNMENT_DATE,
-            sa.ASSIGNMENT_STATUS,
-            sa.NOTES,
-            e.FIRST_NAME,
-            e.LAST_NAME,
-            e.EMAIL,
-            e.PHONE_NUMBER
-        FROM OPERATIONAL.CARPET.SERVICE_ASSIGNMENTS sa
-        JOIN OPERATIONAL.CARPET.EMPLOYEE e ON sa.EMPLOYEE_ID = e.EMPLOYEE_ID
-        WHERE sa.TRANSACTION_ID = ?
-        ORDER BY sa.ASSIGNMENT_DATE DESC
-        """
-        
-        assignments = conn.execute_query(query, [transaction_id])
+        if assignments is None:
+            conn = SnowflakeConnection.get_instance()
+            assignments = conn.execute_query(TRANSACTION_ASSIGNMENTS_QUERY, [transaction_id])
         
         if assignments:
             st.markdown(f"**{len(assignments)} employee(s) assigned to this transaction:**")
@@ -1130,7 +785,7 @@ def display_employee_assignment(transaction: Dict[str, Any]) -> None:
                     with col3:
                         if st.button("Remove", key=f"remove_assignment_{assignment['ASSIGNMENT_ID']}", 
                                    type="secondary", use_container_width=True):
-                            if remove_employee_assignment(assignment['ASSIGNMENT_ID']):
+                            if remove_employee_assignment(assignment['ASSIGNMENT_ID'], transaction_id):
                                 st.success("Assignment removed!")
                                 st.rerun()
                     
@@ -1147,33 +802,19 @@ def display_employee_assignment(transaction: Dict[str, Any]) -> None:
     
     # Show assignment dialog if requested
     if st.session_state.get('show_employee_assign') == f"transaction_{transaction_id}":
-        display_employee_assignment_dialog(transaction_id)
+        display_employee_assignment_dialog(transaction_id, available_employees)
 
-def display_employee_assignment_dialog(transaction_id: int) -> None:
+def display_employee_assignment_dialog(transaction_id: int,
+                                       available_employees: Optional[List[Dict[str, Any]]] = None) -> None:
     """Display dialog for assigning employees to a transaction"""
     
     st.markdown("### ➕ Assign Employee to Transaction")
     
     try:
-        conn = SnowflakeConnection.get_instance()
-        
         # Get available employees (not already assigned to this transaction)
-        employee_query = """
-        SELECT 
-            e.EMPLOYEE_ID,
-            e.FIRST_NAME,
-            e.LAST_NAME,
-            e.EMAIL
-        FROM OPERATIONAL.CARPET.EMPLOYEE e
-        WHERE e.EMPLOYEE_ID NOT IN (
-            SELECT sa.EMPLOYEE_ID 
-            FROM OPERATIONAL.CARPET.SERVICE_ASSIGNMENTS sa 
-            WHERE sa.TRANSACTION_ID = ?
-        )
-        ORDER BY e.FIRST_NAME, e.LAST_NAME
-        """
-        
-        available_employees = conn.execute_query(employee_query, [transaction_id])
+        if available_employees is None:
+            conn = SnowflakeConnection.get_instance()
+            available_employees = conn.execute_query(AVAILABLE_EMPLOYEES_QUERY, [transaction_id])
         
         if available_employees:
             # Create employee options
@@ -1234,6 +875,8 @@ def assign_employee_to_transaction(transaction_id: int, employee_id: int, notes:
     except Exception as e:
         st.error(f"Error assigning employee: {str(e)}")
         return False
+    finally:
+        invalidate_transaction_view(transaction_id)
 
 def send_customer_update(transaction: Dict[str, Any]) -> None:
     """Send customer update (placeholder)"""
@@ -1261,9 +904,14 @@ def transaction_details_page():
             st.rerun()
         return
     
-    # Load transaction details
-    transaction = get_transaction_details(transaction_id)
-    if not transaction:
+    # Load the transaction, its line items, assignments and any dialog lists together
+    view = load_transaction_view(
+        transaction_id,
+        include_available_employees=st.session_state.get('show_employee_assign') == f"transaction_{transaction_id}",
+        include_active_services=st.session_state.get('show_add_service', False),
+        conn=SnowflakeConnection.get_instance()
+    )
+    if not view:
         st.error("Could not load transaction details.")
         if st.button("← Back to Scheduled Services"):
             st.session_state.page = 'scheduled'
@@ -1277,17 +925,23 @@ def transaction_details_page():
             st.session_state.page = 'scheduled'
             st.rerun()
     
+    transaction = view.transaction
+    
     # Display all sections
     display_transaction_header(transaction)
     
     st.markdown("---")
-    total_cost = display_service_breakdown(transaction)
+    total_cost = display_service_breakdown(transaction, view.active_services)
     
     st.markdown("---")
     display_payment_information(transaction)
     
     st.markdown("---")
-    display_employee_assignment(transaction)
+    display_employee_assignment(
+        transaction,
+        assignments=view.assignments,
+        available_employees=view.available_employees
+    )
     
     st.markdown("---")
     display_service_actions(transaction)
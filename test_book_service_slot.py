@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test book_service_slot, the locked check-and-insert used by every booking path
+Books overlapping slots on the local DuckDB backend and checks that only the
+first one is written
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# book_service_slot writes through the shared connection; point it at a throwaway local database
+os.environ.setdefault("EZBIZ_DB_BACKEND", "duckdb")
+os.environ.setdefault("EZBIZ_LOCAL_DB", ":memory:")
+
+from datetime import date, time, timedelta
+
+def local_backend():
+    """The shared connection if it is the local backend, else None"""
+    try:
+        from database.connection import SnowflakeConnection
+        from database.local import LocalConnection
+        instance = SnowflakeConnection.get_instance()
+    except ImportError:
+        return None
+    return instance if isinstance(instance, LocalConnection) else None
+
+def booking_values(service_date, start_time):
+    return {
+        'SERVICE_NAME': 'Test Booking Service',
+        'SERVICE_DATE': service_date,
+        'START_TIME': start_time,
+        'STATUS': 'SCHEDULED',
+        'COMMENTS': 'test_book_service_slot'
+    }
+
+def bookings_on(conn, service_date):
+    return conn.execute_query(
+        """
+        SELECT ID, START_TIME FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION
+        WHERE SERVICE_DATE = ? AND COMMENTS = 'test_book_service_slot'
+        ORDER BY START_TIME
+        """,
+        [service_date],
+        cache=False
+    ) or []
+
+def test_overlapping_booking_is_rejected():
+    """The second of two overlapping bookings gets a conflict and writes nothing"""
+    conn = local_backend()
+    if conn is None:
+        print("   local backend not available; skipped")
+        return
+    from utils.double_booking_prevention import book_service_slot
+
+    # A weekday far past any other test data; unknown services last 60 minutes
+    service_date = date.today() + timedelta(days=500)
+    service_date += timedelta(days=(1 - service_date.weekday()) % 7)
+    services = ['Test Booking Service']
+
+    first_id, error, conflicts = book_service_slot(booking_values(service_date, time(10, 0)), services)
+    assert first_id is not None, error
+    assert error is None and conflicts == []
+
+    second_id, error, conflicts = book_service_slot(booking_values(service_date, time(10, 30)), services)
+    assert second_id is None
+    assert error, "overlapping booking was not reported"
+    assert [conflict.transaction_id for conflict in conflicts] == [first_id]
+
+    rows = bookings_on(conn, service_date)
+    assert [row['ID'] for row in rows] == [first_id]
+
+def test_buffer_and_free_slots():
+    """Bookings inside the buffer are rejected; one clear of it is written"""
+    conn = local_backend()
+    if conn is None:
+        print("   local backend not available; skipped")
+        return
+    from utils.double_booking_prevention import book_service_slot
+
+    service_date = date.today() + timedelta(days=507)
+    service_date += timedelta(days=(2 - service_date.weekday()) % 7)
+    services = ['Test Booking Service']
+
+    first_id, _, _ = book_service_slot(booking_values(service_date, time(9, 0)), services)
+    assert first_id is not None
+    # 09:00-10:00 plus a 15 minute buffer keeps 10:00 taken
+    buffered_id, error, _ = book_service_slot(booking_values(service_date, time(10, 0)), services)
+    assert buffered_id is None and error
+    later_id, error, _ = book_service_slot(booking_values(service_date, time(10, 30)), services)
+    assert later_id is not None, error
+
+    assert [row['ID'] for row in bookings_on(conn, service_date)] == [first_id, later_id]
+
+if __name__ == "__main__":
+    tests = [
+        test_overlapping_booking_is_rejected,
+        test_buffer_and_free_slots
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the minute-resolution day occupancy index
+Covers buffers clipped at midnight, re-adding and removing bookings with
+overlapping counts, excluded bookings in free slot searches, and patching
+the cached days through booking_changes on the local DuckDB backend
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# booking_changes writes through the shared connection; point it at a throwaway local database
+os.environ.setdefault("EZBIZ_DB_BACKEND", "duckdb")
+os.environ.setdefault("EZBIZ_LOCAL_DB", ":memory:")
+
+import threading
+from datetime import date, time, timedelta
+
+from utils.day_occupancy import MINUTES_PER_DAY, DayOccupancy, minute_of_day
+
+DAY = date(2030, 1, 8)
+
+def booking(transaction_id, start, duration=60):
+    return {'TRANSACTION_ID': transaction_id, 'START_TIME': start, 'SERVICE_DURATION': duration}
+
+def test_buffer_is_clipped_at_midnight():
+    """Bookings at either end of the day pad only the minutes that exist"""
+    occupancy = DayOccupancy(DAY, [booking(1, time(23, 30)), booking(2, time(0, 5), 30)], buffer_minutes=15)
+    assert len(occupancy) == 2
+    assert not occupancy.is_free(MINUTES_PER_DAY - 1, 1)
+    assert not occupancy.is_free(0, 1)
+    assert occupancy.is_free(minute_of_day(time(0, 50)), 30)  # 00:05 + 30 + 15 buffer ends at 00:50
+    assert not occupancy.is_free(minute_of_day(time(0, 49)), 1)
+    assert occupancy.is_free(minute_of_day(time(22, 0)), 75)  # 23:30 - 15 buffer starts at 23:15
+    assert not occupancy.is_free(minute_of_day(time(22, 0)), 76)
+
+def test_string_and_missing_start_times():
+    occupancy = DayOccupancy(DAY, [booking(1, "09:00:00"), booking(2, None), booking(3, "nine")])
+    assert len(occupancy) == 1
+    assert not occupancy.is_free(minute_of_day(time(9, 30)), 1)
+
+def test_add_existing_transaction_replaces_it():
+    """Re-adding a TRANSACTION_ID moves it instead of counting it twice"""
+    occupancy = DayOccupancy(DAY, [booking(1, time(9, 0))], buffer_minutes=0)
+    occupancy.add(booking(1, time(14, 0)))
+    assert len(occupancy) == 1
+    assert occupancy.is_free(minute_of_day(time(9, 0)), 60)
+    assert not occupancy.is_free(minute_of_day(time(14, 0)), 1)
+    occupancy.remove(1)
+    assert occupancy.is_free(0, MINUTES_PER_DAY)
+
+def test_remove_keeps_minutes_still_covered_by_others():
+    """Overlapping bookings count minutes; removing one frees only what it alone covered"""
+    occupancy = DayOccupancy(DAY, [booking(1, time(9, 0), 120), booking(2, time(10, 0), 120)], buffer_minutes=0)
+    removed = occupancy.remove(1)
+    assert removed['TRANSACTION_ID'] == 1
+    assert occupancy.is_free(minute_of_day(time(9, 0)), 60)
+    assert not occupancy.is_free(minute_of_day(time(10, 0)), 1)
+    assert not occupancy.is_free(minute_of_day(time(11, 59)), 1)
+    assert occupancy.remove(1) is None
+    assert 2 in occupancy and 1 not in occupancy
+
+def test_exclude_transaction_in_free_starts_and_is_free():
+    """A booking being rescheduled does not block its own slot, but its neighbours still do"""
+    occupancy = DayOccupancy(DAY, [booking(1, time(9, 0)), booking(2, time(11, 0))], buffer_minutes=15)
+    nine = minute_of_day(time(9, 0))
+    assert not occupancy.is_free(nine, 60)
+    assert occupancy.is_free(nine, 60, exclude_transaction_id=1)
+    assert not occupancy.is_free(nine, 120, exclude_transaction_id=1)  # runs into booking 2's buffer
+
+    opening, closing = minute_of_day(time(8, 0)), minute_of_day(time(13, 0))
+    assert list(occupancy.free_starts(opening, closing, 60)) == []
+    assert [int(start) for start in occupancy.free_starts(opening, closing, 60, exclude_transaction_id=1)] == [
+        minute_of_day(time(8, 0)), minute_of_day(time(8, 30)), minute_of_day(time(9, 0)), minute_of_day(time(9, 30))
+    ]
+    # The cached prefix sum is untouched by excluded searches
+    assert list(occupancy.free_starts(opening, closing, 60)) == []
+
+def test_copy_is_independent():
+    occupancy = DayOccupancy(DAY, [booking(1, time(9, 0))])
+    clone = occupancy.copy()
+    clone.remove(1)
+    assert 1 in occupancy and not occupancy.is_free(minute_of_day(time(9, 0)), 1)
+    assert clone.is_free(0, MINUTES_PER_DAY)
+
+def local_bookings_day():
+    """A future date with two bookings on the shared local backend; None when it is not available"""
+    try:
+        from database.connection import SnowflakeConnection, snowflake_conn
+        from database.local import LocalConnection
+        if not isinstance(SnowflakeConnection.get_instance(), LocalConnection):
+            return None
+    except ImportError:
+        return None
+    service_date = date.today() + timedelta(days=400)
+    for transaction_id, start in ((900001, time(9, 0)), (900002, time(13, 0))):
+        snowflake_conn.execute_query(
+            """
+            INSERT INTO OPERATIONAL.CARPET.SERVICE_TRANSACTION (ID, SERVICE_NAME, SERVICE_DATE, START_TIME, STATUS)
+            VALUES (?, 'Test', ?, ?, 'SCHEDULED')
+            """,
+            [transaction_id, service_date, start]
+        )
+    return service_date
+
+def test_booking_changes_patches_or_drops_cached_days():
+    """A known write patches the cached day; a write from another thread in between drops it"""
+    service_date = local_bookings_day()
+    if service_date is None:
+        print("   local backend not available; skipped")
+        return
+    from database.connection import snowflake_conn
+    import utils.double_booking_prevention as booking_module
+
+    cancel_query = "UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION SET STATUS = 'CANCELLED' WHERE ID = ?"
+    occupancy = booking_module.load_day_occupancy([service_date])[service_date]
+    assert 900001 in occupancy and 900002 in occupancy
+
+    with booking_module.booking_changes() as changes:
+        if snowflake_conn.execute_query(cancel_query, [900001]) is not None:
+            changes.cancelled(900001)
+    cached = booking_module._occupancy_store.get(service_date, booking_module._booking_generation())
+    assert cached is not None, "day was dropped instead of patched"
+    assert 900001 not in cached and 900002 in cached
+
+    def other_write():
+        snowflake_conn.execute_query("UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION SET COMMENTS = 'x' WHERE ID = -1")
+
+    with booking_module.booking_changes() as changes:
+        worker = threading.Thread(target=other_write)
+        worker.start()
+        worker.join()
+        if snowflake_conn.execute_query(cancel_query, [900002]) is not None:
+            changes.cancelled(900002)
+    assert booking_module._occupancy_store.get(service_date, booking_module._booking_generation()) is None
+
+    # The rebuilt day matches the database
+    occupancy = booking_module.load_day_occupancy([service_date])[service_date]
+    assert len(occupancy) == 0
+
+if __name__ == "__main__":
+    tests = [
+        test_buffer_is_clipped_at_midnight,
+        test_string_and_missing_start_times,
+        test_add_existing_transaction_replaces_it,
+        test_remove_keeps_minutes_still_covered_by_others,
+        test_exclude_transaction_in_free_starts_and_is_free,
+        test_copy_is_independent,
+        test_booking_changes_patches_or_drops_cached_days
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Test the table-tagged query result cache
+Covers table tagging, eviction by INSERT/UPDATE/DELETE/MERGE, volatile and
+write statements never being cached, the LRU bound and TTL, and cached reads
+through execute_query on the local DuckDB backend
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import time
+
+from database.result_cache import (
+    ResultCache, advance_generation, is_cacheable, referenced_tables, statement_kind
+)
+
+BOOKINGS_READ = """
+SELECT ST.ID, C.FIRST_NAME
+FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION ST
+LEFT JOIN OPERATIONAL.CARPET.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
+WHERE ST.SERVICE_DATE = ?
+"""
+SERVICES_READ = "SELECT SERVICE_NAME FROM OPERATIONAL.CARPET.SERVICES WHERE ACTIVE_STATUS = TRUE"
+
+def cache_read(cache, query, params=None, rows=None):
+    """Store rows for a read the way SnowflakeConnection does; returns its key"""
+    key = cache.key(query, params)
+    tables = referenced_tables(query)
+    cache.put(key, rows if rows is not None else [{'ROW': query[:10]}], tables, cache.generation(tables))
+    return key
+
+def test_tables_are_tagged_from_every_reference():
+    assert referenced_tables(BOOKINGS_READ) == {'SERVICE_TRANSACTION', 'CUSTOMER'}
+    assert referenced_tables("INSERT INTO OPERATIONAL.CARPET.CUSTOMER (FIRST_NAME) VALUES (?)") == {'CUSTOMER'}
+    assert referenced_tables("UPDATE SERVICE_TRANSACTION SET STATUS = ? WHERE ID = ?") == {'SERVICE_TRANSACTION'}
+    assert referenced_tables(
+        "MERGE INTO OPERATIONAL.CARPET.SCHEDULE_LOCKS AS L USING (SELECT 1) AS R ON TRUE"
+    ) == {'SCHEDULE_LOCKS'}
+    # Names inside comments and string literals are not table references
+    assert referenced_tables("SELECT 'FROM EMPLOYEE' AS X -- JOIN ACCOUNTS\nFROM SERVICES") == {'SERVICES'}
+
+def test_statement_kinds():
+    assert statement_kind("  (SELECT 1)") == 'read'
+    assert statement_kind("WITH X AS (SELECT 1) SELECT * FROM X") == 'read'
+    assert statement_kind("delete from CUSTOMER") == 'write'
+    assert statement_kind("BEGIN") == 'control'
+    assert statement_kind("CALL REFRESH_EVERYTHING()") == 'other'
+
+def test_writes_evict_only_their_tables():
+    """INSERT, UPDATE, DELETE and MERGE evict entries tagged with the written table"""
+    for write in (
+        "INSERT INTO OPERATIONAL.CARPET.CUSTOMER (FIRST_NAME) VALUES (?)",
+        "UPDATE OPERATIONAL.CARPET.CUSTOMER SET FIRST_NAME = ? WHERE CUSTOMER_ID = ?",
+        "DELETE FROM OPERATIONAL.CARPET.CUSTOMER WHERE CUSTOMER_ID = ?",
+        "MERGE INTO OPERATIONAL.CARPET.CUSTOMER AS T USING (SELECT 1 AS ID) AS S ON T.CUSTOMER_ID = S.ID "
+        "WHEN MATCHED THEN UPDATE SET FIRST_NAME = 'X'"
+    ):
+        cache = ResultCache()
+        bookings = cache_read(cache, BOOKINGS_READ, ['2030-01-08'])
+        services = cache_read(cache, SERVICES_READ)
+        cache.note_statement(write)
+        assert cache.get(bookings) is None, write
+        assert cache.get(services) is not None, write
+
+def test_unknown_statements_clear_everything():
+    cache = ResultCache()
+    services = cache_read(cache, SERVICES_READ)
+    cache.note_statement("CALL REFRESH_EVERYTHING()")
+    assert cache.get(services) is None
+
+def test_reads_and_control_statements_keep_entries():
+    cache = ResultCache()
+    services = cache_read(cache, SERVICES_READ)
+    cache.note_statement(BOOKINGS_READ)
+    cache.note_statement("COMMIT")
+    assert cache.get(services) is not None
+
+def test_volatile_and_write_statements_are_not_cacheable():
+    assert is_cacheable(SERVICES_READ)
+    assert not is_cacheable("SELECT CURRENT_TIMESTAMP()")
+    assert not is_cacheable("SELECT OPERATIONAL.CARPET.CUSTOMER_CUSTOMER_ID_SEQ.NEXTVAL")
+    assert not is_cacheable("SELECT * FROM SERVICE_TRANSACTION WHERE SERVICE_DATE >= CURRENT_DATE")
+    assert not is_cacheable("SELECT UUID_STRING()")
+    assert not is_cacheable("UPDATE SERVICES SET COST = 1")
+    # The volatile word inside a string literal does not matter
+    assert is_cacheable("SELECT * FROM SERVICES WHERE SERVICE_NAME <> 'CURRENT_DATE'")
+
+def test_lru_bound_and_counters():
+    """The least recently used entry goes first once max_entries is exceeded"""
+    cache = ResultCache(max_entries=2)
+    first = cache_read(cache, SERVICES_READ, [1])
+    second = cache_read(cache, SERVICES_READ, [2])
+    assert cache.get(first) is not None  # first is now the most recently used
+    third = cache_read(cache, SERVICES_READ, [3])
+    assert cache.get(second) is None
+    assert cache.get(first) is not None and cache.get(third) is not None
+    stats = cache.stats()
+    assert stats['size'] == 2 and stats['evictions'] == 1
+    assert stats['hits'] == 3 and stats['misses'] == 1
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(max_entries=0)
+    assert not cache.enabled
+    assert cache.get(cache_read(cache, SERVICES_READ)) is None
+
+def test_ttl_expires_entries():
+    cache = ResultCache(ttl=0.05)
+    key = cache_read(cache, SERVICES_READ)
+    time.sleep(0.1)
+    assert cache.get(key) is None
+
+def test_read_racing_a_write_is_not_stored():
+    """A result read before a write to its table finished is dropped, not cached"""
+    cache = ResultCache()
+    tables = referenced_tables(SERVICES_READ)
+    generation = cache.generation(tables)
+    cache.note_statement("UPDATE OPERATIONAL.CARPET.SERVICES SET COST = 1")
+    key = cache.key(SERVICES_READ)
+    cache.put(key, [{'SERVICE_NAME': 'stale'}], tables, generation)
+    assert cache.get(key) is None
+
+def test_cached_rows_are_copies():
+    cache = ResultCache()
+    key = cache_read(cache, SERVICES_READ, rows=[{'SERVICE_NAME': 'Deep Clean'}])
+    cache.get(key)[0]['SERVICE_NAME'] = 'changed'
+    assert cache.get(key) == [{'SERVICE_NAME': 'Deep Clean'}]
+
+def test_advance_generation_matches_noted_statements():
+    cache = ResultCache()
+    tables = frozenset({'SERVICE_TRANSACTION', 'SERVICES'})
+    before = cache.generation(tables)
+    statements = [
+        "UPDATE OPERATIONAL.CARPET.SERVICE_TRANSACTION SET STATUS = 'CANCELLED' WHERE ID = ?",
+        "MERGE INTO OPERATIONAL.CARPET.SCHEDULE_LOCKS AS L USING (SELECT 1) AS R ON TRUE",
+        BOOKINGS_READ
+    ]
+    with cache.recording() as recorded:
+        for statement in statements:
+            cache.note_statement(statement)
+    assert recorded == statements
+    assert advance_generation(before, tables, recorded) == cache.generation(tables)
+
+def test_execute_query_serves_and_evicts_on_local_backend():
+    """Repeated reads hit the cache, a write evicts them, and cache=False always reads"""
+    try:
+        from database.local import LocalConnection
+        conn = LocalConnection(":memory:")
+    except ImportError:
+        print("   duckdb not installed; skipped")
+        return
+    insert = "INSERT INTO OPERATIONAL.CARPET.SERVICES (SERVICE_ID, SERVICE_NAME, COST) VALUES (?, ?, ?)"
+    read = "SELECT SERVICE_NAME FROM OPERATIONAL.CARPET.SERVICES ORDER BY SERVICE_ID"
+    conn.execute_query(insert, [1, 'Deep Clean', 100])
+
+    assert conn.execute_query(read) == [{'SERVICE_NAME': 'Deep Clean'}]
+    hits = conn.results.hits
+    assert conn.execute_query(read) == [{'SERVICE_NAME': 'Deep Clean'}]
+    assert conn.results.hits == hits + 1
+
+    conn.execute_query(insert, [2, 'Stain Removal', 50])
+    assert [row['SERVICE_NAME'] for row in conn.execute_query(read)] == ['Deep Clean', 'Stain Removal']
+
+    # A write the cache cannot see (another process) is only visible to uncached reads
+    conn._fetch_quietly("DELETE FROM OPERATIONAL.CARPET.SERVICES WHERE SERVICE_ID = 2")
+    assert len(conn.execute_query(read)) == 2
+    assert len(conn.execute_query(read, cache=False)) == 1
+
+if __name__ == "__main__":
+    tests = [
+        test_tables_are_tagged_from_every_reference,
+        test_statement_kinds,
+        test_writes_evict_only_their_tables,
+        test_unknown_statements_clear_everything,
+        test_reads_and_control_statements_keep_entries,
+        test_volatile_and_write_statements_are_not_cacheable,
+        test_lru_bound_and_counters,
+        test_disabled_cache_stores_nothing,
+        test_ttl_expires_entries,
+        test_read_racing_a_write_is_not_stored,
+        test_cached_rows_are_copies,
+        test_advance_generation_matches_noted_statements,
+        test_execute_query_serves_and_evicts_on_local_backend
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test the in-memory customer search index
+Compares SearchIndex results with the LIKE '%term%' query it replaced and
+checks the ranking of whole-field, word-start and substring matches
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import random
+
+from utils.search_index import SearchIndex
+
+FIRST_NAMES = ["Maria", "John", "Lee", "Ann", "Anna", "Joanna", "Smith", "Al", "Carla"]
+LAST_NAMES = ["Smith", "Garcia", "Lee", "Smithson", "Blacksmith", "Johnson", "Ng", "Alvarez"]
+DOMAINS = ["example.com", "mail.org", "smith.net"]
+TERMS = ["smith", "SMITH", "lee", "an", "a", "ann", "anna", "mar", "garcia lee", "example",
+         "smith.net", "480", "480555", "555-01", "(480)", "0123", "nobody", "ng", "al", "son"]
+
+CUSTOMER_FIELDS = [
+    ('FULL_NAME', 'text', 3.0),
+    ('PHONE_NUMBER', 'digits', 2.0),
+    ('EMAIL_ADDRESS', 'text', 2.0)
+]
+
+def build_customers(count=300, seed=11):
+    """Customers shaped like the rows search_customers loads"""
+    rng = random.Random(seed)
+    customers = []
+    for customer_id in range(1, count + 1):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        digits = f"480555{rng.randrange(10000):04d}"
+        phone = rng.choice([digits, f"({digits[:3]}) {digits[3:6]}-{digits[6:]}", f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"])
+        customers.append({
+            'CUSTOMER_ID': customer_id,
+            'FULL_NAME': f"{first} {last}",
+            'PHONE_NUMBER': phone,
+            'EMAIL_ADDRESS': f"{first.lower()}.{last.lower()}{customer_id}@{rng.choice(DOMAINS)}"
+        })
+    return customers
+
+def like_matches(customers, term):
+    """IDs the old query returned: LOWER(name) LIKE, PHONE_NUMBER LIKE, LOWER(email) LIKE '%term%'"""
+    lowered = term.lower()
+    return {
+        customer['CUSTOMER_ID'] for customer in customers
+        if lowered in customer['FULL_NAME'].lower()
+        or term in customer['PHONE_NUMBER']
+        or lowered in customer['EMAIL_ADDRESS'].lower()
+    }
+
+def build_index(customers):
+    index = SearchIndex('CUSTOMER_ID', CUSTOMER_FIELDS)
+    for customer in customers:
+        index.upsert(customer)
+    return index
+
+def test_search_matches_like_results():
+    """Every LIKE match is found; only phone digits typed in another format may add rows"""
+    customers = build_customers()
+    index = build_index(customers)
+    by_id = {customer['CUSTOMER_ID']: customer for customer in customers}
+
+    for term in TERMS:
+        found = {row['CUSTOMER_ID'] for row in index.search(term)}
+        expected = like_matches(customers, term)
+        assert expected <= found, f"{term!r}: index missed {sorted(expected - found)[:5]}"
+        for customer_id in found - expected:
+            digits = "".join(c for c in by_id[customer_id]['PHONE_NUMBER'] if c.isdigit())
+            term_digits = "".join(c for c in term if c.isdigit())
+            assert term_digits and term_digits in digits, f"{term!r}: unexpected match {by_id[customer_id]}"
+
+def test_text_terms_match_like_exactly():
+    """Without digits the gram candidates must neither add nor drop rows"""
+    customers = build_customers()
+    index = build_index(customers)
+    for term in TERMS:
+        if any(character.isdigit() for character in term):
+            continue
+        found = {row['CUSTOMER_ID'] for row in index.search(term)}
+        assert found == like_matches(customers, term), term
+
+def test_updates_and_removals_reach_candidates():
+    """Re-indexed rows drop their old grams and removed rows stop matching"""
+    customers = build_customers(count=20)
+    index = build_index(customers)
+    renamed = dict(customers[0], FULL_NAME="Zelda Quartz")
+    index.upsert(renamed)
+    assert [row['CUSTOMER_ID'] for row in index.search("quartz")] == [renamed['CUSTOMER_ID']]
+    assert renamed['CUSTOMER_ID'] not in {row['CUSTOMER_ID'] for row in index.search(customers[0]['FULL_NAME'])}
+
+    index.remove(renamed['CUSTOMER_ID'])
+    assert index.search("quartz") == []
+    assert len(index) == len(customers) - 1
+
+def test_ranking_whole_field_then_word_start_then_substring():
+    """Exact names outrank word-start matches, which outrank matches inside a word"""
+    index = SearchIndex('CUSTOMER_ID', CUSTOMER_FIELDS)
+    rows = [
+        {'CUSTOMER_ID': 1, 'FULL_NAME': "Carla Blacksmith", 'PHONE_NUMBER': "4805550001", 'EMAIL_ADDRESS': "cb@mail.org"},
+        {'CUSTOMER_ID': 2, 'FULL_NAME': "John Smithson", 'PHONE_NUMBER': "4805550002", 'EMAIL_ADDRESS': "js@mail.org"},
+        {'CUSTOMER_ID': 3, 'FULL_NAME': "Smith", 'PHONE_NUMBER': "4805550003", 'EMAIL_ADDRESS': "s@mail.org"},
+        {'CUSTOMER_ID': 4, 'FULL_NAME': "Ann Lee", 'PHONE_NUMBER': "4805550004", 'EMAIL_ADDRESS': "ann@smith.net"},
+    ]
+    for row in rows:
+        index.upsert(row)
+
+    # Whole name (3 x 3.0), name word start (2 x 3.0), email word start (2 x 2.0), inside a word (1 x 3.0)
+    assert [row['CUSTOMER_ID'] for row in index.search("smith")] == [3, 2, 4, 1]
+    assert [row['CUSTOMER_ID'] for row in index.search("smith", limit=2)] == [3, 2]
+
+def test_limit_keeps_full_ordering():
+    """A limited search returns the head of the unlimited ranking"""
+    index = build_index(build_customers())
+    for term in ["smith", "lee", "an", "480"]:
+        ranked = [row['CUSTOMER_ID'] for row in index.search(term)]
+        assert [row['CUSTOMER_ID'] for row in index.search(term, limit=10)] == ranked[:10], term
+
+if __name__ == "__main__":
+    tests = [
+        test_search_matches_like_results,
+        test_text_terms_match_like_exactly,
+        test_updates_and_removals_reach_candidates,
+        test_ranking_whole_field_then_word_start_then_substring,
+        test_limit_keeps_full_ordering
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
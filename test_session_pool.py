@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test SessionPool, the per-thread pool of Snowflake sessions
+Uses fake sessions to check lease nesting per thread, eviction of broken
+sessions, idle eviction and health checks, and waiting on an exhausted pool
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import threading
+import time
+
+from database.pool import SessionPool
+
+class FakeSession:
+    """Stands in for a snowflake.connector connection"""
+
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+        self.healthy = True
+
+    def close(self):
+        self.closed = True
+
+def fake_pool(**options):
+    """Pool of FakeSessions; returns the pool, every session it opened and every session it closed"""
+    opened, closed = [], []
+
+    def factory():
+        session = FakeSession(len(opened) + 1)
+        opened.append(session)
+        return session
+
+    def ping(session):
+        if not session.healthy:
+            raise ConnectionError("session expired")
+
+    pool = SessionPool(factory, ping=ping, on_close=closed.append, **options)
+    return pool, opened, closed
+
+def test_nested_leases_share_one_session_per_thread():
+    """Nested connection() blocks on a thread reuse its session; other threads get their own"""
+    pool, opened, _ = fake_pool(max_size=2)
+    seen = {}
+
+    with pool.connection() as outer:
+        with pool.connection() as inner:
+            assert inner is outer
+            assert pool.stats()['in_use'] == 1
+
+            worker = threading.Thread(target=lambda: seen.update(other=pool.acquire()) or pool.release())
+            worker.start()
+            worker.join()
+            assert seen['other'] is not outer
+        # Still leased until the outermost block ends
+        assert pool.stats()['in_use'] == 1
+    assert pool.stats() == {'max_size': 2, 'open': 2, 'idle': 2, 'in_use': 0}
+    assert len(opened) == 2
+
+    # The released session is reused rather than a new one opened
+    with pool.connection() as again:
+        assert again in opened
+    assert len(opened) == 2
+
+def test_broken_session_is_closed_not_reused():
+    """An error is_broken accepts discards the session, even from a nested block"""
+    pool, opened, closed = fake_pool()
+
+    with pool.connection() as outer:
+        try:
+            with pool.connection(is_broken=lambda e: isinstance(e, ConnectionError)):
+                raise ConnectionError("connection reset")
+        except ConnectionError:
+            pass
+        # The nested block marked the lease broken; the session stays with this thread until released
+        assert not outer.closed
+    assert closed == [opened[0]] and opened[0].closed
+    assert pool.stats()['open'] == 0
+
+    with pool.connection() as fresh:
+        assert fresh is opened[1]
+
+def test_other_errors_keep_the_session():
+    pool, opened, closed = fake_pool()
+    try:
+        with pool.connection(is_broken=lambda e: isinstance(e, ConnectionError)):
+            raise ValueError("bad parameter")
+    except ValueError:
+        pass
+    assert closed == []
+    assert pool.stats()['idle'] == 1
+    with pool.connection() as session:
+        assert session is opened[0]
+
+def test_idle_sessions_are_evicted_past_idle_timeout():
+    """Sessions idle past idle_timeout are closed, keeping min_idle of the most recent"""
+    pool, opened, closed = fake_pool(max_size=3, min_idle=1, idle_timeout=0.05)
+    leased = []
+    barrier = threading.Barrier(3)
+
+    def hold():
+        with pool.connection() as session:
+            leased.append(session)
+            barrier.wait()
+
+    workers = [threading.Thread(target=hold) for _ in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert pool.stats()['idle'] == 3
+    assert pool.evict_idle() == 0
+
+    time.sleep(0.1)
+    assert pool.evict_idle() == 2
+    assert len(closed) == 2 and all(session.closed for session in closed)
+    assert pool.stats() == {'max_size': 3, 'open': 1, 'idle': 1, 'in_use': 0}
+
+def test_unhealthy_idle_session_is_replaced():
+    """A session idle past health_check_interval is pinged and replaced if the ping fails"""
+    pool, opened, closed = fake_pool(health_check_interval=0.0)
+    with pool.connection():
+        pass
+    opened[0].healthy = False
+    with pool.connection() as session:
+        assert session is opened[1]
+    assert closed == [opened[0]]
+
+def test_exhausted_pool_waits_then_times_out():
+    pool, opened, _ = fake_pool(max_size=1, checkout_timeout=0.05)
+    released = threading.Event()
+    acquired = threading.Event()
+
+    def hold():
+        with pool.connection():
+            acquired.set()
+            released.wait()
+
+    worker = threading.Thread(target=hold)
+    worker.start()
+    acquired.wait()
+    try:
+        pool.acquire()
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("checkout did not time out on an exhausted pool")
+    released.set()
+    worker.join()
+
+    with pool.connection() as session:
+        assert session is opened[0]
+
+def test_failed_factory_frees_its_slot():
+    pool = SessionPool(lambda: None, max_size=1)
+    for _ in range(2):
+        try:
+            pool.acquire()
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("acquire returned without a session")
+    assert pool.stats()['open'] == 0
+    assert not pool.warm_up()
+
+if __name__ == "__main__":
+    tests = [
+        test_nested_leases_share_one_session_per_thread,
+        test_broken_session_is_closed_not_reused,
+        test_other_errors_keep_the_session,
+        test_idle_sessions_are_evicted_past_idle_timeout,
+        test_unhealthy_idle_session_is_replaced,
+        test_exhausted_pool_waits_then_times_out,
+        test_failed_factory_frees_its_slot
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
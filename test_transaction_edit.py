@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test TransactionEdit, the single-UPDATE unit of work for SERVICE_TRANSACTION
+Checks that bind values follow the placeholders when AMOUNT is recomputed
+together with the add_service CASE expressions, then runs the statements
+against the local DuckDB backend
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from decimal import Decimal
+
+from models.transaction import TransactionEdit
+
+def placeholders_by_column(query, params):
+    """Pair each top-level SET assignment with the bind values of its ? placeholders"""
+    set_clause = query.split("SET", 1)[1].split("WHERE", 1)[0]
+    where_clause = query.split("WHERE", 1)[1]
+    assignments, depth, current = [], 0, ""
+    for character in set_clause:
+        depth += {"(": 1, ")": -1}.get(character, 0)
+        if character == "," and depth == 0:
+            assignments.append(current.strip())
+            current = ""
+        else:
+            current += character
+    assignments.append(current.strip())
+    values = iter(params)
+    paired = [(assignment.split(" = ", 1)[0], [next(values) for _ in range(assignment.count("?"))])
+              for assignment in assignments]
+    paired.append(("WHERE", [next(values) for _ in range(where_clause.count("?"))]))
+    assert next(values, None) is None, "more bind values than placeholders"
+    return paired
+
+def test_add_service_with_amount_binds_in_order():
+    """Each CASE and AMOUNT term gets its own values, in placeholder order"""
+    edit = TransactionEdit(42, conn=object())
+    edit.add_service(7, 55.0).set('MATERIAL_COST', 12.5).set('DISCOUNT', 5.0)
+    query, params = edit.statement()
+
+    assert query.count("?") == len(params)
+    assert placeholders_by_column(query, params) == [
+        ("SERVICE2_ID", [7]),
+        ("SERVICE2_COST", [55.0]),
+        ("SERVICE3_ID", [7]),
+        ("SERVICE3_COST", [55.0]),
+        ("MATERIAL_COST", [12.5]),
+        ("DISCOUNT", [5.0]),
+        # BASE_SERVICE_COST is unchanged and reads the column; the rest repeat the staged expressions
+        ("AMOUNT", [55.0, 55.0, 12.5, 5.0]),
+        ("LAST_MODIFIED_DATE", []),
+        ("WHERE", [42])
+    ]
+    assert "(SERVICE2_ID IS NULL OR SERVICE3_ID IS NULL)" in query
+
+def test_add_service_rejects_conflicting_slot_changes():
+    edit = TransactionEdit(1, conn=object()).set('SERVICE2_COST', 10.0)
+    try:
+        edit.add_service(3, 20.0)
+    except ValueError:
+        return
+    raise AssertionError("add_service combined with a SERVICE2_COST change")
+
+def local_transaction_row(base_cost=100.0, material_cost=10.0, discount=0.0):
+    """In-memory DuckDB backend with one transaction; skipped when duckdb is not installed"""
+    try:
+        from database.local import LocalConnection
+        conn = LocalConnection(":memory:")
+    except ImportError:
+        return None, None
+    conn.execute_query(
+        """
+        INSERT INTO OPERATIONAL.CARPET.SERVICE_TRANSACTION
+            (ID, SERVICE_ID, BASE_SERVICE_COST, MATERIAL_COST, DISCOUNT, AMOUNT)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [1, 1, base_cost, material_cost, discount, base_cost + material_cost - discount]
+    )
+    return conn, 1
+
+def read_row(conn, transaction_id):
+    return conn.execute_query(
+        """
+        SELECT SERVICE2_ID, SERVICE2_COST, SERVICE3_ID, SERVICE3_COST, MATERIAL_COST, DISCOUNT, AMOUNT
+        FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION WHERE ID = ?
+        """,
+        [transaction_id],
+        cache=False
+    )[0]
+
+def test_add_service_fills_slots_and_recomputes_amount():
+    """Services land in SERVICE2 then SERVICE3, AMOUNT follows, and a third add updates nothing"""
+    conn, transaction_id = local_transaction_row()
+    if conn is None:
+        print("   duckdb not installed; skipped")
+        return
+
+    edit = TransactionEdit(transaction_id, conn)
+    assert edit.add_service(7, 55.0).set('DISCOUNT', 5.0).flush()
+    row = read_row(conn, transaction_id)
+    assert (row['SERVICE2_ID'], row['SERVICE3_ID']) == (7, None)
+    assert row['SERVICE2_COST'] == Decimal('55.00')
+    assert row['AMOUNT'] == Decimal('160.00')  # 100 + 55 + 10 - 5
+
+    assert TransactionEdit(transaction_id, conn).add_service(8, 30.0).set('MATERIAL_COST', 20.0).flush()
+    row = read_row(conn, transaction_id)
+    assert (row['SERVICE2_ID'], row['SERVICE3_ID']) == (7, 8)
+    assert (row['SERVICE2_COST'], row['SERVICE3_COST']) == (Decimal('55.00'), Decimal('30.00'))
+    assert row['AMOUNT'] == Decimal('200.00')  # 100 + 55 + 30 + 20 - 5
+
+    full = TransactionEdit(transaction_id, conn)
+    assert not full.add_service(9, 99.0).flush()
+    assert full.rows_updated == 0
+    assert read_row(conn, transaction_id)['AMOUNT'] == Decimal('200.00')
+
+if __name__ == "__main__":
+    tests = [
+        test_add_service_with_amount_binds_in_order,
+        test_add_service_rejects_conflicting_slot_changes,
+        test_add_service_fills_slots_and_recomputes_amount
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    sys.exit(1 if failed else 0)
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 import uuid
 from typing import Optional, Tuple, Dict, List
 from database.connection import snowflake_conn
+from utils.auth.session_cache import customer_sessions
 
 def validate_password(password: str) -> List[str]:
     """
@@ -68,7 +69,16 @@ def create_session(portal_user_id: int, ip_address: str, user_agent: str) -> Opt
         return None
 
 def validate_session(session_id: str) -> Optional[Dict]:
-    """Validate session and update last activity"""
+    """Validate session and record last activity"""
+    if not session_id:
+        return None
+
+    # Reruns within the cache TTL are answered without a warehouse round trip
+    cached = customer_sessions.lookup(session_id)
+    if cached:
+        customer_sessions.record_activity(session_id)
+        return cached
+
     query = """
     SELECT 
         s.PORTAL_USER_ID,
@@ -88,14 +98,10 @@ def validate_session(session_id: str) -> Optional[Dict]:
         if result and len(result) > 0:
             # Result is already a dict
             session_data = result[0]
+            customer_sessions.store(session_id, session_data)
             
-            # Update last activity
-            update_query = """
-            UPDATE OPERATIONAL.CARPET.CUSTOMER_SESSIONS
-            SET LAST_ACTIVITY = CURRENT_TIMESTAMP()
-            WHERE SESSION_ID = ?
-            """
-            snowflake_conn.execute_query(update_query, [session_id])
+            # LAST_ACTIVITY is written in the background, at most once a minute
+            customer_sessions.record_activity(session_id)
             
             return session_data
         return None
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Callable, Optional
 from database.connection import snowflake_conn
 from utils.auth.auth_utils import validate_session, log_security_event
+from utils.auth.session_cache import customer_sessions
 
 def init_customer_session() -> None:
     """Initialize customer session state and check timeout"""
@@ -69,6 +70,8 @@ def clear_customer_session(reason: Optional[str] = None) -> None:
     portal_user_id = st.session_state.get('portal_user_id')
     
     if session_id:
+        customer_sessions.invalidate(session_id)
+        
         # Update session in database
         query = """
         UPDATE OPERATIONAL.CARPET.CUSTOMER_SESSIONS
@@ -0,0 +1,148 @@
+# utils/auth/session_cache.py
+"""
+Server-side TTL cache of validated portal sessions so Streamlit reruns skip the
+session lookup.
+
+A session that passed the database check is kept in process memory and trusted
+without a query for the next `ttl` seconds. Nothing is stored in the browser;
+the session ID remains the only credential. LAST_ACTIVITY is written back on a
+background thread at most once per `activity_interval` seconds per session.
+A session deactivated in another process stays valid here for at most `ttl`.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from database.connection import snowflake_conn
+
+SESSION_CACHE_TTL_SECONDS = 60
+ACTIVITY_WRITE_INTERVAL_SECONDS = 60
+
+# Single worker so activity writes never compete with page queries for the pool
+_activity_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-activity")
+
+class SessionCache:
+    """Validated sessions of one portal (business or customer)"""
+
+    def __init__(self,
+                 sessions_table: str,
+                 ttl: float = SESSION_CACHE_TTL_SECONDS,
+                 activity_interval: float = ACTIVITY_WRITE_INTERVAL_SECONDS):
+        """
+        Initialize the cache
+
+        Args:
+            sessions_table (str): Fully qualified sessions table holding LAST_ACTIVITY
+            ttl (float): Seconds a validated session is trusted without a query
+            activity_interval (float): Minimum seconds between LAST_ACTIVITY writes per session
+        """
+        self.sessions_table = sessions_table
+        self.ttl = float(ttl)
+        self.activity_interval = float(activity_interval)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._activity_written: Dict[str, float] = {}
+        self._next_prune = 0.0
+        self._lock = threading.Lock()
+
+    def lookup(self, session_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Get a recently validated session from memory
+
+        Args:
+            session_id (Optional[str]): Session to look up
+
+        Returns:
+            Optional[Dict[str, Any]]: Session data, or None if it must be validated again
+        """
+        if not session_id:
+            return None
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            entry = self._entries.get(session_id)
+            if entry and entry['exp'] > now:
+                return dict(entry['data'])
+            self._entries.pop(session_id, None)
+        return None
+
+    def store(self, session_id: str, session_data: Dict[str, Any]) -> None:
+        """
+        Remember a session that was just validated against the database
+
+        Args:
+            session_id (str): Validated session
+            session_data (Dict[str, Any]): Row returned by the validation query
+        """
+        exp = time.time() + self.ttl
+        expires_at = session_data.get('EXPIRES_AT')
+        if isinstance(expires_at, datetime):
+            # Never trust a cached session past its own expiry
+            exp = min(exp, expires_at.timestamp())
+        with self._lock:
+            self._entries[session_id] = {'data': dict(session_data), 'exp': exp}
+
+    def invalidate(self, session_id: Optional[str]) -> None:
+        """
+        Forget a session (logout or deactivation)
+
+        Args:
+            session_id (Optional[str]): Session to drop
+        """
+        with self._lock:
+            self._entries.pop(session_id, None)
+            self._activity_written.pop(session_id, None)
+
+    def record_activity(self, session_id: str) -> None:
+        """
+        Queue a LAST_ACTIVITY update unless one was written within activity_interval
+
+        Args:
+            session_id (str): Active session
+        """
+        now = time.monotonic()
+        with self._lock:
+            last_written = self._activity_written.get(session_id)
+            if last_written is not None and now - last_written < self.activity_interval:
+                return
+            self._activity_written[session_id] = now
+        _activity_executor.submit(self._write_activity, session_id)
+
+    def _prune(self, now: float) -> None:
+        """Drop expired sessions and stale activity stamps; called with the lock held"""
+        if now < self._next_prune:
+            return
+        self._next_prune = now + self.ttl
+        for session_id in [sid for sid, entry in self._entries.items() if entry['exp'] <= now]:
+            del self._entries[session_id]
+        cutoff = time.monotonic() - self.activity_interval
+        for session_id in [sid for sid, written in self._activity_written.items() if written <= cutoff]:
+            del self._activity_written[session_id]
+
+    def _write_activity(self, session_id: str) -> None:
+        """Runs on the background worker; failures only cost one activity timestamp"""
+        query = f"""
+        UPDATE {self.sessions_table}
+        SET LAST_ACTIVITY = CURRENT_TIMESTAMP()
+        WHERE SESSION_ID = ?
+        """
+        try:
+            snowflake_conn.execute_query(query, [session_id])
+        except Exception as e:
+            print(f"Error recording session activity: {str(e)}")
+
+business_sessions = SessionCache(
+    sessions_table="OPERATIONAL.CARPET.BUSINESS_SESSIONS"
+)
+
+customer_sessions = SessionCache(
+    sessions_table="OPERATIONAL.CARPET.CUSTOMER_SESSIONS"
+)
+
+__all__ = [
+    'SessionCache',
+    'business_sessions',
+    'customer_sessions'
+]
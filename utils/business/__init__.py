@@ -1,7 +1,7 @@
 # utils/business/__init__.py
 import streamlit as st
 
-from .info import fetch_business_info
+from .info import fetch_business_info, get_business_profile, invalidate_business_profile
 from .business_auth import (
     create_business_session,
     verify_business_session,
@@ -14,6 +14,8 @@ from .business_auth import (
 
 __all__ = [
     'fetch_business_info',
+    'get_business_profile',
+    'invalidate_business_profile',
     'create_business_session',
     'verify_business_session', 
     'create_business_user',
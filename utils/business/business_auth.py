@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Tuple
 from passlib.hash import pbkdf2_sha256
 from database.connection import snowflake_conn
+from utils.auth.session_cache import business_sessions
 
 def validate_password(password: str) -> Tuple[bool, str]:
     """
@@ -97,7 +98,16 @@ def create_business_session(portal_user_id: int, ip_address: str, user_agent: st
         return None
 
 def verify_business_session(session_id: str) -> Optional[Dict]:
-    """Validate business session and update last activity"""
+    """Validate business session and record last activity"""
+    if not session_id:
+        return None
+
+    # Reruns within the cache TTL are answered without a warehouse round trip
+    cached = business_sessions.lookup(session_id)
+    if cached:
+        business_sessions.record_activity(session_id)
+        return cached
+
     query = """
     SELECT 
         s.PORTAL_USER_ID,
@@ -116,14 +126,10 @@ def verify_business_session(session_id: str) -> Optional[Dict]:
         result = snowflake_conn.execute_query(query, [session_id])
         if result and len(result) > 0:
             session_data = result[0]
+            business_sessions.store(session_id, session_data)
             
-            # Update last activity
-            update_query = """
-            UPDATE OPERATIONAL.CARPET.BUSINESS_SESSIONS 
-            SET LAST_ACTIVITY = CURRENT_TIMESTAMP()
-            WHERE SESSION_ID = :1
-            """
-            snowflake_conn.execute_query(update_query, [session_id])
+            # LAST_ACTIVITY is written in the background, at most once a minute
+            business_sessions.record_activity(session_id)
             
             return session_data
         return None
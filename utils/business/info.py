@@ -3,8 +3,20 @@ import streamlit as st
 from typing import Dict, Any
 from database.connection import snowflake_conn
 
-def fetch_business_info() -> Dict[str, Any]:
-    """Fetch current business information from settings"""
+# Seconds a loaded BUSINESS_INFO row is reused before it is fetched again
+BUSINESS_PROFILE_TTL_SECONDS = 300
+
+BUSINESS_PROFILE_COLUMNS = [
+    "BUSINESS_ID", "BUSINESS_NAME", "STREET_ADDRESS", "CITY", "STATE",
+    "ZIP_CODE", "PHONE_NUMBER", "EMAIL_ADDRESS", "WEBSITE",
+    "OPERATING_HOURS_START", "OPERATING_HOURS_END",
+    "WEEKEND_OPERATING_HOURS_START", "WEEKEND_OPERATING_HOURS_END",
+    "ACTIVE_STATUS", "MODIFIED_DATE"
+]
+
+@st.cache_data(ttl=BUSINESS_PROFILE_TTL_SECONDS, show_spinner=False)
+def _load_business_profile() -> Dict[str, Any]:
+    """Query the active BUSINESS_INFO row (cached process-wide for the TTL)"""
     query = """
     SELECT 
         BUSINESS_ID,
@@ -27,25 +39,32 @@ def fetch_business_info() -> Dict[str, Any]:
     ORDER BY MODIFIED_DATE DESC
     LIMIT 1
     """
+    result = snowflake_conn.execute_query(query)
+    if result is None:
+        # Raise so a failed lookup is not cached for the whole TTL
+        raise RuntimeError("Business info query failed")
+    return dict(result[0]) if result else {}
+
+def get_business_profile() -> Dict[str, Any]:
+    """Get the raw active BUSINESS_INFO row from the shared cache"""
+    try:
+        return dict(_load_business_profile())
+    except Exception as e:
+        print(f"Error fetching business profile: {str(e)}")
+        return {}
+
+def invalidate_business_profile() -> None:
+    """Drop the cached BUSINESS_INFO row so the next read fetches it again"""
+    _load_business_profile.clear()
+
+def fetch_business_info() -> Dict[str, Any]:
+    """Fetch current business information from settings"""
     try:
-        result = snowflake_conn.execute_query(query)
-        if not result:
+        row = get_business_profile()
+        if not row:
             return {}
 
-        # Convert Snowflake Row object to dictionary
-        row = result[0]
-        business_info = {}
-        for column in [
-            "BUSINESS_ID", "BUSINESS_NAME", "STREET_ADDRESS", "CITY", "STATE",
-            "ZIP_CODE", "PHONE_NUMBER", "EMAIL_ADDRESS", "WEBSITE",
-            "OPERATING_HOURS_START", "OPERATING_HOURS_END",
-            "WEEKEND_OPERATING_HOURS_START", "WEEKEND_OPERATING_HOURS_END",
-            "ACTIVE_STATUS", "MODIFIED_DATE"
-        ]:
-            try:
-                business_info[column] = getattr(row, column, None)
-            except AttributeError:
-                business_info[column] = None
+        business_info = {column: row.get(column) for column in BUSINESS_PROFILE_COLUMNS}
 
         # Clean each field
         for key in business_info:
@@ -67,4 +86,4 @@ def fetch_business_info() -> Dict[str, Any]:
         return business_info
     except Exception as e:
         st.error(f"Error fetching business info: {str(e)}")
-        return {}
\ No newline at end of file
+        return {}
@@ -6,12 +6,15 @@ Ensures no scheduling conflicts across business and customer portals.
 
 import streamlit as st
 from datetime import datetime, date, time, timedelta
-from typing import List, Tuple, Optional, Dict, Any
-from database.connection import SnowflakeConnection
-from utils.business.info import fetch_business_info
+from contextlib import contextmanager
+from typing import List, Tuple, Optional, Dict, Any, Iterator
+from database.connection import snowflake_conn
+from database.ids import sequence_for
+from database.result_cache import advance_generation
+from utils.day_occupancy import DayOccupancy, OccupancyStore, parse_booking_time, minute_of_day, time_of_minute
+from utils.business.info import fetch_business_info, get_business_profile
+from utils.service_utils import get_service_by_name
 
-# Initialize database connection
-snowflake_conn = SnowflakeConnection.get_instance()
 
 def debug_print(msg: str) -> None:
     """Helper function for debug logging with defensive access to debug_mode."""
@@ -42,6 +45,62 @@ class BookingConflict:
                 f"for {self.existing_customer} at {self.conflict_time.strftime('%I:%M %p')} "
                 f"(Duration: {self.conflict_duration} minutes)")
 
+def summarize_conflicts(conflicts: List[BookingConflict]) -> str:
+    """Describe the first conflict and count the rest."""
+    error_message = conflicts[0].get_conflict_message()
+    if len(conflicts) > 1:
+        error_message += f" (and {len(conflicts) - 1} other conflict{'s' if len(conflicts) > 2 else ''})"
+    return error_message
+
+def fetch_business_hours_settings() -> Optional[Dict[str, Any]]:
+    """
+    Get the weekday and weekend operating hours from the shared business profile cache.
+    
+    Returns:
+        Dictionary of operating hour columns or None if unavailable
+    """
+    business_profile = get_business_profile()
+    return business_profile or None
+
+def resolve_business_hours(
+    business_info: Optional[Dict[str, Any]],
+    service_date: date
+) -> Tuple[time, time]:
+    """
+    Pick the weekday or weekend business hours for a date.
+    
+    Args:
+        business_info: Operating hour settings from fetch_business_hours_settings
+        service_date: Date to resolve business hours for
+    
+    Returns:
+        Tuple of (start_time, end_time) for business hours
+    """
+    if not business_info:
+        # Fallback to defaults if no business hours found
+        return time(8, 0), time(17, 0)
+    
+    # Check if it's weekend (Saturday = 5, Sunday = 6)
+    is_weekend = service_date.weekday() >= 5
+    
+    # Get appropriate hours based on weekday/weekend
+    if is_weekend:
+        start_time_str = business_info.get('WEEKEND_OPERATING_HOURS_START')
+        end_time_str = business_info.get('WEEKEND_OPERATING_HOURS_END')
+    else:
+        start_time_str = business_info.get('OPERATING_HOURS_START')
+        end_time_str = business_info.get('OPERATING_HOURS_END')
+    
+    # Parse time strings, fallback to defaults if parsing fails
+    try:
+        business_start = time.fromisoformat(str(start_time_str)) if start_time_str else time(8, 0)
+        business_end = time.fromisoformat(str(end_time_str)) if end_time_str else time(17, 0)
+    except (ValueError, TypeError):
+        business_start = time(8, 0)  # Default 8 AM
+        business_end = time(17, 0)   # Default 5 PM
+    
+    return business_start, business_end
+
 def get_business_hours_for_date(service_date: date) -> Tuple[time, time]:
     """
     Get business hours for a specific date from database.
@@ -52,52 +111,7 @@ def get_business_hours_for_date(service_date: date) -> Tuple[time, time]:
     Returns:
         Tuple of (start_time, end_time) for business hours
     """
-    try:
-        business_hours_query = """
-        SELECT 
-            OPERATING_HOURS_START,
-            OPERATING_HOURS_END,
-            WEEKEND_OPERATING_HOURS_START,
-            WEEKEND_OPERATING_HOURS_END
-        FROM OPERATIONAL.CARPET.BUSINESS_INFO
-        WHERE ACTIVE_STATUS = TRUE
-        ORDER BY MODIFIED_DATE DESC
-        LIMIT 1
-        """
-        
-        business_hours_result = snowflake_conn.execute_query(business_hours_query)
-        
-        if business_hours_result:
-            business_info = business_hours_result[0]
-            # Check if it's weekend (Saturday = 5, Sunday = 6)
-            is_weekend = service_date.weekday() >= 5
-            
-            # Get appropriate hours based on weekday/weekend
-            if is_weekend:
-                start_time_str = business_info.get('WEEKEND_OPERATING_HOURS_START')
-                end_time_str = business_info.get('WEEKEND_OPERATING_HOURS_END')
-            else:
-                start_time_str = business_info.get('OPERATING_HOURS_START')
-                end_time_str = business_info.get('OPERATING_HOURS_END')
-            
-            # Parse time strings, fallback to defaults if parsing fails
-            try:
-                business_start = time.fromisoformat(str(start_time_str)) if start_time_str else time(8, 0)
-                business_end = time.fromisoformat(str(end_time_str)) if end_time_str else time(17, 0)
-            except (ValueError, TypeError):
-                business_start = time(8, 0)  # Default 8 AM
-                business_end = time(17, 0)   # Default 5 PM
-        else:
-            # Fallback to defaults if no business hours found
-            business_start = time(8, 0)  # Default 8 AM
-            business_end = time(17, 0)   # Default 5 PM
-            
-        return business_start, business_end
-        
-    except Exception as e:
-        debug_print(f"Error fetching business hours: {str(e)}")
-        # Fallback to defaults
-        return time(8, 0), time(17, 0)
+    return resolve_business_hours(fetch_business_hours_settings(), service_date)
 
 def get_service_duration(service_names: List[str]) -> int:
     """
@@ -112,65 +126,78 @@ def get_service_duration(service_names: List[str]) -> int:
     if not service_names:
         return 60  # Default duration
     
-    try:
-        placeholders = ','.join(['?' for _ in service_names])
-        services_query = f"""
-        SELECT SUM(COALESCE(SERVICE_DURATION, 60)) as TOTAL_DURATION
-        FROM OPERATIONAL.CARPET.SERVICES
-        WHERE SERVICE_NAME IN ({placeholders})
-        """
-        
-        duration_result = snowflake_conn.execute_query(services_query, service_names)
-        if duration_result and duration_result[0]['TOTAL_DURATION']:
-            return int(duration_result[0]['TOTAL_DURATION'])
-        
-        return len(service_names) * 60  # Fallback: 60 minutes per service
-        
-    except Exception as e:
-        debug_print(f"Error calculating service duration: {str(e)}")
-        return len(service_names) * 60  # Fallback: 60 minutes per service
+    durations = [
+        service['SERVICE_DURATION']
+        for service in (get_service_by_name(name) for name in dict.fromkeys(service_names))
+        if service
+    ]
+    if durations:
+        return sum(durations)
+    
+    return len(service_names) * 60  # Fallback: 60 minutes per service
+
+def group_bookings_by_date(bookings: List[Dict[str, Any]]) -> Dict[date, List[Dict[str, Any]]]:
+    """
+    Group booking rows by their SERVICE_DATE.
+    
+    Args:
+        bookings: Booking dictionaries that include a SERVICE_DATE column
+    
+    Returns:
+        Dictionary mapping each service date to its bookings
+    """
+    bookings_by_date: Dict[date, List[Dict[str, Any]]] = {}
+    for booking in bookings:
+        booking_date = booking.get('SERVICE_DATE')
+        if isinstance(booking_date, datetime):
+            booking_date = booking_date.date()
+        elif isinstance(booking_date, str):
+            try:
+                booking_date = date.fromisoformat(booking_date[:10])
+            except ValueError:
+                continue
+        if not isinstance(booking_date, date):
+            continue
+        bookings_by_date.setdefault(booking_date, []).append(booking)
+    return bookings_by_date
 
-def get_existing_bookings(service_date: date) -> List[Dict[str, Any]]:
+def _query_bookings(condition: str, params: List[Any]) -> Optional[List[Dict[str, Any]]]:
     """
-    Get all existing bookings for a specific date.
+    Active bookings matching a SERVICE_DATE condition, with durations and customer names.
     
     Args:
-        service_date: Date to check bookings for
+        condition: SQL condition on ST.SERVICE_DATE with ? placeholders
+        params: Bind values for the condition
     
     Returns:
-        List of booking dictionaries with scheduling details
+        Booking dictionaries ordered by date and start time, or None if the query failed
     """
     try:
-        bookings_query = """
+        bookings_query = f"""
         SELECT 
             ST.ID as TRANSACTION_ID,
+            ST.SERVICE_DATE,
             ST.START_TIME,
             ST.END_TIME,
             ST.SERVICE_NAME,
             COALESCE(S.SERVICE_DURATION, 60) as SERVICE_DURATION,
             COALESCE(C.FIRST_NAME || ' ' || C.LAST_NAME, A.ACCOUNT_NAME) AS CUSTOMER_NAME,
-            ST.STATUS,
-            CASE 
-                WHEN C.CUSTOMER_ID IS NOT NULL THEN 'Residential'
-                WHEN A.ACCOUNT_ID IS NOT NULL THEN 'Commercial'
-                ELSE 'Unknown'
-            END AS CUSTOMER_TYPE
+            ST.STATUS
         FROM OPERATIONAL.CARPET.SERVICE_TRANSACTION ST
         LEFT JOIN OPERATIONAL.CARPET.SERVICES S ON ST.SERVICE_ID = S.SERVICE_ID
         LEFT JOIN OPERATIONAL.CARPET.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
         LEFT JOIN OPERATIONAL.CARPET.ACCOUNTS A ON ST.ACCOUNT_ID = A.ACCOUNT_ID
-        WHERE ST.SERVICE_DATE = ?
+        WHERE {condition}
         AND ST.STATUS IN ('SCHEDULED', 'IN_PROGRESS')
-        ORDER BY ST.START_TIME
+        ORDER BY ST.SERVICE_DATE, ST.START_TIME
         """
-        
-        bookings = snowflake_conn.execute_query(bookings_query, [service_date.strftime('%Y-%m-%d')])
-        return bookings or []
+        # Bookings made by other processes must be seen; never serve these from the result cache
+        return snowflake_conn.execute_query(bookings_query, params, cache=False)
         
     except Exception as e:
         debug_print(f"Error fetching existing bookings: {str(e)}")
         st.error(f"Error checking existing bookings: {str(e)}")
-        return []
+        return None
 
 def check_time_overlap(
     requested_start: datetime,
@@ -238,6 +265,276 @@ def validate_business_hours(
         debug_print(f"Error validating business hours: {str(e)}")
         return False, f"Error validating business hours: {str(e)}"
 
+def _conflict_from_booking(booking: Dict[str, Any], service_date: date) -> BookingConflict:
+    """BookingConflict for a booking row with TRANSACTION_ID, START_TIME and SERVICE_DURATION."""
+    return BookingConflict(
+        conflict_time=parse_booking_time(booking.get('START_TIME')),
+        conflict_date=service_date,
+        existing_service=booking.get('SERVICE_NAME'),
+        existing_customer=booking.get('CUSTOMER_NAME') or 'Unknown Customer',
+        conflict_duration=int(booking.get('SERVICE_DURATION') or 60),
+        transaction_id=booking.get('TRANSACTION_ID')
+    )
+
+class DayAvailability:
+    """
+    In-memory availability for a single service date.
+    
+    Business hours and the requested service duration are resolved once and the
+    day's bookings are held in a DayOccupancy minute index, so conflict checks
+    and free slot generation are array lookups without further round trips.
+    """
+    
+    def __init__(self,
+                 service_date: date,
+                 business_start: time,
+                 business_end: time,
+                 total_duration: int,
+                 bookings: Optional[List[Dict[str, Any]]] = None,
+                 buffer_minutes: int = 15,
+                 occupancy: Optional[DayOccupancy] = None):
+        self.service_date = service_date
+        self.business_start = business_start
+        self.business_end = business_end
+        self.total_duration = total_duration
+        if occupancy is None:
+            occupancy = DayOccupancy(service_date, bookings or [], buffer_minutes)
+        self.occupancy = occupancy
+        self.buffer_minutes = occupancy.buffer_minutes
+    
+    def validate_business_hours(self, service_time: time) -> Tuple[bool, Optional[str]]:
+        """Validate that a service starting at service_time fits within business hours."""
+        service_start_datetime = datetime.combine(self.service_date, service_time)
+        service_end_time = (service_start_datetime + timedelta(minutes=self.total_duration)).time()
+        
+        if service_time < self.business_start:
+            return False, f"Service cannot start before business hours ({self.business_start.strftime('%I:%M %p')})"
+        
+        if service_end_time > self.business_end:
+            return False, f"Service would end after business hours ({self.business_end.strftime('%I:%M %p')}). Please select an earlier time or reduce service duration."
+        
+        return True, None
+    
+    def find_conflicts(self,
+                       service_time: time,
+                       exclude_transaction_id: Optional[int] = None) -> List[BookingConflict]:
+        """Return every existing booking that overlaps the requested start time."""
+        start = minute_of_day(service_time)
+        # Free windows (the common case) never touch the individual bookings
+        if self.occupancy.is_free(start, self.total_duration, exclude_transaction_id):
+            return []
+        return [
+            _conflict_from_booking(booking, self.service_date)
+            for _, _, booking in self.occupancy.overlapping(start, self.total_duration, exclude_transaction_id)
+        ]
+    
+    def check(self,
+              service_time: time,
+              exclude_transaction_id: Optional[int] = None) -> Tuple[bool, Optional[str], List[BookingConflict]]:
+        """
+        Check a requested start time against business hours and existing bookings.
+        
+        Returns:
+            Tuple of (is_available, error_message, list_of_conflicts)
+        """
+        business_valid, business_error = self.validate_business_hours(service_time)
+        if not business_valid:
+            return False, business_error, []
+        
+        conflicts = self.find_conflicts(service_time, exclude_transaction_id)
+        if conflicts:
+            return False, summarize_conflicts(conflicts), conflicts
+        
+        return True, None, []
+    
+    def is_available(self, service_time: time, exclude_transaction_id: Optional[int] = None) -> bool:
+        """Return True if the requested start time has no conflicts."""
+        return self.check(service_time, exclude_transaction_id)[0]
+    
+    def available_slots(self,
+                        slot_duration_minutes: int = 30,
+                        exclude_transaction_id: Optional[int] = None) -> List[time]:
+        """
+        Compute every free start time from the minute index in one vectorized pass.
+        
+        Args:
+            slot_duration_minutes: Duration between candidate slots in minutes
+            exclude_transaction_id: Transaction ID to ignore (for rescheduling)
+        
+        Returns:
+            List of available time slots
+        """
+        free_starts = self.occupancy.free_starts(
+            minute_of_day(self.business_start),
+            minute_of_day(self.business_end),
+            self.total_duration,
+            step=slot_duration_minutes,
+            exclude_transaction_id=exclude_transaction_id
+        )
+        return [time_of_minute(minute) for minute in free_starts]
+
+# Day indexes shared by every session in this process, stamped with the write
+# generation of the tables the bookings are read from. Writes from this process
+# patch them; the short TTL bounds how long a booking made elsewhere goes unseen.
+ACTIVE_BOOKING_STATUSES = ('SCHEDULED', 'IN_PROGRESS')
+BOOKING_INDEX_TABLES = frozenset({'SERVICE_TRANSACTION', 'SERVICES'})
+OCCUPANCY_TTL_SECONDS = 5
+# Days ahead customers can book (the portal calendar loads today plus this many days)
+BOOKING_WINDOW_DAYS = 180
+# The whole calendar window twice over, so other pages' dates do not push calendar days out
+_occupancy_store = OccupancyStore(max_days=2 * (BOOKING_WINDOW_DAYS + 1), ttl=OCCUPANCY_TTL_SECONDS)
+
+def _booking_generation() -> Tuple[int, ...]:
+    """Write counters of the tables the day indexes are built from."""
+    return snowflake_conn.results.generation(BOOKING_INDEX_TABLES)
+
+def load_day_occupancy(service_dates: List[date], contiguous: bool = False) -> Dict[date, DayOccupancy]:
+    """
+    Minute indexes for a set of dates, building only those not already current.
+    
+    Dates missing from the store are loaded with one bookings query, a BETWEEN
+    over their span when `contiguous` (calendar windows) or an IN list otherwise.
+    
+    Args:
+        service_dates: Dates to index
+        contiguous: Whether the dates form a consecutive window
+    
+    Returns:
+        Dictionary mapping each date to its DayOccupancy
+    """
+    generation = _booking_generation()
+    occupancy_by_date: Dict[date, DayOccupancy] = {}
+    missing = []
+    for service_date in dict.fromkeys(service_dates):
+        occupancy = _occupancy_store.get(service_date, generation)
+        if occupancy is None:
+            missing.append(service_date)
+        else:
+            occupancy_by_date[service_date] = occupancy
+    if not missing:
+        return occupancy_by_date
+    
+    if contiguous:
+        bookings = _query_bookings("ST.SERVICE_DATE BETWEEN ? AND ?", [
+            min(missing).strftime('%Y-%m-%d'),
+            max(missing).strftime('%Y-%m-%d')
+        ])
+    else:
+        placeholders = ','.join(['?' for _ in missing])
+        bookings = _query_bookings(f"ST.SERVICE_DATE IN ({placeholders})", [
+            service_date.strftime('%Y-%m-%d') for service_date in sorted(missing)
+        ])
+    bookings_by_date = group_bookings_by_date(bookings or [])
+    
+    for service_date in missing:
+        occupancy = DayOccupancy(service_date, bookings_by_date.get(service_date, []))
+        # A failed read is reported once and not remembered
+        if bookings is not None:
+            _occupancy_store.put(service_date, occupancy, generation)
+        occupancy_by_date[service_date] = occupancy
+    return occupancy_by_date
+
+class BookingChanges:
+    """Booking writes recorded inside booking_changes(), replayed onto the cached day indexes."""
+    
+    def __init__(self):
+        self._changes: List[Tuple[Any, ...]] = []
+    
+    def added(self, service_date: date, booking: Dict[str, Any]) -> None:
+        """A booking row (TRANSACTION_ID, START_TIME, SERVICE_DURATION, ...) was inserted."""
+        self._changes.append(('add', service_date, booking))
+    
+    def cancelled(self, transaction_id: int) -> None:
+        """A booking no longer blocks its slot."""
+        self._changes.append(('remove', transaction_id))
+    
+    def moved(self, transaction_id: int, service_date: date, start_time: time) -> None:
+        """A booking was rescheduled to a new date and start time."""
+        self._changes.append(('move', transaction_id, service_date, start_time))
+    
+    def status_changed(self, transaction_id: int, status: str) -> None:
+        """A booking's STATUS was set; only SCHEDULED and IN_PROGRESS bookings block slots."""
+        if status in ACTIVE_BOOKING_STATUSES:
+            self._changes.append(('activate', transaction_id))
+        else:
+            self.cancelled(transaction_id)
+    
+    def apply(self, days: Dict[date, DayOccupancy]) -> None:
+        """Patch the current day indexes; days that cannot be patched are dropped for a rebuild."""
+        for change in self._changes:
+            kind = change[0]
+            if kind == 'add':
+                _, service_date, booking = change
+                if service_date in days:
+                    days[service_date].add(booking)
+            elif kind == 'remove':
+                for occupancy in days.values():
+                    occupancy.remove(change[1])
+            elif kind == 'move':
+                _, transaction_id, service_date, start_time = change
+                booking = None
+                for occupancy in days.values():
+                    booking = occupancy.remove(transaction_id) or booking
+                if booking is None:
+                    # Duration unknown without the original row
+                    days.pop(service_date, None)
+                elif service_date in days:
+                    days[service_date].add(dict(booking, START_TIME=start_time))
+            elif kind == 'activate':
+                # A reactivated booking could be on any date
+                if not any(change[1] in occupancy for occupancy in days.values()):
+                    days.clear()
+
+@contextmanager
+def booking_changes() -> Iterator[BookingChanges]:
+    """
+    Patch the cached day indexes with the effect of a booking write.
+    
+    Any write to SERVICE_TRANSACTION makes the cached indexes stale. Wrapping a
+    write whose effect is known keeps them current instead:
+    
+        with booking_changes() as changes:
+            if snowflake_conn.execute_query(cancel_query, [transaction_id]) is not None:
+                changes.cancelled(transaction_id)
+    
+    The indexes are patched only if the statements run inside the block account
+    for every write to the index tables since it started; if another thread's
+    write landed in between, they are dropped and rebuilt on next use.
+    
+    Yields:
+        BookingChanges to record what the write did
+    """
+    changes = BookingChanges()
+    before = _booking_generation()
+    try:
+        with snowflake_conn.results.recording() as statements:
+            yield changes
+    except BaseException:
+        # The write's effect is unknown
+        _occupancy_store.clear()
+        raise
+    after = advance_generation(before, BOOKING_INDEX_TABLES, statements)
+    if _booking_generation() == after:
+        _occupancy_store.patch(before, after, changes.apply)
+    else:
+        _occupancy_store.clear()
+
+def load_day_availability(
+    service_date: date,
+    service_names: List[str]
+) -> DayAvailability:
+    """
+    Load everything needed to answer availability questions for one date.
+    
+    Args:
+        service_date: Date to check availability for
+        service_names: List of service names to calculate total duration
+    
+    Returns:
+        DayAvailability built from business hours, service duration and the day's index
+    """
+    return load_availability_for_dates([service_date], service_names)[service_date]
+
 def check_for_booking_conflicts(
     service_date: date,
     service_time: time,
@@ -257,71 +554,8 @@ def check_for_booking_conflicts(
         Tuple of (is_available, error_message, list_of_conflicts)
     """
     try:
-        # Calculate total service duration
-        total_duration = get_service_duration(service_names)
-        
-        # Validate business hours first
-        business_valid, business_error = validate_business_hours(service_date, service_time, total_duration)
-        if not business_valid:
-            return False, business_error, []
-        
-        # Calculate requested booking time range
-        requested_start = datetime.combine(service_date, service_time)
-        requested_end = requested_start + timedelta(minutes=total_duration)
-        
-        # Get existing bookings for the date
-        existing_bookings = get_existing_bookings(service_date)
-        
-        conflicts = []
-        
-        for booking in existing_bookings:
-            # Skip if this is the same transaction (for rescheduling)
-            if exclude_transaction_id and booking['TRANSACTION_ID'] == exclude_transaction_id:
-                continue
-            
-            # Skip if booking doesn't have valid time data
-            if not booking['START_TIME']:
-                continue
-            
-            # Handle different time formats from database
-            booking_start_time = booking['START_TIME']
-            if isinstance(booking_start_time, str):
-                try:
-                    hour, minute, second = map(int, booking_start_time.split(':'))
-                    booking_start_time = time(hour, minute, second)
-                except ValueError:
-                    continue  # Skip invalid time format
-            elif isinstance(booking_start_time, datetime):
-                booking_start_time = booking_start_time.time()
-            
-            # Calculate booking end time
-            booking_duration = int(booking['SERVICE_DURATION'] or 60)
-            booking_start = datetime.combine(service_date, booking_start_time)
-            booking_end = booking_start + timedelta(minutes=booking_duration)
-            
-            # Check for time overlap with 15-minute buffer
-            if check_time_overlap(requested_start, requested_end, booking_start, booking_end, buffer_minutes=15):
-                conflict = BookingConflict(
-                    conflict_time=booking_start_time,
-                    conflict_date=service_date,
-                    existing_service=booking['SERVICE_NAME'],
-                    existing_customer=booking['CUSTOMER_NAME'] or 'Unknown Customer',
-                    conflict_duration=booking_duration,
-                    transaction_id=booking['TRANSACTION_ID']
-                )
-                conflicts.append(conflict)
-        
-        if conflicts:
-            # Generate detailed error message
-            primary_conflict = conflicts[0]
-            error_message = primary_conflict.get_conflict_message()
-            
-            if len(conflicts) > 1:
-                error_message += f" (and {len(conflicts) - 1} other conflict{'s' if len(conflicts) > 2 else ''})"
-            
-            return False, error_message, conflicts
-        
-        return True, None, []
+        availability = load_day_availability(service_date, service_names)
+        return availability.check(service_time, exclude_transaction_id)
         
     except Exception as e:
         debug_print(f"Error checking booking conflicts: {str(e)}")
@@ -329,6 +563,123 @@ def check_for_booking_conflicts(
         st.error(error_msg)
         return False, error_msg, []
 
+BOOKING_TABLE = "OPERATIONAL.CARPET.SERVICE_TRANSACTION"
+SCHEDULE_LOCK_TABLE = "OPERATIONAL.CARPET.SCHEDULE_LOCKS"
+
+# Minutes after midnight an existing booking starts; NULL start times never overlap
+_BOOKING_START_MINUTE = "(HOUR(ST.START_TIME) * 60 + MINUTE(ST.START_TIME))"
+
+def book_service_slot(
+    values: Dict[str, Any],
+    service_names: List[str],
+    buffer_minutes: int = 15
+) -> Tuple[Optional[int], Optional[str], List[BookingConflict]]:
+    """
+    Insert a service transaction only if its time slot is still free.
+
+    The overlap check and the INSERT run in one database transaction. It first
+    touches the date's row in SCHEDULE_LOCKS, so concurrent bookings for the
+    same day queue behind each other instead of both passing the check. The
+    overlap rule matches DayAvailability: each existing booking lasts its
+    primary service's duration and is padded by buffer_minutes.
+
+    Args:
+        values: SERVICE_TRANSACTION column values, including SERVICE_DATE and START_TIME
+        service_names: Service names used to calculate the requested duration
+        buffer_minutes: Buffer time in minutes between bookings
+
+    Returns:
+        Tuple of (transaction_id, error_message, list_of_conflicts). transaction_id
+        is None when the slot is taken, outside business hours or the insert failed;
+        database errors are already reported and leave error_message None.
+    """
+    service_date = values['SERVICE_DATE']
+    service_time = values['START_TIME']
+    total_duration = get_service_duration(service_names)
+
+    business_valid, business_error = validate_business_hours(service_date, service_time, total_duration)
+    if not business_valid:
+        return None, business_error, []
+
+    requested_start = service_time.hour * 60 + service_time.minute
+    date_param = service_date.strftime('%Y-%m-%d')
+    overlap_filter = f"""
+        ST.SERVICE_DATE = ?
+        AND ST.STATUS IN ('SCHEDULED', 'IN_PROGRESS')
+        AND {_BOOKING_START_MINUTE} < ?
+        AND {_BOOKING_START_MINUTE} + COALESCE(S.SERVICE_DURATION, 60) > ?
+    """
+    overlap_params = [
+        date_param,
+        requested_start + total_duration + buffer_minutes,
+        requested_start - buffer_minutes
+    ]
+
+    lock_query = f"""
+    MERGE INTO {SCHEDULE_LOCK_TABLE} AS L
+    USING (SELECT CAST(? AS DATE) AS SERVICE_DATE) AS R
+    ON L.SERVICE_DATE = R.SERVICE_DATE
+    WHEN MATCHED THEN UPDATE SET LOCKED_AT = CURRENT_TIMESTAMP()
+    WHEN NOT MATCHED THEN INSERT (SERVICE_DATE, LOCKED_AT) VALUES (R.SERVICE_DATE, CURRENT_TIMESTAMP())
+    """
+
+    # Reserve the ID up front when the table's sequence exists; otherwise the column default assigns it
+    columns = list(values.keys())
+    params = list(values.values())
+    new_id = snowflake_conn.ids.next_id(sequence_for(BOOKING_TABLE, 'ID'))
+    if new_id is not None:
+        columns = ['ID'] + columns
+        params = [new_id] + params
+    insert_query = f"""
+    INSERT INTO {BOOKING_TABLE} ({', '.join(columns)})
+    SELECT {', '.join('?' for _ in columns)}
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM {BOOKING_TABLE} ST
+        LEFT JOIN OPERATIONAL.CARPET.SERVICES S ON ST.SERVICE_ID = S.SERVICE_ID
+        WHERE {overlap_filter}
+    )
+    """
+
+    # After the insert the overlapping rows are either the new booking alone or the conflicts
+    overlap_query = f"""
+    SELECT
+        ST.ID as TRANSACTION_ID,
+        ST.START_TIME,
+        ST.SERVICE_NAME,
+        COALESCE(S.SERVICE_DURATION, 60) as SERVICE_DURATION,
+        COALESCE(C.FIRST_NAME || ' ' || C.LAST_NAME, A.ACCOUNT_NAME) AS CUSTOMER_NAME
+    FROM {BOOKING_TABLE} ST
+    LEFT JOIN OPERATIONAL.CARPET.SERVICES S ON ST.SERVICE_ID = S.SERVICE_ID
+    LEFT JOIN OPERATIONAL.CARPET.CUSTOMER C ON ST.CUSTOMER_ID = C.CUSTOMER_ID
+    LEFT JOIN OPERATIONAL.CARPET.ACCOUNTS A ON ST.ACCOUNT_ID = A.ACCOUNT_ID
+    WHERE {overlap_filter}
+    ORDER BY ST.START_TIME
+    """
+
+    with booking_changes() as changes:
+        results = snowflake_conn.execute_transaction([
+            (lock_query, [date_param]),
+            (insert_query, params + overlap_params),
+            (overlap_query, overlap_params)
+        ], error_msg="Error saving service transaction")
+        if results is None:
+            return None, None, []
+
+        _, inserted, overlapping = results
+        if inserted and int(next(iter(inserted[0].values()), 0) or 0) > 0:
+            transaction_id = new_id if new_id is not None else int(max(row['TRANSACTION_ID'] for row in overlapping))
+            for row in overlapping:
+                if row['TRANSACTION_ID'] == transaction_id:
+                    changes.added(service_date, row)
+            return transaction_id, None, []
+
+    conflicts = [_conflict_from_booking(row, service_date) for row in overlapping]
+    if not conflicts:
+        return None, "Time slot is no longer available", []
+    debug_print(f"Booking rejected with {len(conflicts)} conflict(s) on {date_param}")
+    return None, summarize_conflicts(conflicts), conflicts
+
 def get_available_time_slots_enhanced(
     service_date: date,
     service_names: List[str],
@@ -337,6 +688,9 @@ def get_available_time_slots_enhanced(
     """
     Enhanced version of get_available_time_slots with comprehensive conflict checking.
     
+    Business hours, service duration and the day's bookings are loaded once and
+    every slot is evaluated in memory.
+    
     Args:
         service_date: Date to check availability for
         service_names: List of service names to calculate total duration
@@ -346,42 +700,166 @@ def get_available_time_slots_enhanced(
         List of available time slots
     """
     try:
-        # Get business hours
-        business_start, business_end = get_business_hours_for_date(service_date)
-        
-        # Calculate total service duration
-        total_duration = get_service_duration(service_names)
-        
-        # Generate time slots
-        current_slot = datetime.combine(service_date, business_start)
-        end_time = datetime.combine(service_date, business_end)
-        
-        available_slots = []
-        
-        # Generate slots that can fit the entire service within business hours
-        while current_slot + timedelta(minutes=total_duration) <= end_time:
-            slot_time = current_slot.time()
-            
-            # Check if this slot is available (no conflicts)
-            is_available, _, _ = check_for_booking_conflicts(
-                service_date=service_date,
-                service_time=slot_time,
-                service_names=service_names
-            )
-            
-            if is_available:
-                available_slots.append(slot_time)
-            
-            # Move to next slot
-            current_slot += timedelta(minutes=slot_duration_minutes)
-        
-        return available_slots
+        availability = load_day_availability(service_date, service_names)
+        return availability.available_slots(slot_duration_minutes)
         
     except Exception as e:
         debug_print(f"Error generating available time slots: {str(e)}")
         st.error(f"Error generating available time slots: {str(e)}")
         return []
 
+def load_availability_range(
+    start_date: date,
+    end_date: date,
+    service_names: List[str]
+) -> Dict[date, DayAvailability]:
+    """
+    Build in-memory availability for every date in a window.
+    
+    Business hours, service duration and all bookings in the window are
+    fetched once, regardless of how many days the window spans; days whose
+    index is already current are not fetched at all.
+    
+    Args:
+        start_date: First date of the window (inclusive)
+        end_date: Last date of the window (inclusive)
+        service_names: List of service names to calculate total duration
+    
+    Returns:
+        Dictionary mapping each date in the window to its DayAvailability
+    """
+    service_dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    return _build_availability(
+        service_dates,
+        service_names,
+        load_day_occupancy(service_dates, contiguous=True)
+    )
+
+def load_availability_for_dates(
+    service_dates: List[date],
+    service_names: List[str]
+) -> Dict[date, DayAvailability]:
+    """
+    Build in-memory availability for a specific set of dates.
+    
+    Bookings for all dates are loaded with one IN query, which keeps
+    recurring series validation at a constant number of round trips.
+    
+    Args:
+        service_dates: Dates to check availability for
+        service_names: List of service names to calculate total duration
+    
+    Returns:
+        Dictionary mapping each requested date to its DayAvailability
+    """
+    return _build_availability(
+        service_dates,
+        service_names,
+        load_day_occupancy(service_dates)
+    )
+
+def _build_availability(
+    service_dates: List[date],
+    service_names: List[str],
+    occupancy_by_date: Dict[date, DayOccupancy]
+) -> Dict[date, DayAvailability]:
+    """Combine one business hours fetch and one duration lookup with the days' indexes."""
+    business_hours = fetch_business_hours_settings()
+    total_duration = get_service_duration(service_names)
+    
+    availability_by_date = {}
+    for service_date in service_dates:
+        business_start, business_end = resolve_business_hours(business_hours, service_date)
+        availability_by_date[service_date] = DayAvailability(
+            service_date=service_date,
+            business_start=business_start,
+            business_end=business_end,
+            total_duration=total_duration,
+            occupancy=occupancy_by_date[service_date]
+        )
+    return availability_by_date
+
+def get_availability_range(
+    start_date: date,
+    end_date: date,
+    service_names: List[str],
+    slot_duration_minutes: int = 30
+) -> Dict[date, List[time]]:
+    """
+    Get open time slots for every date in a window.
+    
+    Args:
+        start_date: First date of the window (inclusive)
+        end_date: Last date of the window (inclusive)
+        service_names: List of service names to calculate total duration
+        slot_duration_minutes: Duration between available slots in minutes
+    
+    Returns:
+        Dictionary mapping each date to its available time slots (empty when fully booked)
+    """
+    try:
+        availability_by_date = load_availability_range(start_date, end_date, service_names)
+        return {
+            service_date: availability.available_slots(slot_duration_minutes)
+            for service_date, availability in availability_by_date.items()
+        }
+        
+    except Exception as e:
+        debug_print(f"Error generating availability range: {str(e)}")
+        st.error(f"Error generating available time slots: {str(e)}")
+        return {}
+
+def get_recurring_dates(
+    base_date: date,
+    recurrence_pattern: str,
+    max_occurrences: int = 24
+) -> List[date]:
+    """
+    Calculate every occurrence date of a recurring service, including the base date.
+    
+    Args:
+        base_date: Starting date for recurring service
+        recurrence_pattern: "Weekly", "Bi-Weekly", or "Monthly"
+        max_occurrences: Maximum number of occurrences to return
+    
+    Returns:
+        List of occurrence dates within 6 months (180 days) of the base date
+    """
+    occurrence_dates = []
+    current_date = base_date
+    
+    for occurrence in range(max_occurrences):
+        # Calculate next occurrence date
+        if occurrence > 0:  # Skip first occurrence as it's the base_date
+            if recurrence_pattern == "Weekly":
+                current_date += timedelta(days=7)
+            elif recurrence_pattern == "Bi-Weekly":
+                current_date += timedelta(days=14)
+            elif recurrence_pattern == "Monthly":
+                # Handle month increment
+                year = current_date.year
+                month = current_date.month + 1
+                if month > 12:
+                    year += 1
+                    month = 1
+                try:
+                    current_date = current_date.replace(year=year, month=month)
+                except ValueError:
+                    # Handle cases like Jan 31 -> Feb 31 (doesn't exist)
+                    if month + 1 > 12:
+                        next_month = current_date.replace(year=year + 1, month=1, day=1)
+                    else:
+                        next_month = current_date.replace(year=year, month=month + 1, day=1)
+                    current_date = next_month - timedelta(days=1)
+        
+        # Stop if we've gone beyond 6 months (BOOKING_WINDOW_DAYS)
+        if (current_date - base_date).days > BOOKING_WINDOW_DAYS:
+            break
+        
+        occurrence_dates.append(current_date)
+    
+    return occurrence_dates
+
 def validate_recurring_service_availability(
     base_date: date,
     service_time: time,
@@ -392,6 +870,9 @@ def validate_recurring_service_availability(
     """
     Validate availability for recurring services.
     
+    All occurrence dates are computed up front and their bookings loaded in a
+    single query; each occurrence is then checked in memory.
+    
     Args:
         base_date: Starting date for recurring service
         service_time: Time for the service
@@ -405,42 +886,13 @@ def validate_recurring_service_availability(
     try:
         conflict_messages = []
         conflict_dates = []
-        current_date = base_date
         
-        for occurrence in range(max_occurrences):
-            # Calculate next occurrence date
-            if occurrence > 0:  # Skip first occurrence as it's the base_date
-                if recurrence_pattern == "Weekly":
-                    current_date += timedelta(days=7)
-                elif recurrence_pattern == "Bi-Weekly":
-                    current_date += timedelta(days=14)
-                elif recurrence_pattern == "Monthly":
-                    # Handle month increment
-                    year = current_date.year
-                    month = current_date.month + 1
-                    if month > 12:
-                        year += 1
-                        month = 1
-                    try:
-                        current_date = current_date.replace(year=year, month=month)
-                    except ValueError:
-                        # Handle cases like Jan 31 -> Feb 31 (doesn't exist)
-                        if month + 1 > 12:
-                            next_month = current_date.replace(year=year + 1, month=1, day=1)
-                        else:
-                            next_month = current_date.replace(year=year, month=month + 1, day=1)
-                        current_date = next_month - timedelta(days=1)
-            
-            # Stop if we've gone beyond 6 months (180 days)
-            if (current_date - base_date).days > 180:
-                break
-            
+        occurrence_dates = get_recurring_dates(base_date, recurrence_pattern, max_occurrences)
+        availability_by_date = load_availability_for_dates(occurrence_dates, service_names)
+        
+        for current_date in occurrence_dates:
             # Check availability for this occurrence
-            is_available, error_message, conflicts = check_for_booking_conflicts(
-                service_date=current_date,
-                service_time=service_time,
-                service_names=service_names
-            )
+            is_available, error_message, conflicts = availability_by_date[current_date].check(service_time)
             
             if not is_available:
                 conflict_messages.append(f"{current_date.strftime('%B %d, %Y')}: {error_message}")
@@ -504,9 +956,21 @@ def get_available_time_slots(
     )
 
 __all__ = [
+    'BOOKING_WINDOW_DAYS',
     'BookingConflict',
+    'DayAvailability',
+    'load_day_availability',
+    'load_day_occupancy',
+    'booking_changes',
+    'BookingChanges',
     'check_for_booking_conflicts',
+    'book_service_slot',
+    'summarize_conflicts',
     'get_available_time_slots_enhanced',
+    'get_availability_range',
+    'load_availability_range',
+    'load_availability_for_dates',
+    'get_recurring_dates',
     'validate_recurring_service_availability',
     'check_service_availability',
     'get_available_time_slots',
@@ -156,4 +156,28 @@ def render_date_range_picker(page_prefix: str) -> Tuple[date, date]:
         )
         st.session_state[f'{page_prefix}_end_date'] = end_date
     
-    return start_date, end_date
\ No newline at end of file
+    return start_date, end_date
+
+
+def render_page_navigation(page_prefix: str, cursors: list, next_cursor: Optional[Tuple]) -> None:
+    """
+    Render Previous / Next buttons that move through keyset cursors.
+    
+    Args:
+        page_prefix: Unique prefix for widget keys (e.g., 'scheduled', 'completed')
+        cursors: Starting cursor of every page visited so far (mutated in place)
+        next_cursor: Cursor of the current page's last row, or None on the last page
+    """
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("← Previous", disabled=len(cursors) <= 1, use_container_width=True,
+                     key=f"{page_prefix}_previous_page"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.markdown(f"<div style='text-align: center'>Page {len(cursors)}</div>", unsafe_allow_html=True)
+    with col3:
+        if st.button("Next →", disabled=next_cursor is None, use_container_width=True,
+                     key=f"{page_prefix}_next_page"):
+            cursors.append(next_cursor)
+            st.rerun()
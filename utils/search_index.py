@@ -0,0 +1,272 @@
+# utils/search_index.py
+"""
+In-memory type-ahead search over customer and account rows.
+
+SearchIndex keeps each row's searchable fields normalized (lower-cased text,
+digits-only phone numbers) and posts every 3-character gram of them, so a
+query only verifies rows containing all of its grams instead of scanning the
+table with LIKE '%term%'. Matches keep the substring semantics of the SQL
+they replace and are ranked: whole-field matches first, then matches at the
+start of a word, then anywhere.
+
+TableSearch keeps one index current with its table. The first search loads
+every row; later searches fetch only rows changed since the last stamp seen
+(or with a higher ID), at most every `refresh_interval` seconds or right away
+after this process writes to one of the source tables. A periodic full reload
+picks up deletes and anything the watermark cannot see.
+"""
+
+import heapq
+import threading
+import time as clock
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+GRAM_SIZE = 3
+
+# (column, 'text' or 'digits', weight)
+SearchField = Tuple[str, str, float]
+
+_WORD_BREAKS = " @._-"
+_PHONE_PUNCTUATION = str.maketrans("", "", " -().+")
+
+def normalize_text(value: Any) -> str:
+    """Lower-case a value and collapse its whitespace"""
+    if value is None:
+        return ""
+    return " ".join(str(value).lower().split())
+
+def normalize_digits(value: Any) -> str:
+    """Digits of a value, dropping phone punctuation"""
+    if value is None:
+        return ""
+    return "".join(character for character in str(value) if character.isdigit())
+
+def _grams(value: str) -> Set[str]:
+    return {value[index:index + GRAM_SIZE] for index in range(len(value) - GRAM_SIZE + 1)}
+
+class SearchIndex:
+    """Gram postings over the searchable fields of a set of rows"""
+
+    def __init__(self, key_column: str, fields: Sequence[SearchField]):
+        """
+        Initialize an empty index
+
+        Args:
+            key_column (str): Column identifying a row (e.g. CUSTOMER_ID)
+            fields: Searchable columns; the first one also orders equally ranked results
+        """
+        self.key_column = key_column
+        self.fields = list(fields)
+        self._rows: Dict[Any, Dict[str, Any]] = {}
+        self._values: Dict[Any, List[str]] = {}
+        self._postings: Dict[Tuple[str, str], Set[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def upsert(self, row: Dict[str, Any]) -> None:
+        """Add a row, replacing any earlier version with the same key"""
+        key = row[self.key_column]
+        self.remove(key)
+        values = [
+            normalize_digits(row.get(column)) if kind == 'digits' else normalize_text(row.get(column))
+            for column, kind, _ in self.fields
+        ]
+        self._rows[key] = row
+        self._values[key] = values
+        for (_, kind, _), value in zip(self.fields, values):
+            for gram in _grams(value):
+                self._postings.setdefault((kind, gram), set()).add(key)
+
+    def remove(self, key: Any) -> None:
+        """Drop a row if it is indexed"""
+        values = self._values.pop(key, None)
+        if values is None:
+            return
+        del self._rows[key]
+        for (_, kind, _), value in zip(self.fields, values):
+            for gram in _grams(value):
+                posting = self._postings.get((kind, gram))
+                if posting is not None:
+                    posting.discard(key)
+                    if not posting:
+                        del self._postings[(kind, gram)]
+
+    def _candidates(self, kind: str, query: str) -> Optional[Set[Any]]:
+        """Keys holding every gram of the query, or None if the query is too short to narrow"""
+        if len(query) < GRAM_SIZE:
+            return None
+        postings = sorted((self._postings.get((kind, gram), set()) for gram in _grams(query)), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches &= posting
+            if not matches:
+                break
+        return matches
+
+    def search(self, term: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Rows with a field containing the term, best matches first
+
+        Args:
+            term (str): Search text; phone-like terms also match phone digits
+                regardless of formatting
+            limit (Optional[int]): Maximum rows to return
+
+        Returns:
+            List[Dict[str, Any]]: Copies of the matching rows
+        """
+        text_query = normalize_text(term)
+        if not text_query:
+            return []
+        phone_like = str(term).translate(_PHONE_PUNCTUATION).isdigit()
+        digits_query = normalize_digits(term) if phone_like else ""
+
+        text_candidates = self._candidates('text', text_query)
+        digit_candidates = self._candidates('digits', digits_query) if digits_query else set()
+        if text_candidates is None or digit_candidates is None:
+            candidates = self._rows.keys()
+        else:
+            candidates = text_candidates | digit_candidates
+
+        ranked = []
+        for key in candidates:
+            values = self._values[key]
+            best = 0.0
+            for (_, kind, weight), value in zip(self.fields, values):
+                query = digits_query if kind == 'digits' else text_query
+                position = value.find(query) if query and value else -1
+                if position < 0:
+                    continue
+                if value == query:
+                    quality = 3
+                elif position == 0 or value[position - 1] in _WORD_BREAKS:
+                    quality = 2
+                else:
+                    quality = 1
+                best = max(best, quality * weight)
+            if best:
+                ranked.append((-best, values[0], key))
+        if limit is not None:
+            ranked = heapq.nsmallest(limit, ranked, key=lambda match: match[:2])
+        else:
+            ranked.sort(key=lambda match: match[:2])
+        return [dict(self._rows[key]) for _, _, key in ranked]
+
+class TableSearch:
+    """A SearchIndex kept current with one table by an update-stamp/ID watermark"""
+
+    def __init__(self,
+                 key_column: str,
+                 fields: Sequence[SearchField],
+                 load_rows: Callable[[Any, Optional[datetime], Optional[int]], Optional[List[Dict[str, Any]]]],
+                 tables: FrozenSet[str],
+                 stamp_column: str = 'CHANGED_AT',
+                 keep: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 refresh_interval: float = 5.0,
+                 reload_interval: float = 900.0,
+                 overlap: timedelta = timedelta(minutes=1)):
+        """
+        Initialize the search; nothing is loaded until the first search
+
+        Args:
+            key_column (str): Integer key column, also used as the insert watermark
+            fields: Searchable columns, see SearchIndex
+            load_rows: load_rows(conn, since, after_id) returns every row when `since`
+                is None, else rows stamped at or after `since` or keyed above `after_id`;
+                None on error
+            tables (FrozenSet[str]): Tables the rows are read from; local writes to
+                them trigger a refresh on the next search
+            stamp_column (str): Column holding each row's last change time
+            keep: Rows failing this (e.g. deactivated accounts) are dropped from the index
+            refresh_interval (float): Seconds between watermark queries
+            reload_interval (float): Seconds between full reloads
+            overlap (timedelta): How far before the newest stamp seen to look again,
+                covering writes that committed after a later stamp was read
+        """
+        self.key_column = key_column
+        self.fields = list(fields)
+        self.load_rows = load_rows
+        self.tables = frozenset(tables)
+        self.stamp_column = stamp_column
+        self.keep = keep
+        self.refresh_interval = refresh_interval
+        self.reload_interval = reload_interval
+        self.overlap = overlap
+        self._index: Optional[SearchIndex] = None
+        self._lock = threading.Lock()
+        self._loaded_at = 0.0
+        self._checked_at = 0.0
+        self._generation: Optional[Tuple[int, ...]] = None
+        self._max_stamp: Optional[datetime] = None
+        self._max_id: Optional[int] = None
+
+    def _apply(self, index: SearchIndex, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            if self.keep is not None and not self.keep(row):
+                index.remove(row[self.key_column])
+                continue
+            index.upsert(row)
+            stamp = row.get(self.stamp_column)
+            if stamp is not None and (self._max_stamp is None or stamp > self._max_stamp):
+                self._max_stamp = stamp
+            key = row.get(self.key_column)
+            if key is not None and (self._max_id is None or int(key) > self._max_id):
+                self._max_id = int(key)
+
+    def _ensure_current(self, snowflake_conn: Any) -> bool:
+        """Load or refresh under the lock; False if the index could not be loaded"""
+        now = clock.monotonic()
+        generation = snowflake_conn.results.generation(self.tables)
+        if self._index is None or now - self._loaded_at >= self.reload_interval:
+            rows = self.load_rows(snowflake_conn, None, None)
+            if rows is None:
+                return self._index is not None
+            self._max_stamp = self._max_id = None
+            index = SearchIndex(self.key_column, self.fields)
+            self._apply(index, rows)
+            self._index = index
+            self._loaded_at = self._checked_at = now
+            self._generation = generation
+            return True
+        if generation == self._generation and now - self._checked_at < self.refresh_interval:
+            return True
+        since = self._max_stamp - self.overlap if self._max_stamp is not None else datetime(1970, 1, 1)
+        rows = self.load_rows(snowflake_conn, since, self._max_id if self._max_id is not None else 0)
+        if rows is not None:
+            self._apply(self._index, rows)
+            self._checked_at = now
+            self._generation = generation
+        return True
+
+    def search(self, snowflake_conn: Any, term: str, limit: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Ranked rows matching the term
+
+        Args:
+            snowflake_conn: Database connection used to load and refresh
+            term (str): Search text
+            limit (Optional[int]): Maximum rows to return
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Matching rows, or None if the index could not be loaded
+        """
+        with self._lock:
+            if not self._ensure_current(snowflake_conn):
+                return None
+            return self._index.search(term, limit)
+
+    def clear(self) -> None:
+        """Forget everything; the next search reloads the table"""
+        with self._lock:
+            self._index = None
+            self._max_stamp = self._max_id = None
+
+__all__ = [
+    'SearchField',
+    'SearchIndex',
+    'TableSearch',
+    'normalize_text',
+    'normalize_digits'
+]
@@ -4,9 +4,101 @@ Utility functions for service management that can be used across the application
 """
 
 import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from database.connection import snowflake_conn
 
+# Seconds the loaded SERVICES table is reused before it is fetched again
+SERVICE_CATALOG_TTL_SECONDS = 300
+
+@st.cache_data(ttl=SERVICE_CATALOG_TTL_SECONDS, show_spinner=False)
+def _load_service_catalog() -> Dict[str, Dict[Any, Dict[str, Any]]]:
+    """Query every service once and index it by ID and by name (cached for the TTL)"""
+    query = """
+    SELECT 
+        SERVICE_ID,
+        SERVICE_NAME,
+        SERVICE_CATEGORY,
+        SERVICE_DESCRIPTION,
+        COST,
+        ACTIVE_STATUS,
+        CUSTOMER_BOOKABLE,
+        COALESCE(SERVICE_DURATION, 60) as SERVICE_DURATION
+    FROM OPERATIONAL.CARPET.SERVICES
+    ORDER BY SERVICE_CATEGORY, SERVICE_NAME
+    """
+    result = snowflake_conn.execute_query(query)
+    if result is None:
+        # Raise so a failed lookup is not cached for the whole TTL
+        raise RuntimeError("Service catalog query failed")
+
+    by_id = {}
+    by_name = {}
+    for row in result:
+        service = dict(row)
+        service['SERVICE_ID'] = int(service['SERVICE_ID'])
+        service['COST'] = float(service.get('COST') or 0.0)
+        service['SERVICE_DURATION'] = int(service.get('SERVICE_DURATION') or 60)
+        by_id[service['SERVICE_ID']] = service
+        by_name[service['SERVICE_NAME']] = service
+    return {'by_id': by_id, 'by_name': by_name}
+
+def _service_catalog() -> Dict[str, Dict[Any, Dict[str, Any]]]:
+    """Get the cached catalog indexes, or empty indexes if it could not be loaded"""
+    try:
+        return _load_service_catalog()
+    except Exception as e:
+        print(f"Error loading service catalog: {str(e)}")
+        return {'by_id': {}, 'by_name': {}}
+
+def get_service_by_name(service_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Look up a service in the cached catalog by name.
+    
+    Args:
+        service_name: Exact SERVICE_NAME
+    
+    Returns:
+        Copy of the SERVICES row, or None if no service has that name
+    """
+    service = _service_catalog()['by_name'].get(service_name)
+    return dict(service) if service else None
+
+def get_service_by_id(service_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Look up a service in the cached catalog by ID.
+    
+    Args:
+        service_id: SERVICE_ID
+    
+    Returns:
+        Copy of the SERVICES row, or None if no service has that ID
+    """
+    if service_id is None:
+        return None
+    service = _service_catalog()['by_id'].get(int(service_id))
+    return dict(service) if service else None
+
+def get_catalog_services(active_only: bool = True, customer_bookable: bool = False) -> List[Dict[str, Any]]:
+    """
+    List services from the cached catalog, ordered by category and name.
+    
+    Args:
+        active_only: Only include services with ACTIVE_STATUS set
+        customer_bookable: Only include services customers can book in the portal
+    
+    Returns:
+        List of SERVICES rows
+    """
+    return [
+        dict(service) for service in _service_catalog()['by_id'].values()
+        if (not active_only or service.get('ACTIVE_STATUS'))
+        and (not customer_bookable or service.get('CUSTOMER_BOOKABLE'))
+    ]
+
+def invalidate_service_catalog() -> None:
+    """Drop the cached catalog so the next lookup reads SERVICES again"""
+    _load_service_catalog.clear()
+
 def create_new_service(
     service_name: str,
     service_category: str,
@@ -44,40 +136,23 @@ def create_new_service(
             return None
         
         # Insert new service
-        insert_query = """
-        INSERT INTO OPERATIONAL.CARPET.SERVICES (
-            SERVICE_NAME,
-            SERVICE_CATEGORY,
-            SERVICE_DESCRIPTION,
-            COST,
-            ACTIVE_STATUS,
-            SERVICE_DURATION,
-            CUSTOMER_BOOKABLE
-        ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        
-        snowflake_conn.execute_query(insert_query, [
-            service_name,
-            service_category,
-            service_description,
-            float(cost),
-            active_status,
-            int(service_duration),
-            customer_bookable
-        ])
-        
-        # Get the created service ID
-        id_query = """
-        SELECT SERVICE_ID 
-        FROM OPERATIONAL.CARPET.SERVICES 
-        WHERE SERVICE_NAME = ? 
-        ORDER BY SERVICE_ID DESC 
-        LIMIT 1
-        """
-        result = snowflake_conn.execute_query(id_query, [service_name])
+        service_id = snowflake_conn.insert_returning_id(
+            "OPERATIONAL.CARPET.SERVICES",
+            {
+                'SERVICE_NAME': service_name,
+                'SERVICE_CATEGORY': service_category,
+                'SERVICE_DESCRIPTION': service_description,
+                'COST': float(cost),
+                'ACTIVE_STATUS': active_status,
+                'SERVICE_DURATION': int(service_duration),
+                'CUSTOMER_BOOKABLE': customer_bookable
+            },
+            id_column="SERVICE_ID",
+            error_msg="Error creating service"
+        )
+        invalidate_service_catalog()
         
-        if result:
-            service_id = result[0]['SERVICE_ID']
+        if service_id:
             st.success(f"Service '{service_name}' created successfully!")
             return service_id
         else: